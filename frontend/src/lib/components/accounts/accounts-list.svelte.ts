@@ -11,7 +11,12 @@ import {
 } from '@/types/account';
 import { SvelteSet } from 'svelte/reactivity';
 import { group, type GroupBy } from '@/group';
-import { WsEventType, type AccountSyncMessage } from '@/types/websocket';
+import {
+	WsEventType,
+	type AccountSyncMessage,
+	type WsBatchMessage,
+	type WsMessage
+} from '@/types/websocket';
 import { ModalState } from '@/utils/modal-state.svelte';
 
 export class AccountsListState {
@@ -81,22 +86,13 @@ export class AccountsListState {
 		};
 
 		this.ws.onmessage = async (event) => {
-			console.log('WebSocket message received:', event.data);
 			try {
 				const data = JSON.parse(event.data);
-				const accountId = (data as AccountSyncMessage).account_id;
-				if (data.type === WsEventType.SYNC_STARTED) {
-					console.log('Sync started for account:', accountId);
-					this.syncingAccountIds.add(accountId);
-					this.syncErrors[accountId] = null;
-				} else if (data.type === WsEventType.SYNC_FINISHED) {
-					console.log('Sync finished for account:', accountId);
-					this.syncingAccountIds.delete(accountId);
-					this.syncErrors[accountId] = null;
-				} else if (data.type === WsEventType.SYNC_FAILED) {
-					console.log('Sync failed for account:', accountId);
-					this.syncingAccountIds.delete(accountId);
-					this.syncErrors[accountId] = 'Failed to sync. Please try again.';
+				// Messages sent in a burst arrive coalesced into one batch frame
+				const messages: WsMessage[] =
+					data.type === WsEventType.BATCH ? (data as WsBatchMessage).messages : [data];
+				for (const message of messages) {
+					this.handleWsMessage(message);
 				}
 			} catch (e) {
 				console.error('Failed to parse websocket message', e);
@@ -112,6 +108,29 @@ export class AccountsListState {
 		};
 	}
 
+	private handleWsMessage(data: WsMessage) {
+		if (data.type === WsEventType.PING) {
+			// Server heartbeat, the connection is closed without an answer
+			this.ws?.send(JSON.stringify({ type: WsEventType.PONG }));
+			return;
+		}
+		console.log('WebSocket message received:', data);
+		const accountId = (data as AccountSyncMessage).account_id;
+		if (data.type === WsEventType.SYNC_STARTED) {
+			console.log('Sync started for account:', accountId);
+			this.syncingAccountIds.add(accountId);
+			this.syncErrors[accountId] = null;
+		} else if (data.type === WsEventType.SYNC_FINISHED) {
+			console.log('Sync finished for account:', accountId);
+			this.syncingAccountIds.delete(accountId);
+			this.syncErrors[accountId] = null;
+		} else if (data.type === WsEventType.SYNC_FAILED) {
+			console.log('Sync failed for account:', accountId);
+			this.syncingAccountIds.delete(accountId);
+			this.syncErrors[accountId] = 'Failed to sync. Please try again.';
+		}
+	}
+
 	destroy() {
 		if (this.ws) {
 			this.ws.close();
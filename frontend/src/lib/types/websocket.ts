@@ -1,7 +1,13 @@
 export enum WsEventType {
 	SYNC_STARTED = 'sync_started',
 	SYNC_FINISHED = 'sync_finished',
-	SYNC_FAILED = 'sync_failed'
+	SYNC_FAILED = 'sync_failed',
+	PING = 'ping',
+	PONG = 'pong',
+	BATCH = 'batch',
+	SUBSCRIBE = 'subscribe',
+	UNSUBSCRIBE = 'unsubscribe',
+	SECURITY_PRICE_UPDATED = 'security_price_updated'
 }
 
 export interface WsMessage {
@@ -11,3 +17,16 @@ export interface WsMessage {
 export interface AccountSyncMessage extends WsMessage {
 	account_id: string;
 }
+
+export interface WsBatchMessage extends WsMessage {
+	messages: WsMessage[];
+}
+
+export interface SecuritySubscriptionMessage extends WsMessage {
+	security_ids: string[];
+}
+
+export interface SecurityPriceUpdatedMessage extends WsMessage {
+	security_id: string;
+	close: string;
+}
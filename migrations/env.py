@@ -11,6 +11,7 @@ import src.auth.model
 import src.config.database
 import src.integration.model
 import src.market.model
+from src.market.partitions import is_partition
 
 BaseModel = src.config.database.BaseModel
 
@@ -27,6 +28,13 @@ if db_url:
     config.set_main_option("sqlalchemy.url", db_url)
 
 
+def include_name(name, type_, parent_names):
+    """Skip partitions, they are managed at runtime and not by models."""
+    if type_ == "table":
+        return not is_partition(name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -43,6 +51,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +74,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,77 @@
+"""add market security search index
+
+Revision ID: 3f6b2d9c1a47
+Revises: c2a9f7b17e13
+Create Date: 2026-10-19 10:12:44.103512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6b2d9c1a47'
+down_revision: Union[str, Sequence[str], None] = 'c2a9f7b17e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('market_security_search_index',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('exchange', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('security_type', sa.String(), nullable=False),
+    sa.Column('isin', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('search_code', sa.String(), nullable=False),
+    sa.Column('search_name', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code', 'exchange', name='search_code_exchange_unique')
+    )
+    op.create_index('ix_market_security_search_index_search_code', 'market_security_search_index', ['search_code'], unique=False, postgresql_ops={'search_code': 'text_pattern_ops'})
+    op.create_index('ix_market_security_search_index_search_name', 'market_security_search_index', ['search_name'], unique=False, postgresql_ops={'search_name': 'text_pattern_ops'})
+
+    # Seed the index with the search results stored for broker securities
+    op.execute(
+        """
+        INSERT INTO market_security_search_index (
+            code, exchange, name, currency, security_type, isin, country,
+            search_code, search_name, updated_at
+        )
+        SELECT DISTINCT ON (result->>'code', result->>'exchange')
+            result->>'code',
+            result->>'exchange',
+            result->>'name',
+            result->>'currency',
+            COALESCE(result->>'security_type', result->>'type'),
+            NULLIF(result->>'isin', ''),
+            result->>'country',
+            lower(result->>'code'),
+            lower(result->>'name'),
+            now()
+        FROM market_securities_broker,
+            json_array_elements(search_results) AS result
+        WHERE json_typeof(search_results) = 'array'
+            AND result->>'code' IS NOT NULL
+            AND result->>'exchange' IS NOT NULL
+            AND result->>'name' IS NOT NULL
+            AND result->>'currency' IS NOT NULL
+            AND COALESCE(result->>'security_type', result->>'type') IS NOT NULL
+            AND result->>'country' IS NOT NULL
+        ON CONFLICT ON CONSTRAINT search_code_exchange_unique DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_market_security_search_index_search_name', table_name='market_security_search_index', postgresql_ops={'search_name': 'text_pattern_ops'})
+    op.drop_index('ix_market_security_search_index_search_code', table_name='market_security_search_index', postgresql_ops={'search_code': 'text_pattern_ops'})
+    op.drop_table('market_security_search_index')
@@ -0,0 +1,186 @@
+"""partition market_intraday_prices by month
+
+Revision ID: 7c1e4a9d2b58
+Revises: 3f6b2d9c1a47
+Create Date: 2026-10-19 14:03:51.227096
+
+"""
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9d2b58'
+down_revision: Union[str, Sequence[str], None] = '3f6b2d9c1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of the current one, the maintenance task keeps it up
+MONTHS_AHEAD = 2
+
+PRICE_COLUMNS = 'security_id, "timestamp", open, high, low, close, volume'
+
+
+def _next_month(month: datetime) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month, 12)
+    return datetime(year, month_index + 1, 1, tzinfo=UTC)
+
+
+def _create_monthly_partitions(first: datetime, last: datetime) -> None:
+    month = datetime(first.year, first.month, 1, tzinfo=UTC)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f'CREATE TABLE market_intraday_prices_p{month:%Y_%m} '
+            'PARTITION OF market_intraday_prices '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+
+def upgrade() -> None:
+    """Rebuild market_intraday_prices as a monthly range partitioned table.
+
+    Existing bars are copied into one partition per month, a default
+    partition catches bars of months without a partition. The id becomes a
+    bigint and the primary key includes the partition key.
+    """
+    op.rename_table('market_intraday_prices', 'market_intraday_prices_old')
+    op.execute(
+        'ALTER TABLE market_intraday_prices_old RENAME CONSTRAINT '
+        'intraday_price_security_timestamp_unique '
+        'TO intraday_price_security_timestamp_unique_old'
+    )
+    op.execute(
+        'ALTER TABLE market_intraday_prices_old RENAME CONSTRAINT '
+        'market_intraday_prices_pkey TO market_intraday_prices_old_pkey'
+    )
+    op.execute(
+        'ALTER SEQUENCE market_intraday_prices_id_seq '
+        'RENAME TO market_intraday_prices_old_id_seq'
+    )
+
+    op.create_table(
+        'market_intraday_prices',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('security_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('high', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('low', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('close', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['security_id'], ['market_securities.id'],
+        ),
+        sa.PrimaryKeyConstraint('id', 'timestamp'),
+        sa.UniqueConstraint(
+            'security_id', 'timestamp',
+            name='intraday_price_security_timestamp_unique',
+        ),
+        postgresql_partition_by='RANGE (timestamp)',
+    )
+    op.create_index(
+        'ix_market_intraday_prices_timestamp_brin',
+        'market_intraday_prices',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+    )
+    op.execute(
+        'CREATE TABLE market_intraday_prices_default '
+        'PARTITION OF market_intraday_prices DEFAULT'
+    )
+
+    bind = op.get_bind()
+    oldest = bind.execute(
+        sa.text('SELECT min("timestamp") FROM market_intraday_prices_old')
+    ).scalar()
+    now = datetime.now(UTC)
+    last = datetime(now.year, now.month, 1, tzinfo=UTC)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    _create_monthly_partitions(oldest or now, last)
+
+    op.execute(
+        f'INSERT INTO market_intraday_prices (id, {PRICE_COLUMNS}) '
+        f'SELECT id, {PRICE_COLUMNS} FROM market_intraday_prices_old'
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('market_intraday_prices', 'id'), "
+        'COALESCE((SELECT max(id) FROM market_intraday_prices), 0) + 1, false)'
+    )
+    op.drop_table('market_intraday_prices_old')
+
+    op.create_table(
+        'market_intraday_prices_4h',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('security_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('high', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('low', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('close', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['security_id'], ['market_securities.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'security_id', 'timestamp',
+            name='intraday_price_4h_security_timestamp_unique',
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Restore the unpartitioned market_intraday_prices table.
+
+    Bars already rolled up into 4-hour bars are not restored.
+    """
+    op.drop_table('market_intraday_prices_4h')
+
+    op.rename_table('market_intraday_prices', 'market_intraday_prices_partitioned')
+    op.execute(
+        'ALTER TABLE market_intraday_prices_partitioned RENAME CONSTRAINT '
+        'intraday_price_security_timestamp_unique '
+        'TO intraday_price_security_timestamp_unique_partitioned'
+    )
+    op.execute(
+        'ALTER TABLE market_intraday_prices_partitioned RENAME CONSTRAINT '
+        'market_intraday_prices_pkey TO market_intraday_prices_partitioned_pkey'
+    )
+    op.execute(
+        'ALTER SEQUENCE market_intraday_prices_id_seq '
+        'RENAME TO market_intraday_prices_partitioned_id_seq'
+    )
+
+    op.create_table(
+        'market_intraday_prices',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('security_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('high', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('low', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('close', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['security_id'], ['market_securities.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'security_id', 'timestamp',
+            name='intraday_price_security_timestamp_unique',
+        ),
+    )
+    op.execute(
+        f'INSERT INTO market_intraday_prices ({PRICE_COLUMNS}) '
+        f'SELECT {PRICE_COLUMNS} FROM market_intraday_prices_partitioned '
+        'ORDER BY "timestamp"'
+    )
+    # Dropping the partitioned table drops all of its partitions
+    op.drop_table('market_intraday_prices_partitioned')
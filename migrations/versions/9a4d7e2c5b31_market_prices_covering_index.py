@@ -0,0 +1,52 @@
+"""market_prices covering index and bigint id
+
+Revision ID: 9a4d7e2c5b31
+Revises: 7c1e4a9d2b58
+Create Date: 2026-10-19 16:42:08.513904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d7e2c5b31'
+down_revision: Union[str, Sequence[str], None] = '7c1e4a9d2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'market_prices', 'id',
+        existing_type=sa.INTEGER(),
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+    )
+    op.execute('ALTER SEQUENCE market_prices_id_seq AS bigint')
+    op.create_index(
+        'ix_market_prices_security_date_desc',
+        'market_prices',
+        ['security_id', sa.literal_column('date DESC')],
+        unique=False,
+        postgresql_include=['close', 'adjusted_close'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_market_prices_security_date_desc',
+        table_name='market_prices',
+        postgresql_include=['close', 'adjusted_close'],
+    )
+    op.execute('ALTER SEQUENCE market_prices_id_seq AS integer')
+    op.alter_column(
+        'market_prices', 'id',
+        existing_type=sa.BigInteger(),
+        type_=sa.INTEGER(),
+        existing_nullable=False,
+    )
@@ -0,0 +1,35 @@
+"""index account positions security id
+
+Revision ID: a7c4e2f9b813
+Revises: d2f6a9b4e7c3
+Create Date: 2026-10-19 20:41:17.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2f9b813'
+down_revision: Union[str, Sequence[str], None] = 'd2f6a9b4e7c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_account_positions_security_id'),
+        'account_positions',
+        ['security_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_account_positions_security_id'), table_name='account_positions'
+    )
@@ -0,0 +1,41 @@
+"""add market_latest_intraday
+
+Revision ID: b5e8c3f1d602
+Revises: 9a4d7e2c5b31
+Create Date: 2026-10-19 17:25:36.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8c3f1d602'
+down_revision: Union[str, Sequence[str], None] = '9a4d7e2c5b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'market_latest_intraday',
+        sa.Column('security_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('close', sa.DECIMAL(precision=16, scale=8), nullable=False),
+        sa.ForeignKeyConstraint(['security_id'], ['market_securities.id'], ),
+        sa.PrimaryKeyConstraint('security_id')
+    )
+    op.execute(
+        'INSERT INTO market_latest_intraday (security_id, "timestamp", close) '
+        'SELECT DISTINCT ON (security_id) security_id, "timestamp", close '
+        'FROM market_intraday_prices '
+        'ORDER BY security_id, "timestamp" DESC'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('market_latest_intraday')
@@ -0,0 +1,60 @@
+"""index active price alert thresholds
+
+Revision ID: d2f6a9b4e7c3
+Revises: b5e8c3f1d602
+Create Date: 2026-10-19 18:10:52.371846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a9b4e7c3'
+down_revision: Union[str, Sequence[str], None] = 'b5e8c3f1d602'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'market_latest_intraday',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    # The default only backfills existing rows, the application sets it
+    op.alter_column('market_latest_intraday', 'updated_at', server_default=None)
+    op.create_index(
+        op.f('ix_market_latest_intraday_updated_at'),
+        'market_latest_intraday',
+        ['updated_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_market_price_alerts_active_threshold',
+        'market_price_alerts',
+        ['security_id', 'condition', 'target_price'],
+        unique=False,
+        postgresql_where=sa.text('triggered_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_market_price_alerts_active_threshold',
+        table_name='market_price_alerts',
+        postgresql_where=sa.text('triggered_at IS NULL'),
+    )
+    op.drop_index(
+        op.f('ix_market_latest_intraday_updated_at'),
+        table_name='market_latest_intraday',
+    )
+    op.drop_column('market_latest_intraday', 'updated_at')
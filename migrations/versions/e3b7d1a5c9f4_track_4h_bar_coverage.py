@@ -0,0 +1,37 @@
+"""track the 1-hour bars rolled into each 4-hour bar
+
+Revision ID: e3b7d1a5c9f4
+Revises: a7c4e2f9b813
+Create Date: 2026-10-19 21:12:40.318527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7d1a5c9f4'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e2f9b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing 4-hour bars keep NULL: their coverage is unknown, so late bars
+    # of those buckets are never merged into them
+    op.add_column(
+        'market_intraday_prices_4h',
+        sa.Column(
+            'bar_timestamps',
+            sa.ARRAY(sa.DateTime(timezone=True)),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('market_intraday_prices_4h', 'bar_timestamps')
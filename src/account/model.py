@@ -184,7 +184,7 @@ class PositionModel(BaseModel):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     account_id: Mapped[AccountId] = mapped_column(Uuid, ForeignKey("accounts.id"))
-    security_id: Mapped[SecurityId] = mapped_column(Uuid)
+    security_id: Mapped[SecurityId] = mapped_column(Uuid, index=True)
     quantity: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
     average_cost: Mapped[Decimal | None] = mapped_column(Float, nullable=True)
     currency: Mapped[str] = mapped_column(String(3), nullable=True)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable
 
 from src.account.api_types import AccountId, PortfolioId
 from src.account.schema import (
@@ -47,6 +48,12 @@ class AccountRepository(ABC):
     async def get_all(self) -> list[AccountSchema]:
         pass
 
+    @abstractmethod
+    def stream_active_by_securities(
+        self, security_ids: Iterable[SecurityId], batch_size: int
+    ) -> AsyncIterator[list[AccountSchema]]:
+        """Stream the active accounts holding any of the securities, in batches."""
+
     @abstractmethod
     async def delete(self, account_id: AccountId) -> None:
         pass
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Iterable
 from decimal import Decimal
 from typing import override
 
@@ -128,6 +129,34 @@ class SqlAlchemyAccountRepository(AccountRepository):
             for account_model in account_models
         ]
 
+    @override
+    async def stream_active_by_securities(
+        self, security_ids: Iterable[SecurityId], batch_size: int
+    ) -> AsyncIterator[list[AccountSchema]]:
+        ids = set(security_ids)
+        if not ids:
+            return
+
+        q = (
+            select(AccountModel)
+            .where(
+                AccountModel.is_active.is_(True),
+                AccountModel.id.in_(
+                    select(PositionModel.account_id).where(
+                        PositionModel.security_id.in_(ids)
+                    )
+                ),
+            )
+            .order_by(AccountModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream_scalars(q)
+        async for account_models in result.partitions():
+            yield [
+                AccountSchema.model_validate(account_model)
+                for account_model in account_models
+            ]
+
     @override
     async def delete(self, account_id: AccountId) -> None:
         account_model = await self._session.get(AccountModel, account_id)
@@ -2,7 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 import redis
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from svcs.fastapi import DepContainer
 
 from src.account.api_types import (
@@ -276,15 +276,21 @@ async def account_holdings(
 
 @account_router.post("/{account_id}/sync")
 @limiter.limit("3/minute")
-async def account_sync_positions(
+async def account_sync_positions(  # noqa: PLR0913, PLR0917
     request: Request,  # noqa: ARG001
     response: Response,  # noqa: ARG001
     account_id: AccountId,
     user: Annotated[User, Depends(current_user)],
     services: DepContainer,
+    refresh_metadata: Annotated[  # noqa: FBT002
+        bool, Query(description="Fetch the cached security metadata again")
+    ] = False,
 ) -> dict:
     """
     Enqueue a background task to sync positions for the given account.
+
+    With refresh_metadata the security metadata cached from the broker is
+    fetched again, e.g. after a ticker change.
     """
     authorization_api = await services.aget(AuthorizationApi)
     account_repository = await services.aget(AccountRepository)
@@ -297,7 +303,9 @@ async def account_sync_positions(
     authorization_api.check_entity_owned_by_user(user, account)
 
     try:
-        await position_service.sync_account_positions(user.id, account_id)
+        await position_service.sync_account_positions(
+            user.id, account_id, refresh_security_metadata=refresh_metadata
+        )
     except AccountNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
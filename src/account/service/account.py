@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator, Iterable
+
 from svcs import Container
 
 from src.account.api_types import AccountId
@@ -7,6 +9,7 @@ from src.account.repository import (
 )
 from src.account.schema import AccountSchema
 from src.auth.api_types import UserId
+from src.market.api_types import SecurityId
 
 
 class AccountService:
@@ -44,6 +47,14 @@ class AccountService:
         """Get all accounts."""
         return await self._account_repository.get_all()
 
+    def stream_active_accounts_holding(
+        self, security_ids: Iterable[SecurityId], batch_size: int
+    ) -> AsyncIterator[list[AccountSchema]]:
+        """Stream the active accounts holding any of the securities, in batches."""
+        return self._account_repository.stream_active_by_securities(
+            security_ids, batch_size
+        )
+
 
 async def account_service_factory(container: Container) -> AccountService:
     return AccountService(
@@ -60,9 +60,17 @@ class PositionService:
         self._security_service = security_service
 
     async def sync_account_positions(
-        self, user_id: UserId, account_id: AccountId
+        self,
+        user_id: UserId,
+        account_id: AccountId,
+        *,
+        refresh_security_metadata: bool = False,
     ) -> None:
-        """Sync positions for an account from the broker."""
+        """Sync positions for an account from the broker.
+
+        With refresh_security_metadata the broker's security metadata is
+        fetched again instead of being served from the cache.
+        """
         # Check that account exists
         account = await self._account_service.get_account(account_id)
 
@@ -78,6 +86,7 @@ class PositionService:
             user_id=user_id,
             account=Account.model_validate(account),
             broker_account_id=account.external_id,
+            refresh_security_metadata=refresh_security_metadata,
         )
 
     async def get_holdings_by_security(
@@ -6,6 +6,7 @@ from src.auth.api import (
     authorization_api_factory,
     user_api_factory,
 )
+from src.auth.cache import AuthenticatedUserCache, create_authenticated_user_cache
 from src.auth.repository import UserRepository, VerificationTokenRepository
 from src.auth.repository_sqlalchemy import (
     sqlalchemy_user_repository_factory,
@@ -13,6 +14,7 @@ from src.auth.repository_sqlalchemy import (
 )
 from src.auth.service import EmailVerificationService
 from src.core.email import EmailService
+from src.core.redis import redis_pool
 
 
 async def email_verification_service_factory(
@@ -22,10 +24,14 @@ async def email_verification_service_factory(
         user_repository=await container.aget(UserRepository),
         token_repository=await container.aget(VerificationTokenRepository),
         email_service=await container.aget(EmailService),
+        user_cache=await container.aget(AuthenticatedUserCache),
     )
 
 
 def register_auth_services(registry: Registry) -> None:
+    registry.register_value(
+        AuthenticatedUserCache, create_authenticated_user_cache(redis_pool)
+    )
     registry.register_factory(UserRepository, sqlalchemy_user_repository_factory)
     registry.register_factory(
         VerificationTokenRepository, sqlalchemy_verification_token_repository_factory
@@ -1,4 +1,4 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
@@ -17,6 +17,7 @@ from src.auth.api_types import (
     User,
     UserId,
 )
+from src.auth.cache import AuthenticatedUserCache
 from src.auth.exception import (
     AuthInvalidCredentialsError,
     AuthUserAlreadyExistsError,
@@ -36,28 +37,43 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 class UserApi:
     _user_repository: UserRepository
     _email_verification_service: EmailVerificationService
+    _user_cache: AuthenticatedUserCache | None
 
     def __init__(
         self,
         user_repository: UserRepository,
         email_verification_service: EmailVerificationService,
+        user_cache: AuthenticatedUserCache | None = None,
     ):
         self._user_repository = user_repository
         self._email_verification_service = email_verification_service
+        self._user_cache = user_cache
 
     async def get_current_user_from_token(self, token: str) -> User:
-        """Retrieve the current user from the provided JWT token."""
+        """Retrieve the current user from the provided JWT token.
+
+        The user is looked up once and then served from the cache while the
+        token's user id and email still match it.
+        """
         try:
             token_data = self._decode_token(token)
         except jwt.ExpiredSignatureError as e:
             raise HTTPException(401, "Token expired") from e
 
+        if self._user_cache is not None:
+            cached = await self._user_cache.get(UUID(token_data.user_id))
+            if cached is not None and cached.email == token_data.sub:
+                return cached
+
         user = await self._user_repository.get_by_email(token_data.sub)
 
         if not user:
             raise HTTPException(401, "Token invalid")
 
-        return User(id=user.id, email=user.email)
+        current = User(id=user.id, email=user.email)
+        if self._user_cache is not None and str(user.id) == token_data.user_id:
+            await self._user_cache.set(current)
+        return current
 
     def create_access_token(
         self,
@@ -135,6 +151,12 @@ class UserApi:
         user = await self._user_repository.get_by_id(user_id)
         return user.email if user else None
 
+    async def get_emails_for_users(
+        self, user_ids: Iterable[UserId]
+    ) -> dict[UserId, str]:
+        """Look up the emails of many users at once, omitting unknown users."""
+        return await self._user_repository.get_emails_by_ids(user_ids)
+
     async def get_preferences(self, user_id: UserId) -> dict | None:
         """Retrieve the user's stored preferences, returning None if not saved."""
         return await self._user_repository.get_preferences(user_id)
@@ -150,12 +172,14 @@ class UserApi:
     def _decode_token(self, token: str) -> AccessTokenData:
         """Decode and validate a JWT token."""
         try:
-            return AccessTokenData.model_validate(
+            token_data = AccessTokenData.model_validate(
                 jwt.decode(token, settings.secret_key, algorithms=[_ALGORITHM]),
             )
-        except (jwt.DecodeError, ValidationError) as e:
+            UUID(token_data.user_id)
+        except (jwt.DecodeError, ValidationError, ValueError) as e:
             message = "User unauthenticated or malformed token"
             raise HTTPException(401, message) from e
+        return token_data
 
 
 async def user_api_factory(
@@ -164,6 +188,7 @@ async def user_api_factory(
     return UserApi(
         user_repository=await sqlalchemy_user_repository_factory(container),
         email_verification_service=await container.aget(EmailVerificationService),
+        user_cache=await container.aget(AuthenticatedUserCache),
     )
 
 
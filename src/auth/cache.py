@@ -0,0 +1,108 @@
+import logging
+import time
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from src.auth.api_types import User, UserId
+from src.config.settings import settings
+from src.core.redis import RedisPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedUser:
+    user: User
+    expires_at: float
+
+
+class AuthenticatedUserCache:
+    """Two-tier cache of the users authenticated from access tokens.
+
+    Entries are kept in process for a few seconds and in Redis for a few
+    minutes, keyed by user id, so authenticated requests skip the user lookup.
+    Services changing a user's account invalidate it: this removes its Redis
+    entry and the entry of this process, other processes drop theirs within
+    the local TTL. Redis errors count as misses.
+    """
+
+    def __init__(
+        self,
+        redis_pool: RedisPool,
+        *,
+        ttl_seconds: int,
+        local_ttl_seconds: float,
+        max_local_entries: int,
+    ) -> None:
+        self._redis_pool = redis_pool
+        self._ttl_seconds = ttl_seconds
+        self._local_ttl_seconds = local_ttl_seconds
+        self._max_local_entries = max_local_entries
+        self._local: dict[UserId, _CachedUser] = {}
+
+    @staticmethod
+    def _get_cache_key(user_id: UserId) -> str:
+        return f"auth_user:{user_id}"
+
+    def _set_local(self, user: User) -> None:
+        self._local.pop(user.id, None)
+        if len(self._local) >= self._max_local_entries:
+            # Entries are in insertion order, drop the oldest
+            del self._local[next(iter(self._local))]
+        self._local[user.id] = _CachedUser(
+            user=user, expires_at=time.monotonic() + self._local_ttl_seconds
+        )
+
+    async def get(self, user_id: UserId) -> User | None:
+        """Get a cached user, None on a miss."""
+        entry = self._local.get(user_id)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                return entry.user
+            del self._local[user_id]
+
+        try:
+            cached = await self._redis_pool.client().get(self._get_cache_key(user_id))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Authenticated user cache get error: %s", e)
+            return None
+        if cached is None:
+            return None
+
+        try:
+            user = User.model_validate_json(cached)
+        except ValidationError:
+            return None
+        self._set_local(user)
+        return user
+
+    async def set(self, user: User) -> None:
+        """Cache an authenticated user."""
+        self._set_local(user)
+        try:
+            await self._redis_pool.client().set(
+                self._get_cache_key(user.id),
+                user.model_dump_json(),
+                ex=self._ttl_seconds,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Authenticated user cache set error: %s", e)
+
+    async def invalidate(self, user_id: UserId) -> None:
+        """Drop a user whose account changed."""
+        self._local.pop(user_id, None)
+        try:
+            await self._redis_pool.client().delete(self._get_cache_key(user_id))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Authenticated user cache invalidation error: %s", e)
+
+
+def create_authenticated_user_cache(redis_pool: RedisPool) -> AuthenticatedUserCache:
+    """Create the authenticated user cache sized from settings."""
+    return AuthenticatedUserCache(
+        redis_pool,
+        ttl_seconds=settings.auth_user_cache_ttl_seconds,
+        local_ttl_seconds=settings.auth_user_cache_local_ttl_seconds,
+        max_local_entries=settings.auth_user_cache_max_local_entries,
+    )
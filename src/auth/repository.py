@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from datetime import datetime
 
 from src.auth.api_types import UserId
@@ -14,6 +15,15 @@ class UserRepository(ABC):
     async def get_by_email(self, email: str) -> UserSchema | None:
         pass
 
+    async def get_emails_by_ids(self, user_ids: Iterable[UserId]) -> dict[UserId, str]:
+        """Emails of the given users, unknown users are omitted."""
+        emails = {}
+        for user_id in set(user_ids):
+            user = await self.get_by_id(user_id)
+            if user is not None:
+                emails[user_id] = user.email
+        return emails
+
     @abstractmethod
     async def create_user(self, email: str, plain_text_password: str) -> UserSchema:
         pass
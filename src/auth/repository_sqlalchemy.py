@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from datetime import datetime
 from typing import override
 from uuid import uuid4
@@ -43,6 +44,17 @@ class SqlAlchemyUserRepository(UserRepository):
 
         return None
 
+    @override
+    async def get_emails_by_ids(self, user_ids: Iterable[UserId]) -> dict[UserId, str]:
+        ids = set(user_ids)
+        if not ids:
+            return {}
+
+        result = await self._session.execute(
+            select(UserModel.id, UserModel.email).where(UserModel.id.in_(ids))
+        )
+        return dict(result.tuples().all())
+
     @override
     async def create_user(self, email: str, plain_text_password: str) -> UserSchema:
         user_db = UserModel(email=email, password=plain_text_password)
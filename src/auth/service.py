@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from itsdangerous import BadData, URLSafeTimedSerializer
 
 from src.auth.api_types import UserId
+from src.auth.cache import AuthenticatedUserCache
 from src.auth.repository import UserRepository, VerificationTokenRepository
 from src.config.settings import settings
 from src.core.email import EmailService
@@ -14,6 +15,7 @@ class EmailVerificationService:
     _user_repository: UserRepository
     _token_repository: VerificationTokenRepository
     _email_service: EmailService
+    _user_cache: AuthenticatedUserCache | None
     _serializer: URLSafeTimedSerializer
 
     def __init__(
@@ -21,10 +23,12 @@ class EmailVerificationService:
         user_repository: UserRepository,
         token_repository: VerificationTokenRepository,
         email_service: EmailService,
+        user_cache: AuthenticatedUserCache | None = None,
     ):
         self._user_repository = user_repository
         self._token_repository = token_repository
         self._email_service = email_service
+        self._user_cache = user_cache
         self._serializer = URLSafeTimedSerializer(settings.secret_key)
 
     def _generate_token(self, email: str) -> str:
@@ -85,6 +89,8 @@ class EmailVerificationService:
 
         await self._user_repository.mark_as_verified(user.id)
         await self._token_repository.mark_as_used(token_record.id)
+        if self._user_cache is not None:
+            await self._user_cache.invalidate(user.id)
 
     async def resend_verification(self, email: str) -> None:
         user = await self._user_repository.get_by_email(email)
@@ -7,7 +7,12 @@ from sqlalchemy import delete, func, select
 
 from src.config.database import sessionmanager
 from src.market.cache import indicator_cache_factory
-from src.market.model import IntradayPriceModel, PriceModel, SecurityModel
+from src.market.model import (
+    IntradayPriceModel,
+    LatestIntradayPriceModel,
+    PriceModel,
+    SecurityModel,
+)
 
 
 def _confirm(prompt: str) -> bool:
@@ -41,6 +46,7 @@ async def flush_all() -> None:
 
         await session.execute(delete(PriceModel))
         await session.execute(delete(IntradayPriceModel))
+        await session.execute(delete(LatestIntradayPriceModel))
         await session.commit()
         await cache.flush_all()
         rprint(f"Flushed {total} market data rows and indicator cache.")
@@ -101,6 +107,11 @@ async def flush_security(security_id_str: str) -> None:
                 IntradayPriceModel.security_id == security_id
             )
         )
+        await session.execute(
+            delete(LatestIntradayPriceModel).where(
+                LatestIntradayPriceModel.security_id == security_id
+            )
+        )
         await session.commit()
         await cache.invalidate_security(str(security_id))
         rprint(
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+
+from rich import print as rprint
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import sessionmanager
+from src.market.partitions import PRICES_TABLE, price_partition_name
+
+_UNPARTITIONED_TABLE = f"{PRICES_TABLE}_unpartitioned"
+
+# Relations renamed along with the table so the new table can reuse the names
+_RENAMED_CONSTRAINTS = ("market_prices_pkey", "price_security_date_unique")
+_RENAMED_INDEXES = ("ix_market_prices_security_date_desc",)
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    partitioned = await session.scalar(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(:table))"
+        ),
+        {"table": PRICES_TABLE},
+    )
+    return bool(partitioned)
+
+
+async def partition_prices(session: AsyncSession, partitions: int) -> bool:
+    """Rebuild market_prices as a table hash partitioned by security.
+
+    Prices are copied into the new table within the session transaction. The
+    primary key becomes (id, security_id) since it must include the partition
+    key, ids keep being drawn from the same sequence. Returns False when the
+    table is already partitioned.
+    """
+    if await is_partitioned(session):
+        return False
+
+    await session.execute(
+        text(f"ALTER TABLE {PRICES_TABLE} RENAME TO {_UNPARTITIONED_TABLE}")
+    )
+    for constraint in _RENAMED_CONSTRAINTS:
+        await session.execute(
+            text(
+                f"ALTER TABLE {_UNPARTITIONED_TABLE} "
+                f"RENAME CONSTRAINT {constraint} TO {constraint}_unpartitioned"
+            )
+        )
+    for index in _RENAMED_INDEXES:
+        await session.execute(
+            text(f"ALTER INDEX {index} RENAME TO {index}_unpartitioned")
+        )
+
+    await session.execute(
+        text(
+            f"CREATE TABLE {PRICES_TABLE} "
+            f"(LIKE {_UNPARTITIONED_TABLE} INCLUDING DEFAULTS) "
+            "PARTITION BY HASH (security_id)"
+        )
+    )
+    await session.execute(
+        text(
+            f"ALTER TABLE {PRICES_TABLE} "
+            "ADD CONSTRAINT market_prices_pkey PRIMARY KEY (id, security_id), "
+            "ADD CONSTRAINT price_security_date_unique UNIQUE (security_id, date), "
+            "ADD CONSTRAINT market_prices_security_id_fkey "
+            "FOREIGN KEY (security_id) REFERENCES market_securities (id)"
+        )
+    )
+    await session.execute(
+        text(
+            "CREATE INDEX ix_market_prices_security_date_desc "
+            f"ON {PRICES_TABLE} (security_id, date DESC) "
+            "INCLUDE (close, adjusted_close)"
+        )
+    )
+    for remainder in range(partitions):
+        await session.execute(
+            text(
+                f"CREATE TABLE {price_partition_name(remainder)} "
+                f"PARTITION OF {PRICES_TABLE} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        )
+
+    await session.execute(
+        text(
+            f"INSERT INTO {PRICES_TABLE} "  # noqa: S608
+            f"SELECT * FROM {_UNPARTITIONED_TABLE}"
+        )
+    )
+    # The sequence would otherwise be dropped with the old table
+    await session.execute(
+        text(f"ALTER SEQUENCE market_prices_id_seq OWNED BY {PRICES_TABLE}.id")
+    )
+    await session.execute(text(f"DROP TABLE {_UNPARTITIONED_TABLE}"))
+    await session.execute(text(f"ANALYZE {PRICES_TABLE}"))
+    return True
+
+
+async def partition(partitions: int) -> None:
+    async with sessionmanager.session() as session:
+        if not await partition_prices(session, partitions):
+            rprint("market_prices is already partitioned.")
+            return
+        await session.commit()
+        rprint(f"Partitioned market_prices into {partitions} hash partitions.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Hash partition daily prices by security (admin, one-off)"
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=8,
+        help="Number of hash partitions (default: 8)",
+    )
+    args = parser.parse_args()
+    if args.partitions < 2:  # noqa: PLR2004
+        parser.error("--partitions must be at least 2")
+
+    asyncio.run(partition(args.partitions))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import asyncio
 import contextlib
+import threading
 from collections.abc import AsyncIterator
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -66,6 +69,48 @@ class DatabaseSessionManager:
             await session.close()
 
 
+class LoopScopedSessionManager:
+    """Session manager with one pooled engine per event loop.
+
+    asyncpg connections belong to the event loop that opened them. Workers keep
+    a long-lived loop per thread, so each of them gets its own pool.
+    """
+
+    _managers: WeakKeyDictionary[asyncio.AbstractEventLoop, DatabaseSessionManager]
+
+    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):  # noqa: B006
+        self._host = host
+        self._engine_kwargs = engine_kwargs
+        self._managers = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _manager(self) -> DatabaseSessionManager:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            manager = self._managers.get(loop)
+            if manager is None:
+                manager = DatabaseSessionManager(self._host, self._engine_kwargs)
+                self._managers[loop] = manager
+        return manager
+
+    async def close(self) -> None:
+        """Dispose the pool of the running event loop."""
+        with self._lock:
+            manager = self._managers.pop(asyncio.get_running_loop(), None)
+        if manager is not None:
+            await manager.close()
+
+    @contextlib.asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        async with self._manager().connect() as connection:
+            yield connection
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self._manager().session() as session:
+            yield session
+
+
 sessionmanager = DatabaseSessionManager(
     str(settings.database_url), {"echo": settings.echo_sql}
 )
@@ -3,7 +3,7 @@ from svcs import Registry
 
 from src.account.registry import register_account_services
 from src.auth import register_auth_services
-from src.config.database import DatabaseSessionManager
+from src.config.database import DatabaseSessionManager, LoopScopedSessionManager
 from src.config.settings import settings
 from src.core.registry import register_core_services
 from src.integration.registry import register_integration_services
@@ -13,7 +13,7 @@ from src.stubs.wealthsimple import StubWealthsimpleApiGateway
 
 def register_services(
     registry: Registry,
-    sessionmanager: DatabaseSessionManager,
+    sessionmanager: DatabaseSessionManager | LoopScopedSessionManager,
 ) -> None:
     registry.register_factory(AsyncSession, sessionmanager.session)
 
@@ -77,10 +77,22 @@ def register_market_stub_services(registry: Registry) -> None:
     )
     from src.market.cache import (  # noqa: PLC0415
         IndicatorCache,
+        SecuritySearchCache,
         indicator_cache_factory,
+        security_search_cache_factory,
+    )
+    from src.market.eodhd import (  # noqa: PLC0415
+        create_async_eodhd_gateway,
+        eodhd_gateway_factory,
+    )
+    from src.market.gateway import (  # noqa: PLC0415
+        AsyncMarketGateway,
+        MarketGateway,
+    )
+    from src.market.ingestion import (  # noqa: PLC0415
+        IngestionScheduler,
+        eodhd_ingestion_scheduler,
     )
-    from src.market.eodhd import eodhd_gateway_factory  # noqa: PLC0415
-    from src.market.gateway import MarketGateway  # noqa: PLC0415
     from src.market.repository import (  # noqa: PLC0415
         IntradayPriceRepository,
         PriceAlertRepository,
@@ -89,6 +101,7 @@ def register_market_stub_services(registry: Registry) -> None:
         SecurityDocumentRepository,
         SecurityNoteRepository,
         SecurityRepository,
+        SecuritySearchIndexRepository,
         WatchlistRepository,
     )
     from src.market.repository_eodhd import (  # noqa: PLC0415
@@ -101,8 +114,13 @@ def register_market_stub_services(registry: Registry) -> None:
         sqlalchemy_security_document_repository_factory,
         sqlalchemy_security_note_repository_factory,
         sqlalchemy_security_repository_factory,
+        sqlalchemy_security_search_index_repository_factory,
         sqlalchemy_watchlist_repository_factory,
     )
+    from src.market.search import (  # noqa: PLC0415
+        SecuritySearchService,
+        security_search_service_factory,
+    )
     from src.market.service import (  # noqa: PLC0415
         MarketService,
         market_service_factory,
@@ -110,6 +128,11 @@ def register_market_stub_services(registry: Registry) -> None:
     from src.stubs.ai import StubAIService  # noqa: PLC0415
 
     registry.register_factory(MarketGateway, eodhd_gateway_factory)
+    async_gateway = create_async_eodhd_gateway()
+    registry.register_value(
+        AsyncMarketGateway, async_gateway, on_registry_close=async_gateway.aclose
+    )
+    registry.register_value(IngestionScheduler, eodhd_ingestion_scheduler)
     registry.register_factory(PriceRepository, eodhd_price_repository_factory)
     registry.register_factory(
         IntradayPriceRepository, sqlalchemy_intraday_price_repository_factory
@@ -132,7 +155,13 @@ def register_market_stub_services(registry: Registry) -> None:
     registry.register_factory(
         SecurityDocumentRepository, sqlalchemy_security_document_repository_factory
     )
+    registry.register_factory(
+        SecuritySearchIndexRepository,
+        sqlalchemy_security_search_index_repository_factory,
+    )
     registry.register_factory(IndicatorCache, indicator_cache_factory)
+    registry.register_factory(SecuritySearchCache, security_search_cache_factory)
+    registry.register_factory(SecuritySearchService, security_search_service_factory)
     registry.register_factory(MarketPricesApi, market_prices_factory)
     registry.register_factory(SecurityApi, security_api_factory)
     registry.register_factory(MarketService, market_service_factory)
@@ -5,10 +5,10 @@ from email.message import EmailMessage
 from pathlib import Path
 from uuid import UUID
 
-import aiosmtplib
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 from src.config.settings import settings
+from src.core.smtp import SmtpTransport, create_smtp_transport
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +16,15 @@ template_dir = Path(__file__).parent.parent / "templates" / "email"
 jinja_env = Environment(
     loader=FileSystemLoader(template_dir),
     autoescape=True,
+    auto_reload=False,
 )
 
 
+def compile_templates() -> dict[str, Template]:
+    """Compile every email template once, keyed by template name."""
+    return {name: jinja_env.get_template(name) for name in jinja_env.list_templates()}
+
+
 class EmailSendError(Exception):
     pass
 
@@ -35,12 +41,60 @@ class PriceAlertEmailData:
     latest_price: Decimal
 
 
+@dataclass
+class PriceAlertDigestData:
+    """All price alerts of one recipient, sent as a single email."""
+
+    recipient: str
+    alerts: list[PriceAlertEmailData]
+
+
+def _condition_text(condition: str) -> str:
+    return "rose above" if condition == "above" else "fell below"
+
+
+def _digest_subject(alerts: list[PriceAlertEmailData]) -> str:
+    if len(alerts) == 1:
+        return f"Price Alert: {alerts[0].security_name} ({alerts[0].security_symbol})"
+    return f"Price Alerts: {len(alerts)} alerts triggered"
+
+
 class EmailService:
-    """Async email service using aiosmtplib.
+    """Async email service on a pooled SMTP transport.
 
-    All send methods are async coroutines.
+    All send methods are async coroutines. Templates are compiled once when the
+    service is created.
     """
 
+    _transport: SmtpTransport
+    _templates: dict[str, Template]
+
+    def __init__(self, transport: SmtpTransport | None = None) -> None:
+        self._transport = transport or create_smtp_transport()
+        self._templates = compile_templates()
+
+    def render_message(
+        self,
+        recipient: str,
+        subject: str,
+        *,
+        html_template: str,
+        text_template: str,
+        context: dict,
+    ) -> EmailMessage:
+        """Render both templates into a multipart message."""
+        html_content = self._templates[html_template].render(**context)
+        text_content = self._templates[text_template].render(**context)
+
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = settings.smtp_sender_email
+        msg["To"] = recipient
+
+        msg.set_content(text_content)
+        msg.add_alternative(html_content, subtype="html")
+        return msg
+
     async def send_email(
         self,
         recipient: str,
@@ -62,19 +116,13 @@ class EmailService:
         Raises:
             EmailSendError: on any SMTP failure.
         """
-        template_html = jinja_env.get_template(html_template)
-        template_text = jinja_env.get_template(text_template)
-
-        html_content = template_html.render(**context)
-        text_content = template_text.render(**context)
-
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = settings.smtp_sender_email
-        msg["To"] = recipient
-
-        msg.set_content(text_content)
-        msg.add_alternative(html_content, subtype="html")
+        msg = self.render_message(
+            recipient,
+            subject,
+            html_template=html_template,
+            text_template=text_template,
+            context=context,
+        )
 
         logger.info(
             "Sending email via SMTP to %s at %s:%s",
@@ -83,23 +131,46 @@ class EmailService:
             settings.smtp_port,
         )
         try:
-            # TODO: Consider connection pooling if hourly alert volume justifies it.
-            smtp = aiosmtplib.SMTP(
-                hostname=settings.smtp_host,
-                port=settings.smtp_port,
-            )
-            await smtp.connect()
-            if settings.smtp_use_tls:
-                await smtp.starttls()
-            if settings.smtp_user and settings.smtp_password:
-                await smtp.login(settings.smtp_user, settings.smtp_password)
-            await smtp.send_message(msg)
-            await smtp.quit()
+            await self._transport.send(msg)
         except Exception as exc:
             logger.exception("Failed to send email")
             error_msg = "Failed to send email"
             raise EmailSendError(error_msg) from exc
 
+    async def send_messages(self, messages: list[EmailMessage]) -> list[bool]:
+        """Send rendered messages concurrently over the pooled connections.
+
+        A message the server rejects does not stop the others.
+
+        Returns:
+            Whether each message was sent, in order.
+
+        Raises:
+            EmailSendError: when none of the messages could be sent.
+        """
+        if not messages:
+            return []
+
+        logger.info(
+            "Sending %d emails via SMTP at %s:%s",
+            len(messages),
+            settings.smtp_host,
+            settings.smtp_port,
+        )
+        errors = await self._transport.send_many(messages)
+        for msg, error in zip(messages, errors, strict=True):
+            if error is not None:
+                logger.error("Failed to send email to %s", msg["To"], exc_info=error)
+
+        if all(error is not None for error in errors):
+            error_msg = "Failed to send email"
+            raise EmailSendError(error_msg) from errors[0]
+        return [error is None for error in errors]
+
+    async def aclose(self) -> None:
+        """Close the pooled SMTP connections of the running event loop."""
+        await self._transport.aclose()
+
     async def send_verification_email(self, email: str, token: str) -> None:
         """Send email verification link. Thin wrapper over send_email."""
         link = f"{settings.frontend_url}/auth/verify-email?token={token}"
@@ -122,7 +193,7 @@ class EmailService:
             recipient: user's email address.
             alert: bundled price alert data (security info, condition, prices).
         """
-        condition_text = "rose above" if alert.condition == "above" else "fell below"
+        condition_text = _condition_text(alert.condition)
 
         deeplink = f"{settings.frontend_url}/security/{alert.security_id}"
 
@@ -140,3 +211,43 @@ class EmailService:
                 "deeplink": deeplink,
             },
         )
+
+    async def send_price_alert_digests(
+        self, digests: list[PriceAlertDigestData]
+    ) -> list[bool]:
+        """Send one email per recipient listing all of their triggered alerts.
+
+        Args:
+            digests: alerts grouped by recipient.
+
+        Returns:
+            Whether each digest was sent, in order.
+
+        Raises:
+            EmailSendError: when none of the digests could be sent.
+        """
+        messages = [
+            self.render_message(
+                digest.recipient,
+                _digest_subject(digest.alerts),
+                html_template="price_alert_digest.html",
+                text_template="price_alert_digest.txt",
+                context={
+                    "alerts": [
+                        {
+                            "security_name": alert.security_name,
+                            "security_symbol": alert.security_symbol,
+                            "condition_text": _condition_text(alert.condition),
+                            "target_price": str(alert.target_price),
+                            "latest_price": str(alert.latest_price),
+                            "deeplink": (
+                                f"{settings.frontend_url}/security/{alert.security_id}"
+                            ),
+                        }
+                        for alert in digest.alerts
+                    ],
+                },
+            )
+            for digest in digests
+        ]
+        return await self.send_messages(messages)
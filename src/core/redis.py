@@ -0,0 +1,103 @@
+import asyncio
+import contextlib
+import logging
+import threading
+from collections.abc import AsyncIterator
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisPool:
+    """Process-wide Redis client over a bounded connection pool.
+
+    Connections cannot be shared between event loops, so one pool is kept per
+    running loop: the API process reuses a single pool for its lifetime and
+    each worker thread one pool across its tasks. When all connections are in
+    use, callers wait for one to be released instead of opening more.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        max_connections: int = 50,
+        timeout: float = 5.0,
+        health_check_interval: int = 30,
+    ) -> None:
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._clients: WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis] = (
+            WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def client(self) -> aioredis.Redis:
+        """The client of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = aioredis.Redis(
+                    connection_pool=aioredis.BlockingConnectionPool.from_url(
+                        self.url,
+                        max_connections=self.max_connections,
+                        timeout=self.timeout,
+                        health_check_interval=self.health_check_interval,
+                        decode_responses=True,
+                    )
+                )
+                self._clients[loop] = client
+        return client
+
+    @contextlib.asynccontextmanager
+    async def pipeline(self, *, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """A pipeline of the running loop's client, sent with execute().
+
+        Non-transactional by default: the commands are only batched into one
+        round trip.
+        """
+        async with self.client().pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+    async def execute_pipelined(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """Send raw commands, e.g. ("EXPIRE", key, ttl), in one round trip.
+
+        Returns:
+            The result of each command, in order.
+        """
+        async with self.pipeline() as pipe:
+            for command in commands:
+                pipe.execute_command(*command)
+            return await pipe.execute()
+
+    async def aclose(self) -> None:
+        """Close the pool of the running event loop."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            try:
+                await client.aclose(close_connection_pool=True)
+            except Exception:
+                logger.debug("Failed to close Redis connection pool", exc_info=True)
+
+
+def create_redis_pool() -> RedisPool:
+    """Create the process-wide Redis pool sized from settings."""
+    return RedisPool(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout_seconds,
+        health_check_interval=settings.redis_health_check_interval_seconds,
+    )
+
+
+redis_pool = create_redis_pool()
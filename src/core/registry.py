@@ -1,7 +1,13 @@
 from svcs import Registry
 
 from src.core.email import EmailService
+from src.core.redis import RedisPool, redis_pool
 
 
 def register_core_services(registry: Registry) -> None:
-    registry.register_value(EmailService, EmailService())
+    email_service = EmailService()
+    registry.register_value(
+        EmailService, email_service, on_registry_close=email_service.aclose
+    )
+    # Closed by the owner of each event loop (API lifespan, worker runtime)
+    registry.register_value(RedisPool, redis_pool)
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+async def _cancel_pending_tasks() -> None:
+    current = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+class WorkerRuntime:
+    """One long-lived event loop per worker thread.
+
+    Huey tasks are synchronous functions. Instead of creating and tearing down
+    an event loop per task with asyncio.run(), tasks submit their coroutine to
+    the loop of the thread they run on. Loop-scoped resources (database pools,
+    Redis and HTTP clients, SMTP connections) then survive from one task to
+    the next.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._closers: list[Callable[[], Awaitable[None]]] = []
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop of the calling thread, created on first use."""
+        loop: asyncio.AbstractEventLoop | None = getattr(self._local, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._local.loop = loop
+        return loop
+
+    def submit[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion on the calling thread's event loop."""
+        return self.loop().run_until_complete(coro)
+
+    def on_close(self, closer: Callable[[], Awaitable[None]]) -> None:
+        """Register a cleanup run on each thread's loop before it is closed."""
+        self._closers.append(closer)
+
+    def close(self) -> None:
+        """Run the cleanups, cancel leftover tasks and close the thread's loop."""
+        loop: asyncio.AbstractEventLoop | None = getattr(self._local, "loop", None)
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            for closer in reversed(self._closers):
+                try:
+                    loop.run_until_complete(closer())
+                except Exception:
+                    logger.exception("Worker event loop cleanup failed")
+
+            loop.run_until_complete(_cancel_pending_tasks())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+            self._local.loop = None
@@ -0,0 +1,238 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Iterable
+from email.message import EmailMessage
+from weakref import WeakKeyDictionary
+
+import aiosmtplib
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Failures after which a message is resent once over a fresh connection
+_DISCONNECTED = (aiosmtplib.SMTPServerDisconnected, ConnectionError)
+
+
+class _SmtpConnection:
+    """A lazily opened, authenticated SMTP session kept alive between sends."""
+
+    def __init__(self, transport: SmtpTransport) -> None:
+        self._transport = transport
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._smtp is not None and self._smtp.is_connected
+
+    async def _session(self) -> aiosmtplib.SMTP:
+        smtp = self._smtp
+        idle = time.monotonic() - self._last_used
+        if (
+            smtp is not None
+            and smtp.is_connected
+            and idle > self._transport.health_check_interval
+        ):
+            try:
+                await smtp.noop()
+            except Exception:  # noqa: BLE001
+                logger.info("SMTP connection failed its health check, reconnecting")
+                self.abort()
+
+        if self._smtp is None or not self._smtp.is_connected:
+            self._smtp = await self._transport.connect()
+        return self._smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        smtp = await self._session()
+        try:
+            await smtp.send_message(message)
+        except _DISCONNECTED:
+            logger.info("SMTP connection dropped, resending over a new one")
+            self.abort()
+            smtp = await self._session()
+            await smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    async def close(self) -> None:
+        smtp = self._smtp
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except Exception:
+                logger.warning("Failed to close SMTP session", exc_info=True)
+        self.abort()
+
+    def abort(self) -> None:
+        if self._smtp is not None:
+            with contextlib.suppress(Exception):
+                self._smtp.close()
+        self._smtp = None
+
+
+class _SendQueue:
+    """Bounded send queue of one event loop, drained by one worker per connection.
+
+    Workers are started on demand up to the connection limit, each keeps its
+    connection open until it has been idle for the keep-alive expiry.
+    """
+
+    def __init__(self, transport: SmtpTransport) -> None:
+        self._transport = transport
+        self._queue: asyncio.Queue[tuple[EmailMessage, asyncio.Future[None]]] = (
+            asyncio.Queue(maxsize=transport.queue_size)
+        )
+        self._workers: set[asyncio.Task[None]] = set()
+        self._idle_workers = 0
+
+    async def submit(self, message: EmailMessage) -> asyncio.Future[None]:
+        """Queue a message, waiting while the queue is full (backpressure)."""
+        future = asyncio.get_running_loop().create_future()
+        if (
+            len(self._workers) < self._transport.max_connections
+            and self._idle_workers <= self._queue.qsize()
+        ):
+            worker = asyncio.create_task(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+        await self._queue.put((message, future))
+        return future
+
+    async def _work(self) -> None:
+        connection = _SmtpConnection(self._transport)
+        try:
+            while True:
+                self._idle_workers += 1
+                try:
+                    expiry = (
+                        self._transport.keepalive_expiry if connection.is_open else None
+                    )
+                    async with asyncio.timeout(expiry):
+                        message, future = await self._queue.get()
+                except TimeoutError:
+                    await connection.close()
+                    continue
+                finally:
+                    self._idle_workers -= 1
+
+                try:
+                    if not future.cancelled():
+                        await connection.send(message)
+                        future.set_result(None)
+                except Exception as exc:  # noqa: BLE001
+                    if not future.cancelled():
+                        future.set_exception(exc)
+                finally:
+                    self._queue.task_done()
+        finally:
+            await connection.close()
+
+    async def aclose(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+
+class SmtpTransport:
+    """Pooled SMTP transport with an async send queue.
+
+    Messages are queued and sent over at most max_connections authenticated,
+    keep-alive connections. A connection idle for longer than the health check
+    interval is checked with NOOP before reuse and reopened when the server
+    dropped it. Connections cannot be shared between event loops, so each
+    running loop gets its own queue and connections.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        hostname: str,
+        port: int,
+        use_tls: bool = True,
+        username: str = "",
+        password: str = "",
+        max_connections: int = 4,
+        queue_size: int = 1000,
+        keepalive_expiry: float = 60.0,
+        health_check_interval: float = 15.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.keepalive_expiry = keepalive_expiry
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._queues: WeakKeyDictionary[asyncio.AbstractEventLoop, _SendQueue] = (
+            WeakKeyDictionary()
+        )
+
+    def _send_queue(self) -> _SendQueue:
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = _SendQueue(self)
+            self._queues[loop] = queue
+        return queue
+
+    async def connect(self) -> aiosmtplib.SMTP:
+        """Open an authenticated SMTP session."""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.use_tls:
+            await smtp.starttls()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        return smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send a message through the queue, raising the SMTP error on failure."""
+        await (await self._send_queue().submit(message))
+
+    async def send_many(
+        self, messages: Iterable[EmailMessage]
+    ) -> list[BaseException | None]:
+        """Send messages concurrently over the pool.
+
+        Returns:
+            The error of each message, None when it was sent, in order.
+        """
+        queue = self._send_queue()
+        futures = [await queue.submit(message) for message in messages]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return [
+            result if isinstance(result, BaseException) else None for result in results
+        ]
+
+    async def aclose(self) -> None:
+        """Close the connections of the running event loop."""
+        queue = self._queues.pop(asyncio.get_running_loop(), None)
+        if queue is not None:
+            await queue.aclose()
+
+
+def create_smtp_transport() -> SmtpTransport:
+    """Create the process-wide SMTP transport sized from settings."""
+    return SmtpTransport(
+        hostname=settings.smtp_host,
+        port=settings.smtp_port,
+        use_tls=settings.smtp_use_tls,
+        username=settings.smtp_user,
+        password=settings.smtp_password,
+        max_connections=settings.smtp_max_connections,
+        queue_size=settings.smtp_send_queue_size,
+        keepalive_expiry=settings.smtp_keepalive_expiry_seconds,
+        health_check_interval=settings.smtp_health_check_interval_seconds,
+        timeout=settings.smtp_timeout_seconds,
+    )
@@ -42,6 +42,8 @@ class IntegrationAccountApi:
         user_id: UserId,
         account: Account,
         broker_account_id: BrokerAccountId,
+        *,
+        refresh_security_metadata: bool = False,
     ) -> None:
         from src.integration.task import sync_account_positions_task  # noqa: PLC0415
 
@@ -51,6 +53,7 @@ class IntegrationAccountApi:
             broker_account_id,
             get_broker_gateway_class(InstitutionEnum(account.institution_id)),
             request_id=get_request_id(),
+            refresh_security_metadata=refresh_security_metadata,
         )
 
 
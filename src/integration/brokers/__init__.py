@@ -15,6 +15,8 @@ from src.integration.schema import IntegrationUserSchema
 class BrokerApiGateway(ABC):
     _keyring_prefix: str
     _institution: InstitutionEnum
+    # Re-fetch cached security metadata from the broker instead of reusing it
+    refresh_security_metadata: bool = False
 
     def __init__(self):
         # TODO secure this before staging deployment
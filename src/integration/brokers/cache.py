@@ -0,0 +1,118 @@
+import json
+import logging
+from typing import Any
+
+from redis.asyncio.client import Redis
+
+from src.core.redis import redis_pool
+
+logger = logging.getLogger(__name__)
+
+# Symbol, name and primary exchange of a security are practically immutable
+_DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+
+class SecurityMetadataCache:
+    """Cache for broker security metadata using Redis.
+
+    Entries are keyed by the broker's own security id so repeat syncs only hit
+    the broker API for securities that were never seen before.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        prefix: str,
+        cache_ttl: int = _DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize security metadata cache.
+
+        Args:
+            redis_client: Redis client instance
+            prefix: Namespace for the cache keys (e.g. the broker name)
+            cache_ttl: Time-to-live for cache entries in seconds (default 30 days)
+        """
+        self._redis = redis_client
+        self._prefix = prefix
+        self._cache_ttl = cache_ttl
+
+    def _get_cache_key(self, security_id: str) -> str:
+        return f"broker_security_metadata:{self._prefix}:{security_id}"
+
+    async def get_many(self, security_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get cached metadata for several securities in a single round trip.
+
+        Args:
+            security_ids: Broker security identifiers
+
+        Returns:
+            Mapping of security id to metadata, cache misses are omitted
+        """
+        if not security_ids:
+            return {}
+
+        try:
+            cached = await self._redis.mget(
+                [self._get_cache_key(security_id) for security_id in security_ids]
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Security metadata cache get error: %s", e)
+            return {}
+
+        hits = {
+            security_id: json.loads(data)
+            for security_id, data in zip(security_ids, cached, strict=True)
+            if data
+        }
+        logger.debug(
+            "Security metadata cache: %d hit(s), %d miss(es)",
+            len(hits),
+            len(security_ids) - len(hits),
+        )
+        return hits
+
+    async def set_many(self, metadata: dict[str, dict[str, Any]]) -> None:
+        """
+        Cache metadata for several securities in a single pipeline.
+
+        Args:
+            metadata: Mapping of security id to metadata
+        """
+        if not metadata:
+            return
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for security_id, data in metadata.items():
+                    pipe.setex(
+                        self._get_cache_key(security_id),
+                        self._cache_ttl,
+                        json.dumps(data),
+                    )
+                await pipe.execute()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Security metadata cache set error: %s", e)
+
+    async def invalidate(self, security_ids: list[str]) -> None:
+        """
+        Invalidate cached metadata for the given securities.
+
+        Args:
+            security_ids: Broker security identifiers
+        """
+        if not security_ids:
+            return
+
+        try:
+            await self._redis.delete(
+                *[self._get_cache_key(security_id) for security_id in security_ids]
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Security metadata cache invalidation error: %s", e)
+
+
+async def security_metadata_cache_factory() -> SecurityMetadataCache:
+    """Factory function to create the Wealthsimple security metadata cache."""
+    return SecurityMetadataCache(redis_pool.client(), prefix="wealthsimple")
@@ -1,27 +1,36 @@
 import json
 import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 from pathlib import Path
 from typing import Any, cast, override
 
 import keyring
+from svcs import Container
 from ws_api import WealthsimpleAPI
 from ws_api.exceptions import (
     LoginFailedException,
     ManualLoginRequired,
     OTPRequiredException,
     UnexpectedException,
+    WSApiException,
 )
 from ws_api.session import WSAPISession
 
 from src.account.enum import AccountTypeEnum, InstitutionEnum
+from src.config.settings import settings
 from src.integration.brokers import BrokerApiGateway
 from src.integration.brokers.api_types import (
     BrokerAccount,
     BrokerAccountId,
     BrokerPosition,
 )
+from src.integration.brokers.cache import SecurityMetadataCache
 from src.integration.brokers.exception import (
     AccountTypeUnkownError,
     LoginFailedError,
@@ -42,21 +51,104 @@ _wealthsimple_account_type_map = {
 }
 
 
+@dataclass
+class _CachedClient:
+    client: WealthsimpleAPI
+    generation: int
+    expires_at: float
+
+
+class WealthsimpleClientCache:
+    """Per worker thread cache of authenticated Wealthsimple clients.
+
+    Reusing a client keeps its HTTP connections alive and skips the keyring
+    read and the token validation request done by ``WealthsimpleAPI.from_token``.
+    Clients are kept per thread because the underlying HTTP session is not
+    thread safe, while invalidations are shared across threads through a
+    per-username generation counter.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _entries(self) -> dict[str, _CachedClient]:
+        entries = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = {}
+            self._local.entries = entries
+        return entries
+
+    def _generation(self, username: str) -> int:
+        with self._lock:
+            return self._generations.get(username, 0)
+
+    def get(self, username: str) -> WealthsimpleAPI | None:
+        entries = self._entries()
+        entry = entries.get(username)
+        if entry is None:
+            return None
+
+        if (
+            entry.generation != self._generation(username)
+            or entry.expires_at <= time.monotonic()
+        ):
+            del entries[username]
+            return None
+
+        return entry.client
+
+    def set(self, username: str, client: WealthsimpleAPI) -> None:
+        self._entries()[username] = _CachedClient(
+            client=client,
+            generation=self._generation(username),
+            expires_at=time.monotonic() + self._ttl_seconds,
+        )
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            self._generations[username] = self._generations.get(username, 0) + 1
+        self._entries().pop(username, None)
+
+
 class WealthsimpleApiGateway(BrokerApiGateway):
     _username: str
     _keyring_prefix: str = "retail_portfolio_wealthsimple"
     _institution: InstitutionEnum = InstitutionEnum.WEALTHSIMPLE
+    _client_cache: WealthsimpleClientCache = WealthsimpleClientCache(
+        settings.wealthsimple_client_ttl_seconds
+    )
     debug_api_responses: bool = False
     debug_dump_path: str | None = None
+    security_metadata_cache: SecurityMetadataCache | None = None
 
     def _get_client(self, username: str) -> WealthsimpleAPI:
+        cached_client = self._client_cache.get(username)
+        if cached_client is not None:
+            logger.debug("Reusing cached Wealthsimple client for user: %s", username)
+            return cached_client
+
         logger.debug("Getting Wealthsimple client from session for user: %s", username)
 
-        return WealthsimpleAPI.from_token(
+        client = WealthsimpleAPI.from_token(
             self._get_session(username),
             username=username,
             persist_session_fct=self._save_session,
         )
+        self._client_cache.set(username, client)
+        return client
+
+    @contextmanager
+    def _invalidate_client_on_error(self, username: str) -> Iterator[None]:
+        """Drop the cached client when the API rejects it, then re-raise."""
+        try:
+            yield
+        except ManualLoginRequired, WSApiException:
+            logger.info("Discarding cached Wealthsimple client for user: %s", username)
+            self._client_cache.invalidate(username)
+            raise
 
     def _get_session(self, username: str) -> WSAPISession:
         logger.debug("Getting Wealthsimple session from keyring for user: %s", username)
@@ -78,6 +170,8 @@ class WealthsimpleApiGateway(BrokerApiGateway):
         logger.debug("Saving Wealthsimple session tp keyring for user: %s", username)
 
         keyring.set_password(f"{self._keyring_prefix}.{username}", "session", session)
+        # A new or refreshed session supersedes clients built from the old one
+        self._client_cache.invalidate(username)
 
     def _ws_login(self, username: str, password: str, otp: str | None) -> WSAPISession:
         logger.debug("Logging in Wealthsimple for user: %s", username)
@@ -125,10 +219,13 @@ class WealthsimpleApiGateway(BrokerApiGateway):
 
         try:
             self._username = username
-            # Attempt to get cached session
-            _ = self._get_session(username)
-            # Test if session is still valid
-            self._get_client(username).get_accounts()
+            # A cached client was validated when built, skip the network check
+            if self._client_cache.get(username) is None:
+                # Attempt to get cached session
+                _ = self._get_session(username)
+                # Test if session is still valid
+                with self._invalidate_client_on_error(username):
+                    self._get_client(username).get_accounts()
         except SessionDoesNotExistError:
             try:
                 if password is None:
@@ -151,8 +248,13 @@ class WealthsimpleApiGateway(BrokerApiGateway):
         self,
         integration_user: IntegrationUserSchema,
     ) -> list[BrokerAccount]:
-        ws_client = self._get_client(integration_user.external_user_id)
-        ws_accounts = cast("list[dict[str, Any]]", ws_client.get_accounts())
+        username = integration_user.external_user_id
+        with self._invalidate_client_on_error(username):
+            ws_client = self._get_client(username)
+            # The client may be reused across syncs, bypass its account cache
+            ws_accounts = cast(
+                "list[dict[str, Any]]", ws_client.get_accounts(use_cache=False)
+            )
 
         if getattr(self, "debug_api_responses", False):
             logger.debug(
@@ -185,35 +287,49 @@ class WealthsimpleApiGateway(BrokerApiGateway):
         integration_user: IntegrationUserSchema,
         broker_account_id: BrokerAccountId,
     ) -> list[BrokerPosition]:
-        ws_client = self._get_client(integration_user.external_user_id)
-        ws_balances = cast(
-            "dict[str, float]", ws_client.get_account_balances(broker_account_id)
-        )
         positions: list[BrokerPosition] = []
         all_raw_ws_positions: list[list[dict[str, Any]]] = []
 
-        for security_id, ws_balance in ws_balances.items():
-            position, raw_ws_positions = self._parse_position(
-                ws_client=ws_client,
-                broker_account_id=broker_account_id,
-                security_id=security_id,
-                ws_balance=ws_balance,
+        username = integration_user.external_user_id
+        with self._invalidate_client_on_error(username):
+            ws_client = self._get_client(username)
+            ws_balances = cast(
+                "dict[str, float]", ws_client.get_account_balances(broker_account_id)
             )
-            if raw_ws_positions:
-                all_raw_ws_positions.append(raw_ws_positions)
-
-            if position is not None:
-                logger.info(
-                    "Fetched position: %s.%s",
-                    position.symbol,
-                    position.exchange,
-                )
-                positions.append(position)
-            else:
-                logger.warning(
-                    "Could not parse position: %s",
-                    security_id,
+            ws_securities_market_data = await self._get_securities_market_data(
+                ws_client,
+                [
+                    self._trim_security_id(security_id)
+                    for security_id in ws_balances
+                    if security_id != "sec-c-cad"
+                ],
+            )
+
+            for security_id, ws_balance in ws_balances.items():
+                position, raw_ws_positions = self._parse_position(
+                    ws_client=ws_client,
+                    broker_account_id=broker_account_id,
+                    security_id=security_id,
+                    ws_balance=ws_balance,
+                    ws_security_market_data=ws_securities_market_data.get(
+                        self._trim_security_id(security_id)
+                    ),
                 )
+                if raw_ws_positions:
+                    all_raw_ws_positions.append(raw_ws_positions)
+
+                if position is not None:
+                    logger.info(
+                        "Fetched position: %s.%s",
+                        position.symbol,
+                        position.exchange,
+                    )
+                    positions.append(position)
+                else:
+                    logger.warning(
+                        "Could not parse position: %s",
+                        security_id,
+                    )
 
         if getattr(self, "debug_api_responses", False):
             logger.debug(
@@ -281,23 +397,70 @@ class WealthsimpleApiGateway(BrokerApiGateway):
             ).astimezone(UTC),
         )
 
+    async def _get_securities_market_data(
+        self,
+        ws_client: WealthsimpleAPI,
+        security_ids: list[str],
+    ) -> dict[str, Any]:
+        """Fetch market data for securities, only hitting the API on cache misses.
+
+        Symbol, name and primary exchange almost never change, so the cached
+        metadata is reused across syncs unless a refresh is forced.
+        """
+        if self.security_metadata_cache is None:
+            return {}
+
+        cached: dict[str, Any] = {}
+        if not self.refresh_security_metadata:
+            cached = await self.security_metadata_cache.get_many(security_ids)
+
+        fetched: dict[str, Any] = {}
+        for security_id in security_ids:
+            if security_id in cached or security_id in fetched:
+                continue
+            ws_security_market_data = ws_client.get_security_market_data(security_id)
+            if isinstance(ws_security_market_data, dict):
+                fetched[security_id] = ws_security_market_data
+
+        if fetched:
+            logger.debug(
+                "Fetched market data for %d new Wealthsimple securities", len(fetched)
+            )
+            await self.security_metadata_cache.set_many(fetched)
+        if self.refresh_security_metadata:
+            # Stale entries of securities the broker no longer describes
+            await self.security_metadata_cache.invalidate(
+                [
+                    security_id
+                    for security_id in security_ids
+                    if security_id not in fetched
+                ]
+            )
+
+        return cached | fetched
+
+    def _trim_security_id(self, security_id: str) -> str:
+        # Handle API bug where security id is wrapped in []
+        return security_id[1:-1]
+
     def _parse_position(
         self,
         ws_client: WealthsimpleAPI,
         broker_account_id: BrokerAccountId,
         security_id: str,
         ws_balance: float,
+        ws_security_market_data: Any = None,
     ) -> tuple[BrokerPosition | None, list[dict[str, Any]] | None]:
         if security_id == "sec-c-cad":
             logger.info("Skipping cash position: not yet supported")
             return None, None
 
-        # Handle API bug where security id is wrapped in []
-        trimmed_security_id = security_id[1:-1]
+        trimmed_security_id = self._trim_security_id(security_id)
 
-        ws_security_market_data = ws_client.get_security_market_data(
-            trimmed_security_id
-        )
+        if ws_security_market_data is None:
+            ws_security_market_data = ws_client.get_security_market_data(
+                trimmed_security_id
+            )
         if not isinstance(ws_security_market_data, dict):
             logger.error(
                 "Malformed security market data: %s",
@@ -387,11 +550,18 @@ class WealthsimpleApiGateway(BrokerApiGateway):
 
 
 async def wealthsimple_api_wrapper_factory(
+    svcs_container: Container | None = None,
     *,
     debug_api_responses: bool = False,
     debug_dump_path: str | None = None,
+    refresh_security_metadata: bool = False,
 ) -> WealthsimpleApiGateway:
     gateway = WealthsimpleApiGateway()
     gateway.debug_api_responses = debug_api_responses
     gateway.debug_dump_path = debug_dump_path
+    gateway.refresh_security_metadata = refresh_security_metadata
+    if svcs_container is not None:
+        gateway.security_metadata_cache = await svcs_container.aget(
+            SecurityMetadataCache
+        )
     return gateway
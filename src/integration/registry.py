@@ -6,6 +6,10 @@ from src.integration.api import (
     integration_account_api_factory,
     integration_api_factory,
 )
+from src.integration.brokers.cache import (
+    SecurityMetadataCache,
+    security_metadata_cache_factory,
+)
 from src.integration.brokers.wealthsimple import (
     WealthsimpleApiGateway,
     wealthsimple_api_wrapper_factory,
@@ -21,6 +25,7 @@ from src.integration.service import (
 
 
 def register_integration_services(registry: Registry) -> None:
+    registry.register_factory(SecurityMetadataCache, security_metadata_cache_factory)
     registry.register_factory(WealthsimpleApiGateway, wealthsimple_api_wrapper_factory)
     registry.register_factory(
         IntegrationUserRepository, sqlalchemy_integration_user_repository_factory
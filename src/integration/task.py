@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from huey import signals
@@ -18,7 +17,7 @@ from src.integration.exception import (
 from src.integration.repository import IntegrationUserRepository
 from src.integration.sync_status import mark_sync_finished, mark_sync_started
 from src.market.api import SecurityApi
-from src.worker import huey
+from src.worker import huey, worker_runtime
 from src.ws.api_types import AccountSyncMessage, WsEventType
 from src.ws.manager import ws_manager
 
@@ -26,24 +25,33 @@ logger = logging.getLogger(__name__)
 
 
 @huey.task()
-def sync_account_positions_task(
+def sync_account_positions_task(  # noqa: PLR0913
     user_id: UserId,
     account: Account,
     broker_account_id: BrokerAccountId,
     broker_class: type[BrokerApiGateway],
     request_id: str | None = None,
+    *,
+    refresh_security_metadata: bool = False,
 ) -> None:
     """
     Huey task to sync positions for newly imported accounts
     and notify the frontend via WebSockets.
     Runs in the huey-worker process, isolated from the FastAPI lifecycle.
+    With refresh_security_metadata the broker's cached security metadata is
+    fetched again.
     """
     if request_id is None:
         request_id = get_request_id()
 
-    asyncio.run(
+    worker_runtime.submit(
         _sync_account_positions_task(
-            user_id, account, broker_account_id, broker_class, request_id=request_id
+            user_id,
+            account,
+            broker_account_id,
+            broker_class,
+            request_id=request_id,
+            refresh_security_metadata=refresh_security_metadata,
         )
     )
 
@@ -53,6 +61,8 @@ async def _do_sync_positions(
     broker_account_id: BrokerAccountId,
     broker_class: type[BrokerApiGateway],
     svcs_container: Container,
+    *,
+    refresh_security_metadata: bool = False,
 ) -> None:
     security_api = await svcs_container.aget(SecurityApi)
     integration_user_repository = await svcs_container.aget(IntegrationUserRepository)
@@ -69,6 +79,7 @@ async def _do_sync_positions(
         raise IntegrationUserNotFoundError(account.integration_user_id)
 
     broker = await svcs_container.aget(broker_class)
+    broker.refresh_security_metadata = refresh_security_metadata
     broker_positions = await broker.get_positions_by_account(
         integration_user=integration_user,
         broker_account_id=broker_account_id,
@@ -105,12 +116,14 @@ async def _do_sync_positions(
         await account_repository.update_last_sync_at(account.id)
 
 
-async def _sync_account_positions_task(
+async def _sync_account_positions_task(  # noqa: PLR0913
     user_id: UserId,
     account: Account,
     broker_account_id: BrokerAccountId,
     broker_class: type[BrokerApiGateway],
     request_id: str | None = None,
+    *,
+    refresh_security_metadata: bool = False,
 ) -> None:
     """
     Async implementation of sync_positions_task.
@@ -140,7 +153,11 @@ async def _sync_account_positions_task(
                 )
 
                 await _do_sync_positions(
-                    account, broker_account_id, broker_class, svcs_container
+                    account,
+                    broker_account_id,
+                    broker_class,
+                    svcs_container,
+                    refresh_security_metadata=refresh_security_metadata,
                 )
 
                 # Send sync_finished websocket message
@@ -175,7 +192,7 @@ def handle_interrupted_task(signal, task, exc=None):
         try:
             user_id = task.args[0]
             account = task.args[1]
-            asyncio.run(mark_sync_finished(user_id, account.id))
+            worker_runtime.submit(mark_sync_finished(user_id, account.id))
             logger.info(
                 "Cleaned up sync status for interrupted task %s (user=%s, account=%s)",
                 task.id,
@@ -27,8 +27,8 @@ from src.config.services import register_services
 from src.config.settings import settings
 from src.core.exception import AuthorizationError, EntityNotFoundError
 from src.core.middleware import RequestIdMiddleware
+from src.core.redis import RedisPool, redis_pool
 from src.integration.router import institutions_router, integration_router
-from src.integration.sync_status import redis_manager
 from src.market.router import market_router
 from src.ws.manager import ws_manager
 from src.ws.router import ws_router
@@ -55,7 +55,7 @@ async def lifespan_context(app: FastAPI):
     register_services(registry, sessionmanager)
 
     # Initialize WebSocket manager
-    await ws_manager.init_redis(settings.redis_url)
+    await ws_manager.init_redis(redis_pool)
 
     # Initialize Huey dashboard
     init_huey_dashboard(
@@ -74,7 +74,7 @@ async def lifespan_context(app: FastAPI):
         logger.exception("Lifespan yield failed:")
 
     await ws_manager.close()
-    await redis_manager.close()
+    await redis_pool.aclose()
 
 
 logger = logging.getLogger(__name__)
@@ -188,8 +188,8 @@ async def readiness(services: DepContainer) -> JSONResponse:
         checks["database"] = "error"
 
     try:
-        async with redis_manager.client() as client:
-            await client.ping()
+        pool = await services.aget(RedisPool)
+        await pool.client().ping()
         checks["redis"] = "ok"
     except Exception:  # noqa: BLE001
         checks["redis"] = "error"
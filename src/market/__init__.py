@@ -11,10 +11,16 @@ from src.market.api import (
     market_prices_factory,
     security_api_factory,
 )
-from src.market.cache import IndicatorCache, indicator_cache_factory
+from src.market.cache import (
+    IndicatorCache,
+    SecuritySearchCache,
+    indicator_cache_factory,
+    security_search_cache_factory,
+)
 from src.market.enum import PriceInterval
-from src.market.eodhd import eodhd_gateway_factory
-from src.market.gateway import MarketGateway
+from src.market.eodhd import create_async_eodhd_gateway, eodhd_gateway_factory
+from src.market.gateway import AsyncMarketGateway, MarketGateway
+from src.market.ingestion import IngestionScheduler, eodhd_ingestion_scheduler
 from src.market.repository import (
     IntradayPriceRepository,
     PriceAlertRepository,
@@ -23,6 +29,7 @@ from src.market.repository import (
     SecurityDocumentRepository,
     SecurityNoteRepository,
     SecurityRepository,
+    SecuritySearchIndexRepository,
     WatchlistRepository,
 )
 from src.market.repository_eodhd import eodhd_price_repository_factory
@@ -33,8 +40,10 @@ from src.market.repository_sqlalchemy import (
     sqlalchemy_security_document_repository_factory,
     sqlalchemy_security_note_repository_factory,
     sqlalchemy_security_repository_factory,
+    sqlalchemy_security_search_index_repository_factory,
     sqlalchemy_watchlist_repository_factory,
 )
+from src.market.search import SecuritySearchService, security_search_service_factory
 from src.market.service import (
     MarketService,
     PriceAggregationService,
@@ -47,6 +56,11 @@ from src.market.service import (
 
 def register_market_services(registry: Registry) -> None:
     registry.register_factory(MarketGateway, eodhd_gateway_factory)
+    async_gateway = create_async_eodhd_gateway()
+    registry.register_value(
+        AsyncMarketGateway, async_gateway, on_registry_close=async_gateway.aclose
+    )
+    registry.register_value(IngestionScheduler, eodhd_ingestion_scheduler)
     registry.register_factory(PriceRepository, eodhd_price_repository_factory)
     registry.register_factory(
         IntradayPriceRepository, sqlalchemy_intraday_price_repository_factory
@@ -69,7 +83,13 @@ def register_market_services(registry: Registry) -> None:
     registry.register_factory(
         SecurityDocumentRepository, sqlalchemy_security_document_repository_factory
     )
+    registry.register_factory(
+        SecuritySearchIndexRepository,
+        sqlalchemy_security_search_index_repository_factory,
+    )
     registry.register_factory(IndicatorCache, indicator_cache_factory)
+    registry.register_factory(SecuritySearchCache, security_search_cache_factory)
+    registry.register_factory(SecuritySearchService, security_search_service_factory)
     registry.register_factory(MarketPricesApi, market_prices_factory)
     registry.register_factory(SecurityApi, security_api_factory)
     registry.register_factory(MarketService, market_service_factory)
@@ -11,7 +11,13 @@ from decimal import Decimal
 from svcs import Container
 
 from src.auth.api import UserApi
-from src.core.email import EmailService, PriceAlertEmailData
+from src.auth.api_types import UserId
+from src.core.email import (
+    EmailSendError,
+    EmailService,
+    PriceAlertDigestData,
+    PriceAlertEmailData,
+)
 from src.market.api_types import SecurityId
 from src.market.repository import (
     IntradayPriceRepository,
@@ -98,6 +104,57 @@ class AlertEvaluationService:
                 triggered.append(alert)
         return triggered
 
+    async def evaluate_changed(
+        self, changed_since: datetime
+    ) -> list[AlertForEvaluation]:
+        """Evaluate only alerts of securities whose latest price changed.
+
+        The comparison runs in the database against the latest-close table,
+        on the active alerts index, so the cost follows the number of price
+        changes and triggered alerts rather than the number of alerts.
+
+        Args:
+            changed_since: start of the ingestion run that updated prices.
+
+        Returns:
+            List of alerts whose condition was met.
+        """
+        triggered = await self._alert_repo.get_triggered_alerts(changed_since)
+        self._log_triggered(triggered)
+        return triggered
+
+    async def evaluate_securities(
+        self, security_ids: list[SecurityId]
+    ) -> list[AlertForEvaluation]:
+        """Evaluate the alerts of securities whose prices were just stored.
+
+        Args:
+            security_ids: securities to evaluate.
+
+        Returns:
+            List of alerts whose condition was met.
+        """
+        triggered = await self._alert_repo.get_triggered_alerts_for_securities(
+            security_ids
+        )
+        self._log_triggered(triggered)
+        return triggered
+
+    async def get_alerted_security_ids(self) -> set[SecurityId]:
+        """Securities with active alerts, the only ones worth evaluating."""
+        return await self._alert_repo.get_alerted_security_ids()
+
+    @staticmethod
+    def _log_triggered(triggered: list[AlertForEvaluation]) -> None:
+        for alert in triggered:
+            logger.info(
+                "Alert %d triggered: %s %s (target: %s)",
+                alert.alert_id,
+                alert.condition,
+                alert.security_symbol,
+                alert.target_price,
+            )
+
     # ------------------------------------------------------------------ #
     #  Stage-3 dispatch: fetch security/user/price → send → mark_triggered.
     # ------------------------------------------------------------------ #
@@ -131,7 +188,9 @@ class AlertEvaluationService:
             return
 
         # Re-resolve latest price at dispatch time (not stale snapshot from Stage 2)
-        latest_map = await self._intraday_repo.get_latest_intraday_close_by_security()
+        latest_map = await self._intraday_repo.get_latest_intraday_close(
+            [alert.security_id]
+        )
         latest_price = latest_map.get(alert.security_id)
         if latest_price is None:
             logger.info(
@@ -179,6 +238,116 @@ class AlertEvaluationService:
             "Price alert email sent and marked triggered for alert %d.", alert_id
         )
 
+    async def dispatch_alert_digests(
+        self, alert_ids: list[int], run_ts: datetime
+    ) -> int:
+        """Send one digest email per user for triggered alerts.
+
+        The pending alerts are claimed first with a single UPDATE, so a
+        concurrent dispatch of the same alerts sends nothing. Latest prices
+        and user emails are resolved with one query each and the digests go
+        out over a single SMTP session. Claims of alerts not sent are released,
+        so a retry, or the next evaluation, only resends those.
+
+        Args:
+            alert_ids: primary keys of the triggered alerts.
+            run_ts: the evaluation run timestamp (threaded from Stage 2).
+
+        Returns:
+            Number of alerts sent and marked triggered.
+
+        Raises:
+            EmailSendError: when some digests could not be sent, after releasing
+                their alerts, so Huey retries them.
+        """
+        alerts = await self._alert_repo.claim_pending_alerts(alert_ids, run_ts)
+        if not alerts:
+            logger.info("No pending alerts among %d to dispatch", len(alert_ids))
+            return 0
+
+        try:
+            sent_ids, failed = await self._send_alert_digests(alerts)
+        except Exception:
+            await self._alert_repo.release_alerts(
+                [alert.alert_id for alert in alerts], run_ts
+            )
+            raise
+
+        unsent_ids = [
+            alert.alert_id for alert in alerts if alert.alert_id not in sent_ids
+        ]
+        await self._alert_repo.release_alerts(unsent_ids, run_ts)
+        logger.info(
+            "Price alert digests sent: %d of %d alerts marked triggered.",
+            len(sent_ids),
+            len(alerts),
+        )
+
+        if failed:
+            error_msg = f"{failed} price alert digests failed"
+            raise EmailSendError(error_msg)
+        return len(sent_ids)
+
+    async def _send_alert_digests(
+        self, alerts: list[AlertForEvaluation]
+    ) -> tuple[set[int], int]:
+        """Send the digests of the claimed alerts.
+
+        Returns:
+            The ids of the alerts sent and the number of digests that failed.
+        """
+        latest_prices = await self._intraday_repo.get_latest_intraday_close(
+            {alert.security_id for alert in alerts}
+        )
+        emails = await self._user_api.get_emails_for_users(
+            {alert.user_id for alert in alerts}
+        )
+
+        by_user: dict[UserId, list[AlertForEvaluation]] = {}
+        for alert in alerts:
+            if alert.security_id not in latest_prices:
+                logger.info(
+                    "No intraday price for security %s at dispatch; skipping alert %d",
+                    alert.security_symbol,
+                    alert.alert_id,
+                )
+            elif alert.user_id not in emails:
+                logger.warning(
+                    "User %s not found for alert %d, skipping email.",
+                    alert.user_id,
+                    alert.alert_id,
+                )
+            else:
+                by_user.setdefault(alert.user_id, []).append(alert)
+
+        user_alerts = list(by_user.values())
+        digests = [
+            PriceAlertDigestData(
+                recipient=emails[alerts_of_user[0].user_id],
+                alerts=[
+                    PriceAlertEmailData(
+                        security_id=alert.security_id,
+                        security_symbol=alert.security_symbol,
+                        security_name=alert.security_name,
+                        condition=alert.condition,
+                        target_price=alert.target_price,
+                        latest_price=latest_prices[alert.security_id],
+                    )
+                    for alert in alerts_of_user
+                ],
+            )
+            for alerts_of_user in user_alerts
+        ]
+        sent = await self._email_service.send_price_alert_digests(digests)
+
+        sent_ids = {
+            alert.alert_id
+            for alerts_of_user, was_sent in zip(user_alerts, sent, strict=True)
+            if was_sent
+            for alert in alerts_of_user
+        }
+        return sent_ids, len(sent) - sum(sent)
+
 
 async def alert_evaluation_service_factory(
     container: Container,
@@ -14,7 +14,7 @@ from src.market.api_types import (
     SecuritySearchResult,
 )
 from src.market.eodhd import eodhd_gateway_factory
-from src.market.gateway import MarketGateway
+from src.market.gateway import AsyncMarketGateway, MarketGateway
 from src.market.repository import (
     PriceRepository,
     SecurityBrokerRepository,
@@ -49,12 +49,13 @@ class MarketPricesApi:
 
     async def get_latest_close(self, security_id: SecurityId) -> Money | None:
         security = await self._security_repository.get_by_id_or_fail(security_id)
-        latest_price = await self._price_repository.get_latest_price(security)
+        latest_close = await self._price_repository.get_latest_close(security)
 
-        if latest_price is None:
+        if latest_close is None:
             return None
 
-        return Money(latest_price.close, security.currency)
+        _date, close = latest_close
+        return Money(close, security.currency)
 
     async def get_latest_price(self, security_id: SecurityId) -> PriceSchema | None:
         security = await self._security_repository.get_by_id_or_fail(security_id)
@@ -72,7 +73,7 @@ async def market_prices_factory(container: Container) -> MarketPricesApi:
 class SecurityApi:
     def __init__(  # noqa: PLR0913, PLR0917
         self,
-        gateway: MarketGateway,
+        gateway: AsyncMarketGateway,
         market_prices_api: MarketPricesApi,
         market_service: MarketService,
         price_repository: PriceRepository,
@@ -99,7 +100,7 @@ class SecurityApi:
     ) -> Security:
         mapped_symbol = self._map_eodhd_symbol(broker_symbol)
         mapped_exchange = self._map_eodhd_exchange(broker_exchange)
-        search_results = self._gateway.search(
+        search_results = await self._gateway.search(
             query=f"{mapped_symbol}.{mapped_exchange}"
         )
         logger.debug(
@@ -226,7 +227,7 @@ class SecurityApi:
 
 async def security_api_factory(container: Container) -> SecurityApi:
     return SecurityApi(
-        gateway=await container.aget(MarketGateway),
+        gateway=await container.aget(AsyncMarketGateway),
         market_prices_api=await container.aget(MarketPricesApi),
         market_service=await container.aget(MarketService),
         price_repository=await container.aget(PriceRepository),
@@ -9,6 +9,14 @@ from stockholm.currency import Currency
 type SecurityId = UUID
 type WatchlistId = UUID
 
+# Column-ordered rows fed straight to the bulk price writer
+type PriceRow = tuple[
+    SecurityId, date, Decimal, Decimal, Decimal, Decimal, Decimal, int
+]
+type IntradayPriceRow = tuple[
+    SecurityId, datetime, Decimal, Decimal, Decimal, Decimal, int
+]
+
 
 class Security(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -61,6 +69,20 @@ class HistoricalPrice(BaseModel):
     volume: int
 
 
+class BulkLastDayPrice(BaseModel):
+    """End-of-day price of a ticker from an exchange-wide bulk download."""
+
+    code: str
+    exchange: str
+    date: date
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    adjusted_close: Decimal
+    volume: int
+
+
 class IntradayHistoricalPrice(BaseModel):
     id: int | None = None
     security_id: SecurityId
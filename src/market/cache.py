@@ -4,10 +4,11 @@ import logging
 from datetime import timedelta
 from typing import Any
 
-import redis.asyncio as aioredis
 from redis.asyncio.client import Redis
 
 from src.config.settings import settings
+from src.core.redis import redis_pool
+from src.market.api_types import SecuritySearchResult
 
 logger = logging.getLogger(__name__)
 
@@ -151,9 +152,70 @@ class IndicatorCache:
             logger.warning("Cache flush error: %s", e)
 
 
+class SecuritySearchCache:
+    """Cache of provider security search results per normalized query."""
+
+    def __init__(self, redis_client: Redis, cache_ttl: int):
+        """
+        Initialize security search cache.
+
+        Args:
+            redis_client: Redis client instance
+            cache_ttl: Time-to-live for cache entries in seconds
+        """
+        self._redis = redis_client
+        self._cache_ttl = cache_ttl
+
+    @staticmethod
+    def _get_cache_key(query: str) -> str:
+        digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+        return f"security_search:{digest}"
+
+    async def get(self, query: str) -> list[SecuritySearchResult] | None:
+        """
+        Get cached search results.
+
+        Args:
+            query: Normalized search query
+
+        Returns:
+            Cached results (possibly empty) or None on a cache miss
+        """
+        try:
+            cached_data = await self._redis.get(self._get_cache_key(query))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Security search cache get error: %s", e)
+            return None
+
+        if cached_data is None:
+            return None
+        return [SecuritySearchResult.model_validate(r) for r in json.loads(cached_data)]
+
+    async def set(self, query: str, results: list[SecuritySearchResult]) -> None:
+        """
+        Cache search results.
+
+        Args:
+            query: Normalized search query
+            results: Provider search results, empty results are cached too
+        """
+        try:
+            await self._redis.setex(
+                self._get_cache_key(query),
+                self._cache_ttl,
+                json.dumps([result.model_dump() for result in results]),
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Security search cache set error: %s", e)
+
+
 async def indicator_cache_factory() -> IndicatorCache:
     """Factory function to create indicator cache instance."""
-    redis_client = aioredis.from_url(
-        settings.redis_url, encoding="utf-8", decode_responses=False
+    return IndicatorCache(redis_pool.client())
+
+
+async def security_search_cache_factory() -> SecuritySearchCache:
+    """Factory function to create the security search cache."""
+    return SecuritySearchCache(
+        redis_pool.client(), cache_ttl=settings.security_search_cache_ttl_seconds
     )
-    return IndicatorCache(redis_client)
@@ -1,20 +1,33 @@
+import asyncio
 import logging
 from datetime import UTC, date, datetime
 from decimal import Decimal
+from typing import Any, override
+from urllib.parse import quote
+from weakref import WeakKeyDictionary
 
+import httpx2
+import numpy as np
 import requests
 from eodhd.apiclient import APIClient
-from pandas import Timestamp
+from pandas import DataFrame, DatetimeIndex, NaT, to_datetime
 
 from src.config.settings import settings
 from src.market.api_types import (
+    BulkLastDayPrice,
     EodhdSearchResult,
     HistoricalPrice,
     IntradayHistoricalPrice,
+    IntradayPriceRow,
+    PriceRow,
     SecurityId,
     SecuritySearchResult,
 )
-from src.market.gateway import MarketGateway
+from src.market.gateway import (
+    AsyncMarketGateway,
+    MarketGateway,
+    ThreadedMarketGateway,
+)
 from src.market.schema import SecuritySchema
 
 logger = logging.getLogger(__name__)
@@ -30,20 +43,7 @@ class EodhdGateway(MarketGateway):
 
     def search(self, query: str) -> list[SecuritySearchResult]:
         url = f"https://eodhd.com/api/search/{query}?api_token={self._api_key}&fmt=json"
-        results = requests.get(url, timeout=10).json()
-
-        return [
-            SecuritySearchResult(
-                code=result["Code"],
-                exchange=result["Exchange"],
-                name=result["Name"],
-                currency=result["Currency"],
-                security_type=result["Type"],
-                isin=result.get("ISIN"),
-                country=result["Country"],
-            )
-            for result in results
-        ]
+        return _search_results(requests.get(url, timeout=10).json())
 
     def get_price_on_date(
         self,
@@ -83,6 +83,31 @@ class EodhdGateway(MarketGateway):
         from_date: date,
         to_date: date,
     ) -> list[HistoricalPrice]:
+        return [
+            HistoricalPrice(
+                security_id=row[0],
+                date=row[1],
+                open=row[2],
+                high=row[3],
+                low=row[4],
+                close=row[5],
+                adjusted_close=row[6],
+                volume=row[7],
+            )
+            for row in self.get_price_rows(
+                security_id, symbol, exchange, from_date, to_date
+            )
+        ]
+
+    @override
+    def get_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[PriceRow]:
         eodhd_symbol = f"{symbol}.{exchange}"
         logger.info("Fetching data for security: %s", eodhd_symbol)
 
@@ -92,32 +117,19 @@ class EodhdGateway(MarketGateway):
             iso8601_start=from_date.isoformat(),
             iso8601_end=to_date.isoformat(),
         )
+        return _daily_price_rows(security_id, data)
 
-        prices: list[HistoricalPrice] = []
-        for index, price in data.iterrows():
-            if type(index) is not Timestamp:
-                logger.error(
-                    "Historical data index should be pandas.Timestamp but is: %s",
-                    type(index),
-                )
-                continue
-
-            prices.append(
-                HistoricalPrice(
-                    security_id=security_id,
-                    date=index.date(),
-                    open=Decimal(str(price["open"])),
-                    high=Decimal(str(price["high"])),
-                    low=Decimal(str(price["low"])),
-                    close=Decimal(str(price["close"])),
-                    adjusted_close=Decimal(str(price["adjusted_close"])),
-                    volume=int(price["volume"]),
-                )
-            )
+    def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        logger.info("Fetching bulk end-of-day data for exchange: %s", exchange)
 
-        return prices
+        data = self._client.get_eod_splits_dividends_data(
+            country=exchange, date=date.isoformat() if date else None
+        )
+        return _bulk_last_day_prices(exchange, data)
 
-    def get_intraday_prices(  # noqa: PLR0913, PLR0917, PLR0912, C901
+    def get_intraday_prices(  # noqa: PLR0913, PLR0917
         self,
         security_id: SecurityId,
         symbol: str,
@@ -126,20 +138,34 @@ class EodhdGateway(MarketGateway):
         to_datetime: datetime,
         interval: str = "1h",
     ) -> list[IntradayHistoricalPrice]:
-        if interval != "1h":
-            msg = f"Unsupported interval '{interval}'. Only '1h' interval is supported."
-            raise ValueError(msg)
+        return [
+            IntradayHistoricalPrice(
+                security_id=row[0],
+                timestamp=row[1],
+                open=row[2],
+                high=row[3],
+                low=row[4],
+                close=row[5],
+                volume=row[6],
+            )
+            for row in self.get_intraday_price_rows(
+                security_id, symbol, exchange, from_datetime, to_datetime, interval
+            )
+        ]
 
+    @override
+    def get_intraday_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        interval: str = "1h",
+    ) -> list[IntradayPriceRow]:
         eodhd_symbol = f"{symbol}.{exchange}"
         logger.info("Fetching intraday data for security: %s", eodhd_symbol)
-
-        if from_datetime.tzinfo is None:
-            from_datetime = from_datetime.replace(tzinfo=UTC)
-        if to_datetime.tzinfo is None:
-            to_datetime = to_datetime.replace(tzinfo=UTC)
-
-        from_unix = int(from_datetime.timestamp())
-        to_unix = int(to_datetime.timestamp())
+        from_unix, to_unix = _intraday_range(interval, from_datetime, to_datetime)
 
         data = self._client.get_intraday_historical_data(
             symbol=eodhd_symbol,
@@ -147,72 +173,290 @@ class EodhdGateway(MarketGateway):
             from_unix_time=from_unix,
             to_unix_time=to_unix,
         )
+        return _intraday_price_rows(security_id, data)
+
+
+class AsyncEodhdGateway(AsyncMarketGateway):
+    """EODHD gateway on a pooled, keep-alive HTTP client.
+
+    Connections cannot be shared between event loops, so one client is kept
+    per running loop: the API process reuses a single pool for its lifetime.
+    """
+
+    _base_url = "https://eodhd.com/api"
+
+    def __init__(
+        self,
+        api_key: str,
+        limits: httpx2.Limits | None = None,
+        timeout: httpx2.Timeout | None = None,
+        transport: httpx2.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._api_key = api_key
+        self._limits = limits or httpx2.Limits()
+        self._timeout = timeout or httpx2.Timeout(30.0)
+        self._transport = transport
+        self._clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx2.AsyncClient
+        ] = WeakKeyDictionary()
+
+    def _client(self) -> httpx2.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx2.AsyncClient(
+                base_url=self._base_url,
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+            )
+            self._clients[loop] = client
+        return client
+
+    async def _get(self, path: str, **params: str | int | None) -> Any:
+        response = await self._client().get(
+            path,
+            params={
+                "api_token": self._api_key,
+                "fmt": "json",
+                **{key: value for key, value in params.items() if value is not None},
+            },
+        )
+        response.raise_for_status()
+        return response.json()
 
-        prices: list[IntradayHistoricalPrice] = []
-        if isinstance(data, list):
-            for row in data:
-                if "timestamp" in row and row["timestamp"] is not None:
-                    dt = datetime.fromtimestamp(int(row["timestamp"]), tz=UTC)
-                else:
-                    dt = datetime.fromisoformat(str(row["datetime"]))
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=UTC)
-
-                open_val = Decimal(str(row["open"]))
-                high_val = Decimal(str(row["high"]))
-                low_val = Decimal(str(row["low"]))
-                close_val = Decimal(str(row["close"]))
-                volume_val = int(row["volume"]) if row.get("volume") is not None else 0
-
-                if open_val == high_val == low_val == close_val and volume_val == 0:
-                    continue
-
-                prices.append(
-                    IntradayHistoricalPrice(
-                        security_id=security_id,
-                        timestamp=dt,
-                        open=open_val,
-                        high=high_val,
-                        low=low_val,
-                        close=close_val,
-                        volume=volume_val,
-                    )
-                )
-        elif hasattr(data, "iterrows"):
-            for index, row in data.iterrows():
-                if "timestamp" in row and row["timestamp"] is not None:
-                    dt = datetime.fromtimestamp(int(row["timestamp"]), tz=UTC)
-                elif isinstance(index, Timestamp):
-                    dt = index.to_pydatetime()
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=UTC)
-                else:
-                    dt = datetime.fromisoformat(str(row["datetime"]))
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=UTC)
-
-                open_val = Decimal(str(row["open"]))
-                high_val = Decimal(str(row["high"]))
-                low_val = Decimal(str(row["low"]))
-                close_val = Decimal(str(row["close"]))
-                volume_val = int(row["volume"]) if row.get("volume") is not None else 0
-
-                if open_val == high_val == low_val == close_val and volume_val == 0:
-                    continue
-
-                prices.append(
-                    IntradayHistoricalPrice(
-                        security_id=security_id,
-                        timestamp=dt,
-                        open=open_val,
-                        high=high_val,
-                        low=low_val,
-                        close=close_val,
-                        volume=volume_val,
-                    )
-                )
-
-        return prices
+    @override
+    async def search(self, query: str) -> list[SecuritySearchResult]:
+        return _search_results(await self._get(f"/search/{quote(query, safe='')}"))
+
+    @override
+    async def get_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[PriceRow]:
+        eodhd_symbol = f"{symbol}.{exchange}"
+        logger.info("Fetching data for security: %s", eodhd_symbol)
+
+        data = await self._get(
+            f"/eod/{eodhd_symbol}",
+            period="d",
+            **{"from": from_date.isoformat(), "to": to_date.isoformat()},
+        )
+        if not isinstance(data, list) or not data:
+            return []
+        frame = DataFrame(data)
+        frame.index = DatetimeIndex(to_datetime(frame["date"]))
+        return _daily_price_rows(security_id, frame)
+
+    @override
+    async def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        logger.info("Fetching bulk end-of-day data for exchange: %s", exchange)
+
+        data = await self._get(
+            f"/eod-bulk-last-day/{exchange}", date=date.isoformat() if date else None
+        )
+        return _bulk_last_day_prices(exchange, data)
+
+    @override
+    async def get_intraday_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        interval: str = "1h",
+    ) -> list[IntradayPriceRow]:
+        eodhd_symbol = f"{symbol}.{exchange}"
+        logger.info("Fetching intraday data for security: %s", eodhd_symbol)
+        from_unix, to_unix = _intraday_range(interval, from_datetime, to_datetime)
+
+        data = await self._get(
+            f"/intraday/{eodhd_symbol}",
+            interval=interval,
+            **{"from": from_unix, "to": to_unix},
+        )
+        return _intraday_price_rows(security_id, data)
+
+    @override
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# Prices are stored as DECIMAL(16, 8)
+_PRICE_DECIMALS = 8
+
+
+def _to_scaled(values: np.ndarray) -> np.ndarray:
+    """Quantize float prices to scaled integers in one vectorized pass."""
+    return np.rint(values * 10**_PRICE_DECIMALS).astype(np.int64)
+
+
+def _from_scaled(scaled: list[int]) -> list[Decimal]:
+    return [Decimal(value).scaleb(-_PRICE_DECIMALS) for value in scaled]
+
+
+def _search_results(results: list[dict[str, Any]]) -> list[SecuritySearchResult]:
+    return [
+        SecuritySearchResult(
+            code=result["Code"],
+            exchange=result["Exchange"],
+            name=result["Name"],
+            currency=result["Currency"],
+            security_type=result["Type"],
+            isin=result.get("ISIN"),
+            country=result["Country"],
+        )
+        for result in results
+    ]
+
+
+def _daily_price_rows(security_id: SecurityId, data: DataFrame) -> list[PriceRow]:
+    """Convert a date-indexed end-of-day frame to price rows."""
+    if data.empty:
+        return []
+    if not isinstance(data.index, DatetimeIndex):
+        logger.error(
+            "Historical data index should be pandas.DatetimeIndex but is: %s",
+            type(data.index),
+        )
+        return []
+
+    columns = ["open", "high", "low", "close", "adjusted_close"]
+    values = data[columns].to_numpy(dtype=np.float64)
+    complete = ~np.isnan(values).any(axis=1)
+    scaled = _to_scaled(values[complete])
+    volumes = data["volume"].fillna(0).to_numpy(dtype=np.int64)[complete]
+    dates = data.index[complete].date
+
+    return [
+        (security_id, day, *_from_scaled(prices), volume)
+        for day, prices, volume in zip(
+            dates, scaled.tolist(), volumes.tolist(), strict=True
+        )
+    ]
+
+
+_BULK_PRICE_COLUMNS = ("open", "high", "low", "close", "adjusted_close")
+
+
+def _bulk_last_day_prices(exchange: str, data: object) -> list[BulkLastDayPrice]:
+    if not isinstance(data, list):
+        logger.error(
+            "Bulk end-of-day data for %s should be a list but is: %s",
+            exchange,
+            type(data),
+        )
+        return []
+
+    prices: list[BulkLastDayPrice] = []
+    skipped: list[str] = []
+    for row in data:
+        values = [row.get(column) for column in _BULK_PRICE_COLUMNS]
+        # Like the per-symbol path, rows with a missing price are dropped
+        if any(value is None for value in values):
+            skipped.append(str(row.get("code")))
+            continue
+        open_, high, low, close, adjusted_close = (
+            Decimal(str(value)) for value in values
+        )
+        prices.append(
+            BulkLastDayPrice(
+                code=row["code"],
+                exchange=row.get("exchange_short_name", exchange),
+                date=row["date"],
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                adjusted_close=adjusted_close,
+                volume=int(row.get("volume") or 0),
+            )
+        )
+    if skipped:
+        logger.warning(
+            "Skipped %d bulk end-of-day rows of %s without prices: %s",
+            len(skipped),
+            exchange,
+            ", ".join(skipped[:10]),
+        )
+    return prices
+
+
+def _intraday_range(
+    interval: str, from_datetime: datetime, to_datetime: datetime
+) -> tuple[int, int]:
+    """Validate the interval and convert the range to unix times."""
+    if interval != "1h":
+        msg = f"Unsupported interval '{interval}'. Only '1h' interval is supported."
+        raise ValueError(msg)
+
+    if from_datetime.tzinfo is None:
+        from_datetime = from_datetime.replace(tzinfo=UTC)
+    if to_datetime.tzinfo is None:
+        to_datetime = to_datetime.replace(tzinfo=UTC)
+    return int(from_datetime.timestamp()), int(to_datetime.timestamp())
+
+
+def _intraday_price_rows(
+    security_id: SecurityId, data: object
+) -> list[IntradayPriceRow]:
+    """Convert intraday bars to price rows, skipping closed-market candles."""
+    if isinstance(data, list):
+        data = DataFrame(data)
+    if not isinstance(data, DataFrame) or data.empty:
+        return []
+
+    timestamps = _intraday_timestamps(data)
+    values = data[["open", "high", "low", "close"]].to_numpy(dtype=np.float64)
+    volumes = (
+        data["volume"].fillna(0).to_numpy(dtype=np.int64)
+        if "volume" in data
+        else np.zeros(len(data), dtype=np.int64)
+    )
+    scaled = _to_scaled(np.nan_to_num(values))
+
+    # Skip flat candles without volume (market closed)
+    flat = (scaled == scaled[:, :1]).all(axis=1) & (volumes == 0)
+    keep = ~flat & ~np.isnan(values).any(axis=1)
+
+    return [
+        (security_id, timestamp, *_from_scaled(prices), volume)
+        for timestamp, prices, volume in zip(
+            timestamps[keep].to_pydatetime().tolist(),
+            scaled[keep].tolist(),
+            volumes[keep].tolist(),
+            strict=True,
+        )
+    ]
+
+
+def _intraday_timestamps(data: DataFrame) -> DatetimeIndex:
+    """Resolve UTC bar timestamps from unix times, the index or datetime strings."""
+    if isinstance(data.index, DatetimeIndex):
+        fallback = data.index
+        fallback = (
+            fallback.tz_localize(UTC)
+            if fallback.tz is None
+            else fallback.tz_convert(UTC)
+        )
+    elif "datetime" in data:
+        fallback = DatetimeIndex(to_datetime(data["datetime"], utc=True))
+    else:
+        fallback = DatetimeIndex([NaT] * len(data), tz=UTC)
+
+    if "timestamp" not in data:
+        return fallback
+    timestamps = DatetimeIndex(to_datetime(data["timestamp"], unit="s", utc=True))
+    return timestamps.where(timestamps.notna(), fallback)
 
 
 def eodhd_gateway_factory():
@@ -221,3 +465,21 @@ def eodhd_gateway_factory():
 
         return StubEodhdGateway(api_key=settings.eodhd_api_key)
     return EodhdGateway(api_key=settings.eodhd_api_key)
+
+
+def create_async_eodhd_gateway() -> AsyncMarketGateway:
+    """Create the process-wide async gateway sized from settings."""
+    if settings.stub_external_api:
+        return ThreadedMarketGateway(eodhd_gateway_factory())
+    return AsyncEodhdGateway(
+        api_key=settings.eodhd_api_key,
+        limits=httpx2.Limits(
+            max_connections=settings.eodhd_http_max_connections,
+            max_keepalive_connections=settings.eodhd_http_max_keepalive_connections,
+            keepalive_expiry=settings.eodhd_http_keepalive_expiry_seconds,
+        ),
+        timeout=httpx2.Timeout(
+            settings.eodhd_http_timeout_seconds,
+            connect=settings.eodhd_http_connect_timeout_seconds,
+        ),
+    )
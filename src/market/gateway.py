@@ -1,9 +1,14 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import date, datetime
+from typing import override
 
 from src.market.api_types import (
+    BulkLastDayPrice,
     HistoricalPrice,
     IntradayHistoricalPrice,
+    IntradayPriceRow,
+    PriceRow,
     SecurityId,
     SecuritySearchResult,
 )
@@ -40,6 +45,41 @@ class MarketGateway(ABC):
         """Get historical prices for a security within a date range."""
         ...
 
+    def get_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[PriceRow]:
+        """Get historical prices as rows for the bulk price writer."""
+        return [
+            (
+                price.security_id,
+                price.date,
+                price.open,
+                price.high,
+                price.low,
+                price.close,
+                price.adjusted_close,
+                price.volume,
+            )
+            for price in self.get_prices(
+                security_id, symbol, exchange, from_date, to_date
+            )
+        ]
+
+    @abstractmethod
+    def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        """Get end-of-day prices of every ticker on an exchange in one request.
+
+        Defaults to the exchange's last trading day when no date is given.
+        """
+        ...
+
     @abstractmethod
     def get_intraday_prices(  # noqa: PLR0913, PLR0917
         self,
@@ -52,3 +92,141 @@ class MarketGateway(ABC):
     ) -> list[IntradayHistoricalPrice]:
         """Get intraday prices for a security within a datetime range."""
         ...
+
+    def get_intraday_price_rows(  # noqa: PLR0913, PLR0917
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        interval: str = "1h",
+    ) -> list[IntradayPriceRow]:
+        """Get intraday prices as rows for the bulk price writer."""
+        return [
+            (
+                price.security_id,
+                price.timestamp,
+                price.open,
+                price.high,
+                price.low,
+                price.close,
+                price.volume,
+            )
+            for price in self.get_intraday_prices(
+                security_id, symbol, exchange, from_datetime, to_datetime, interval
+            )
+        ]
+
+
+class AsyncMarketGateway(ABC):
+    """Non-blocking market data gateway used by ingestion and search.
+
+    Implementations are registered once per process so that connections to
+    the provider are pooled and kept alive across requests and jobs.
+    """
+
+    @abstractmethod
+    async def search(self, query: str) -> list[SecuritySearchResult]:
+        """Search for securities by query string."""
+        ...
+
+    @abstractmethod
+    async def get_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[PriceRow]:
+        """Get historical prices as rows for the bulk price writer."""
+        ...
+
+    @abstractmethod
+    async def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        """Get end-of-day prices of every ticker on an exchange in one request."""
+        ...
+
+    @abstractmethod
+    async def get_intraday_price_rows(  # noqa: PLR0913, PLR0917
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        interval: str = "1h",
+    ) -> list[IntradayPriceRow]:
+        """Get intraday prices as rows for the bulk price writer."""
+        ...
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+        ...
+
+
+class ThreadedMarketGateway(AsyncMarketGateway):
+    """Adapts a blocking MarketGateway by running its calls in worker threads.
+
+    Used for stub gateways and implementations without native async I/O.
+    """
+
+    def __init__(self, gateway: MarketGateway) -> None:
+        self._gateway = gateway
+
+    @override
+    async def search(self, query: str) -> list[SecuritySearchResult]:
+        return await asyncio.to_thread(self._gateway.search, query)
+
+    @override
+    async def get_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[PriceRow]:
+        return await asyncio.to_thread(
+            self._gateway.get_price_rows,
+            security_id,
+            symbol,
+            exchange,
+            from_date=from_date,
+            to_date=to_date,
+        )
+
+    @override
+    async def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        return await asyncio.to_thread(self._gateway.get_bulk_last_day, exchange, date)
+
+    @override
+    async def get_intraday_price_rows(
+        self,
+        security_id: SecurityId,
+        symbol: str,
+        exchange: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        interval: str = "1h",
+    ) -> list[IntradayPriceRow]:
+        return await asyncio.to_thread(
+            self._gateway.get_intraday_price_rows,
+            security_id,
+            symbol,
+            exchange,
+            from_datetime=from_datetime,
+            to_datetime=to_datetime,
+            interval=interval,
+        )
+
+    @override
+    async def aclose(self) -> None:
+        # Blocking gateways open a connection per request, nothing to release
+        return
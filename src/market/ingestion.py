@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+import httpx2
+import requests
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Failures worth retrying: network hiccups, timeouts and 429/5xx responses.
+# Anything else (bad data, unknown symbol answered with a 404) would fail again.
+_RETRYABLE_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    requests.RequestException,
+    httpx2.TransportError,
+    httpx2.HTTPStatusError,
+    OSError,
+)
+_TOO_MANY_REQUESTS = 429
+_SERVER_ERROR = 500
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Whether a job failure is transient, judging HTTP errors by their status."""
+    response = getattr(error, "response", None)
+    http_error = isinstance(error, (httpx2.HTTPStatusError, requests.HTTPError))
+    # requests responses are falsy on error statuses, compare with None
+    if http_error and response is not None:
+        status = response.status_code
+        return status == _TOO_MANY_REQUESTS or status >= _SERVER_ERROR
+    return isinstance(error, _RETRYABLE_EXCEPTIONS)
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by every event loop of the process.
+
+    Huey runs each task in its own event loop on a worker thread, so the bucket
+    is guarded by a thread lock and waiting happens with ``asyncio.sleep``
+    outside of it.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate_per_second: Tokens added to the bucket every second
+            capacity: Maximum number of tokens the bucket can hold (burst size)
+        """
+        if rate_per_second <= 0 or capacity <= 0:
+            msg = "rate_per_second and capacity must be positive"
+            raise ValueError(msg)
+
+        self._rate = rate_per_second
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens from the bucket, returning how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """
+        Wait until the requested number of tokens is available.
+
+        Args:
+            tokens: Number of tokens to take (API calls consumed by the request)
+        """
+        if tokens > self._capacity:
+            msg = f"Cannot acquire {tokens} tokens from a bucket of {self._capacity}"
+            raise ValueError(msg)
+
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class IngestionMetrics:
+    """Outcome of a single ingestion run."""
+
+    name: str
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+
+class IngestionScheduler:
+    """Runs per-security ingestion jobs within the market data provider quota.
+
+    Jobs are processed by a bounded pool of workers, every attempt takes its
+    cost from a shared token bucket and transient failures are retried with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket,
+        max_concurrency: int,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+    ):
+        """
+        Initialize ingestion scheduler.
+
+        Args:
+            rate_limiter: Token bucket shared by all runs of the process
+            max_concurrency: Maximum number of jobs running at the same time
+            max_retries: Retries of a job after a transient failure
+            retry_base_delay: Delay before the first retry in seconds, doubled
+                on every subsequent retry
+        """
+        self._rate_limiter = rate_limiter
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max(0, max_retries)
+        self._retry_base_delay = retry_base_delay
+
+    @staticmethod
+    def _label(item: object) -> str:
+        return str(getattr(item, "symbol", item))
+
+    async def _run_job[T](
+        self,
+        item: T,
+        job: Callable[[T], Awaitable[None]],
+        cost: int,
+        metrics: IngestionMetrics,
+    ) -> bool:
+        label = self._label(item)
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire(cost)
+            try:
+                await job(item)
+            except _RETRYABLE_EXCEPTIONS as e:
+                if not _is_retryable(e):
+                    logger.exception("%s: failed for %s", metrics.name, label)
+                    return False
+                if attempt >= self._max_retries:
+                    logger.exception(
+                        "%s: giving up on %s after %d attempt(s)",
+                        metrics.name,
+                        label,
+                        attempt + 1,
+                    )
+                    return False
+                delay = self._retry_base_delay * 2**attempt
+                attempt += 1
+                metrics.retries += 1
+                logger.warning(
+                    "%s: transient failure for %s, retry %d/%d in %.1fs",
+                    metrics.name,
+                    label,
+                    attempt,
+                    self._max_retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+            except Exception:
+                # Catching general Exception to prevent one failure from stopping jobs
+                logger.exception("%s: failed for %s", metrics.name, label)
+                return False
+            else:
+                return True
+
+    async def run[T](
+        self,
+        name: str,
+        items: Sequence[T],
+        job: Callable[[T], Awaitable[None]],
+        cost: int = 1,
+    ) -> IngestionMetrics:
+        """
+        Run a job for every item and collect the run metrics.
+
+        Args:
+            name: Name of the run used in logs and metrics
+            items: Items to process, one job per item
+            job: Coroutine function processing a single item, raising on failure
+            cost: Provider API calls consumed by a single job attempt
+
+        Returns:
+            Success, failure and retry counts of the run
+        """
+        metrics = IngestionMetrics(name=name)
+        started_at = time.monotonic()
+
+        queue: asyncio.Queue[T] = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker() -> None:
+            while not queue.empty():
+                item = queue.get_nowait()
+                if await self._run_job(item, job, cost, metrics):
+                    metrics.succeeded += 1
+                else:
+                    metrics.failed += 1
+
+        workers = min(self._max_concurrency, len(items))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        metrics.duration_seconds = time.monotonic() - started_at
+        logger.info(
+            "%s: %d succeeded, %d failed, %d retries in %.2fs",
+            name,
+            metrics.succeeded,
+            metrics.failed,
+            metrics.retries,
+            metrics.duration_seconds,
+        )
+        return metrics
+
+
+def create_eodhd_ingestion_scheduler() -> IngestionScheduler:
+    """Create an ingestion scheduler sized for the configured EODHD plan."""
+    return IngestionScheduler(
+        rate_limiter=TokenBucket(
+            rate_per_second=settings.eodhd_requests_per_minute / 60,
+            capacity=settings.eodhd_burst_size,
+        ),
+        max_concurrency=settings.eodhd_max_concurrency,
+        max_retries=settings.eodhd_max_retries,
+        retry_base_delay=settings.eodhd_retry_base_delay_seconds,
+    )
+
+
+# One limiter per process: the provider quota is shared by all jobs and workers
+eodhd_ingestion_scheduler = create_eodhd_ingestion_scheduler()
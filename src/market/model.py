@@ -6,6 +6,8 @@ from decimal import Decimal
 from uuid import uuid4
 
 from sqlalchemy import (
+    ARRAY,
+    DDL,
     DECIMAL,
     JSON,
     BigInteger,
@@ -13,11 +15,14 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     Uuid,
+    event,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -68,12 +73,47 @@ class SecurityBrokerModel(BaseModel):
     )
 
 
+class SecuritySearchEntryModel(BaseModel):
+    """Security returned by a provider search, used as a local search index"""
+
+    __tablename__ = "market_security_search_index"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    code: Mapped[str] = mapped_column(String)
+    exchange: Mapped[str] = mapped_column(String)
+    name: Mapped[str] = mapped_column(String)
+    currency: Mapped[str] = mapped_column(String)
+    security_type: Mapped[str] = mapped_column(String)
+    isin: Mapped[str | None] = mapped_column(String, nullable=True)
+    country: Mapped[str] = mapped_column(String)
+    # Lower-cased copies of code and name for indexed prefix matching
+    search_code: Mapped[str] = mapped_column(String)
+    search_name: Mapped[str] = mapped_column(String)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("code", "exchange", name="search_code_exchange_unique"),
+        Index(
+            "ix_market_security_search_index_search_code",
+            "search_code",
+            postgresql_ops={"search_code": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_market_security_search_index_search_name",
+            "search_name",
+            postgresql_ops={"search_name": "text_pattern_ops"},
+        ),
+    )
+
+
 class PriceModel(BaseModel):
     """Security model."""
 
     __tablename__ = "market_prices"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     security_id: Mapped[SecurityId] = mapped_column(
         Uuid, ForeignKey("market_securities.id")
     )
@@ -87,19 +127,33 @@ class PriceModel(BaseModel):
 
     __table_args__ = (
         UniqueConstraint("security_id", "date", name="price_security_date_unique"),
+        # Latest price and close lookups are index-only scans
+        Index(
+            "ix_market_prices_security_date_desc",
+            "security_id",
+            text("date DESC"),
+            postgresql_include=["close", "adjusted_close"],
+        ),
     )
 
 
 class IntradayPriceModel(BaseModel):
-    """Intraday security price model for 1-hour resolution candles."""
+    """Intraday security price model for 1-hour resolution candles.
+
+    The table is range partitioned by month on the bar timestamp, see
+    src.market.partitions for partition maintenance.
+    """
 
     __tablename__ = "market_intraday_prices"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # The partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     security_id: Mapped[SecurityId] = mapped_column(
         Uuid, ForeignKey("market_securities.id")
     )
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
     open: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
     high: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
     low: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
@@ -110,6 +164,75 @@ class IntradayPriceModel(BaseModel):
         UniqueConstraint(
             "security_id", "timestamp", name="intraday_price_security_timestamp_unique"
         ),
+        # Bars are appended in time order, a BRIN index stays tiny
+        Index(
+            "ix_market_intraday_prices_timestamp_brin",
+            "timestamp",
+            postgresql_using="brin",
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+
+# Catch-all partition so rows are never rejected, the maintenance task creates
+# the monthly partitions ahead of time to keep it empty.
+event.listen(
+    IntradayPriceModel.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS market_intraday_prices_default "
+        "PARTITION OF market_intraday_prices DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class IntradayPrice4hModel(BaseModel):
+    """4-hour candles rolled up from 1-hour candles past their retention."""
+
+    __tablename__ = "market_intraday_prices_4h"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    security_id: Mapped[SecurityId] = mapped_column(
+        Uuid, ForeignKey("market_securities.id")
+    )
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    open: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
+    high: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
+    low: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
+    close: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
+    volume: Mapped[int] = mapped_column(BigInteger)
+    # Sorted timestamps of the 1-hour bars rolled into the bar, so late bars
+    # are merged without counting a bar twice. NULL when unknown.
+    bar_timestamps: Mapped[list[datetime] | None] = mapped_column(
+        ARRAY(DateTime(timezone=True)), nullable=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "security_id",
+            "timestamp",
+            name="intraday_price_4h_security_timestamp_unique",
+        ),
+    )
+
+
+class LatestIntradayPriceModel(BaseModel):
+    """Most recent 1-hour candle close of each security.
+
+    Maintained along with market_intraday_prices so the latest close of a
+    security is a primary key lookup instead of a scan over its history.
+    updated_at only moves when the latest close changes.
+    """
+
+    __tablename__ = "market_latest_intraday"
+
+    security_id: Mapped[SecurityId] = mapped_column(
+        Uuid, ForeignKey("market_securities.id"), primary_key=True
+    )
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    close: Mapped[Decimal] = mapped_column(DECIMAL(16, 8))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), index=True
     )
 
 
@@ -159,6 +282,17 @@ class PriceAlertModel(BaseModel):
         DateTime(timezone=True), default=func.now()
     )
 
+    __table_args__ = (
+        # Triggered alerts of a security are a range scan on its thresholds
+        Index(
+            "ix_market_price_alerts_active_threshold",
+            "security_id",
+            "condition",
+            "target_price",
+            postgresql_where=text("triggered_at IS NULL"),
+        ),
+    )
+
 
 class SecurityNoteModel(BaseModel):
     __tablename__ = "market_security_notes"
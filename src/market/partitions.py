@@ -0,0 +1,73 @@
+"""Naming of the market_prices and market_intraday_prices partitions.
+
+Intraday prices are partitioned by month, daily prices can optionally be
+hash partitioned by security.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+INTRADAY_PRICES_TABLE = "market_intraday_prices"
+INTRADAY_DEFAULT_PARTITION = f"{INTRADAY_PRICES_TABLE}_default"
+
+PRICES_TABLE = "market_prices"
+
+_MONTHLY_PARTITION = re.compile(rf"^{INTRADAY_PRICES_TABLE}_p(\d{{4}})_(\d{{2}})$")
+_HASH_PARTITION = re.compile(rf"^{PRICES_TABLE}_h\d+$")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    year, month_index = divmod(month.year * 12 + month.month, 12)
+    return date(year, month_index + 1, 1)
+
+
+def upcoming_months(today: date, months_ahead: int) -> list[date]:
+    """First day of the current month and of the following months."""
+    months = [month_start(today)]
+    for _ in range(months_ahead):
+        months.append(next_month(months[-1]))
+    return months
+
+
+def intraday_partition_name(month: date) -> str:
+    return f"{INTRADAY_PRICES_TABLE}_p{month:%Y_%m}"
+
+
+def intraday_partition_month(table_name: str) -> date | None:
+    """Month covered by a monthly partition, None for any other table."""
+    match = _MONTHLY_PARTITION.match(table_name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def is_intraday_partition(table_name: str) -> bool:
+    return (
+        table_name == INTRADAY_DEFAULT_PARTITION
+        or intraday_partition_month(table_name) is not None
+    )
+
+
+def price_partition_name(remainder: int) -> str:
+    return f"{PRICES_TABLE}_h{remainder}"
+
+
+def is_price_partition(table_name: str) -> bool:
+    return _HASH_PARTITION.match(table_name) is not None
+
+
+def is_partition(table_name: str) -> bool:
+    """Whether a table is a partition, managed outside of the models."""
+    return is_intraday_partition(table_name) or is_price_partition(table_name)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """UTC bounds of a monthly partition, lower inclusive and upper exclusive."""
+    lower = datetime(month.year, month.month, 1, tzinfo=UTC)
+    upper_month = next_month(month)
+    upper = datetime(upper_month.year, upper_month.month, 1, tzinfo=UTC)
+    return lower, upper
@@ -1,10 +1,16 @@
 import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from datetime import date, datetime
 from decimal import Decimal
 
 from src.auth.api_types import UserId
-from src.market.api_types import SecurityId
+from src.market.api_types import (
+    IntradayPriceRow,
+    PriceRow,
+    SecurityId,
+    SecuritySearchResult,
+)
 from src.market.schema import (
     AlertForEvaluation,
     IntradayPriceSchema,
@@ -49,6 +55,19 @@ class SecurityBrokerRepository(ABC):
         pass
 
 
+class SecuritySearchIndexRepository(ABC):
+    @abstractmethod
+    async def search(self, query: str, limit: int) -> list[SecuritySearchResult]:
+        """Find indexed securities whose code or name starts with the query.
+
+        The query is expected to be normalized (lower-cased, trimmed).
+        """
+
+    @abstractmethod
+    async def upsert(self, results: list[SecuritySearchResult]) -> None:
+        """Add provider search results to the index, refreshing known entries."""
+
+
 class PriceRepository(ABC):
     @abstractmethod
     async def get_prices(
@@ -69,6 +88,15 @@ class PriceRepository(ABC):
     async def get_latest_price(self, security: SecuritySchema) -> PriceSchema | None:
         pass
 
+    async def get_latest_close(
+        self, security: SecuritySchema
+    ) -> tuple[date, Decimal] | None:
+        """Date and close of the most recent price."""
+        latest_price = await self.get_latest_price(security)
+        if latest_price is None:
+            return None
+        return latest_price.date, latest_price.close
+
     @abstractmethod
     async def get_price_on_date(
         self, security: SecuritySchema, date: date
@@ -80,8 +108,35 @@ class PriceRepository(ABC):
         pass
 
     @abstractmethod
-    async def save_prices(self, prices: list[PriceSchema]) -> list[PriceSchema]:
-        pass
+    async def save_prices(
+        self, prices: list[PriceSchema], *, returning: bool = False
+    ) -> list[PriceSchema]:
+        """Upsert prices, returning the stored rows only when requested."""
+
+    async def save_price_rows(self, rows: list[PriceRow]) -> None:
+        """Upsert prices given as column-ordered rows, skipping model validation."""
+        await self.save_prices(
+            [
+                PriceSchema(
+                    security_id=row[0],
+                    date=row[1],
+                    open=row[2],
+                    high=row[3],
+                    low=row[4],
+                    close=row[5],
+                    adjusted_close=row[6],
+                    volume=row[7],
+                )
+                for row in rows
+            ]
+        )
+
+    @abstractmethod
+    async def get_latest_dates_by_security(self) -> dict[SecurityId, date]:
+        """Return the date of the most recent stored price for every security.
+
+        Used as the ingestion watermark, securities without prices are omitted.
+        """
 
 
 class IntradayPriceRepository(ABC):
@@ -102,9 +157,39 @@ class IntradayPriceRepository(ABC):
 
     @abstractmethod
     async def save_intraday_prices(
-        self, prices: list[IntradayPriceSchema]
+        self, prices: list[IntradayPriceSchema], *, returning: bool = False
     ) -> list[IntradayPriceSchema]:
-        pass
+        """Upsert intraday bars, returning the stored rows only when requested."""
+
+    async def save_intraday_price_rows(self, rows: list[IntradayPriceRow]) -> None:
+        """Upsert intraday bars given as column-ordered rows."""
+        await self.save_intraday_prices(
+            [
+                IntradayPriceSchema(
+                    security_id=row[0],
+                    timestamp=row[1],
+                    open=row[2],
+                    high=row[3],
+                    low=row[4],
+                    close=row[5],
+                    volume=row[6],
+                )
+                for row in rows
+            ]
+        )
+
+    @abstractmethod
+    async def get_moved_security_ids(self, since: datetime) -> list[SecurityId]:
+        """Return the securities whose latest intraday close changed since then."""
+
+    @abstractmethod
+    async def get_latest_intraday_close(
+        self, security_ids: Iterable[SecurityId]
+    ) -> dict[SecurityId, Decimal]:
+        """Return the latest intraday close price of the given securities.
+
+        Securities without any intraday price data are omitted from the result.
+        """
 
     @abstractmethod
     async def get_latest_intraday_close_by_security(
@@ -113,8 +198,38 @@ class IntradayPriceRepository(ABC):
         """Return the latest intraday close price for every security.
 
         Securities without any intraday price data are omitted from the result.
-        Uses DISTINCT ON to guarantee one row per security even if two bars
-        share the same timestamp.
+        """
+
+    @abstractmethod
+    async def get_latest_timestamps_by_security(self) -> dict[SecurityId, datetime]:
+        """Return the timestamp of the most recent stored bar for every security.
+
+        Used as the ingestion watermark, securities without bars are omitted.
+        """
+
+    @abstractmethod
+    async def get_intraday_4h_prices(
+        self,
+        security_id: SecurityId,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> list[IntradayPriceSchema]:
+        """Return the 4-hour bars rolled up from expired 1-hour bars."""
+
+    @abstractmethod
+    async def create_intraday_partitions(self, months: list[date]) -> list[str]:
+        """Create the storage partitions of the given months if missing.
+
+        Bars already stored for those months in the catch-all partition are
+        moved to the new partitions. Returns the names of created partitions.
+        """
+
+    @abstractmethod
+    async def downsample_intraday_prices(self, before: datetime) -> int:
+        """Roll 1-hour bars older than the cutoff into 4-hour bars.
+
+        Monthly partitions entirely older than the cutoff are dropped as a
+        whole once rolled up. Returns the number of partitions dropped.
         """
 
 
@@ -167,10 +282,44 @@ class PriceAlertRepository(ABC):
     async def get_active_alerts_for_evaluation(self) -> list[AlertForEvaluation]:
         """Return all alerts with triggered_at IS NULL, joined to Security."""
 
+    @abstractmethod
+    async def get_triggered_alerts(
+        self, changed_since: datetime
+    ) -> list[AlertForEvaluation]:
+        """Return active alerts met by the latest intraday close of their security.
+
+        Only securities whose latest close changed since the given time, or
+        with alerts created since then, are evaluated.
+        """
+
+    @abstractmethod
+    async def get_triggered_alerts_for_securities(
+        self, security_ids: Iterable[SecurityId]
+    ) -> list[AlertForEvaluation]:
+        """Return active alerts of the given securities met by their latest close."""
+
+    @abstractmethod
+    async def get_alerted_security_ids(self) -> set[SecurityId]:
+        """Return the securities having at least one active alert."""
+
     @abstractmethod
     async def mark_triggered(self, alert_id: int, at: datetime) -> None:
         """Set triggered_at to the given timestamp for the alert (single UPDATE)."""
 
+    @abstractmethod
+    async def claim_pending_alerts(
+        self, alert_ids: Iterable[int], at: datetime
+    ) -> list[AlertForEvaluation]:
+        """Mark the given untriggered alerts triggered at the given time.
+
+        Single UPDATE, so concurrent dispatches never claim the same alert.
+        Returns the claimed alerts joined to Security.
+        """
+
+    @abstractmethod
+    async def release_alerts(self, alert_ids: Iterable[int], at: datetime) -> None:
+        """Clear triggered_at of the given alerts claimed at the given time."""
+
     @abstractmethod
     async def get_by_id(self, alert_id: int) -> PriceAlertRead | None:
         """Get a single alert by its integer ID."""
@@ -1,10 +1,11 @@
 from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
 from typing import override
 
 import holidays
 from svcs import Container
 
-from src.market.api_types import SecurityId
+from src.market.api_types import PriceRow, SecurityId
 from src.market.eodhd import eodhd_gateway_factory
 from src.market.gateway import MarketGateway
 from src.market.repository import PriceRepository
@@ -12,6 +13,20 @@ from src.market.repository_sqlalchemy import sqlalchemy_price_repository_factory
 from src.market.schema import PriceSchema, SecuritySchema
 
 
+def _latest_close_date() -> date:
+    """Most recent NYSE trading day before today."""
+    nyse_holidays = holidays.NYSE()
+    latest_close_date = datetime.now(UTC).date() - timedelta(days=1)
+
+    while (
+        latest_close_date.weekday() >= 5  # noqa: PLR2004
+        or latest_close_date in nyse_holidays
+    ):
+        latest_close_date -= timedelta(days=1)
+
+    return latest_close_date
+
+
 class EodhdPriceRepository(PriceRepository):
     _db_repository: PriceRepository
     _gateway: MarketGateway
@@ -57,15 +72,7 @@ class EodhdPriceRepository(PriceRepository):
     @override
     async def get_latest_price(self, security: SecuritySchema) -> PriceSchema | None:
         latest_price = await self._db_repository.get_latest_price(security)
-
-        nyse_holidays = holidays.NYSE()
-        latest_close_date = datetime.now(UTC).date() - timedelta(days=1)
-
-        while (
-            latest_close_date.weekday() >= 5  # noqa: PLR2004
-            or latest_close_date in nyse_holidays
-        ):
-            latest_close_date -= timedelta(days=1)
+        latest_close_date = _latest_close_date()
 
         if latest_price is not None and latest_price.date >= latest_close_date:
             return latest_price
@@ -78,6 +85,17 @@ class EodhdPriceRepository(PriceRepository):
 
         return prices[-1] if prices else None
 
+    @override
+    async def get_latest_close(
+        self, security: SecuritySchema
+    ) -> tuple[date, Decimal] | None:
+        latest_close = await self._db_repository.get_latest_close(security)
+        if latest_close is not None and latest_close[0] >= _latest_close_date():
+            return latest_close
+
+        # Stale or missing, fetch through get_latest_price
+        return await super().get_latest_close(security)
+
     @override
     async def get_price_on_date(
         self, security: SecuritySchema, date: date
@@ -100,8 +118,18 @@ class EodhdPriceRepository(PriceRepository):
         raise NotImplementedError
 
     @override
-    async def save_prices(self, prices: list[PriceSchema]) -> list[PriceSchema]:
-        raise NotImplementedError
+    async def save_prices(
+        self, prices: list[PriceSchema], *, returning: bool = False
+    ) -> list[PriceSchema]:
+        return await self._db_repository.save_prices(prices, returning=returning)
+
+    @override
+    async def save_price_rows(self, rows: list[PriceRow]) -> None:
+        await self._db_repository.save_price_rows(rows)
+
+    @override
+    async def get_latest_dates_by_security(self) -> dict[SecurityId, date]:
+        return await self._db_repository.get_latest_dates_by_security()
 
 
 async def eodhd_price_repository_factory(
@@ -1,9 +1,24 @@
+import asyncio
 import uuid
+from collections.abc import Iterable
 from datetime import UTC, date, datetime
 from decimal import Decimal
-from typing import override
-
-from sqlalchemy import delete, func, select, update
+from typing import Any, override
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    column,
+    delete,
+    func,
+    or_,
+    select,
+    table,
+    text,
+    union,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,18 +26,34 @@ from sqlalchemy.orm import selectinload
 from svcs import Container
 
 from src.auth.api_types import UserId
-from src.market.api_types import SecurityId
+from src.config.database import BaseModel
+from src.market.api_types import (
+    IntradayPriceRow,
+    PriceRow,
+    SecurityId,
+    SecuritySearchResult,
+)
 from src.market.exception import SecurityNotFoundError, WatchlistNotFoundError
 from src.market.model import (
+    IntradayPrice4hModel,
     IntradayPriceModel,
+    LatestIntradayPriceModel,
     PriceAlertModel,
     PriceModel,
     SecurityBrokerModel,
     SecurityDocumentModel,
     SecurityModel,
     SecurityNoteModel,
+    SecuritySearchEntryModel,
     WatchlistModel,
 )
+from src.market.partitions import (
+    INTRADAY_DEFAULT_PARTITION,
+    INTRADAY_PRICES_TABLE,
+    intraday_partition_month,
+    intraday_partition_name,
+    month_bounds,
+)
 from src.market.repository import (
     IntradayPriceRepository,
     PriceAlertRepository,
@@ -31,6 +62,7 @@ from src.market.repository import (
     SecurityDocumentRepository,
     SecurityNoteRepository,
     SecurityRepository,
+    SecuritySearchIndexRepository,
     WatchlistRepository,
 )
 from src.market.schema import (
@@ -48,6 +80,108 @@ from src.market.schema import (
     WatchlistRead,
 )
 
+PRICE_COLUMNS = (
+    "security_id",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "adjusted_close",
+    "volume",
+)
+INTRADAY_PRICE_COLUMNS = (
+    "security_id",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+)
+
+
+# Orders the staged rows so the last one of duplicated keys is kept
+_STAGING_SEQUENCE = "staging_seq"
+
+_write_locks: WeakKeyDictionary[AsyncSession, asyncio.Lock] = WeakKeyDictionary()
+
+
+def session_write_lock(session: AsyncSession) -> asyncio.Lock:
+    """Lock serializing the bulk writes of concurrent jobs sharing a session.
+
+    Ingestion jobs run concurrently on the repositories of one container. A
+    session runs one statement at a time and its staging tables are shared,
+    so each bulk write and its commit hold the lock.
+    """
+    lock = _write_locks.get(session)
+    if lock is None:
+        lock = asyncio.Lock()
+        _write_locks[session] = lock
+    return lock
+
+
+async def copy_upsert(  # noqa: PLR0913, PLR0917
+    session: AsyncSession,
+    model: type[BaseModel],
+    columns: tuple[str, ...],
+    key_columns: tuple[str, ...],
+    constraint: str,
+    records: Iterable[tuple[Any, ...]],
+) -> None:
+    """
+    Upsert rows by streaming them through COPY into a staging table.
+
+    The staging table is a session-local temporary table (never WAL-logged)
+    emptied on commit, merged into the target with a single
+    INSERT ... SELECT ... ON CONFLICT statement. Of rows sharing a key, the
+    last one given wins. Requires the asyncpg driver; callers sharing the
+    session between concurrent tasks hold its session_write_lock.
+
+    Args:
+        session: Session whose transaction the upsert runs in
+        model: Target table model
+        columns: Columns of the records, in order
+        key_columns: Columns of the unique constraint
+        constraint: Name of the unique constraint to upsert on
+        records: Row tuples matching columns
+    """
+    target = model.__tablename__
+    staging = table(
+        f"{target}_staging",
+        *(column(name) for name in (*columns, _STAGING_SEQUENCE)),
+    )
+    connection = await session.connection()
+    # Identifiers come from the model metadata, never from user input
+    create_staging = (
+        f"CREATE TEMP TABLE IF NOT EXISTS {staging.name} ON COMMIT DELETE ROWS "  # noqa: S608
+        f"AS SELECT {', '.join(columns)}, 0::bigint AS {_STAGING_SEQUENCE} "
+        f"FROM {target} WITH NO DATA"
+    )
+    await connection.execute(text(create_staging))
+
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging.name,
+        records=((*record, seq) for seq, record in enumerate(records)),
+        columns=(*columns, _STAGING_SEQUENCE),
+    )
+
+    # DISTINCT ON: a row cannot be updated twice by the same statement
+    keys = [staging.c[name] for name in key_columns]
+    stmt = insert(model).from_select(
+        columns,
+        select(*(staging.c[name] for name in columns))
+        .distinct(*keys)
+        .order_by(*keys, staging.c[_STAGING_SEQUENCE].desc()),
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_={name: stmt.excluded[name] for name in columns if name not in key_columns},
+    )
+    await connection.execute(stmt)
+    await connection.execute(text(f"TRUNCATE {staging.name}"))
+
 
 class SqlAlchemySecurityRepository(SecurityRepository):
     _session: AsyncSession
@@ -186,6 +320,87 @@ async def sqlalchemy_security_broker_repository_factory(
     )
 
 
+class SqlAlchemySecuritySearchIndexRepository(SecuritySearchIndexRepository):
+    _session: AsyncSession
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    @override
+    async def search(self, query: str, limit: int) -> list[SecuritySearchResult]:
+        # Prefix patterns only, so both text_pattern_ops indexes can be used
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%"
+        result = await self._session.execute(
+            select(SecuritySearchEntryModel)
+            .where(
+                or_(
+                    SecuritySearchEntryModel.search_code.like(pattern),
+                    SecuritySearchEntryModel.search_name.like(pattern),
+                )
+            )
+            .order_by(
+                # Exact ticker matches first, then ticker prefixes, then names
+                (SecuritySearchEntryModel.search_code != query),
+                (~SecuritySearchEntryModel.search_code.like(pattern)),
+                func.length(SecuritySearchEntryModel.code),
+                SecuritySearchEntryModel.code,
+                SecuritySearchEntryModel.exchange,
+            )
+            .limit(limit)
+        )
+        return [
+            SecuritySearchResult(
+                code=entry.code,
+                exchange=entry.exchange,
+                name=entry.name,
+                currency=entry.currency,
+                security_type=entry.security_type,
+                isin=entry.isin,
+                country=entry.country,
+            )
+            for entry in result.scalars()
+        ]
+
+    @override
+    async def upsert(self, results: list[SecuritySearchResult]) -> None:
+        if not results:
+            return
+
+        # Providers may list the same ticker twice, keep the last one
+        entries = {
+            (result.code, result.exchange): {
+                **result.model_dump(),
+                "search_code": result.code.lower(),
+                "search_name": result.name.lower(),
+            }
+            for result in results
+        }
+        stmt = insert(SecuritySearchEntryModel).values(list(entries.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint="search_code_exchange_unique",
+            set_={
+                "name": stmt.excluded.name,
+                "currency": stmt.excluded.currency,
+                "security_type": stmt.excluded.security_type,
+                "isin": stmt.excluded.isin,
+                "country": stmt.excluded.country,
+                "search_name": stmt.excluded.search_name,
+                "updated_at": func.now(),
+            },
+        )
+        await self._session.execute(stmt)
+        await self._session.commit()
+
+
+async def sqlalchemy_security_search_index_repository_factory(
+    container: Container,
+) -> SqlAlchemySecuritySearchIndexRepository:
+    return SqlAlchemySecuritySearchIndexRepository(
+        session=await container.aget(AsyncSession)
+    )
+
+
 class SqlAlchemyPriceRepository(PriceRepository):
     _session: AsyncSession
 
@@ -201,17 +416,21 @@ class SqlAlchemyPriceRepository(PriceRepository):
         offset: int = 0,
         limit: int = 50,
     ) -> tuple[list[PriceSchema], int]:
-        base_query = (
-            select(PriceModel)
-            .where(PriceModel.security_id == security.id)
-            .where(PriceModel.date >= from_date)
-            .where(PriceModel.date <= to_date)
+        criteria = (
+            PriceModel.security_id == security.id,
+            PriceModel.date >= from_date,
+            PriceModel.date <= to_date,
         )
+        # Counting without selecting the rows keeps it an index-only scan
         total = await self._session.scalar(
-            select(func.count()).select_from(base_query.subquery())
+            select(func.count()).select_from(PriceModel).where(*criteria)
         )
         prices = await self._session.execute(
-            base_query.order_by(PriceModel.date).offset(offset).limit(limit)
+            select(PriceModel)
+            .where(*criteria)
+            .order_by(PriceModel.date)
+            .offset(offset)
+            .limit(limit)
         )
         return [
             PriceSchema.model_validate(price) for price in prices.scalars()
@@ -253,6 +472,19 @@ class SqlAlchemyPriceRepository(PriceRepository):
             return None
         return PriceSchema.model_validate(result)
 
+    @override
+    async def get_latest_close(
+        self, security: SecuritySchema
+    ) -> tuple[date, Decimal] | None:
+        # Only columns of the covering index, answered by an index-only scan
+        result = await self._session.execute(
+            select(PriceModel.date, PriceModel.close)
+            .where(PriceModel.security_id == security.id)
+            .order_by(PriceModel.date.desc())
+            .limit(1)
+        )
+        return result.tuples().one_or_none()
+
     @override
     async def save_price(self, price: PriceSchema) -> PriceSchema:
         price_dict = {k: v for k, v in price.model_dump().items() if k != "id"}
@@ -263,10 +495,30 @@ class SqlAlchemyPriceRepository(PriceRepository):
         return PriceSchema.model_validate(price_model)
 
     @override
-    async def save_prices(self, prices: list[PriceSchema]) -> list[PriceSchema]:
+    async def save_prices(
+        self, prices: list[PriceSchema], *, returning: bool = False
+    ) -> list[PriceSchema]:
         if not prices:
             return []
 
+        if not returning:
+            await self.save_price_rows(
+                [
+                    (
+                        p.security_id,
+                        p.date,
+                        p.open,
+                        p.high,
+                        p.low,
+                        p.close,
+                        p.adjusted_close,
+                        p.volume,
+                    )
+                    for p in prices
+                ]
+            )
+            return []
+
         price_dicts = [
             {k: v for k, v in p.model_dump().items() if k != "id"} for p in prices
         ]
@@ -296,6 +548,30 @@ class SqlAlchemyPriceRepository(PriceRepository):
         await self._session.commit()
         return schemas
 
+    @override
+    async def save_price_rows(self, rows: list[PriceRow]) -> None:
+        if not rows:
+            return
+
+        async with session_write_lock(self._session):
+            await copy_upsert(
+                self._session,
+                PriceModel,
+                PRICE_COLUMNS,
+                ("security_id", "date"),
+                "price_security_date_unique",
+                rows,
+            )
+            await self._session.commit()
+
+    @override
+    async def get_latest_dates_by_security(self) -> dict[SecurityId, date]:
+        stmt = select(PriceModel.security_id, func.max(PriceModel.date)).group_by(
+            PriceModel.security_id
+        )
+        result = await self._session.execute(stmt)
+        return dict(result.tuples().all())
+
 
 async def sqlalchemy_price_repository_factory(
     container: Container,
@@ -333,16 +609,33 @@ class SqlAlchemyIntradayPriceRepository(IntradayPriceRepository):
     async def save_intraday_price(
         self, price: IntradayPriceSchema
     ) -> IntradayPriceSchema:
-        saved = await self.save_intraday_prices([price])
+        saved = await self.save_intraday_prices([price], returning=True)
         return saved[0]
 
     @override
     async def save_intraday_prices(
-        self, prices: list[IntradayPriceSchema]
+        self, prices: list[IntradayPriceSchema], *, returning: bool = False
     ) -> list[IntradayPriceSchema]:
         if not prices:
             return []
 
+        if not returning:
+            await self.save_intraday_price_rows(
+                [
+                    (
+                        p.security_id,
+                        p.timestamp,
+                        p.open,
+                        p.high,
+                        p.low,
+                        p.close,
+                        p.volume,
+                    )
+                    for p in prices
+                ]
+            )
+            return []
+
         price_dicts = [p.model_dump(exclude={"id"}) for p in prices]
 
         chunk_size = 1000
@@ -369,29 +662,262 @@ class SqlAlchemyIntradayPriceRepository(IntradayPriceRepository):
                 ]
             )
 
+        await self._upsert_latest_intraday(
+            (p.security_id, p.timestamp, p.close) for p in prices
+        )
         await self._session.commit()
         return schemas
 
+    @override
+    async def save_intraday_price_rows(self, rows: list[IntradayPriceRow]) -> None:
+        if not rows:
+            return
+
+        async with session_write_lock(self._session):
+            await copy_upsert(
+                self._session,
+                IntradayPriceModel,
+                INTRADAY_PRICE_COLUMNS,
+                ("security_id", "timestamp"),
+                "intraday_price_security_timestamp_unique",
+                rows,
+            )
+            await self._upsert_latest_intraday((row[0], row[1], row[5]) for row in rows)
+            await self._session.commit()
+
+    async def _upsert_latest_intraday(
+        self, bars: Iterable[tuple[SecurityId, datetime, Decimal]]
+    ) -> None:
+        """Advance the latest close of the securities of saved bars.
+
+        Runs in the transaction saving the bars. Older bars, from a backfill
+        for instance, never replace a more recent latest close.
+        """
+        latest: dict[SecurityId, tuple[datetime, Decimal]] = {}
+        for security_id, timestamp, close in bars:
+            current = latest.get(security_id)
+            if current is None or timestamp >= current[0]:
+                latest[security_id] = (timestamp, close)
+
+        values = [
+            {"security_id": security_id, "timestamp": timestamp, "close": close}
+            for security_id, (timestamp, close) in latest.items()
+        ]
+        chunk_size = 1000
+        for i in range(0, len(values), chunk_size):
+            stmt = insert(LatestIntradayPriceModel).values(values[i : i + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LatestIntradayPriceModel.security_id],
+                set_={
+                    "timestamp": stmt.excluded.timestamp,
+                    "close": stmt.excluded.close,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    stmt.excluded.timestamp > LatestIntradayPriceModel.timestamp,
+                    and_(
+                        stmt.excluded.timestamp == LatestIntradayPriceModel.timestamp,
+                        stmt.excluded.close != LatestIntradayPriceModel.close,
+                    ),
+                ),
+            )
+            await self._session.execute(stmt)
+
+    @override
+    async def get_moved_security_ids(self, since: datetime) -> list[SecurityId]:
+        result = await self._session.execute(
+            select(LatestIntradayPriceModel.security_id).where(
+                LatestIntradayPriceModel.updated_at >= since
+            )
+        )
+        return list(result.scalars().all())
+
+    @override
+    async def get_latest_intraday_close(
+        self, security_ids: Iterable[SecurityId]
+    ) -> dict[SecurityId, Decimal]:
+        ids = set(security_ids)
+        if not ids:
+            return {}
+
+        result = await self._session.execute(
+            select(
+                LatestIntradayPriceModel.security_id,
+                LatestIntradayPriceModel.close,
+            ).where(LatestIntradayPriceModel.security_id.in_(ids))
+        )
+        return dict(result.tuples().all())
+
     @override
     async def get_latest_intraday_close_by_security(
         self,
     ) -> dict[SecurityId, Decimal]:
-        # DISTINCT ON guarantees one row per security even if two bars
-        # share the same timestamp.
-        stmt = (
+        result = await self._session.execute(
+            select(LatestIntradayPriceModel.security_id, LatestIntradayPriceModel.close)
+        )
+        return dict(result.tuples().all())
+
+    @override
+    async def get_latest_timestamps_by_security(self) -> dict[SecurityId, datetime]:
+        # One row per security, no aggregate over every intraday partition
+        result = await self._session.execute(
             select(
-                IntradayPriceModel.security_id,
-                IntradayPriceModel.close,
-            )
-            .distinct(IntradayPriceModel.security_id)
-            .order_by(
-                IntradayPriceModel.security_id,
-                IntradayPriceModel.timestamp.desc(),
+                LatestIntradayPriceModel.security_id,
+                LatestIntradayPriceModel.timestamp,
             )
         )
+        return dict(result.tuples().all())
 
+    @override
+    async def get_intraday_4h_prices(
+        self,
+        security_id: SecurityId,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> list[IntradayPriceSchema]:
+        stmt = select(IntradayPrice4hModel).where(
+            IntradayPrice4hModel.security_id == security_id
+        )
+        if start_time is not None:
+            stmt = stmt.where(IntradayPrice4hModel.timestamp >= start_time)
+        if end_time is not None:
+            stmt = stmt.where(IntradayPrice4hModel.timestamp <= end_time)
+        stmt = stmt.order_by(IntradayPrice4hModel.timestamp.asc())
         result = await self._session.execute(stmt)
-        return {row.security_id: row.close for row in result.mappings().all()}
+        return [IntradayPriceSchema.model_validate(model) for model in result.scalars()]
+
+    async def _intraday_partitions(self) -> list[str]:
+        result = await self._session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": INTRADAY_PRICES_TABLE},
+        )
+        return list(result.scalars())
+
+    @override
+    async def create_intraday_partitions(self, months: list[date]) -> list[str]:
+        existing = set(await self._intraday_partitions())
+        created = []
+        for month in months:
+            name = intraday_partition_name(month)
+            if name in existing:
+                continue
+
+            lower, upper = month_bounds(month)
+            # Attaching fails while the default partition holds rows of the
+            # month, so they are moved to the new table before it is attached
+            await self._session.execute(
+                text(
+                    f'CREATE TABLE "{name}" '
+                    f"(LIKE {INTRADAY_PRICES_TABLE} INCLUDING DEFAULTS)"
+                )
+            )
+            await self._session.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {INTRADAY_DEFAULT_PARTITION} "  # noqa: S608
+                    'WHERE "timestamp" >= :lower AND "timestamp" < :upper '
+                    f'RETURNING *) INSERT INTO "{name}" SELECT * FROM moved'
+                ),
+                {"lower": lower, "upper": upper},
+            )
+            await self._session.execute(
+                text(
+                    f'ALTER TABLE {INTRADAY_PRICES_TABLE} ATTACH PARTITION "{name}" '
+                    f"FOR VALUES FROM ('{lower.isoformat()}') "
+                    f"TO ('{upper.isoformat()}')"
+                )
+            )
+            created.append(name)
+
+        await self._session.commit()
+        return created
+
+    async def _roll_up_4h(self, partitions: list[str], before: datetime) -> None:
+        """Roll expired 1-hour bars into 4-hour bars.
+
+        The bars of the expired partitions and the default partition are
+        aggregated in one pass, so no bucket is rolled up twice within a run.
+        Buckets rolled up by an earlier run are merged with their late bars,
+        skipping the bars listed in the bucket's ``bar_timestamps``: the high
+        and low are widened, the volumes added, and the open and close only
+        replaced by an earlier or a later bar.
+        """
+        columns = 'security_id, "timestamp", open, high, low, close, volume'
+        sources = [
+            f'SELECT {columns} FROM "{name}"'  # noqa: S608
+            for name in partitions
+        ]
+        sources.append(
+            f"SELECT {columns} FROM {INTRADAY_DEFAULT_PARTITION} "  # noqa: S608
+            'WHERE "timestamp" < :before'
+        )
+        first = "{0}.bar_timestamps[1]"
+        last = "{0}.bar_timestamps[array_upper({0}.bar_timestamps, 1)]"
+        await self._session.execute(
+            text(
+                "INSERT INTO market_intraday_prices_4h "  # noqa: S608
+                f"({columns}, bar_timestamps) "
+                "SELECT bars.security_id, bars.bucket, "
+                '(array_agg(bars.open ORDER BY bars."timestamp"))[1], '
+                "max(bars.high), min(bars.low), "
+                '(array_agg(bars.close ORDER BY bars."timestamp" DESC))[1], '
+                "sum(bars.volume), "
+                'array_agg(bars."timestamp" ORDER BY bars."timestamp") '
+                "FROM (SELECT *, date_bin(INTERVAL '4 hours', \"timestamp\", "
+                "TIMESTAMPTZ '2000-01-01 00:00:00+00') AS bucket "
+                f"FROM ({' UNION ALL '.join(sources)}) AS expired) AS bars "
+                "LEFT JOIN market_intraday_prices_4h AS rolled "
+                "ON rolled.security_id = bars.security_id "
+                'AND rolled."timestamp" = bars.bucket '
+                # Buckets of unknown coverage are left as they are
+                "WHERE rolled.id IS NULL OR (rolled.bar_timestamps IS NOT NULL "
+                'AND NOT bars."timestamp" = ANY(rolled.bar_timestamps)) '
+                "GROUP BY bars.security_id, bars.bucket "
+                "ON CONFLICT ON CONSTRAINT "
+                "intraday_price_4h_security_timestamp_unique DO UPDATE SET "
+                f"open = CASE WHEN {first.format('EXCLUDED')} < "
+                f"{first.format('market_intraday_prices_4h')} "
+                "THEN EXCLUDED.open ELSE market_intraday_prices_4h.open END, "
+                "high = GREATEST(market_intraday_prices_4h.high, EXCLUDED.high), "
+                "low = LEAST(market_intraday_prices_4h.low, EXCLUDED.low), "
+                f"close = CASE WHEN {last.format('EXCLUDED')} > "
+                f"{last.format('market_intraday_prices_4h')} "
+                "THEN EXCLUDED.close ELSE market_intraday_prices_4h.close END, "
+                "volume = market_intraday_prices_4h.volume + EXCLUDED.volume, "
+                "bar_timestamps = ARRAY(SELECT unnest("
+                "market_intraday_prices_4h.bar_timestamps "
+                "|| EXCLUDED.bar_timestamps) ORDER BY 1)"
+            ),
+            {"before": before},
+        )
+
+    @override
+    async def downsample_intraday_prices(self, before: datetime) -> int:
+        expired = [
+            name
+            for name in await self._intraday_partitions()
+            if (month := intraday_partition_month(name)) is not None
+            and month_bounds(month)[1] <= before
+        ]
+        # Expired months and late or backfilled bars of months without a
+        # partition
+        await self._roll_up_4h(expired, before)
+        for name in expired:
+            # Dropping a whole partition is O(1), no row deletes or vacuum
+            await self._session.execute(text(f'DROP TABLE "{name}"'))
+        await self._session.execute(
+            text(
+                f"DELETE FROM {INTRADAY_DEFAULT_PARTITION} "  # noqa: S608
+                'WHERE "timestamp" < :before'
+            ),
+            {"before": before},
+        )
+
+        await self._session.commit()
+        return len(expired)
 
 
 async def sqlalchemy_intraday_price_repository_factory(
@@ -629,6 +1155,89 @@ class SqlAlchemyPriceAlertRepository(PriceAlertRepository):
             for row in result.mappings().all()
         ]
 
+    async def _triggered_alerts(
+        self, securities: ColumnElement[bool]
+    ) -> list[AlertForEvaluation]:
+        """Active alerts met by the latest intraday close, compared in SQL."""
+        latest_close = LatestIntradayPriceModel.close
+        result = await self._session.execute(
+            select(
+                PriceAlertModel.id,
+                PriceAlertModel.security_id,
+                PriceAlertModel.user_id,
+                PriceAlertModel.target_price,
+                PriceAlertModel.condition,
+                SecurityModel.symbol,
+                SecurityModel.name,
+            )
+            .join(SecurityModel, PriceAlertModel.security_id == SecurityModel.id)
+            .join(
+                LatestIntradayPriceModel,
+                PriceAlertModel.security_id == LatestIntradayPriceModel.security_id,
+            )
+            .where(
+                PriceAlertModel.triggered_at.is_(None),
+                securities,
+                or_(
+                    and_(
+                        PriceAlertModel.condition == "above",
+                        PriceAlertModel.target_price <= latest_close,
+                    ),
+                    and_(
+                        PriceAlertModel.condition == "below",
+                        PriceAlertModel.target_price >= latest_close,
+                    ),
+                ),
+            )
+        )
+        return [
+            AlertForEvaluation(
+                alert_id=row.id,
+                security_id=row.security_id,
+                security_symbol=row.symbol,
+                security_name=row.name,
+                user_id=row.user_id,
+                target_price=row.target_price,
+                condition=row.condition,
+            )
+            for row in result.mappings().all()
+        ]
+
+    @override
+    async def get_triggered_alerts(
+        self, changed_since: datetime
+    ) -> list[AlertForEvaluation]:
+        # Securities whose latest close changed, and those of new alerts
+        candidates = union(
+            select(LatestIntradayPriceModel.security_id).where(
+                LatestIntradayPriceModel.updated_at >= changed_since
+            ),
+            select(PriceAlertModel.security_id).where(
+                PriceAlertModel.triggered_at.is_(None),
+                PriceAlertModel.created_at >= changed_since,
+            ),
+        )
+        return await self._triggered_alerts(PriceAlertModel.security_id.in_(candidates))
+
+    @override
+    async def get_triggered_alerts_for_securities(
+        self, security_ids: Iterable[SecurityId]
+    ) -> list[AlertForEvaluation]:
+        ids = set(security_ids)
+        if not ids:
+            return []
+        return await self._triggered_alerts(PriceAlertModel.security_id.in_(ids))
+
+    @override
+    async def get_alerted_security_ids(self) -> set[SecurityId]:
+        # Answered from the partial index of active alerts
+        result = await self._session.execute(
+            select(PriceAlertModel.security_id)
+            .where(PriceAlertModel.triggered_at.is_(None))
+            .distinct()
+        )
+        return set(result.scalars())
+
     @override
     async def mark_triggered(self, alert_id: int, at: datetime) -> None:
         await self._session.execute(
@@ -638,6 +1247,65 @@ class SqlAlchemyPriceAlertRepository(PriceAlertRepository):
         )
         await self._session.commit()
 
+    @override
+    async def claim_pending_alerts(
+        self, alert_ids: Iterable[int], at: datetime
+    ) -> list[AlertForEvaluation]:
+        ids = set(alert_ids)
+        if not ids:
+            return []
+
+        # Concurrent claims wait on the row locks and re-check triggered_at, so
+        # every alert is returned to a single caller
+        result = await self._session.execute(
+            update(PriceAlertModel)
+            .where(
+                PriceAlertModel.id.in_(ids),
+                PriceAlertModel.triggered_at.is_(None),
+                PriceAlertModel.security_id == SecurityModel.id,
+            )
+            .values(triggered_at=at)
+            .returning(
+                PriceAlertModel.id,
+                PriceAlertModel.security_id,
+                PriceAlertModel.user_id,
+                PriceAlertModel.target_price,
+                PriceAlertModel.condition,
+                SecurityModel.symbol,
+                SecurityModel.name,
+            )
+        )
+        rows = sorted(result.mappings().all(), key=lambda row: row.id)
+        await self._session.commit()
+        return [
+            AlertForEvaluation(
+                alert_id=row.id,
+                security_id=row.security_id,
+                security_symbol=row.symbol,
+                security_name=row.name,
+                user_id=row.user_id,
+                target_price=row.target_price,
+                condition=row.condition,
+            )
+            for row in rows
+        ]
+
+    @override
+    async def release_alerts(self, alert_ids: Iterable[int], at: datetime) -> None:
+        ids = set(alert_ids)
+        if not ids:
+            return
+
+        await self._session.execute(
+            update(PriceAlertModel)
+            .where(
+                PriceAlertModel.id.in_(ids),
+                PriceAlertModel.triggered_at == at,
+            )
+            .values(triggered_at=None)
+        )
+        await self._session.commit()
+
     @override
     async def get_by_id(self, alert_id: int) -> PriceAlertRead | None:
         result = await self._session.execute(
@@ -20,7 +20,6 @@ from src.market.api import SecurityApi
 from src.market.api_types import SecurityId, SecuritySearchResult, WatchlistId
 from src.market.cache import IndicatorCache
 from src.market.enum import PriceInterval
-from src.market.gateway import MarketGateway
 from src.market.indicators import (
     calculate_50_day_ma,
     calculate_50_week_ma,
@@ -61,6 +60,7 @@ from src.market.schema import (
     TechnicalIndicatorsRead,
     WatchlistRead,
 )
+from src.market.search import SecuritySearchService
 from src.market.service import (
     MarketService,
     aggregate_4h_candles,
@@ -103,8 +103,8 @@ async def market_search(
     """
     Search for securities by query string
     """
-    gateway = services.get(MarketGateway)
-    results = gateway.search(q)
+    search_service = await services.aget(SecuritySearchService)
+    results = await search_service.search(q)
     logger.info(
         "Searched for securities with query: %s, found %d results", q, len(results)
     )
@@ -240,8 +240,16 @@ async def market_get_prices(
     candles = await intraday_repository.get_intraday_prices(
         security_id, start_time=from_dt, end_time=to_dt
     )
+    # 1h candles past their retention are only kept as 4h candles
+    archived = (
+        await intraday_repository.get_intraday_4h_prices(
+            security_id, start_time=from_dt, end_time=to_dt
+        )
+        if interval == PriceInterval.FOUR_HOURS
+        else []
+    )
 
-    if not candles:
+    if not candles and not archived:
         market_service = await services.aget(MarketService)
         fetched = await market_service.fetch_and_save_intraday_prices(
             security, from_datetime=from_dt, to_datetime=to_dt
@@ -252,7 +260,12 @@ async def market_get_prices(
             )
 
     if interval == PriceInterval.FOUR_HOURS:
-        candles = aggregate_4h_candles(candles)
+        first_hourly = candles[0].timestamp if candles else None
+        candles = [
+            candle
+            for candle in archived
+            if first_hourly is None or candle.timestamp < first_hourly
+        ] + aggregate_4h_candles(candles)
 
     total = len(candles)
     paginated_candles = candles
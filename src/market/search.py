@@ -0,0 +1,76 @@
+import logging
+
+from svcs import Container
+
+from src.config.settings import settings
+from src.market.api_types import SecuritySearchResult
+from src.market.cache import SecuritySearchCache
+from src.market.gateway import AsyncMarketGateway
+from src.market.repository import SecuritySearchIndexRepository
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so equivalent queries share index and cache."""
+    return " ".join(query.split()).casefold()
+
+
+class SecuritySearchService:
+    """Security search answered locally whenever possible.
+
+    Lookups go to the cache of provider results first, then to the local index
+    of previously returned results. The provider is only queried, without
+    blocking the event loop, for cold queries the index cannot answer.
+    """
+
+    _gateway: AsyncMarketGateway
+    _index_repository: SecuritySearchIndexRepository
+    _cache: SecuritySearchCache
+
+    def __init__(
+        self,
+        gateway: AsyncMarketGateway,
+        index_repository: SecuritySearchIndexRepository,
+        cache: SecuritySearchCache,
+    ):
+        self._gateway = gateway
+        self._index_repository = index_repository
+        self._cache = cache
+
+    async def search(self, query: str) -> list[SecuritySearchResult]:
+        normalized = normalize_query(query)
+        if not normalized:
+            return []
+
+        cached = await self._cache.get(normalized)
+        if cached is not None:
+            logger.debug("Security search cache hit for %r", normalized)
+            return cached
+
+        local = await self._index_repository.search(
+            normalized, settings.security_search_limit
+        )
+        if len(local) >= settings.security_search_min_local_results:
+            logger.debug("Security search answered from local index for %r", normalized)
+            return local
+
+        results = await self._gateway.search(normalized)
+        await self._index_repository.upsert(results)
+        await self._cache.set(normalized, results)
+
+        # Provider results first, then local matches it did not return
+        seen = {(result.code, result.exchange) for result in results}
+        return results + [
+            result for result in local if (result.code, result.exchange) not in seen
+        ]
+
+
+async def security_search_service_factory(
+    container: Container,
+) -> SecuritySearchService:
+    return SecuritySearchService(
+        gateway=await container.aget(AsyncMarketGateway),
+        index_repository=await container.aget(SecuritySearchIndexRepository),
+        cache=await container.aget(SecuritySearchCache),
+    )
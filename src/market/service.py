@@ -1,12 +1,19 @@
-import asyncio
 import logging
-from collections.abc import Sequence
-from datetime import UTC, date, datetime, timedelta
+from collections.abc import Callable, Sequence
+from datetime import UTC, date, datetime, time, timedelta
 
 from svcs import Container
 
-from src.market.gateway import MarketGateway
+from src.config.settings import settings
+from src.market.api_types import PriceRow, SecurityId
+from src.market.gateway import (
+    AsyncMarketGateway,
+    MarketGateway,
+    ThreadedMarketGateway,
+)
+from src.market.ingestion import IngestionScheduler, eodhd_ingestion_scheduler
 from src.market.model import IntradayPriceModel, PriceModel
+from src.market.partitions import upcoming_months
 from src.market.repository import (
     IntradayPriceRepository,
     PriceRepository,
@@ -16,6 +23,13 @@ from src.market.schema import IntradayPriceSchema, PriceSchema, SecuritySchema
 
 logger = logging.getLogger(__name__)
 
+# Called with each security as soon as its fetched prices are stored
+type PricesSavedHook = Callable[[SecurityId], None]
+
+
+def _noop_prices_saved(_security_id: SecurityId) -> None:
+    pass
+
 
 def aggregate_weekly_prices(
     prices: Sequence[PriceSchema | PriceModel],
@@ -130,6 +144,28 @@ def aggregate_4h_candles(
     return aggregated
 
 
+def incremental_start[T: (date, datetime)](
+    watermark: T | None, window_start: T, overlap: timedelta
+) -> T:
+    """
+    Start of the range to fetch for a security during an incremental update.
+    Resume from the watermark minus the overlap, so late revisions of recent
+    prices are picked up, but never go back further than the full window.
+    """
+    if watermark is None:
+        return window_start
+    return max(window_start, watermark - overlap)
+
+
+def weekdays_after(watermark: date, to_date: date) -> list[date]:
+    """Weekdays after the watermark up to to_date, the possible trading days."""
+    return [
+        day
+        for offset in range(1, (to_date - watermark).days + 1)
+        if (day := watermark + timedelta(days=offset)).weekday() < 5  # noqa: PLR2004
+    ]
+
+
 class PriceAggregationService:
     @staticmethod
     def aggregate_weekly_prices(
@@ -152,120 +188,290 @@ class PriceAggregationService:
 
 class MarketService:
     _gateway: MarketGateway
+    _async_gateway: AsyncMarketGateway
     _price_repository: PriceRepository
     _security_repository: SecurityRepository
     _intraday_price_repository: IntradayPriceRepository
+    _ingestion_scheduler: IngestionScheduler
 
-    def __init__(
+    def __init__(  # noqa: PLR0913, PLR0917
         self,
         gateway: MarketGateway,
         price_repository: PriceRepository,
         security_repository: SecurityRepository,
         intraday_price_repository: IntradayPriceRepository,
+        ingestion_scheduler: IngestionScheduler | None = None,
+        async_gateway: AsyncMarketGateway | None = None,
     ):
         self._gateway = gateway
+        self._async_gateway = async_gateway or ThreadedMarketGateway(gateway)
         self._price_repository = price_repository
         self._security_repository = security_repository
         self._intraday_price_repository = intraday_price_repository
+        self._ingestion_scheduler = ingestion_scheduler or eodhd_ingestion_scheduler
 
-    async def _update_security_prices(
-        self, security: SecuritySchema, from_date: date, to_date: date
-    ) -> bool:
-        try:
-            # Gateway returns a list of HistoricalPrice
-            prices = await asyncio.to_thread(
-                self._gateway.get_prices,
-                security.id,
-                security.symbol,
-                security.exchange,
-                from_date=from_date,
-                to_date=to_date,
+    async def _ingest_security_prices(
+        self,
+        security: SecuritySchema,
+        from_date: date,
+        to_date: date,
+        on_saved: PricesSavedHook,
+    ) -> None:
+        # Rows go straight to the bulk writer, skipping per-row models
+        rows = await self._async_gateway.get_price_rows(
+            security.id,
+            security.symbol,
+            security.exchange,
+            from_date=from_date,
+            to_date=to_date,
+        )
+        if rows:
+            await self._price_repository.save_price_rows(rows)
+            on_saved(security.id)
+
+    async def _ingest_exchange_day(  # noqa: PLR0913, PLR0917
+        self,
+        exchange: str,
+        day: date,
+        securities_by_symbol: dict[str, SecuritySchema],
+        fetched: set[tuple[str, date]],
+        traded: set[tuple[str, date]],
+        saved: set[tuple[SecurityId, date]],
+    ) -> None:
+        bulk_prices = await self._async_gateway.get_bulk_last_day(exchange, day)
+        # The bulk download covers the whole exchange, keep tracked securities only
+        rows: list[PriceRow] = [
+            (
+                securities_by_symbol[price.code].id,
+                price.date,
+                price.open,
+                price.high,
+                price.low,
+                price.close,
+                price.adjusted_close,
+                price.volume,
             )
-        except Exception:
-            # Catching general Exception to prevent one failure from stopping jobs
-            logger.exception("Failed to update prices for security %s", security.symbol)
-            return False
-        else:
-            if prices:
-                price_schemas = [PriceSchema.from_historical_price(p) for p in prices]
-                await self._price_repository.save_prices(price_schemas)
-            return True
+            for price in bulk_prices
+            if price.code in securities_by_symbol
+        ]
+        if rows:
+            await self._price_repository.save_price_rows(rows)
+        fetched.add((exchange, day))
+        if bulk_prices:
+            traded.add((exchange, day))
+        saved.update((row[0], day) for row in rows)
+
+    async def _update_daily_prices_by_exchange(
+        self,
+        securities: list[SecuritySchema],
+        watermarks: dict[SecurityId, date],
+        to_date: date,
+        on_saved: PricesSavedHook,
+    ) -> tuple[int, list[SecuritySchema]]:
+        """Update recent securities with one bulk request per exchange and day.
+
+        Every weekday after a security's watermark is downloaded, so missed
+        trading days are filled in too. Returns the number of securities
+        updated and the securities left for per-symbol updates: never
+        ingested, lagging behind by more than the bulk gap, or missing from
+        (or failed) a download of a day their exchange traded.
+        """
+        max_gap = timedelta(days=settings.daily_price_bulk_max_gap_days)
+        missing_days: dict[SecurityId, list[date]] = {}
+        by_exchange: dict[str, dict[str, SecuritySchema]] = {}
+        pending: list[SecuritySchema] = []
+        for security in securities:
+            watermark = watermarks.get(security.id)
+            if watermark is None or to_date - watermark > max_gap:
+                pending.append(security)
+            else:
+                missing_days[security.id] = weekdays_after(watermark, to_date)
+                by_exchange.setdefault(security.exchange, {})[security.symbol] = (
+                    security
+                )
+
+        exchange_days = sorted(
+            {
+                (exchange, day)
+                for exchange, securities_by_symbol in by_exchange.items()
+                for security in securities_by_symbol.values()
+                for day in missing_days[security.id]
+            }
+        )
+        fetched: set[tuple[str, date]] = set()
+        traded: set[tuple[str, date]] = set()
+        saved: set[tuple[SecurityId, date]] = set()
+        await self._ingestion_scheduler.run(
+            "daily_prices_bulk",
+            exchange_days,
+            lambda exchange_day: self._ingest_exchange_day(
+                *exchange_day,
+                by_exchange[exchange_day[0]],
+                fetched,
+                traded,
+                saved,
+            ),
+            cost=settings.eodhd_bulk_request_cost,
+        )
 
-    async def update_daily_prices_for_all_securities(self) -> dict[str, int]:
+        updated = 0
+        for exchange, securities_by_symbol in by_exchange.items():
+            for security in securities_by_symbol.values():
+                days = missing_days[security.id]
+                if all(
+                    (exchange, day) in fetched
+                    and ((exchange, day) not in traded or (security.id, day) in saved)
+                    for day in days
+                ):
+                    updated += 1
+                    if any((security.id, day) in saved for day in days):
+                        on_saved(security.id)
+                else:
+                    pending.append(security)
+        return updated, pending
+
+    async def update_daily_prices_for_all_securities(
+        self,
+        *,
+        full_refresh: bool = False,
+        on_saved: PricesSavedHook = _noop_prices_saved,
+    ) -> dict[str, int]:
         """Fetches all securities and updates their prices for the last year.
 
+        Only prices from each security's watermark (latest stored date, minus a
+        small overlap for revisions) are fetched unless full_refresh is set.
+        Securities that are up to date are updated from one bulk end-of-day
+        request per exchange when bulk ingestion is enabled. on_saved is called
+        with each security once its prices are stored.
+
         Returns a dict containing 'success' and 'failure' counts.
         """
         securities = await self._security_repository.get_all_active_securities()
 
         # We'll fetch prices for the last year as per the issue comment
         to_date = datetime.now(UTC).date()
-        from_date = to_date - timedelta(days=365)
+        window_start = to_date - timedelta(days=365)
+
+        watermarks = (
+            {}
+            if full_refresh
+            else await self._price_repository.get_latest_dates_by_security()
+        )
+        overlap = timedelta(days=settings.daily_price_overlap_days)
 
-        results = await asyncio.gather(
-            *(
-                self._update_security_prices(security, from_date, to_date)
-                for security in securities
+        bulk_count = 0
+        if watermarks and settings.eodhd_bulk_eod_enabled:
+            bulk_count, securities = await self._update_daily_prices_by_exchange(
+                securities, watermarks, to_date, on_saved
             )
+
+        metrics = await self._ingestion_scheduler.run(
+            "daily_prices_full" if full_refresh else "daily_prices",
+            securities,
+            lambda security: self._ingest_security_prices(
+                security,
+                incremental_start(watermarks.get(security.id), window_start, overlap),
+                to_date,
+                on_saved,
+            ),
         )
 
-        success_count = sum(1 for result in results if result)
-        failure_count = sum(1 for result in results if not result)
+        return {"success": bulk_count + metrics.succeeded, "failure": metrics.failed}
 
-        return {"success": success_count, "failure": failure_count}
+    async def _ingest_security_intraday_prices(
+        self,
+        security: SecuritySchema,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        on_saved: PricesSavedHook = _noop_prices_saved,
+    ) -> None:
+        rows = await self._async_gateway.get_intraday_price_rows(
+            security.id,
+            security.symbol,
+            security.exchange,
+            from_datetime=from_datetime,
+            to_datetime=to_datetime,
+            interval="1h",
+        )
+        if rows:
+            await self._intraday_price_repository.save_intraday_price_rows(rows)
+            on_saved(security.id)
 
     async def _update_security_intraday_prices(
         self, security: SecuritySchema, from_datetime: datetime, to_datetime: datetime
     ) -> bool:
         try:
-            prices = await asyncio.to_thread(
-                self._gateway.get_intraday_prices,
-                security.id,
-                security.symbol,
-                security.exchange,
-                from_datetime=from_datetime,
-                to_datetime=to_datetime,
-                interval="1h",
+            await self._ingest_security_intraday_prices(
+                security, from_datetime, to_datetime
             )
         except Exception:
             logger.exception(
                 "Failed to update intraday prices for security %s", security.symbol
             )
             return False
-        else:
-            if prices:
-                price_schemas = [
-                    IntradayPriceSchema.model_validate(p, from_attributes=True)
-                    for p in prices
-                ]
-                await self._intraday_price_repository.save_intraday_prices(
-                    price_schemas
-                )
-            return True
+        return True
 
-    async def update_intraday_prices_for_all_securities(self) -> dict[str, int]:
+    async def update_intraday_prices_for_all_securities(
+        self,
+        *,
+        full_refresh: bool = False,
+        on_saved: PricesSavedHook = _noop_prices_saved,
+    ) -> dict[str, int]:
         """Fetches active securities and updates 1h intraday prices for last 7 days.
 
+        Only bars from each security's watermark (latest stored timestamp, minus
+        a small overlap for revisions) are fetched unless full_refresh is set.
+        on_saved is called with each security once its bars are stored.
+
         Returns a dict containing 'success' and 'failure' counts.
         """
         securities = await self._security_repository.get_all_active_securities()
 
         to_datetime = datetime.now(UTC)
-        from_datetime = to_datetime - timedelta(days=7)
+        window_start = to_datetime - timedelta(days=7)
 
-        results = await asyncio.gather(
-            *(
-                self._update_security_intraday_prices(
-                    security, from_datetime, to_datetime
-                )
-                for security in securities
-            )
+        intraday_repository = self._intraday_price_repository
+        watermarks = (
+            {}
+            if full_refresh
+            else await intraday_repository.get_latest_timestamps_by_security()
+        )
+        overlap = timedelta(hours=settings.intraday_price_overlap_hours)
+
+        metrics = await self._ingestion_scheduler.run(
+            "intraday_prices_full" if full_refresh else "intraday_prices",
+            securities,
+            lambda security: self._ingest_security_intraday_prices(
+                security,
+                incremental_start(watermarks.get(security.id), window_start, overlap),
+                to_datetime,
+                on_saved,
+            ),
+            cost=settings.eodhd_intraday_request_cost,
         )
 
-        success_count = sum(1 for result in results if result)
-        failure_count = sum(1 for result in results if not result)
+        return {"success": metrics.succeeded, "failure": metrics.failed}
 
-        return {"success": success_count, "failure": failure_count}
+    async def maintain_intraday_price_storage(self) -> dict[str, int]:
+        """Create upcoming intraday partitions and downsample expired bars.
+
+        Returns a dict containing 'created' and 'dropped' partition counts.
+        """
+        today = datetime.now(UTC).date()
+        created = await self._intraday_price_repository.create_intraday_partitions(
+            upcoming_months(today, settings.intraday_partition_months_ahead)
+        )
+
+        # Cut at midnight UTC so no 4-hour bucket is split
+        cutoff = datetime.combine(
+            today - timedelta(days=settings.intraday_price_retention_days),
+            time.min,
+            tzinfo=UTC,
+        )
+        dropped = await self._intraday_price_repository.downsample_intraday_prices(
+            cutoff
+        )
+        return {"created": len(created), "dropped": dropped}
 
     async def fetch_and_save_intraday_prices(
         self,
@@ -287,7 +493,7 @@ class MarketService:
             from_date = date(2000, 1, 3)
             to_date = datetime.now(UTC).date()
 
-            prices = self._gateway.get_prices(
+            rows = await self._async_gateway.get_price_rows(
                 security.id,
                 security.symbol,
                 security.exchange,
@@ -295,12 +501,11 @@ class MarketService:
                 to_date=to_date,
             )
 
-            if prices:
-                price_schemas = [PriceSchema.from_historical_price(p) for p in prices]
-                await self._price_repository.save_prices(price_schemas)
+            if rows:
+                await self._price_repository.save_price_rows(rows)
                 logger.info(
                     "Fetched and saved %d prices for security %s",
-                    len(prices),
+                    len(rows),
                     security.symbol,
                 )
                 return True
@@ -318,4 +523,6 @@ async def market_service_factory(container: Container) -> MarketService:
         price_repository=await container.aget(PriceRepository),
         security_repository=await container.aget(SecurityRepository),
         intraday_price_repository=await container.aget(IntradayPriceRepository),
+        ingestion_scheduler=await container.aget(IngestionScheduler),
+        async_gateway=await container.aget(AsyncMarketGateway),
     )
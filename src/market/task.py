@@ -1,23 +1,28 @@
 import asyncio
 import logging
 from datetime import UTC, datetime
+from typing import Self
 
 from huey import crontab
-from svcs import Container
+from svcs import Container, Registry
 
+from src.account.schema import AccountSchema
 from src.account.service.account import AccountService
 from src.account.service.position import PositionService
+from src.config.settings import settings
 from src.core.context import get_request_id, request_id_ctx_var, set_request_id
 from src.market.ai_service import AIService
 from src.market.alert_service import AlertEvaluationService
+from src.market.api_types import SecurityId
 from src.market.repository import (
     IntradayPriceRepository,
     PriceAlertRepository,
     SecurityNoteRepository,
 )
-from src.market.service import MarketService
-from src.worker import huey
-from src.ws.api_types import AccountTotalsUpdatedMessage
+from src.market.schema import AlertForEvaluation
+from src.market.service import MarketService, PricesSavedHook
+from src.worker import huey, worker_runtime
+from src.ws.api_types import AccountTotalsUpdatedMessage, SecurityPriceUpdatedMessage
 from src.ws.manager import ws_manager
 
 logger = logging.getLogger(__name__)
@@ -29,7 +34,7 @@ def generate_note_title_task(note_id: int, request_id: str | None = None) -> Non
     if request_id is None:
         request_id = get_request_id()
 
-    asyncio.run(_generate_note_title(note_id, request_id=request_id))
+    worker_runtime.submit(_generate_note_title(note_id, request_id=request_id))
 
 
 async def _generate_note_title(note_id: int, request_id: str | None = None) -> None:
@@ -58,14 +63,94 @@ async def _generate_note_title(note_id: int, request_id: str | None = None) -> N
             request_id_ctx_var.reset(req_token)
 
 
+class _AlertEvaluationRun:
+    """Run-scoped collector of the alerted securities saved by an ingestion run.
+
+    Saving prices only records the security, its alerts are evaluated once the
+    run ends and the triggered ones go out in a single digest dispatch, so a
+    user gets one email per run however many of their securities moved. The
+    alert latency is therefore bounded by the run duration rather than by the
+    save of the security's prices.
+    """
+
+    def __init__(
+        self,
+        alert_service: AlertEvaluationService | None,
+        alerted: set[SecurityId],
+    ) -> None:
+        self._alert_service = alert_service
+        self._alerted = alerted
+        self._saved: set[SecurityId] = set()
+
+    @classmethod
+    async def start(cls, svcs_container: Container) -> Self:
+        """Load the securities with active alerts, the only ones collected."""
+        try:
+            alert_service: AlertEvaluationService = await svcs_container.aget(
+                AlertEvaluationService
+            )
+            alerted = await alert_service.get_alerted_security_ids()
+        except Exception:
+            logger.exception("Failed to load alerted securities, alerts not evaluated")
+            return cls(None, set())
+        return cls(alert_service, alerted)
+
+    def on_saved(self, security_id: SecurityId) -> None:
+        if security_id in self._alerted:
+            self._saved.add(security_id)
+
+    async def dispatch(self) -> int:
+        """Evaluate the collected securities, returning the enqueued alert count."""
+        if self._alert_service is None or not self._saved:
+            return 0
+        run_ts = datetime.now(UTC)
+        try:
+            triggered = await self._alert_service.evaluate_securities(list(self._saved))
+        except Exception:
+            logger.exception(
+                "Failed to evaluate alerts of %d securities", len(self._saved)
+            )
+            return 0
+        return _enqueue_alert_email_dispatch(triggered, run_ts)
+
+
+async def _price_subscription_hook() -> PricesSavedHook:
+    """Build the ingestion hook enqueuing a live price push per saved security.
+
+    Only securities with WebSocket subscribers somewhere get a push, they are
+    loaded once per run.
+    """
+    subscribed = await ws_manager.get_subscribed_security_ids()
+
+    def on_saved(security_id: SecurityId) -> None:
+        if security_id not in subscribed:
+            return
+        try:
+            push_security_price_task(security_id)
+        except Exception:
+            logger.exception(
+                "Failed to enqueue price push for security %s", security_id
+            )
+
+    return on_saved
+
+
+def _chain_hooks(*hooks: PricesSavedHook) -> PricesSavedHook:
+    def on_saved(security_id: SecurityId) -> None:
+        for hook in hooks:
+            hook(security_id)
+
+    return on_saved
+
+
 @huey.periodic_task(crontab(hour="0", minute="0"))
 def daily_price_update() -> None:
     """Huey periodic task to run daily price updates at midnight.
 
     Runs in the huey-worker process via thread workers.
-    Uses asyncio.run() to execute the async business logic.
+    Runs the async business logic on the worker thread's event loop.
     """
-    asyncio.run(_daily_price_update())
+    worker_runtime.submit(_daily_price_update())
 
 
 async def _daily_price_update() -> None:
@@ -77,7 +162,10 @@ async def _daily_price_update() -> None:
         market_service: MarketService = await svcs_container.aget(MarketService)
 
         logger.info("Starting daily price update for all active securities...")
-        result = await market_service.update_daily_prices_for_all_securities()
+        alert_run = await _AlertEvaluationRun.start(svcs_container)
+        result = await market_service.update_daily_prices_for_all_securities(
+            on_saved=alert_run.on_saved
+        )
 
         success = result.get("success", 0)
         failure = result.get("failure", 0)
@@ -87,6 +175,73 @@ async def _daily_price_update() -> None:
             success,
             failure,
         )
+        logger.info(
+            "Price alerts enqueued for dispatch: %d", await alert_run.dispatch()
+        )
+
+
+@huey.periodic_task(crontab(day_of_week="0", hour="2", minute="30"))
+def weekly_full_price_refresh() -> None:
+    """Huey periodic task re-fetching the full daily and intraday windows.
+
+    The daily and hourly updates only fetch from each security's watermark, this
+    weekly run catches revisions older than their overlap.
+    """
+    worker_runtime.submit(_weekly_full_price_refresh())
+
+
+async def _weekly_full_price_refresh() -> None:
+    if huey.svcs_registry is None:
+        msg = "Worker registry not initialized"
+        raise RuntimeError(msg)
+
+    async with Container(huey.svcs_registry) as svcs_container:
+        market_service: MarketService = await svcs_container.aget(MarketService)
+
+        logger.info("Starting weekly full price refresh for all active securities...")
+        daily = await market_service.update_daily_prices_for_all_securities(
+            full_refresh=True
+        )
+        intraday = await market_service.update_intraday_prices_for_all_securities(
+            full_refresh=True
+        )
+
+        logger.info(
+            "Weekly full price refresh completed. Daily: %s updated, %s failed | "
+            "Intraday: %s updated, %s failed",
+            daily.get("success", 0),
+            daily.get("failure", 0),
+            intraday.get("success", 0),
+            intraday.get("failure", 0),
+        )
+
+
+@huey.periodic_task(crontab(hour="3", minute="15"))
+def intraday_price_storage_maintenance() -> None:
+    """Huey periodic task maintaining the partitioned intraday price storage.
+
+    Creates the monthly partitions ahead of time and rolls expired 1-hour bars
+    into 4-hour bars, dropping their partitions.
+    """
+    worker_runtime.submit(_intraday_price_storage_maintenance())
+
+
+async def _intraday_price_storage_maintenance() -> None:
+    if huey.svcs_registry is None:
+        msg = "Worker registry not initialized"
+        raise RuntimeError(msg)
+
+    async with Container(huey.svcs_registry) as svcs_container:
+        market_service: MarketService = await svcs_container.aget(MarketService)
+
+        result = await market_service.maintain_intraday_price_storage()
+
+        logger.info(
+            "Intraday price storage maintenance completed. Partitions created: %s | "
+            "Partitions rolled up and dropped: %s",
+            result.get("created", 0),
+            result.get("dropped", 0),
+        )
 
 
 @huey.periodic_task(crontab(minute="0"))
@@ -94,9 +249,9 @@ def hourly_intraday_price_update() -> None:
     """Huey periodic task to run hourly intraday price updates.
 
     Runs in the huey-worker process via thread workers.
-    Uses asyncio.run() to execute the async business logic.
+    Runs the async business logic on the worker thread's event loop.
     """
-    asyncio.run(_hourly_intraday_price_update())
+    worker_runtime.submit(_hourly_intraday_price_update())
 
 
 async def _hourly_intraday_price_update() -> None:
@@ -110,7 +265,16 @@ async def _hourly_intraday_price_update() -> None:
         logger.info(
             "Starting hourly intraday price update for all active securities..."
         )
-        result = await market_service.update_intraday_prices_for_all_securities()
+        started_at = datetime.now(UTC)
+        # Subscribers get the new price per security as soon as its bars are
+        # stored, alerts are evaluated once the run ends
+        alert_run = await _AlertEvaluationRun.start(svcs_container)
+        result = await market_service.update_intraday_prices_for_all_securities(
+            on_saved=_chain_hooks(
+                alert_run.on_saved,
+                await _price_subscription_hook(),
+            )
+        )
 
         success = result.get("success", 0)
         failure = result.get("failure", 0)
@@ -121,50 +285,91 @@ async def _hourly_intraday_price_update() -> None:
             success,
             failure,
         )
+        logger.info(
+            "Price alerts enqueued for dispatch: %d", await alert_run.dispatch()
+        )
 
-        account_service: AccountService = await svcs_container.aget(AccountService)
-        position_service: PositionService = await svcs_container.aget(PositionService)
+        intraday_repo: IntradayPriceRepository = await svcs_container.aget(
+            IntradayPriceRepository
+        )
+        moved_security_ids = await intraday_repo.get_moved_security_ids(started_at)
+        pushed = await _push_account_totals(svcs_container, moved_security_ids)
+        logger.info(
+            "Account totals pushed for %d accounts holding %d moved securities",
+            pushed,
+            len(moved_security_ids),
+        )
 
-        accounts = await account_service.get_all_accounts()
-        for account in accounts:
-            if not account.is_active:
-                continue
-            try:
-                totals = await position_service.get_total_for_account(
-                    account.id, account.currency
-                )
-                msg = AccountTotalsUpdatedMessage(
-                    account_id=account.id,
-                    totals=totals,
-                )
-                await ws_manager.send_personal_message(
-                    msg.model_dump(mode="json"), account.user_id
-                )
-            except Exception:
-                logger.exception(
-                    "Failed to update totals and send WS message for account %s",
-                    account.id,
+
+async def _push_account_totals(
+    svcs_container: Container, security_ids: list[SecurityId]
+) -> int:
+    """Push fresh totals of the active accounts holding the given securities.
+
+    Accounts are streamed in batches, the totals of the accounts of online
+    users in a batch are computed concurrently, each on its own container and
+    database session.
+    """
+    if not security_ids or huey.svcs_registry is None:
+        return 0
+
+    account_service: AccountService = await svcs_container.aget(AccountService)
+    pushed = 0
+    # Users with several accounts get their totals in one frame per window
+    async with ws_manager.coalescing():
+        async for accounts in account_service.stream_active_accounts_holding(
+            security_ids, settings.ws_totals_push_batch_size
+        ):
+            # Nobody would receive the totals of users not connected anywhere
+            online = await ws_manager.is_online(account.user_id for account in accounts)
+            results = await asyncio.gather(
+                *(
+                    _push_account_total(huey.svcs_registry, account)
+                    for account in accounts
+                    if online[account.user_id]
                 )
+            )
+            pushed += sum(results)
+    return pushed
 
-        # Enqueue Stage 2: price alert evaluation (isolated — failure doesn't abort)
-        if huey.svcs_registry is not None:
-            try:
-                check_and_dispatch_price_alerts()
-            except Exception:
-                logger.exception("Failed to enqueue check_and_dispatch_price_alerts")
+
+async def _push_account_total(registry: Registry, account: AccountSchema) -> bool:
+    account_id = account.id
+    try:
+        async with Container(registry) as svcs_container:
+            position_service: PositionService = await svcs_container.aget(
+                PositionService
+            )
+            totals = await position_service.get_total_for_account(
+                account_id, account.currency
+            )
+        msg = AccountTotalsUpdatedMessage(account_id=account_id, totals=totals)
+        await ws_manager.send_personal_message(
+            msg.model_dump(mode="json"), account.user_id
+        )
+    except Exception:
+        logger.exception(
+            "Failed to update totals and send WS message for account %s", account_id
+        )
+        return False
+    return True
 
 
 @huey.task()
-def check_and_dispatch_price_alerts() -> None:
+def check_and_dispatch_price_alerts(changed_since: datetime | None = None) -> None:
     """Stage 2: Evaluate all active price alerts and dispatch emails for triggered ones.
 
-    Called at the end of the hourly intraday price update (Stage 1).
-    Delegates evaluation to AlertEvaluationService.
+    Ingestion evaluates the alerts of the securities it updated once per run,
+    this sweep remains for manual runs. Delegates evaluation to AlertEvaluationService.
+    With changed_since only the securities whose price changed since then are
+    evaluated.
     """
-    asyncio.run(_check_and_dispatch_price_alerts())
+    worker_runtime.submit(_check_and_dispatch_price_alerts(changed_since))
 
 
-async def _check_and_dispatch_price_alerts() -> None:
+async def _check_and_dispatch_price_alerts(
+    changed_since: datetime | None = None,
+) -> None:
     if huey.svcs_registry is None:
         return
 
@@ -174,6 +379,18 @@ async def _check_and_dispatch_price_alerts() -> None:
         alert_service: AlertEvaluationService = await svcs_container.aget(
             AlertEvaluationService
         )
+
+        if changed_since is not None:
+            triggered = await alert_service.evaluate_changed(changed_since)
+            enqueued = _enqueue_alert_email_dispatch(triggered, run_ts)
+            logger.info(
+                "Price alert evaluation of changed prices complete. "
+                "triggered=%d enqueued=%d",
+                len(triggered),
+                enqueued,
+            )
+            return
+
         alert_repo: PriceAlertRepository = await svcs_container.aget(
             PriceAlertRepository
         )
@@ -189,25 +406,16 @@ async def _check_and_dispatch_price_alerts() -> None:
 
         logger.info("Evaluating %d active price alert(s).", len(active_alerts))
 
-        # Fetch latest intraday close for all securities (single query)
-        latest_prices = await intraday_repo.get_latest_intraday_close_by_security()
+        # Latest intraday close of the alerted securities only (single query)
+        latest_prices = await intraday_repo.get_latest_intraday_close(
+            {alert.security_id for alert in active_alerts}
+        )
 
         # Delegate evaluation to the service
         triggered_alerts = alert_service.evaluate(active_alerts, latest_prices)
 
         triggered_count = len(triggered_alerts)
-        enqueued_count = 0
-        for alert in triggered_alerts:
-            try:
-                # Enqueue Stage 3 email dispatch
-                alert_email_dispatch_task(alert.alert_id, run_ts)
-                enqueued_count += 1
-            except Exception:
-                logger.exception(
-                    "Failed to enqueue alert email dispatch for alert %d",
-                    alert.alert_id,
-                )
-                continue
+        enqueued_count = _enqueue_alert_email_dispatch(triggered_alerts, run_ts)
 
         logger.info(
             "Price alert evaluation complete. evaluated=%d triggered=%d enqueued=%d",
@@ -217,14 +425,80 @@ async def _check_and_dispatch_price_alerts() -> None:
         )
 
 
+@huey.task()
+def push_security_price_task(security_id: SecurityId) -> None:
+    """Push the latest intraday close of a security to its live subscribers.
+
+    Enqueued by the ingestion hook, only for securities with subscribers.
+    """
+    worker_runtime.submit(_push_security_price(security_id))
+
+
+async def _push_security_price(security_id: SecurityId) -> None:
+    if huey.svcs_registry is None:
+        return
+
+    async with Container(huey.svcs_registry) as svcs_container:
+        intraday_repo: IntradayPriceRepository = await svcs_container.aget(
+            IntradayPriceRepository
+        )
+        closes = await intraday_repo.get_latest_intraday_close([security_id])
+
+    if security_id not in closes:
+        return
+    msg = SecurityPriceUpdatedMessage(
+        security_id=security_id, close=closes[security_id]
+    )
+    await ws_manager.send_security_message(msg.model_dump(mode="json"), security_id)
+
+
+def _enqueue_alert_email_dispatch(
+    alerts: list[AlertForEvaluation], run_ts: datetime
+) -> int:
+    """Enqueue one Stage 3 digest dispatch, returning the enqueued alert count."""
+    if not alerts:
+        return 0
+    try:
+        alert_digest_dispatch_task([alert.alert_id for alert in alerts], run_ts)
+    except Exception:
+        logger.exception(
+            "Failed to enqueue alert digest dispatch for %d alerts", len(alerts)
+        )
+        return 0
+    return len(alerts)
+
+
+@huey.task(retries=3)
+def alert_digest_dispatch_task(alert_ids: list[int], run_ts: datetime) -> None:
+    """Stage 3: Send one digest email per user for triggered price alerts.
+
+    Delegates to AlertEvaluationService.dispatch_alert_digests, which claims the
+    alerts and releases those not sent, so a retry only resends the failed ones.
+    retries=3: transient SMTP/DB failures are retried before giving up.
+    """
+    worker_runtime.submit(_alert_digest_dispatch(alert_ids, run_ts))
+
+
+async def _alert_digest_dispatch(alert_ids: list[int], run_ts: datetime) -> None:
+    if huey.svcs_registry is None:
+        return
+
+    async with Container(huey.svcs_registry) as svcs_container:
+        alert_service: AlertEvaluationService = await svcs_container.aget(
+            AlertEvaluationService
+        )
+        await alert_service.dispatch_alert_digests(alert_ids, run_ts)
+
+
 @huey.task(retries=3)
 def alert_email_dispatch_task(alert_id: int, run_ts: datetime) -> None:
     """Stage 3: Send email for a triggered price alert, then mark as triggered.
 
+    Superseded by alert_digest_dispatch_task, kept for tasks already queued.
     Delegates to AlertEvaluationService.dispatch_alert_email.
     retries=3: transient SMTP/DB failures are retried before giving up.
     """
-    asyncio.run(_alert_email_dispatch(alert_id, run_ts))
+    worker_runtime.submit(_alert_email_dispatch(alert_id, run_ts))
 
 
 async def _alert_email_dispatch(alert_id: int, run_ts: datetime) -> None:
@@ -9,6 +9,7 @@ from uuid import UUID
 import pandas as pd
 
 from src.market.api_types import (
+    BulkLastDayPrice,
     EodhdSearchResult,
     HistoricalPrice,
     IntradayHistoricalPrice,
@@ -19,6 +20,13 @@ from src.market.schema import SecuritySchema
 
 MAX_INTRADAY_STEPS = 10000
 MARKET_CLOSE_HOUR = 16
+SATURDAY = 5
+
+# Tickers returned by the bulk end-of-day stub, per exchange
+BULK_TICKERS = {
+    "US": ["AAPL", "MSFT", "NFLX", "GOOGL", "TSLA", "AMZN"],
+    "TO": ["RY", "XYR", "RYT", "TD"],
+}
 
 
 class StubEodhdAPIClient:
@@ -91,6 +99,31 @@ class StubEodhdAPIClient:
 
         return prices
 
+    def get_eod_splits_dividends_data(
+        self,
+        country: str = "US",
+        type: str | None = None,  # noqa: A002
+        date: str | None = None,
+        symbols: str | None = None,
+        filter: str | None = None,  # noqa: A002
+    ) -> list[dict[str, Any]]:
+        """Get bulk end-of-day data for every ticker of an exchange."""
+        _ = type, symbols, filter  # Unused in stub mode
+        if date is not None:
+            bulk_date = datetime.fromisoformat(date).date()
+        else:
+            bulk_date = datetime.now(tz=UTC).date() - timedelta(days=1)
+            while bulk_date.weekday() >= SATURDAY:
+                bulk_date -= timedelta(days=1)
+
+        rows = []
+        for code in BULK_TICKERS.get(country, []):
+            price = self._generate_price_data(
+                f"{code}.{country}", bulk_date, bulk_date
+            )[0]
+            rows.append({"code": code, "exchange_short_name": country, **price})
+        return rows
+
     def get_intraday_historical_data(
         self,
         symbol: str,
@@ -288,6 +321,20 @@ class StubEodhdGateway(MarketGateway):
 
         return prices
 
+    def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        """Get end-of-day prices of every ticker on an exchange."""
+        data = self._client.get_eod_splits_dividends_data(
+            country=exchange, date=date.isoformat() if date else None
+        )
+        return [
+            BulkLastDayPrice.model_validate(
+                {**row, "exchange": row["exchange_short_name"]}
+            )
+            for row in data
+        ]
+
     def get_intraday_prices(  # noqa: PLR0913, PLR0917
         self,
         security_id: UUID,
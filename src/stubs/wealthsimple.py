@@ -48,9 +48,10 @@ class StubWealthsimpleAPI:
     def get_accounts(
         self,
         open_only: bool = True,  # noqa: FBT001, FBT002
-        _use_cache: bool = True,  # noqa: FBT001, FBT002
+        use_cache: bool = True,  # noqa: FBT001, FBT002
     ) -> list[dict[str, Any]]:
         """Get Wealthsimple accounts."""
+        _ = use_cache  # Stub data is never cached
         accounts = [
             {
                 "id": "acc-tfsa-001",
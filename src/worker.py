@@ -1,13 +1,17 @@
+import threading
+
 from huey import MemoryHuey, RedisHuey
 from huey_dashboard import init_worker_signals
-from sqlalchemy.pool import NullPool
-from svcs import Registry
+from svcs import Container, Registry
 
 from src.config.settings import settings
+from src.core.runtime import WorkerRuntime
 
 
 class HueyWithRegistry:
     svcs_registry: Registry | None = None
+    # Worker threads started and not yet shut down, sharing the registry
+    worker_threads: int = 0
 
 
 class RedisHueyWithRegistry(RedisHuey, HueyWithRegistry):
@@ -23,37 +27,70 @@ if settings.environment == "test":
 else:
     huey = RedisHueyWithRegistry("retail-portfolio", url=settings.redis_url)
 
+# Tasks run their coroutines on the long-lived event loop of their worker thread
+worker_runtime = WorkerRuntime()
+_worker_services_lock = threading.Lock()
+
 
 @huey.on_startup()
 def setup_worker_services():
-    from src.config.database import DatabaseSessionManager  # noqa: PLC0415
+    """Build the services shared by all worker threads, on the first thread."""
+    from src.config.database import LoopScopedSessionManager  # noqa: PLC0415
     from src.config.logging import init_logging  # noqa: PLC0415
     from src.config.services import register_services  # noqa: PLC0415
-
-    init_logging()
-
-    init_worker_signals(
-        huey=huey,  # ty: ignore[invalid-argument-type]
-        db_url=settings.database_url,
-        redis_url=settings.redis_url,
-    )
-
-    # Use NullPool for the worker to avoid "operation in progress" errors
-    # during asyncio.run() task cycles.
-    worker_sessionmanager = DatabaseSessionManager(
-        str(settings.database_url),
-        {"echo": settings.echo_sql, "poolclass": NullPool},
-    )
-
-    registry = Registry()
-    register_services(registry, worker_sessionmanager)
-    huey.svcs_registry = registry
+    from src.core.email import EmailService  # noqa: PLC0415
+    from src.core.redis import redis_pool  # noqa: PLC0415
+    from src.market.gateway import AsyncMarketGateway  # noqa: PLC0415
+
+    with _worker_services_lock:
+        huey.worker_threads += 1
+        if huey.svcs_registry is not None:
+            return
+
+        init_logging()
+
+        init_worker_signals(
+            huey=huey,  # ty: ignore[invalid-argument-type]
+            db_url=settings.database_url,
+            redis_url=settings.redis_url,
+        )
+
+        # Each worker thread loop gets its own pool, reused across tasks
+        worker_sessionmanager = LoopScopedSessionManager(
+            str(settings.database_url),
+            {
+                "echo": settings.echo_sql,
+                "pool_size": settings.worker_db_pool_size,
+                "max_overflow": settings.worker_db_max_overflow,
+                "pool_pre_ping": True,
+            },
+        )
+        worker_runtime.on_close(worker_sessionmanager.close)
+        # Likewise one Redis pool per worker thread loop
+        worker_runtime.on_close(redis_pool.aclose)
+
+        registry = Registry()
+        register_services(registry, worker_sessionmanager)
+        # The provider HTTP client and SMTP connections are kept per loop too,
+        # closing the registry only releases those of the last thread
+        with Container(registry) as services:
+            worker_runtime.on_close(services.get(AsyncMarketGateway).aclose)
+            worker_runtime.on_close(services.get(EmailService).aclose)
+        huey.svcs_registry = registry
 
 
 @huey.on_shutdown()
 def teardown_worker_services():
-    if huey.svcs_registry is not None:
-        huey.svcs_registry.close()
+    """Close the thread's event loop, and the registry with the last thread."""
+    with _worker_services_lock:
+        huey.worker_threads -= 1
+        registry = huey.svcs_registry if huey.worker_threads == 0 else None
+        if registry is not None:
+            huey.svcs_registry = None
+
+    if registry is not None:
+        worker_runtime.submit(registry.aclose())
+    worker_runtime.close()
 
 
 # Import tasks to ensure they are registered with Huey
@@ -1,8 +1,11 @@
+from decimal import Decimal
 from enum import StrEnum
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from src.account.api_types import AccountId, AccountTotals
+from src.market.api_types import SecurityId
 
 
 class WsEventType(StrEnum):
@@ -10,6 +13,15 @@ class WsEventType(StrEnum):
     ACCOUNT_SYNC_FINISHED = "sync_finished"
     ACCOUNT_SYNC_FAILED = "sync_failed"
     ACCOUNT_TOTALS_UPDATED = "account_totals_updated"
+    # Server heartbeat, answered by the client with a pong
+    PING = "ping"
+    PONG = "pong"
+    # Several messages coalesced into one frame
+    BATCH = "batch"
+    # Live prices of the securities a client subscribed to
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
+    SECURITY_PRICE_UPDATED = "security_price_updated"
 
 
 class WsMessage(BaseModel):
@@ -24,3 +36,16 @@ class AccountTotalsUpdatedMessage(WsMessage):
     type: WsEventType = WsEventType.ACCOUNT_TOTALS_UPDATED
     account_id: AccountId
     totals: AccountTotals
+
+
+class SecuritySubscriptionMessage(WsMessage):
+    """Sent by the client to (un)subscribe to live prices of securities."""
+
+    type: Literal[WsEventType.SUBSCRIBE, WsEventType.UNSUBSCRIBE]
+    security_ids: list[SecurityId] = Field(max_length=500)
+
+
+class SecurityPriceUpdatedMessage(WsMessage):
+    type: WsEventType = WsEventType.SECURITY_PRICE_UPDATED
+    security_id: SecurityId
+    close: Decimal
@@ -0,0 +1,43 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from src.ws.api_types import WsEventType
+
+
+def _flatten(messages: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    for message in messages:
+        if message.get("type") == WsEventType.BATCH:
+            yield from message["messages"]
+        else:
+            yield message
+
+
+# Messages superseded by a later one of the same type, by their subject field
+_LATEST_ONLY: dict[str, str] = {
+    WsEventType.ACCOUNT_TOTALS_UPDATED: "account_id",
+    WsEventType.SECURITY_PRICE_UPDATED: "security_id",
+}
+
+
+def coalesce(messages: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Flatten batches and keep only the latest update of each account or security.
+
+    Totals and price updates are superseded by later ones for the same account
+    or security, every other event is kept in order.
+    """
+    latest: dict[object, dict[str, Any]] = {}
+    for position, message in enumerate(_flatten(messages)):
+        key: object = position
+        subject = _LATEST_ONLY.get(message.get("type", ""))
+        if subject is not None:
+            key = (message["type"], message[subject])
+            latest.pop(key, None)
+        latest[key] = message
+    return list(latest.values())
+
+
+def to_frame(messages: list[dict[str, Any]]) -> dict[str, Any]:
+    """A single message as is, several as one batch frame."""
+    if len(messages) == 1:
+        return messages[0]
+    return {"type": WsEventType.BATCH, "messages": messages}
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from src.auth.api_types import UserId
+from src.market.api_types import SecurityId
+from src.ws.api_types import WsEventType
+from src.ws.batching import coalesce, to_frame
+
+logger = logging.getLogger(__name__)
+
+# Close codes of server-side evictions
+WS_GOING_AWAY = 1001
+WS_POLICY_VIOLATION = 1008
+WS_TRY_AGAIN_LATER = 1013
+
+
+class ClientConnection:
+    """A client WebSocket with its own bounded outbound queue and writer task.
+
+    Messages are queued without waiting, so a slow or stuck client never
+    delays delivery to the others. When the queue is full the client is a slow
+    consumer: either its oldest message is dropped or it is disconnected. A
+    heartbeat pings the client and evicts it when nothing was received from it
+    within the ping timeout.
+
+    The writer coalesces the messages queued within the coalesce window and
+    writes them as one frame.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        websocket: WebSocket,
+        user_id: UserId,
+        *,
+        queue_size: int,
+        ping_interval: float,
+        ping_timeout: float,
+        drop_oldest_on_overflow: bool,
+        coalesce_window: float,
+        on_evicted: Callable[[ClientConnection], Awaitable[None]],
+    ) -> None:
+        self.websocket = websocket
+        self.user_id = user_id
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.drop_oldest_on_overflow = drop_oldest_on_overflow
+        self.coalesce_window = coalesce_window
+        self._on_evicted = on_evicted
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: list[asyncio.Task[None]] = []
+        self._eviction: asyncio.Task[None] | None = None
+        self._closed = False
+        self.last_seen = time.monotonic()
+        # Securities whose live prices the client subscribed to
+        self.security_ids: set[SecurityId] = set()
+
+    def start(self) -> None:
+        """Start the writer and heartbeat tasks."""
+        self._tasks = [
+            asyncio.create_task(self._write()),
+            asyncio.create_task(self._heartbeat()),
+        ]
+
+    def send(self, message: dict[str, Any]) -> None:
+        """Queue a message for the client without waiting for it."""
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            if self.drop_oldest_on_overflow:
+                self._queue.get_nowait()
+                self._queue.put_nowait(message)
+                logger.warning(
+                    "Outbound queue full for user %s, dropped oldest message",
+                    self.user_id,
+                )
+            elif self._eviction is None:
+                self._eviction = asyncio.create_task(
+                    self._evict(WS_TRY_AGAIN_LATER, "outbound queue full")
+                )
+
+    def touch(self) -> None:
+        """Record that the client is alive (any frame received from it)."""
+        self.last_seen = time.monotonic()
+
+    async def _write(self) -> None:
+        while True:
+            messages = [await self._queue.get()]
+            if self.coalesce_window > 0:
+                await asyncio.sleep(self.coalesce_window)
+            while not self._queue.empty():
+                messages.append(self._queue.get_nowait())
+            try:
+                await self.websocket.send_json(to_frame(coalesce(messages)))
+            except Exception:  # noqa: BLE001
+                await self._evict(WS_GOING_AWAY, "send failed")
+                return
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if time.monotonic() - self.last_seen > self.ping_timeout:
+                await self._evict(WS_POLICY_VIOLATION, "no pong within timeout")
+                return
+            self.send({"type": WsEventType.PING})
+
+    async def _evict(self, code: int, reason: str) -> None:
+        logger.warning("Evicting WebSocket of user %s: %s", self.user_id, reason)
+        await self.close(code)
+        await self._on_evicted(self)
+
+    async def close(self, code: int = WS_GOING_AWAY) -> None:
+        """Stop the connection's tasks and close the socket if still open."""
+        if self._closed:
+            return
+        self._closed = True
+
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.websocket.application_state == WebSocketState.CONNECTED:
+            with contextlib.suppress(Exception):
+                await self.websocket.close(code=code)
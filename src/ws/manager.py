@@ -2,65 +2,102 @@ import asyncio
 import contextlib
 import json
 import logging
-import threading
+import os
+import socket
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextvars import ContextVar
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
+from weakref import WeakKeyDictionary
 
 import redis.asyncio as aioredis
 from fastapi import WebSocket
-from starlette.websockets import WebSocketState
+from redis.commands.core import AsyncScript
 
 from src.auth.api_types import UserId
+from src.config.settings import settings
+from src.core.redis import RedisPool, redis_pool
+from src.market.api_types import SecurityId
+from src.ws.batching import coalesce, to_frame
+from src.ws.connection import ClientConnection
 
 logger = logging.getLogger(__name__)
 
 
+# Channel prefix of the per-process message channels
+_CHANNEL_PREFIX = "ws_messages:"
+
+# Publish a message on the channel of every process listed in a presence or
+# subscribers hash, in one round trip. Returns the number of receivers.
+_PUBLISH_TO_PRESENT_PROCESSES = """
+local receivers = 0
+for _, instance_id in ipairs(redis.call('HKEYS', KEYS[1])) do
+    receivers = receivers + redis.call('PUBLISH', ARGV[1] .. instance_id, ARGV[2])
+end
+return receivers
+"""
+
+
+# Messages buffered per user by the coalescing() block of the current context
+_outbox: ContextVar[dict[UserId, list[dict[str, Any]]] | None] = ContextVar(
+    "ws_outbox", default=None
+)
+
+
+# Sorted set of the securities with live price subscribers, scored by expiry
+_SUBSCRIBED_SECURITIES_KEY = "ws-price-subscribed"
+
+
+def _presence_key(user_id: UserId) -> str:
+    return f"ws-presence:{user_id}"
+
+
+def _subscribers_key(security_id: SecurityId) -> str:
+    return f"ws-price-subs:{security_id}"
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: dict[UserId, list[WebSocket]] = {}
-        self._clients: dict[asyncio.AbstractEventLoop, aioredis.Redis] = {}
+        self.active_connections: dict[UserId, list[ClientConnection]] = {}
+        # Local connections subscribed to the live prices of each security
+        self.subscriptions: dict[SecurityId, set[ClientConnection]] = {}
+        self._pool: RedisPool | None = None
+        # Publish script registered with each loop's client, sent by EVALSHA
+        self._publish_scripts: WeakKeyDictionary[aioredis.Redis, AsyncScript] = (
+            WeakKeyDictionary()
+        )
         self._pubsub_task: asyncio.Task | None = None
-        self._lock = threading.Lock()
+        self._presence_task: asyncio.Task | None = None
+        # Presence hash field of this process, unique across restarts
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        # Messages for this process's connections only are published here
+        self.channel = f"{_CHANNEL_PREFIX}{self.instance_id}"
 
     def get_redis_client(self) -> aioredis.Redis | None:
         """Get the Redis client for current running loop."""
+        if self._pool is None:
+            return None
         try:
-            current_loop = asyncio.get_running_loop()
+            return self._pool.client()
         except RuntimeError:
             return None
 
-        with self._lock:
-            return self._clients.get(current_loop)
+    def _publish_script(self, redis: aioredis.Redis) -> AsyncScript:
+        """The publish script of a client, registered on first use."""
+        script = self._publish_scripts.get(redis)
+        if script is None:
+            script = redis.register_script(_PUBLISH_TO_PRESENT_PROCESSES)
+            self._publish_scripts[redis] = script
+        return script
 
-    async def init_redis(self, redis_url: str, *, run_listener: bool = True):
-        """Initialize Redis connection for current event loop and optional listener."""
-        current_loop = asyncio.get_running_loop()
-
-        clients_to_close: list[aioredis.Redis] = []
-        with self._lock:
-            for loop in list(self._clients.keys()):
-                if loop.is_closed():
-                    client = self._clients.pop(loop, None)
-                    if client is not None:
-                        clients_to_close.append(client)
-
-        for client in clients_to_close:
-            try:
-                await client.aclose()
-            except Exception:
-                logger.debug(
-                    "Failed to close Redis client for closed loop", exc_info=True
-                )
-
-        with self._lock:
-            if current_loop not in self._clients:
-                self._clients[current_loop] = aioredis.from_url(
-                    redis_url, decode_responses=True
-                )
-                logger.info(
-                    "ConnectionManager Redis client initialized (loop: %s)",
-                    current_loop,
-                )
+    async def init_redis(
+        self, pool: RedisPool = redis_pool, *, run_listener: bool = True
+    ):
+        """Use the shared Redis pool and optionally start the listener."""
+        if self._pool is None:
+            self._pool = pool
+            logger.info("ConnectionManager attached to the Redis pool")
 
         if run_listener and (self._pubsub_task is None or self._pubsub_task.done()):
             if self._pubsub_task and self._pubsub_task.done():
@@ -70,26 +107,36 @@ class ConnectionManager:
             self._pubsub_task = asyncio.create_task(self._listen_for_messages())
             logger.info("ConnectionManager Pub/Sub listener started")
 
+        if run_listener and (self._presence_task is None or self._presence_task.done()):
+            self._presence_task = asyncio.create_task(self._heartbeat_presence())
+
     async def close(self):
-        """Close Redis connections and stop listening."""
-        if self._pubsub_task:
-            self._pubsub_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._pubsub_task
-            self._pubsub_task = None
+        """Stop listening and release this process's presence."""
+        for task in (self._pubsub_task, self._presence_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._pubsub_task = None
+        self._presence_task = None
 
-        with self._lock:
-            clients = list(self._clients.values())
-            self._clients.clear()
+        # Connections of this process are gone, don't wait for the TTL
+        if self.active_connections:
+            await self._clear_presence(list(self.active_connections))
+            connections = [
+                connection
+                for user_connections in self.active_connections.values()
+                for connection in user_connections
+            ]
+            await asyncio.gather(*(connection.close() for connection in connections))
+            self.active_connections.clear()
+        if self.subscriptions:
+            security_ids = list(self.subscriptions)
+            self.subscriptions.clear()
+            await self._write_subscriptions(security_ids)
 
-        for client in clients:
-            try:
-                await client.aclose()
-            except Exception:
-                logger.debug(
-                    "Failed to close Redis client during ConnectionManager.close",
-                    exc_info=True,
-                )
+        # The pool is shared, its owner closes it
+        self._pool = None
 
     async def _listen_for_messages(self):
         """Background task to listen for messages from Redis Pub/Sub."""
@@ -98,16 +145,21 @@ class ConnectionManager:
             return
 
         pubsub = redis.pubsub()
-        await pubsub.subscribe("ws_messages")
-        logger.debug("Subscribed to Redis channel 'ws_messages'")
+        await pubsub.subscribe(self.channel)
+        logger.debug("Subscribed to Redis channel '%s'", self.channel)
 
         try:
             async for message in pubsub.listen():
                 if message["type"] == "message":
                     try:
                         data = json.loads(message["data"])
-                        user_id = UUID(data["user_id"])
                         msg_payload = data["message"]
+                        if "security_id" in data:
+                            await self._send_to_subscribers(
+                                UUID(data["security_id"]), msg_payload
+                            )
+                            continue
+                        user_id = UUID(data["user_id"])
                         logger.debug(
                             "Received message from Redis for user %s: %s",
                             user_id,
@@ -118,7 +170,7 @@ class ConnectionManager:
                         logger.exception("Failed to process message from Redis")
         except asyncio.CancelledError:
             logger.debug("Redis Pub/Sub listener cancelled")
-            await pubsub.unsubscribe("ws_messages")
+            await pubsub.unsubscribe(self.channel)
             await pubsub.aclose()
         except Exception:
             logger.exception("Redis Pub/Sub listener encountered an error")
@@ -128,31 +180,219 @@ class ConnectionManager:
 
     async def connect(
         self, websocket: WebSocket, user_id: UserId, subprotocol: str | None = None
-    ):
+    ) -> ClientConnection:
         await websocket.accept(subprotocol=subprotocol)
+        connection = ClientConnection(
+            websocket,
+            user_id,
+            queue_size=settings.ws_outbound_queue_size,
+            ping_interval=settings.ws_ping_interval_seconds,
+            ping_timeout=settings.ws_ping_timeout_seconds,
+            drop_oldest_on_overflow=settings.ws_drop_oldest_on_overflow,
+            coalesce_window=settings.ws_coalesce_window_seconds,
+            on_evicted=self._on_evicted,
+        )
+        connection.start()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+        self.active_connections[user_id].append(connection)
         logger.info(
             "WebSocket connected for user %s. Total connections for user: %d",
             user_id,
             len(self.active_connections[user_id]),
         )
+        await self._write_presence([user_id])
+        return connection
 
-    def disconnect(self, websocket: WebSocket, user_id: UserId):
+    async def disconnect(self, websocket: WebSocket, user_id: UserId):
+        connections = self.active_connections.get(user_id, [])
+        connection = next((c for c in connections if c.websocket is websocket), None)
+        if connection is None:
+            return
+
+        connections.remove(connection)
+        if not connections:
+            del self.active_connections[user_id]
+        logger.info("WebSocket disconnected for user %s", user_id)
+        await connection.close()
+        await self.unsubscribe(connection, list(connection.security_ids))
         if user_id in self.active_connections:
+            await self._write_presence([user_id])
+        else:
+            await self._clear_presence([user_id])
+
+    async def _on_evicted(self, connection: ClientConnection) -> None:
+        await self.disconnect(connection.websocket, connection.user_id)
+
+    async def _write_presence(self, user_ids: list[UserId]) -> None:
+        """Publish this process's connection count of each user.
+
+        Presence is a hash per user mapping each process to its number of
+        connections. Every write refreshes the TTL, so the entries of a process
+        that died without cleaning up expire.
+        """
+        redis = self.get_redis_client()
+        if redis is None or not user_ids:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    key = _presence_key(user_id)
+                    count = len(self.active_connections.get(user_id, []))
+                    pipe.hset(key, self.instance_id, count)
+                    pipe.expire(key, settings.ws_presence_ttl_seconds)
+                await pipe.execute()
+        except Exception:
+            logger.exception("Failed to update WebSocket presence")
+
+    async def _clear_presence(self, user_ids: list[UserId]) -> None:
+        """Remove this process's presence entries of the users."""
+        redis = self.get_redis_client()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.hdel(_presence_key(user_id), self.instance_id)
+                await pipe.execute()
+        except Exception:
+            logger.exception("Failed to clear WebSocket presence")
+
+    async def _heartbeat_presence(self):
+        """Background task refreshing the presence and subscriptions of this process."""
+        while True:
+            await asyncio.sleep(settings.ws_presence_heartbeat_seconds)
+            await self._write_presence(list(self.active_connections))
+            await self._write_subscriptions(list(self.subscriptions))
+
+    async def subscribe(
+        self, connection: ClientConnection, security_ids: Iterable[SecurityId]
+    ) -> None:
+        """Subscribe a connection to the live prices of securities.
+
+        Subscriptions beyond the per-connection limit are ignored.
+        """
+        room = settings.ws_max_subscriptions_per_connection - len(
+            connection.security_ids
+        )
+        added = [
+            security_id
+            for security_id in dict.fromkeys(security_ids)
+            if security_id not in connection.security_ids
+        ][: max(room, 0)]
+        for security_id in added:
+            connection.security_ids.add(security_id)
+            self.subscriptions.setdefault(security_id, set()).add(connection)
+        await self._write_subscriptions(added)
+
+    async def unsubscribe(
+        self, connection: ClientConnection, security_ids: Iterable[SecurityId]
+    ) -> None:
+        """Remove a connection's subscriptions to the prices of securities."""
+        removed = [
+            security_id
+            for security_id in dict.fromkeys(security_ids)
+            if security_id in connection.security_ids
+        ]
+        for security_id in removed:
+            connection.security_ids.discard(security_id)
+            subscribers = self.subscriptions.get(security_id, set())
+            subscribers.discard(connection)
+            if not subscribers:
+                self.subscriptions.pop(security_id, None)
+        await self._write_subscriptions(removed)
+
+    async def _write_subscriptions(self, security_ids: list[SecurityId]) -> None:
+        """Publish this process's subscriber count of each security.
+
+        Like presence, each security has a hash mapping processes to their
+        number of subscribed connections, refreshed with a TTL. The securities
+        with subscribers are also indexed in a sorted set scored by expiry, so
+        ingestion can list them.
+        """
+        redis = self.get_redis_client()
+        if redis is None or not security_ids:
+            return
+        ttl = settings.ws_presence_ttl_seconds
+        expires_at = time.time() + ttl
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for security_id in security_ids:
+                    key = _subscribers_key(security_id)
+                    count = len(self.subscriptions.get(security_id, ()))
+                    if count:
+                        pipe.hset(key, self.instance_id, count)
+                        pipe.expire(key, ttl)
+                        pipe.zadd(
+                            _SUBSCRIBED_SECURITIES_KEY, {str(security_id): expires_at}
+                        )
+                    else:
+                        pipe.hdel(key, self.instance_id)
+                await pipe.execute()
+        except Exception:
+            logger.exception("Failed to update live price subscriptions")
+
+    async def get_subscribed_security_ids(self) -> set[SecurityId]:
+        """The securities with live price subscribers on any process.
+
+        Empty when Redis cannot be reached, prices are then not pushed.
+        """
+        redis = await self._get_or_init_redis()
+        if redis is None:
+            return set()
+        now = time.time()
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(_SUBSCRIBED_SECURITIES_KEY, "-inf", now)
+                pipe.zrangebyscore(_SUBSCRIBED_SECURITIES_KEY, now, "+inf")
+                _, security_ids = await pipe.execute()
+        except Exception:
+            logger.exception("Failed to read live price subscriptions")
+            return set()
+        return {UUID(security_id) for security_id in security_ids}
+
+    async def is_online(self, user_ids: Iterable[UserId]) -> dict[UserId, bool]:
+        """Whether each user has a WebSocket connection on any process.
+
+        When Redis cannot be reached every user is reported online, so callers
+        skipping offline users never drop messages because of it.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        redis = await self._get_or_init_redis()
+        if redis is None or not ids:
+            return dict.fromkeys(ids, True)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in ids:
+                    pipe.exists(_presence_key(user_id))
+                results = await pipe.execute()
+        except Exception:
+            logger.exception("Failed to read WebSocket presence")
+            return dict.fromkeys(ids, True)
+        return {
+            user_id: bool(exists) for user_id, exists in zip(ids, results, strict=True)
+        }
+
+    async def _get_or_init_redis(self) -> aioredis.Redis | None:
+        """The Redis client of the running loop, created without a listener."""
+        redis = self.get_redis_client()
+        if redis is None:
             try:
-                self.active_connections[user_id].remove(websocket)
-                if not self.active_connections[user_id]:
-                    del self.active_connections[user_id]
-                logger.info("WebSocket disconnected for user %s", user_id)
-            except ValueError:
-                pass
+                await self.init_redis(run_listener=False)
+            except Exception:
+                logger.exception("Failed to lazily initialize Redis")
+                return None
+            redis = self.get_redis_client()
+        return redis
 
     async def _send_to_local_connections(
         self, user_id: UserId, message: dict[str, Any]
     ):
-        """Send a message to local WebSocket connections for a user."""
+        """Queue a message on the local WebSocket connections of a user.
+
+        Each connection is written by its own task, nothing here waits on a
+        client.
+        """
         if user_id in self.active_connections:
             connections = self.active_connections[user_id]
             logger.debug(
@@ -161,30 +401,93 @@ class ConnectionManager:
                 user_id,
             )
             for connection in connections:
-                if connection.client_state == WebSocketState.CONNECTED:
-                    try:
-                        await connection.send_json(message)
-                    except Exception:
-                        logger.exception("Failed to send message to user %s", user_id)
+                connection.send(message)
         else:
             logger.debug("No local connections for user %s", user_id)
 
+    async def _send_to_subscribers(
+        self, security_id: SecurityId, message: dict[str, Any]
+    ):
+        """Queue a message on the local connections subscribed to a security."""
+        for connection in self.subscriptions.get(security_id, ()):
+            connection.send(message)
+
     async def send_personal_message(self, message: dict[str, Any], user_id: UserId):
-        """Publish a message to Redis Pub/Sub to be delivered by any process."""
-        redis = self.get_redis_client()
+        """Publish a message to the processes holding the user's connections.
+
+        The processes are looked up in the user's presence hash, each one only
+        receives messages for its own connections. A user without connections
+        costs no publish at all. Inside a coalescing() block the message is
+        buffered instead.
+        """
+        outbox = _outbox.get()
+        if outbox is not None:
+            outbox.setdefault(user_id, []).append(message)
+            return
+        await self._publish(message, user_id)
+
+    @contextlib.asynccontextmanager
+    async def coalescing(self) -> AsyncIterator[None]:
+        """Coalesce the messages sent within the block.
+
+        Every coalesce window, and when the block exits, the buffered messages
+        of each user are published as one frame. Only the latest totals update
+        of each account is kept.
+        """
+        if _outbox.get() is not None:
+            yield
+            return
+
+        outbox: dict[UserId, list[dict[str, Any]]] = {}
+        flusher = asyncio.create_task(self._flush_periodically(outbox))
+        token = _outbox.set(outbox)
+        try:
+            yield
+        finally:
+            _outbox.reset(token)
+            flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flusher
+            await self._flush(outbox)
+
+    async def _flush_periodically(
+        self, outbox: dict[UserId, list[dict[str, Any]]]
+    ) -> None:
+        while True:
+            await asyncio.sleep(settings.ws_coalesce_window_seconds)
+            await self._flush(outbox)
+
+    async def _flush(self, outbox: dict[UserId, list[dict[str, Any]]]) -> None:
+        pending = dict(outbox)
+        outbox.clear()
+        await asyncio.gather(
+            *(
+                self._publish(to_frame(coalesce(messages)), user_id)
+                for user_id, messages in pending.items()
+            )
+        )
+
+    async def send_security_message(
+        self, message: dict[str, Any], security_id: SecurityId
+    ) -> None:
+        """Publish a message to the processes with subscribers of a security."""
+        redis = await self._get_or_init_redis()
         if redis is None:
-            try:
-                from src.config.settings import settings  # noqa: PLC0415
+            await self._send_to_subscribers(security_id, message)
+            return
 
-                await self.init_redis(settings.redis_url, run_listener=False)
-                redis = self.get_redis_client()
-            except Exception:
-                logger.exception(
-                    "Failed to lazily initialize Redis in send_personal_message"
-                )
-                await self._send_to_local_connections(user_id, message)
-                return
+        payload = {"security_id": str(security_id), "message": message}
+        try:
+            await self._publish_script(redis)(
+                keys=[_subscribers_key(security_id)],
+                args=[_CHANNEL_PREFIX, json.dumps(payload)],
+            )
+        except Exception:
+            logger.exception("Failed to publish message to Redis: payload=%s", payload)
+            await self._send_to_subscribers(security_id, message)
 
+    async def _publish(self, message: dict[str, Any], user_id: UserId) -> None:
+        redis = await self._get_or_init_redis()
         payload = {
             "user_id": str(user_id),
             "message": message,
@@ -195,8 +498,13 @@ class ConnectionManager:
             return
 
         try:
-            logger.debug("Publishing to Redis 'ws_messages': payload=%s", payload)
-            await redis.publish("ws_messages", json.dumps(payload))
+            logger.debug("Publishing to Redis: payload=%s", payload)
+            receivers = await self._publish_script(redis)(
+                keys=[_presence_key(user_id)],
+                args=[_CHANNEL_PREFIX, json.dumps(payload)],
+            )
+            if not receivers:
+                logger.debug("No connected process for user %s", user_id)
         except Exception:
             logger.exception("Failed to publish message to Redis: payload=%s", payload)
             await self._send_to_local_connections(user_id, message)
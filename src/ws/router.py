@@ -4,37 +4,61 @@ import logging
 import uuid
 from uuid import UUID
 
-import redis.asyncio as aioredis
 import svcs
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from itsdangerous import URLSafeTimedSerializer
+from pydantic import ValidationError
 
 from src.auth.api import UserApi
 from src.config.settings import settings
 from src.core.context import request_id_ctx_var, set_request_id
+from src.core.redis import redis_pool
+from src.ws.api_types import SecuritySubscriptionMessage, WsEventType
+from src.ws.connection import ClientConnection
 from src.ws.manager import ws_manager
 
 logger = logging.getLogger(__name__)
 ws_router = APIRouter()
 
 
-async def _check_ticket_not_replayed(ticket: str, redis_url: str) -> bool:
+async def _check_ticket_not_replayed(ticket: str) -> bool:
     """Atomically check if a ticket has already been used and mark it as used.
 
     Returns True if the ticket is new (first use), False if it was already used.
     """
     ticket_hash = hashlib.sha256(ticket.encode()).hexdigest()
     key = f"ws-ticket-used:{ticket_hash}"
-    redis_client = aioredis.from_url(redis_url, decode_responses=True)
     try:
-        acquired = await redis_client.set(key, "1", nx=True, ex=30)
+        acquired = await redis_pool.client().set(key, "1", nx=True, ex=30)
     except Exception:
         logger.exception("Failed to check ticket replay status")
         return True
     else:
         return acquired is not None
-    finally:
-        await redis_client.aclose()
+
+
+async def _handle_client_message(connection: ClientConnection, text: str) -> None:
+    """Apply a live price (un)subscription, ignoring pongs and anything else."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return
+    if not isinstance(data, dict) or data.get("type") not in {
+        WsEventType.SUBSCRIBE,
+        WsEventType.UNSUBSCRIBE,
+    }:
+        return
+
+    try:
+        request = SecuritySubscriptionMessage.model_validate(data)
+    except ValidationError:
+        logger.debug("Ignoring invalid subscription message: %s", text)
+        return
+
+    if request.type == WsEventType.SUBSCRIBE:
+        await ws_manager.subscribe(connection, request.security_ids)
+    else:
+        await ws_manager.unsubscribe(connection, request.security_ids)
 
 
 @ws_router.websocket("/api/ws")
@@ -54,7 +78,7 @@ async def websocket_endpoint(
         user_id: UUID | None = None
 
         if ticket:
-            if not await _check_ticket_not_replayed(ticket, settings.redis_url):
+            if not await _check_ticket_not_replayed(ticket):
                 logger.warning("WebSocket ticket replay attempt detected")
                 await websocket.close(code=1008)
                 return
@@ -84,7 +108,7 @@ async def websocket_endpoint(
             return
 
         subprotocol = token if websocket.headers.get("sec-websocket-protocol") else None
-        await ws_manager.connect(
+        connection = await ws_manager.connect(
             websocket,
             user_id,
             subprotocol=subprotocol,
@@ -92,9 +116,16 @@ async def websocket_endpoint(
 
         try:
             while True:
-                # We just want to keep the connection alive
-                await websocket.receive_text()
+                # Pongs and any other client frame prove the connection alive
+                text = await websocket.receive_text()
+                connection.touch()
+                await _handle_client_message(connection, text)
         except WebSocketDisconnect:
-            ws_manager.disconnect(websocket, user_id)
+            pass
+        except RuntimeError:
+            # The socket was closed by the server, e.g. a slow consumer eviction
+            logger.debug("WebSocket of user %s closed by the server", user_id)
+        finally:
+            await ws_manager.disconnect(websocket, user_id)
     finally:
         request_id_ctx_var.reset(req_token)
@@ -0,0 +1,104 @@
+import sys
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select, text
+
+from src.commands.partition_market_prices import is_partitioned, main, partition_prices
+from src.market.model import PriceModel, SecurityModel
+from src.market.repository_sqlalchemy import SqlAlchemyPriceRepository
+from src.market.schema import SecuritySchema
+
+
+def _price_row(security_id: uuid.UUID, day: date, close: int):
+    return (
+        security_id,
+        day,
+        Decimal(10),
+        Decimal(12),
+        Decimal(9),
+        Decimal(close),
+        Decimal(close),
+        1000,
+    )
+
+
+@pytest.mark.anyio
+async def test_partition_prices_keeps_prices_and_upserts(db_session):
+    securities = [
+        SecurityModel(
+            id=uuid.uuid4(),
+            symbol=f"HASH{i}",
+            exchange="US",
+            currency="USD",
+            name=f"Hash {i}",
+        )
+        for i in range(6)
+    ]
+    db_session.add_all(securities)
+    await db_session.commit()
+
+    price_repo = SqlAlchemyPriceRepository(db_session)
+    first_day = date(2026, 1, 1)
+    await price_repo.save_price_rows(
+        [
+            _price_row(security.id, first_day + timedelta(days=i), 10 + i)
+            for security in securities
+            for i in range(10)
+        ]
+    )
+
+    assert not await is_partitioned(db_session)
+    assert await partition_prices(db_session, 4)
+    await db_session.commit()
+
+    assert await is_partitioned(db_session)
+    assert not await partition_prices(db_session, 4)
+    assert await db_session.scalar(select(func.count()).select_from(PriceModel)) == 60
+    partitions = await db_session.execute(
+        text("SELECT DISTINCT tableoid::regclass::text FROM market_prices")
+    )
+    assert set(partitions.scalars()) <= {f"market_prices_h{i}" for i in range(4)}
+
+    # Upserts still resolve conflicts and new ids follow the existing ones
+    security = SecuritySchema.model_validate(securities[0])
+    await price_repo.save_price_rows(
+        [
+            _price_row(security.id, first_day + timedelta(days=9), 99),
+            _price_row(security.id, first_day + timedelta(days=10), 100),
+        ]
+    )
+    assert await price_repo.get_latest_close(security) == (
+        first_day + timedelta(days=10),
+        Decimal(100),
+    )
+    prices, total = await price_repo.get_prices(
+        security, first_day, first_day + timedelta(days=10), limit=20
+    )
+    assert total == 11
+    assert prices[-2].close == Decimal(99)
+    max_id = await db_session.scalar(select(func.max(PriceModel.id)))
+    assert prices[-1].id == max_id
+
+    # Lookups by security only touch that security's partition
+    plan = await db_session.execute(
+        text(
+            "EXPLAIN SELECT date, close FROM market_prices "
+            "WHERE security_id = :security_id ORDER BY date DESC LIMIT 1"
+        ),
+        {"security_id": security.id},
+    )
+    plan_text = "\n".join(plan.scalars())
+    assert "Append" not in plan_text
+    assert plan_text.count("Scan") == 1
+
+
+def test_main_rejects_a_single_partition():
+    with (
+        patch.object(sys, "argv", ["prog", "--partitions", "1"]),
+        pytest.raises(SystemExit),
+    ):
+        main()
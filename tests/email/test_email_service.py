@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiosmtplib import SMTP
 
 from src.core.email import EmailSendError, EmailService
 
@@ -37,7 +38,7 @@ class TestSendEmailGeneric:
     async def test_send_email_renders_and_sends(self, email_service):
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.smtp_host = "smtp.test.com"
             mock_settings.smtp_port = 587
@@ -46,7 +47,7 @@ class TestSendEmailGeneric:
             mock_settings.smtp_password = "pass"
             mock_settings.smtp_sender_email = "test@example.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
 
             await email_service.send_email(
@@ -67,7 +68,7 @@ class TestSendEmailGeneric:
     async def test_send_email_raises_on_smtp_failure(self, email_service):
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.smtp_host = "bad.com"
             mock_settings.smtp_port = 587
@@ -76,7 +77,7 @@ class TestSendEmailGeneric:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "test@example.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
             mock_smtp.connect.side_effect = ConnectionRefusedError("refused")
 
@@ -97,7 +98,7 @@ class TestSendVerificationEmail:
     async def test_send_verification_email_contains_link(self, email_service):
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.frontend_url = "http://localhost:8101"
             mock_settings.smtp_host = "smtp.test.com"
@@ -107,7 +108,7 @@ class TestSendVerificationEmail:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "noreply@test.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
 
             await email_service.send_verification_email("user@test.com", "token123")
@@ -127,7 +128,7 @@ class TestSendVerificationEmail:
     async def test_send_verification_email_text_contains_link(self, email_service):
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.frontend_url = "http://localhost:8101"
             mock_settings.smtp_host = "smtp.test.com"
@@ -137,7 +138,7 @@ class TestSendVerificationEmail:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "noreply@test.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
 
             await email_service.send_verification_email("user@test.com", "token123")
@@ -163,7 +164,7 @@ class TestSendPriceAlertEmail:
         sec_id = uuid4()
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.frontend_url = "http://localhost:8101"
             mock_settings.smtp_host = "smtp.test.com"
@@ -173,7 +174,7 @@ class TestSendPriceAlertEmail:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "alerts@test.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
 
             alert = PriceAlertEmailData(
@@ -215,7 +216,7 @@ class TestSendPriceAlertEmail:
         sec_id = uuid4()
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.frontend_url = "http://localhost:8101"
             mock_settings.smtp_host = "smtp.test.com"
@@ -225,7 +226,7 @@ class TestSendPriceAlertEmail:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "alerts@test.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
 
             alert = PriceAlertEmailData(
@@ -257,7 +258,7 @@ class TestSendPriceAlertEmail:
 
         with (
             patch("src.core.email.settings") as mock_settings,
-            patch("src.core.email.aiosmtplib.SMTP") as mock_smtp_cls,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
         ):
             mock_settings.frontend_url = "http://localhost:8101"
             mock_settings.smtp_host = "bad.com"
@@ -267,7 +268,7 @@ class TestSendPriceAlertEmail:
             mock_settings.smtp_password = ""
             mock_settings.smtp_sender_email = "alerts@test.com"
 
-            mock_smtp = AsyncMock()
+            mock_smtp = MagicMock(spec=SMTP)
             mock_smtp_cls.return_value = mock_smtp
             mock_smtp.connect.side_effect = ConnectionRefusedError("refused")
 
@@ -284,3 +285,109 @@ class TestSendPriceAlertEmail:
                     "user@test.com",
                     alert=alert,
                 )
+
+
+class TestSendPriceAlertDigests:
+    """Digests go out over the pooled connections, one email per recipient."""
+
+    @staticmethod
+    def _digest(recipient, *symbols):
+        from decimal import Decimal
+        from uuid import uuid4
+
+        from src.core.email import PriceAlertDigestData, PriceAlertEmailData
+
+        return PriceAlertDigestData(
+            recipient=recipient,
+            alerts=[
+                PriceAlertEmailData(
+                    security_id=uuid4(),
+                    security_symbol=symbol,
+                    security_name=f"{symbol} Inc",
+                    condition="above",
+                    target_price=Decimal("150.00"),
+                    latest_price=Decimal("152.50"),
+                )
+                for symbol in symbols
+            ],
+        )
+
+    @pytest.mark.anyio
+    async def test_sends_all_digests_over_a_reused_connection(self, email_service):
+        with (
+            patch("src.core.email.settings") as mock_settings,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
+        ):
+            mock_settings.frontend_url = "http://localhost:8101"
+            mock_settings.smtp_use_tls = False
+            mock_settings.smtp_user = ""
+            mock_settings.smtp_sender_email = "alerts@test.com"
+
+            mock_smtp = MagicMock(spec=SMTP)
+            mock_smtp_cls.return_value = mock_smtp
+
+            sent = await email_service.send_price_alert_digests(
+                [
+                    self._digest("one@test.com", "AAPL", "MSFT"),
+                    self._digest("two@test.com", "NVDA"),
+                ]
+            )
+
+            assert sent == [True, True]
+            mock_smtp_cls.assert_called_once()
+            mock_smtp.connect.assert_awaited_once()
+            assert mock_smtp.send_message.await_count == 2
+
+            first, second = (c[0][0] for c in mock_smtp.send_message.call_args_list)
+            assert first["To"] == "one@test.com"
+            assert first["Subject"] == "Price Alerts: 2 alerts triggered"
+            html_part = _get_html_part(first)
+            assert "AAPL" in html_part
+            assert "MSFT" in html_part
+            assert second["Subject"] == "Price Alert: NVDA Inc (NVDA)"
+
+    @pytest.mark.anyio
+    async def test_rejected_digest_does_not_stop_the_others(self, email_service):
+        with (
+            patch("src.core.email.settings") as mock_settings,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
+        ):
+            mock_settings.smtp_use_tls = False
+            mock_settings.smtp_user = ""
+            mock_settings.smtp_sender_email = "alerts@test.com"
+
+            mock_smtp = MagicMock(spec=SMTP)
+            mock_smtp.is_connected = True
+            mock_smtp.send_message.side_effect = [RuntimeError("rejected"), None]
+            mock_smtp_cls.return_value = mock_smtp
+
+            sent = await email_service.send_price_alert_digests(
+                [
+                    self._digest("one@test.com", "AAPL"),
+                    self._digest("two@test.com", "MSFT"),
+                ]
+            )
+
+            assert sent == [False, True]
+            mock_smtp.quit.assert_not_awaited()
+
+            await email_service.aclose()
+            mock_smtp.quit.assert_awaited()
+
+    @pytest.mark.anyio
+    async def test_raises_when_session_cannot_open(self, email_service):
+        with (
+            patch("src.core.email.settings") as mock_settings,
+            patch("src.core.smtp.aiosmtplib.SMTP") as mock_smtp_cls,
+        ):
+            mock_settings.smtp_use_tls = False
+            mock_settings.smtp_sender_email = "alerts@test.com"
+
+            mock_smtp = MagicMock(spec=SMTP)
+            mock_smtp.connect.side_effect = ConnectionRefusedError("refused")
+            mock_smtp_cls.return_value = mock_smtp
+
+            with pytest.raises(EmailSendError):
+                await email_service.send_price_alert_digests(
+                    [self._digest("one@test.com", "AAPL")]
+                )
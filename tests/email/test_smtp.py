@@ -0,0 +1,156 @@
+# ruff: noqa: PLR2004
+"""Tests for the pooled, queued SMTP transport."""
+
+import asyncio
+from email.message import EmailMessage
+from unittest.mock import MagicMock, patch
+
+import aiosmtplib
+import pytest
+from aiosmtplib import SMTP
+
+from src.core.smtp import SmtpTransport
+
+
+def _message(recipient: str = "user@test.com") -> EmailMessage:
+    msg = EmailMessage()
+    msg["To"] = recipient
+    msg.set_content("body")
+    return msg
+
+
+def _transport(**kwargs) -> SmtpTransport:
+    return SmtpTransport(hostname="smtp.test.com", port=587, use_tls=False, **kwargs)
+
+
+@pytest.fixture
+def connections():
+    """Patch aiosmtplib.SMTP, recording every connection the transport opens."""
+    opened: list[MagicMock] = []
+
+    def open_connection(**_kwargs):
+        smtp = MagicMock(spec=SMTP)
+        smtp.is_connected = True
+        opened.append(smtp)
+        return smtp
+
+    with patch("src.core.smtp.aiosmtplib.SMTP", side_effect=open_connection):
+        yield opened
+
+
+@pytest.mark.anyio
+async def test_connections_are_reused_and_bounded(connections):
+    transport = _transport(max_connections=2)
+
+    errors = await transport.send_many([_message() for _ in range(10)])
+    await transport.send(_message())
+
+    assert errors == [None] * 10
+    assert 1 <= len(connections) <= 2
+    assert sum(smtp.send_message.await_count for smtp in connections) == 11
+    for smtp in connections:
+        smtp.connect.assert_awaited_once()
+        smtp.quit.assert_not_awaited()
+
+    await transport.aclose()
+    for smtp in connections:
+        smtp.quit.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_rejected_message_keeps_the_connection(connections):
+    transport = _transport(max_connections=1)
+
+    await transport.send(_message())
+    connections[0].send_message.side_effect = aiosmtplib.SMTPRecipientsRefused([])
+    errors = await transport.send_many([_message("bad@test.com")])
+
+    assert isinstance(errors[0], aiosmtplib.SMTPRecipientsRefused)
+    assert len(connections) == 1
+    await transport.aclose()
+
+
+@pytest.mark.anyio
+async def test_dropped_connection_is_reopened_and_message_resent(connections):
+    transport = _transport(max_connections=1)
+
+    await transport.send(_message())
+    connections[0].send_message.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+    await transport.send(_message())
+
+    assert len(connections) == 2
+    connections[1].send_message.assert_awaited_once()
+    await transport.aclose()
+
+
+@pytest.mark.anyio
+async def test_idle_connection_failing_health_check_is_replaced(connections):
+    transport = _transport(max_connections=1, health_check_interval=0)
+
+    await transport.send(_message())
+    connections[0].noop.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+    await transport.send(_message())
+
+    connections[0].noop.assert_awaited_once()
+    connections[0].send_message.assert_awaited_once()
+    assert len(connections) == 2
+    await transport.aclose()
+
+
+@pytest.mark.anyio
+async def test_idle_connection_is_closed_after_keepalive_expiry(connections):
+    transport = _transport(max_connections=1, keepalive_expiry=0.01)
+
+    await transport.send(_message())
+    await asyncio.sleep(0.05)
+
+    connections[0].quit.assert_awaited_once()
+    await transport.send(_message())
+    assert len(connections) == 2
+    await transport.aclose()
+
+
+@pytest.mark.anyio
+async def test_full_queue_applies_backpressure():
+    transport = _transport(max_connections=1, queue_size=1)
+    release = asyncio.Event()
+
+    async def slow_send(_message):
+        await release.wait()
+
+    smtp = MagicMock(spec=SMTP)
+    smtp.is_connected = True
+    smtp.send_message.side_effect = slow_send
+
+    with patch("src.core.smtp.aiosmtplib.SMTP", return_value=smtp):
+        sends = [asyncio.create_task(transport.send(_message())) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        # One message in flight, one queued, the third waits for room
+        assert smtp.send_message.await_count == 1
+        assert not any(send.done() for send in sends)
+
+        release.set()
+        await asyncio.gather(*sends)
+        assert smtp.send_message.await_count == 3
+        await transport.aclose()
+
+
+@pytest.mark.anyio
+async def test_connect_failure_is_raised_to_the_sender(connections):
+    transport = _transport(max_connections=1)
+
+    with (
+        patch(
+            "src.core.smtp.aiosmtplib.SMTP",
+            return_value=MagicMock(
+                spec=SMTP, connect=MagicMock(side_effect=ConnectionRefusedError())
+            ),
+        ),
+        pytest.raises(ConnectionRefusedError),
+    ):
+        await transport.send(_message())
+
+    await transport.send(_message())
+    assert len(connections) == 1
+    await transport.aclose()
@@ -25,11 +25,11 @@ class TestVerifyEmailTemplates:
 
         # Structural elements from base.html must be present
         assert "Retail Portfolio" in html
-        assert "class=\"container\"" in html
-        assert "class=\"card\"" in html
-        assert "class=\"logo\"" in html
-        assert "class=\"footer\"" in html
-        assert "class=\"button\"" in html
+        assert 'class="container"' in html
+        assert 'class="card"' in html
+        assert 'class="logo"' in html
+        assert 'class="footer"' in html
+        assert 'class="button"' in html
 
     def test_verify_email_text_contains_link(self):
         template = jinja_env.get_template("verify_email.txt")
@@ -97,7 +97,7 @@ class TestPriceAlertTemplates:
         html = template.render(**context)
 
         assert "<!DOCTYPE html>" in html
-        assert "class=\"container\"" in html
+        assert 'class="container"' in html
         assert "Retail Portfolio" in html
 
     def test_price_alert_text_contains_all_vars(self):
@@ -134,3 +134,44 @@ class TestPriceAlertTemplates:
         assert "<html" not in text.lower()
         assert "<style" not in text.lower()
         assert "<div" not in text.lower()
+
+
+class TestPriceAlertDigestTemplates:
+    """The digest templates list every alert of the recipient."""
+
+    _ALERTS = (
+        {
+            "security_name": "Apple Inc",
+            "security_symbol": "AAPL",
+            "condition_text": "rose above",
+            "target_price": "150.00",
+            "latest_price": "152.50",
+            "deeplink": "http://localhost:8101/security/abc-uuid",
+        },
+        {
+            "security_name": "Microsoft Corp",
+            "security_symbol": "MSFT",
+            "condition_text": "fell below",
+            "target_price": "300.00",
+            "latest_price": "298.50",
+            "deeplink": "http://localhost:8101/security/def-uuid",
+        },
+    )
+
+    @pytest.mark.parametrize(
+        "name", ["price_alert_digest.html", "price_alert_digest.txt"]
+    )
+    def test_digest_contains_every_alert(self, name):
+        rendered = jinja_env.get_template(name).render(alerts=list(self._ALERTS))
+
+        for alert in self._ALERTS:
+            for value in alert.values():
+                assert value in rendered
+
+    def test_digest_html_extends_base(self):
+        html = jinja_env.get_template("price_alert_digest.html").render(
+            alerts=list(self._ALERTS)
+        )
+
+        assert "<!DOCTYPE html>" in html
+        assert "Retail Portfolio" in html
@@ -17,6 +17,7 @@ from src.auth.schema import UserSchema
 from src.main import app
 from src.market import api, repository_eodhd
 from src.market.api_types import (
+    BulkLastDayPrice,
     EodhdSearchResult,
     HistoricalPrice,
     IntradayHistoricalPrice,
@@ -86,6 +87,13 @@ class MockEodhdGateway(MarketGateway):
             )
         ]
 
+    def get_bulk_last_day(
+        self, exchange: str, date: date | None = None
+    ) -> list[BulkLastDayPrice]:
+        """Return an empty bulk download."""
+        _ = exchange, date  # Unused in mock
+        return []
+
     def get_intraday_prices(  # noqa: PLR0913, PLR0917
         self,
         security_id: UUID,
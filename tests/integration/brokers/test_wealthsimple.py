@@ -3,7 +3,7 @@
 import json
 import uuid
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from ws_api.exceptions import (
@@ -15,6 +15,7 @@ from ws_api.exceptions import (
 
 from src.account.enum import AccountTypeEnum, InstitutionEnum
 from src.integration.brokers.api_types import BrokerAccount, BrokerPosition
+from src.integration.brokers.cache import SecurityMetadataCache
 from src.integration.brokers.exception import (
     AccountTypeUnkownError,
     LoginFailedError,
@@ -25,6 +26,7 @@ from src.integration.brokers.exception import (
 )
 from src.integration.brokers.wealthsimple import (
     WealthsimpleApiGateway,
+    WealthsimpleClientCache,
     wealthsimple_api_wrapper_factory,
 )
 from src.integration.schema import IntegrationUserSchema
@@ -34,7 +36,9 @@ from src.stubs.wealthsimple import StubWealthsimpleAPI, StubWSAPISession
 @pytest.fixture
 def gateway() -> WealthsimpleApiGateway:
     """Fixture providing a fresh WealthsimpleApiGateway instance."""
-    return WealthsimpleApiGateway()
+    gateway = WealthsimpleApiGateway()
+    gateway._client_cache = WealthsimpleClientCache(ttl_seconds=60)
+    return gateway
 
 
 @pytest.fixture
@@ -409,3 +413,166 @@ async def test_wealthsimple_api_wrapper_factory() -> None:
     assert isinstance(gateway, WealthsimpleApiGateway)
     assert gateway.debug_api_responses is True
     assert gateway.debug_dump_path == "/tmp/dump.json"
+
+
+@pytest.mark.asyncio
+async def test_get_positions_by_account_uses_cached_security_metadata(
+    gateway: WealthsimpleApiGateway,
+    dummy_user: IntegrationUserSchema,
+) -> None:
+    """Test cached security metadata is reused and only misses hit the API."""
+    stub_api = StubWealthsimpleAPI()
+    cached_nflx = stub_api.get_security_market_data("sec-us-nflx")
+
+    cache = MagicMock()
+    cache.get_many = AsyncMock(return_value={"sec-us-nflx": cached_nflx})
+    cache.set_many = AsyncMock()
+    gateway.security_metadata_cache = cache
+
+    with (
+        patch.object(gateway, "_get_client", return_value=stub_api),
+        patch.object(
+            stub_api,
+            "get_security_market_data",
+            wraps=stub_api.get_security_market_data,
+        ) as mock_market_data,
+    ):
+        positions = await gateway.get_positions_by_account(dummy_user, "acc-tfsa-001")
+
+    assert len(positions) == 3
+    fetched_ids = [call.args[0] for call in mock_market_data.call_args_list]
+    assert sorted(fetched_ids) == ["sec-tsx-xyr", "sec-us-aapl"]
+
+    cache.set_many.assert_awaited_once()
+    assert set(cache.set_many.await_args.args[0]) == {"sec-tsx-xyr", "sec-us-aapl"}
+
+
+@pytest.mark.asyncio
+async def test_get_positions_by_account_refreshes_security_metadata(
+    gateway: WealthsimpleApiGateway,
+    dummy_user: IntegrationUserSchema,
+) -> None:
+    """Test forced refresh bypasses cached metadata and rewrites the cache."""
+    stub_api = StubWealthsimpleAPI()
+
+    cache = MagicMock()
+    cache.get_many = AsyncMock()
+    cache.set_many = AsyncMock()
+    cache.invalidate = AsyncMock()
+    gateway.security_metadata_cache = cache
+    gateway.refresh_security_metadata = True
+
+    with patch.object(gateway, "_get_client", return_value=stub_api):
+        positions = await gateway.get_positions_by_account(dummy_user, "acc-tfsa-001")
+
+    assert len(positions) == 3
+    cache.get_many.assert_not_awaited()
+    assert set(cache.set_many.await_args.args[0]) == {
+        "sec-tsx-xyr",
+        "sec-us-nflx",
+        "sec-us-aapl",
+    }
+    cache.invalidate.assert_awaited_once_with([])
+
+
+@pytest.mark.asyncio
+async def test_security_metadata_cache_invalidate() -> None:
+    redis_client = MagicMock()
+    redis_client.delete = AsyncMock()
+
+    cache = SecurityMetadataCache(redis_client, prefix="wealthsimple")
+    await cache.invalidate(["sec-a"])
+    await cache.invalidate([])
+
+    redis_client.delete.assert_awaited_once_with(
+        "broker_security_metadata:wealthsimple:sec-a"
+    )
+
+
+@pytest.mark.asyncio
+async def test_security_metadata_cache_round_trip() -> None:
+    """Test SecurityMetadataCache serializes entries and skips misses."""
+    redis_client = MagicMock()
+    redis_client.mget = AsyncMock(return_value=[json.dumps({"stock": {}}), None])
+
+    cache = SecurityMetadataCache(redis_client, prefix="wealthsimple")
+    hits = await cache.get_many(["sec-a", "sec-b"])
+
+    assert hits == {"sec-a": {"stock": {}}}
+    redis_client.mget.assert_awaited_once_with(
+        [
+            "broker_security_metadata:wealthsimple:sec-a",
+            "broker_security_metadata:wealthsimple:sec-b",
+        ]
+    )
+
+
+def test_get_client_reuses_cached_client(gateway: WealthsimpleApiGateway) -> None:
+    """Test the client is built from the keyring once and then reused."""
+    json_str = StubWSAPISession().to_json()
+    stub_api = StubWealthsimpleAPI()
+
+    with (
+        patch("keyring.get_password", return_value=json_str) as mock_get_pw,
+        patch(
+            "src.integration.brokers.wealthsimple.WealthsimpleAPI.from_token",
+            return_value=stub_api,
+        ) as mock_from_token,
+    ):
+        first = gateway._get_client("user@example.com")
+        second = gateway._get_client("user@example.com")
+
+    assert first is stub_api
+    assert second is stub_api
+    mock_get_pw.assert_called_once()
+    mock_from_token.assert_called_once()
+
+
+def test_login_skips_validation_with_cached_client(
+    gateway: WealthsimpleApiGateway,
+) -> None:
+    """Test login does not hit the network when a cached client exists."""
+    mock_client = MagicMock()
+    gateway._client_cache.set("user@example.com", mock_client)
+
+    with patch("keyring.get_password") as mock_get_pw:
+        assert gateway.login("user@example.com") is True
+
+    mock_get_pw.assert_not_called()
+    mock_client.get_accounts.assert_not_called()
+
+
+def test_save_session_invalidates_cached_client(
+    gateway: WealthsimpleApiGateway,
+) -> None:
+    """Test persisting a new session drops the client built from the old one."""
+    gateway._client_cache.set("user@example.com", MagicMock())
+
+    with patch("keyring.set_password"):
+        gateway._save_session("new_session_data", "user@example.com")
+
+    assert gateway._client_cache.get("user@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_auth_error_invalidates_cached_client(
+    gateway: WealthsimpleApiGateway,
+    dummy_user: IntegrationUserSchema,
+) -> None:
+    """Test an auth error from the API drops the cached client and re-raises."""
+    mock_client = MagicMock()
+    mock_client.get_accounts.side_effect = ManualLoginRequired("Expired")
+    gateway._client_cache.set(dummy_user.external_user_id, mock_client)
+
+    with pytest.raises(ManualLoginRequired):
+        await gateway.get_accounts(dummy_user)
+
+    assert gateway._client_cache.get(dummy_user.external_user_id) is None
+
+
+def test_client_cache_expires_entries() -> None:
+    """Test cached clients are discarded once their TTL has elapsed."""
+    cache = WealthsimpleClientCache(ttl_seconds=0)
+    cache.set("user@example.com", MagicMock())
+
+    assert cache.get("user@example.com") is None
@@ -11,7 +11,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from src.market.alert_service import AlertEvaluationService
-from src.market.task import _alert_email_dispatch, alert_email_dispatch_task
+from src.market.task import (
+    _alert_digest_dispatch,
+    _alert_email_dispatch,
+    alert_digest_dispatch_task,
+    alert_email_dispatch_task,
+)
 
 
 def _mock_container(alert_service):
@@ -58,3 +63,25 @@ async def test_stage3_no_registry_returns_early():
 def test_stage3_decorator_has_retries():
     """The alert_email_dispatch_task decorator specifies retries=3."""
     assert alert_email_dispatch_task.settings["default_retries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stage3_digest_delegates_to_service():
+    """The digest task resolves AlertEvaluationService and delegates dispatch."""
+    run_ts = datetime(2026, 7, 15, 10, 0, 0, tzinfo=UTC)
+
+    alert_service = AsyncMock(spec=AlertEvaluationService)
+    mock_container = _mock_container(alert_service)
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+    ):
+        await _alert_digest_dispatch([1, 2], run_ts)
+
+    alert_service.dispatch_alert_digests.assert_awaited_once_with([1, 2], run_ts)
+
+
+def test_stage3_digest_decorator_has_retries():
+    """The alert_digest_dispatch_task decorator specifies retries=3."""
+    assert alert_digest_dispatch_task.settings["default_retries"] == 3
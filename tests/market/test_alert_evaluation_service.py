@@ -9,7 +9,7 @@ from uuid import uuid4
 import pytest
 
 from src.auth.api import UserApi
-from src.core.email import EmailService, PriceAlertEmailData
+from src.core.email import EmailSendError, EmailService, PriceAlertEmailData
 from src.market.alert_service import AlertEvaluationService
 from src.market.repository import (
     IntradayPriceRepository,
@@ -269,7 +269,7 @@ class TestDispatchAlertEmail:
         email_service.send_price_alert_email = AsyncMock()
 
         intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-        intraday_repo.get_latest_intraday_close_by_security = AsyncMock(
+        intraday_repo.get_latest_intraday_close = AsyncMock(
             return_value={security.id: latest_price}
         )
 
@@ -298,6 +298,7 @@ class TestDispatchAlertEmail:
 
         # Alert was marked triggered with the run_ts
         alert_repo.mark_triggered.assert_called_once_with(alert.id, run_ts)
+        intraday_repo.get_latest_intraday_close.assert_awaited_once_with([security.id])
 
     @pytest.mark.asyncio
     async def test_security_missing_skips(self):
@@ -332,7 +333,7 @@ class TestDispatchAlertEmail:
         user_api.get_email_for_user = AsyncMock(return_value=None)
 
         intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-        intraday_repo.get_latest_intraday_close_by_security = AsyncMock(
+        intraday_repo.get_latest_intraday_close = AsyncMock(
             return_value={security.id: Decimal("200.00")}
         )
 
@@ -361,7 +362,7 @@ class TestDispatchAlertEmail:
         security_repo.get_by_id_or_fail = AsyncMock(return_value=security)
 
         intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-        intraday_repo.get_latest_intraday_close_by_security = AsyncMock(return_value={})
+        intraday_repo.get_latest_intraday_close = AsyncMock(return_value={})
 
         svc = _make_service(
             alert_repo=alert_repo,
@@ -392,7 +393,7 @@ class TestDispatchAlertEmail:
         email_service.send_price_alert_email = AsyncMock(side_effect=smtp_error)
 
         intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-        intraday_repo.get_latest_intraday_close_by_security = AsyncMock(
+        intraday_repo.get_latest_intraday_close = AsyncMock(
             return_value={security.id: Decimal("200.00")}
         )
 
@@ -409,3 +410,157 @@ class TestDispatchAlertEmail:
 
         # Alert must NOT be marked triggered
         alert_repo.mark_triggered.assert_not_awaited()
+
+
+class TestDispatchAlertDigests:
+    """Batched dispatch: alerts claimed in one UPDATE, one digest per user."""
+
+    @staticmethod
+    def _service(alerts, latest_prices, emails, sent):
+        alert_repo = AsyncMock(spec=PriceAlertRepository)
+        alert_repo.claim_pending_alerts = AsyncMock(return_value=alerts)
+        intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+        intraday_repo.get_latest_intraday_close = AsyncMock(return_value=latest_prices)
+        user_api = AsyncMock(spec=UserApi)
+        user_api.get_emails_for_users = AsyncMock(return_value=emails)
+        email_service = AsyncMock(spec=EmailService)
+        email_service.send_price_alert_digests = AsyncMock(return_value=sent)
+        svc = _make_service(
+            alert_repo=alert_repo,
+            intraday_repo=intraday_repo,
+            user_api=user_api,
+            email_service=email_service,
+        )
+        return svc, alert_repo, email_service
+
+    @pytest.mark.asyncio
+    async def test_claims_alerts_and_groups_them_per_user(self):
+        sec_id = uuid4()
+        alert_1 = _make_alert(alert_id=1, security_id=sec_id)
+        alert_2 = _make_alert(alert_id=2, security_id=sec_id, condition="below")
+        alert_2 = alert_2.model_copy(update={"user_id": alert_1.user_id})
+        alert_3 = _make_alert(alert_id=3, security_id=sec_id)
+        run_ts = datetime(2026, 7, 15, 10, 0, tzinfo=UTC)
+
+        svc, alert_repo, email_service = self._service(
+            [alert_1, alert_2, alert_3],
+            {sec_id: Decimal("155.00")},
+            {alert_1.user_id: "one@example.com", alert_3.user_id: "two@example.com"},
+            [True, True],
+        )
+
+        assert await svc.dispatch_alert_digests([1, 2, 3], run_ts) == 3
+
+        digests = email_service.send_price_alert_digests.call_args[0][0]
+        assert [d.recipient for d in digests] == ["one@example.com", "two@example.com"]
+        assert [len(d.alerts) for d in digests] == [2, 1]
+        assert digests[0].alerts[1].condition == "below"
+        assert digests[0].alerts[0].latest_price == Decimal("155.00")
+        alert_repo.claim_pending_alerts.assert_awaited_once_with([1, 2, 3], run_ts)
+        alert_repo.release_alerts.assert_awaited_once_with([], run_ts)
+
+    @pytest.mark.asyncio
+    async def test_failed_digest_is_released_and_raises_for_retry(self):
+        sec_id = uuid4()
+        alert_1 = _make_alert(alert_id=1, security_id=sec_id)
+        alert_2 = _make_alert(alert_id=2, security_id=sec_id)
+        run_ts = datetime.now(UTC)
+
+        svc, alert_repo, _ = self._service(
+            [alert_1, alert_2],
+            {sec_id: Decimal("155.00")},
+            {alert_1.user_id: "one@example.com", alert_2.user_id: "two@example.com"},
+            [False, True],
+        )
+
+        with pytest.raises(EmailSendError):
+            await svc.dispatch_alert_digests([1, 2], run_ts)
+
+        alert_repo.release_alerts.assert_awaited_once_with([1], run_ts)
+
+    @pytest.mark.asyncio
+    async def test_send_error_releases_every_claimed_alert(self):
+        sec_id = uuid4()
+        alert_1 = _make_alert(alert_id=1, security_id=sec_id)
+        alert_2 = _make_alert(alert_id=2, security_id=sec_id)
+        run_ts = datetime.now(UTC)
+
+        svc, alert_repo, email_service = self._service(
+            [alert_1, alert_2],
+            {sec_id: Decimal("155.00")},
+            {alert_1.user_id: "one@example.com", alert_2.user_id: "two@example.com"},
+            [],
+        )
+        email_service.send_price_alert_digests.side_effect = RuntimeError("SMTP down")
+
+        with pytest.raises(RuntimeError, match="SMTP down"):
+            await svc.dispatch_alert_digests([1, 2], run_ts)
+
+        alert_repo.release_alerts.assert_awaited_once_with([1, 2], run_ts)
+
+    @pytest.mark.asyncio
+    async def test_skips_alerts_without_price_or_user(self):
+        priced = uuid4()
+        alert_1 = _make_alert(alert_id=1, security_id=priced)
+        alert_2 = _make_alert(alert_id=2, security_id=uuid4())
+        alert_3 = _make_alert(alert_id=3, security_id=priced)
+        run_ts = datetime.now(UTC)
+
+        svc, alert_repo, email_service = self._service(
+            [alert_1, alert_2, alert_3],
+            {priced: Decimal("155.00")},
+            {alert_1.user_id: "one@example.com", alert_2.user_id: "two@example.com"},
+            [True],
+        )
+
+        assert await svc.dispatch_alert_digests([1, 2, 3], run_ts) == 1
+
+        digests = email_service.send_price_alert_digests.call_args[0][0]
+        assert [d.recipient for d in digests] == ["one@example.com"]
+        # Skipped alerts stay pending for the next evaluation
+        alert_repo.release_alerts.assert_awaited_once_with([2, 3], run_ts)
+
+    @pytest.mark.asyncio
+    async def test_no_pending_alerts_sends_nothing(self):
+        svc, alert_repo, email_service = self._service([], {}, {}, [])
+
+        assert await svc.dispatch_alert_digests([1], datetime.now(UTC)) == 0
+
+        email_service.send_price_alert_digests.assert_not_awaited()
+        alert_repo.release_alerts.assert_not_awaited()
+
+
+class TestEvaluateChanged:
+    @pytest.mark.asyncio
+    async def test_delegates_to_indexed_repository_query(self):
+        changed_since = datetime(2026, 3, 2, 15, 0, tzinfo=UTC)
+        alert = AlertForEvaluation(
+            alert_id=3,
+            security_id=uuid4(),
+            security_symbol="AAPL",
+            security_name="Apple",
+            user_id=uuid4(),
+            target_price=Decimal("150.00"),
+            condition="above",
+        )
+        alert_repo = AsyncMock(spec=PriceAlertRepository)
+        alert_repo.get_triggered_alerts = AsyncMock(return_value=[alert])
+
+        svc = _make_service(alert_repo=alert_repo)
+
+        assert await svc.evaluate_changed(changed_since) == [alert]
+        alert_repo.get_triggered_alerts.assert_awaited_once_with(changed_since)
+        alert_repo.get_active_alerts_for_evaluation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_evaluate_securities_queries_only_given_securities(self):
+        security_id = uuid4()
+        alert_repo = AsyncMock(spec=PriceAlertRepository)
+        alert_repo.get_triggered_alerts_for_securities = AsyncMock(return_value=[])
+
+        svc = _make_service(alert_repo=alert_repo)
+
+        assert await svc.evaluate_securities([security_id]) == []
+        alert_repo.get_triggered_alerts_for_securities.assert_awaited_once_with(
+            [security_id]
+        )
@@ -73,7 +73,7 @@ async def test_stage2_no_active_alerts_returns_early():
 
     alert_repo.get_active_alerts_for_evaluation.assert_awaited_once()
     # Intraday prices should NOT be fetched when there are no alerts
-    intraday_repo.get_latest_intraday_close_by_security.assert_not_awaited()
+    intraday_repo.get_latest_intraday_close.assert_not_awaited()
     alert_service.evaluate.assert_not_called()
 
 
@@ -87,7 +87,7 @@ async def test_stage2_enqueues_one_per_triggered_alert():
     alert_repo.get_active_alerts_for_evaluation = AsyncMock(return_value=[alert])
 
     intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-    intraday_repo.get_latest_intraday_close_by_security = AsyncMock(
+    intraday_repo.get_latest_intraday_close = AsyncMock(
         return_value={sec_id: Decimal("155.00")}
     )
 
@@ -99,7 +99,7 @@ async def test_stage2_enqueues_one_per_triggered_alert():
     with (
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
-        patch("src.market.task.alert_email_dispatch_task") as mock_dispatch,
+        patch("src.market.task.alert_digest_dispatch_task") as mock_dispatch,
     ):
         await _check_and_dispatch_price_alerts()
 
@@ -108,11 +108,13 @@ async def test_stage2_enqueues_one_per_triggered_alert():
     eval_args = alert_service.evaluate.call_args
     assert eval_args[0][0] == [alert]
     assert eval_args[0][1] == {sec_id: Decimal("155.00")}
+    # Only the alerted securities are looked up
+    intraday_repo.get_latest_intraday_close.assert_awaited_once_with({sec_id})
 
-    # One dispatch task enqueued per triggered alert
+    # One digest task enqueued with all triggered alerts
     mock_dispatch.assert_called_once()
     call_args = mock_dispatch.call_args
-    assert call_args[0][0] == alert.alert_id
+    assert call_args[0][0] == [alert.alert_id]
     assert isinstance(call_args[0][1], datetime)
 
 
@@ -126,7 +128,7 @@ async def test_stage2_zero_dispatches_when_no_alerts_triggered():
     alert_repo.get_active_alerts_for_evaluation = AsyncMock(return_value=[alert])
 
     intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-    intraday_repo.get_latest_intraday_close_by_security = AsyncMock(
+    intraday_repo.get_latest_intraday_close = AsyncMock(
         return_value={sec_id: Decimal("100.00")}
     )
 
@@ -138,7 +140,7 @@ async def test_stage2_zero_dispatches_when_no_alerts_triggered():
     with (
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
-        patch("src.market.task.alert_email_dispatch_task") as mock_dispatch,
+        patch("src.market.task.alert_digest_dispatch_task") as mock_dispatch,
     ):
         await _check_and_dispatch_price_alerts()
 
@@ -147,7 +149,7 @@ async def test_stage2_zero_dispatches_when_no_alerts_triggered():
 
 @pytest.mark.asyncio
 async def test_stage2_enqueue_failure_isolated():
-    """If dispatching one alert raises, the rest are still processed."""
+    """If enqueuing the digest dispatch raises, the sweep still completes."""
     alert_1 = _make_alert(alert_id=1)
     alert_2 = _make_alert(alert_id=2)
 
@@ -157,34 +159,26 @@ async def test_stage2_enqueue_failure_isolated():
     )
 
     intraday_repo = AsyncMock(spec=IntradayPriceRepository)
-    intraday_repo.get_latest_intraday_close_by_security = AsyncMock(return_value={})
+    intraday_repo.get_latest_intraday_close = AsyncMock(return_value={})
 
     alert_service = AsyncMock(spec=AlertEvaluationService)
     alert_service.evaluate = MagicMock(return_value=[alert_1, alert_2])
 
     mock_container = _mock_container(alert_repo, intraday_repo, alert_service)
 
-    dispatch_call_count = 0
-
-    def dispatch_side_effect(*args, **kwargs):
-        nonlocal dispatch_call_count
-        dispatch_call_count += 1
-        if dispatch_call_count == 1:
-            msg = "dispatch error"
-            raise RuntimeError(msg)
-
     with (
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
         patch(
-            "src.market.task.alert_email_dispatch_task",
-            side_effect=dispatch_side_effect,
-        ),
+            "src.market.task.alert_digest_dispatch_task",
+            side_effect=RuntimeError("dispatch error"),
+        ) as mock_dispatch,
     ):
         await _check_and_dispatch_price_alerts()
 
-    # Both alerts triggered and dispatch was attempted for both
-    assert dispatch_call_count == 2
+    # Both alerts are batched into the single attempted dispatch
+    mock_dispatch.assert_called_once()
+    assert mock_dispatch.call_args[0][0] == [1, 2]
 
 
 @pytest.mark.asyncio
@@ -193,3 +187,30 @@ async def test_stage2_no_registry_returns_early():
     with patch("src.market.task.huey.svcs_registry", None):
         await _check_and_dispatch_price_alerts()
     # Should not raise
+
+
+@pytest.mark.asyncio
+async def test_stage2_changed_since_evaluates_changed_prices_only():
+    """With changed_since, evaluation is delegated to the indexed path."""
+    changed_since = datetime(2026, 3, 2, 15, 0, tzinfo=UTC)
+    alert = _make_alert(alert_id=7)
+
+    alert_repo = AsyncMock(spec=PriceAlertRepository)
+    intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    alert_service = AsyncMock(spec=AlertEvaluationService)
+    alert_service.evaluate_changed = AsyncMock(return_value=[alert])
+
+    mock_container = _mock_container(alert_repo, intraday_repo, alert_service)
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+        patch("src.market.task.alert_digest_dispatch_task") as mock_dispatch,
+    ):
+        await _check_and_dispatch_price_alerts(changed_since)
+
+    alert_service.evaluate_changed.assert_awaited_once_with(changed_since)
+    alert_repo.get_active_alerts_for_evaluation.assert_not_awaited()
+    intraday_repo.get_latest_intraday_close.assert_not_awaited()
+    mock_dispatch.assert_called_once()
+    assert mock_dispatch.call_args[0][0] == [7]
@@ -1,16 +1,17 @@
 # ruff: noqa: PLR2004, SLF001
 """Tests for EODHD gateway and stub intraday price data fetching."""
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
+import httpx2
 import pandas as pd
 import pytest
 
 from src.market.api_types import IntradayHistoricalPrice
-from src.market.eodhd import EodhdGateway
+from src.market.eodhd import AsyncEodhdGateway, EodhdGateway
 from src.stubs.eodhd import StubEodhdAPIClient, StubEodhdGateway
 
 
@@ -161,7 +162,6 @@ def test_stub_eodhd_gateway_filters_end_of_day_flat_candle():
     assert all(p.timestamp.hour != 16 for p in prices)
 
 
-
 def test_stub_eodhd_gateway_invalid_interval():
     gateway = StubEodhdGateway(api_key="stub_key")
     sec_id = uuid4()
@@ -288,3 +288,262 @@ def test_eodhd_gateway_invalid_interval(mock_api_client_cls):
             to_datetime=to_dt,
             interval="1m",
         )
+
+
+@patch("src.market.eodhd.APIClient")
+def test_eodhd_gateway_get_bulk_last_day(mock_api_client_cls):
+    gateway = EodhdGateway(api_key="test_key")
+    gateway._client = mock_api_client_cls.return_value
+    gateway._client.get_eod_splits_dividends_data.return_value = [
+        {
+            "code": "AAPL",
+            "exchange_short_name": "US",
+            "date": "2026-04-01",
+            "open": 150.25,
+            "high": 152.0,
+            "low": 149.5,
+            "close": 151.10,
+            "adjusted_close": 151.10,
+            "volume": 5000,
+        }
+    ]
+
+    prices = gateway.get_bulk_last_day("US", date(2026, 4, 1))
+
+    gateway._client.get_eod_splits_dividends_data.assert_called_once_with(
+        country="US", date="2026-04-01"
+    )
+    assert len(prices) == 1
+    assert prices[0].code == "AAPL"
+    assert prices[0].date == date(2026, 4, 1)
+    assert prices[0].close == Decimal("151.1")
+    assert prices[0].volume == 5000
+
+
+@patch("src.market.eodhd.APIClient")
+def test_eodhd_gateway_get_bulk_last_day_skips_rows_without_prices(
+    mock_api_client_cls,
+):
+    gateway = EodhdGateway(api_key="test_key")
+    gateway._client = mock_api_client_cls.return_value
+    row = {
+        "code": "AAPL",
+        "exchange_short_name": "US",
+        "date": "2026-04-01",
+        "open": 150.25,
+        "high": 152.0,
+        "low": 149.5,
+        "close": 151.10,
+        "adjusted_close": 151.10,
+        "volume": None,
+    }
+    missing = {key: value for key, value in row.items() if key != "low"}
+    gateway._client.get_eod_splits_dividends_data.return_value = [
+        {**row, "code": "NULL", "close": None},
+        {**missing, "code": "MISSING"},
+        row,
+    ]
+
+    prices = gateway.get_bulk_last_day("US", date(2026, 4, 1))
+
+    # The rest of the exchange-day is kept
+    assert [price.code for price in prices] == ["AAPL"]
+    assert prices[0].volume == 0
+
+
+@patch("src.market.eodhd.APIClient")
+def test_eodhd_gateway_get_bulk_last_day_error_response(mock_api_client_cls):
+    gateway = EodhdGateway(api_key="test_key")
+    gateway._client = mock_api_client_cls.return_value
+    # The client swallows HTTP errors and returns an empty dict
+    gateway._client.get_eod_splits_dividends_data.return_value = {}
+
+    assert gateway.get_bulk_last_day("US") == []
+
+
+def test_stub_eodhd_gateway_get_bulk_last_day():
+    gateway = StubEodhdGateway(api_key="stub_key")
+
+    prices = gateway.get_bulk_last_day("TO", date(2026, 4, 1))
+
+    assert {price.code for price in prices} == {"RY", "XYR", "RYT", "TD"}
+    assert all(price.exchange == "TO" for price in prices)
+    assert all(price.date == date(2026, 4, 1) for price in prices)
+
+
+@patch("src.market.eodhd.APIClient")
+def test_eodhd_gateway_get_price_rows_vectorized(mock_api_client_cls):
+    gateway = EodhdGateway(api_key="test_key")
+    gateway._client = mock_api_client_cls.return_value
+    gateway._client.get_historical_data.return_value = pd.DataFrame(
+        {
+            "open": [150.25, float("nan"), 151.0],
+            "high": [152.0, 153.0, 0.1 + 0.2],
+            "low": [149.5, 150.0, 150.5],
+            "close": [151.1, 152.0, 151.7],
+            "adjusted_close": [151.1, 152.0, 151.7],
+            "volume": [5000, 6000, 7000],
+        },
+        index=pd.DatetimeIndex(["2026-04-01", "2026-04-02", "2026-04-03"]),
+    )
+
+    sec_id = uuid4()
+    rows = gateway.get_price_rows(
+        sec_id, "AAPL", "US", date(2026, 4, 1), date(2026, 4, 3)
+    )
+
+    # Incomplete rows are dropped
+    assert [row[1] for row in rows] == [date(2026, 4, 1), date(2026, 4, 3)]
+    assert rows[0] == (
+        sec_id,
+        date(2026, 4, 1),
+        Decimal("150.25"),
+        Decimal("152.0"),
+        Decimal("149.5"),
+        Decimal("151.1"),
+        Decimal("151.1"),
+        5000,
+    )
+    # Float noise is quantized to the stored precision
+    assert rows[1][3] == Decimal("0.3")
+
+    prices = gateway.get_prices(
+        sec_id, "AAPL", "US", date(2026, 4, 1), date(2026, 4, 3)
+    )
+    assert [price.close for price in prices] == [Decimal("151.1"), Decimal("151.7")]
+
+
+@patch("src.market.eodhd.APIClient")
+def test_eodhd_gateway_get_price_rows_empty_response(mock_api_client_cls):
+    gateway = EodhdGateway(api_key="test_key")
+    gateway._client = mock_api_client_cls.return_value
+    gateway._client.get_historical_data.return_value = pd.DataFrame(
+        columns=["open", "high", "low", "close", "adjusted_close", "volume"]
+    )
+
+    assert (
+        gateway.get_price_rows(
+            uuid4(), "AAPL", "US", date(2026, 4, 1), date(2026, 4, 3)
+        )
+        == []
+    )
+
+
+def _async_gateway(handler) -> AsyncEodhdGateway:
+    return AsyncEodhdGateway(
+        api_key="test_key", transport=httpx2.MockTransport(handler)
+    )
+
+
+@pytest.mark.anyio
+async def test_async_eodhd_gateway_get_price_rows():
+    requests: list[httpx2.Request] = []
+
+    def handler(request: httpx2.Request) -> httpx2.Response:
+        requests.append(request)
+        return httpx2.Response(
+            200,
+            json=[
+                {
+                    "date": "2026-07-27",
+                    "open": 10.0,
+                    "high": 11.0,
+                    "low": 9.5,
+                    "close": 10.5,
+                    "adjusted_close": 10.4,
+                    "volume": 1200,
+                },
+                {
+                    "date": "2026-07-28",
+                    "open": None,
+                    "high": 11.0,
+                    "low": 9.5,
+                    "close": 10.5,
+                    "adjusted_close": 10.4,
+                    "volume": 0,
+                },
+            ],
+        )
+
+    gateway = _async_gateway(handler)
+    security_id = uuid4()
+    rows = await gateway.get_price_rows(
+        security_id, "AAPL", "US", date(2026, 7, 27), date(2026, 7, 28)
+    )
+    await gateway.aclose()
+
+    assert rows == [
+        (
+            security_id,
+            date(2026, 7, 27),
+            Decimal("10.00000000"),
+            Decimal("11.00000000"),
+            Decimal("9.50000000"),
+            Decimal("10.50000000"),
+            Decimal("10.40000000"),
+            1200,
+        )
+    ]
+    assert requests[0].url.path == "/api/eod/AAPL.US"
+    assert requests[0].url.params["from"] == "2026-07-27"
+
+
+@pytest.mark.anyio
+async def test_async_eodhd_gateway_get_intraday_price_rows():
+    def handler(request: httpx2.Request) -> httpx2.Response:
+        assert request.url.params["interval"] == "1h"
+        return httpx2.Response(
+            200,
+            json=[
+                {
+                    "timestamp": 1785229200,
+                    "open": 10.0,
+                    "high": 11.0,
+                    "low": 9.5,
+                    "close": 10.5,
+                    "volume": 100,
+                },
+                {
+                    "timestamp": 1785232800,
+                    "open": 10.5,
+                    "high": 10.5,
+                    "low": 10.5,
+                    "close": 10.5,
+                    "volume": 0,
+                },
+            ],
+        )
+
+    gateway = _async_gateway(handler)
+    rows = await gateway.get_intraday_price_rows(
+        uuid4(),
+        "AAPL",
+        "US",
+        datetime(2026, 7, 28, tzinfo=UTC),
+        datetime(2026, 7, 29, tzinfo=UTC),
+    )
+
+    # The flat candle without volume is skipped
+    assert len(rows) == 1
+    assert rows[0][1] == datetime.fromtimestamp(1785229200, tz=UTC)
+
+
+@pytest.mark.anyio
+async def test_async_eodhd_gateway_reuses_client_within_loop():
+    gateway = _async_gateway(lambda _request: httpx2.Response(200, json=[]))
+
+    client = gateway._client()
+    await gateway.search("AAPL")
+    await gateway.get_bulk_last_day("US")
+
+    assert gateway._client() is client
+    await gateway.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.anyio
+async def test_async_eodhd_gateway_raises_on_http_error():
+    gateway = _async_gateway(lambda _request: httpx2.Response(503))
+
+    with pytest.raises(httpx2.HTTPStatusError):
+        await gateway.get_bulk_last_day("US")
@@ -0,0 +1,156 @@
+# ruff: noqa: PLR2004, SLF001
+"""Tests for the rate-limited market data ingestion scheduler."""
+
+import asyncio
+
+import httpx2
+import pytest
+import requests
+
+from src.market.ingestion import IngestionScheduler, TokenBucket
+
+
+def _scheduler(
+    rate_per_second: float = 1000,
+    capacity: int = 100,
+    max_concurrency: int = 4,
+    max_retries: int = 2,
+) -> IngestionScheduler:
+    return IngestionScheduler(
+        rate_limiter=TokenBucket(rate_per_second=rate_per_second, capacity=capacity),
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        retry_base_delay=0,
+    )
+
+
+@pytest.mark.anyio
+async def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+
+    assert bucket._reserve(1) == 0
+    assert bucket._reserve(1) == 0
+    # Bucket is empty, the next token arrives after 1/rate seconds
+    assert bucket._reserve(1) == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.anyio
+async def test_token_bucket_rejects_cost_above_capacity():
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+
+    with pytest.raises(ValueError, match="Cannot acquire"):
+        await bucket.acquire(3)
+
+
+@pytest.mark.anyio
+async def test_scheduler_bounds_concurrency():
+    scheduler = _scheduler(max_concurrency=3)
+    running = 0
+    peak = 0
+
+    async def job(_item: int) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    metrics = await scheduler.run("test", list(range(10)), job)
+
+    assert metrics.succeeded == 10
+    assert metrics.failed == 0
+    assert peak == 3
+
+
+@pytest.mark.anyio
+async def test_scheduler_retries_transient_failures():
+    scheduler = _scheduler(max_retries=2)
+    attempts: dict[str, int] = {}
+
+    async def job(item: str) -> None:
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == "FLAKY" and attempts[item] < 2:
+            raise requests.ConnectionError
+        if item == "DOWN":
+            raise requests.HTTPError
+
+    metrics = await scheduler.run("test", ["FLAKY", "DOWN", "OK"], job)
+
+    assert metrics.succeeded == 2
+    assert metrics.failed == 1
+    assert attempts == {"FLAKY": 2, "DOWN": 3, "OK": 1}
+    assert metrics.retries == 3
+
+
+@pytest.mark.anyio
+async def test_scheduler_does_not_retry_permanent_failures():
+    scheduler = _scheduler(max_retries=2)
+    attempts = 0
+
+    async def job(_item: str) -> None:
+        nonlocal attempts
+        attempts += 1
+        msg = "Unknown symbol"
+        raise ValueError(msg)
+
+    metrics = await scheduler.run("test", ["BAD"], job)
+
+    assert metrics.failed == 1
+    assert metrics.retries == 0
+    assert attempts == 1
+
+
+def _status_error(status: int) -> httpx2.HTTPStatusError:
+    request = httpx2.Request("GET", "https://eodhd.com/api/eod/BAD.US")
+    return httpx2.HTTPStatusError(
+        "status", request=request, response=httpx2.Response(status, request=request)
+    )
+
+
+@pytest.mark.anyio
+async def test_scheduler_retries_only_transient_http_statuses():
+    scheduler = _scheduler(max_retries=2)
+    attempts: dict[int, int] = {}
+
+    async def job(status: int) -> None:
+        attempts[status] = attempts.get(status, 0) + 1
+        raise _status_error(status)
+
+    metrics = await scheduler.run("test", [404, 401, 429, 503], job)
+
+    assert metrics.failed == 4
+    # An unknown symbol fails again, throttling and server errors may not
+    assert attempts == {404: 1, 401: 1, 429: 3, 503: 3}
+    assert metrics.retries == 4
+
+
+@pytest.mark.anyio
+async def test_scheduler_does_not_retry_requests_client_errors():
+    scheduler = _scheduler(max_retries=2)
+    attempts = 0
+
+    async def job(_item: str) -> None:
+        nonlocal attempts
+        attempts += 1
+        response = requests.Response()
+        response.status_code = 404
+        raise requests.HTTPError(response=response)
+
+    metrics = await scheduler.run("test", ["BAD"], job)
+
+    assert metrics.failed == 1
+    assert attempts == 1
+
+
+@pytest.mark.anyio
+async def test_scheduler_takes_cost_per_attempt_from_bucket():
+    bucket = TokenBucket(rate_per_second=0.001, capacity=10)
+    scheduler = IngestionScheduler(rate_limiter=bucket, max_concurrency=1)
+
+    async def job(_item: int) -> None:
+        pass
+
+    await scheduler.run("test", [1, 2], job, cost=5)
+
+    # Both requests consumed the whole burst, the bucket is now empty
+    assert bucket._reserve(1) > 0
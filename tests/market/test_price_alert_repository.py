@@ -6,11 +6,15 @@ from decimal import Decimal
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.market.model import PriceAlertModel, SecurityModel
-from src.market.repository_sqlalchemy import SqlAlchemyPriceAlertRepository
-from src.market.schema import PriceAlertWrite
+from src.market.model import LatestIntradayPriceModel, PriceAlertModel, SecurityModel
+from src.market.repository_sqlalchemy import (
+    SqlAlchemyIntradayPriceRepository,
+    SqlAlchemyPriceAlertRepository,
+)
+from src.market.schema import IntradayPriceSchema, PriceAlertWrite
 
 
 @pytest.fixture
@@ -225,3 +229,155 @@ async def test_create_defaults_to_manual_source(
     persisted = await repo.get_by_id(created.id)
     assert persisted is not None
     assert persisted.source == "manual"
+
+
+@pytest.mark.anyio
+async def test_get_triggered_alerts_evaluates_changed_prices_only(
+    db_session: AsyncSession, repo, _test_security, _test_user_id
+):
+    """Thresholds are compared in SQL, only for changed or newly alerted securities."""
+    unchanged, newly_alerted = [
+        SecurityModel(
+            id=uuid4(),
+            symbol=symbol,
+            name=f"{symbol} Corp",
+            exchange="NASDAQ",
+            currency="USD",
+            is_active=True,
+        )
+        for symbol in ("SAME", "NEW")
+    ]
+    db_session.add_all([unchanged, newly_alerted])
+    await db_session.commit()
+
+    long_ago = datetime(2026, 1, 1, tzinfo=UTC)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+
+    async def save_close(security_id, close: str) -> None:
+        await intraday_repo.save_intraday_prices(
+            [
+                IntradayPriceSchema(
+                    security_id=security_id,
+                    timestamp=datetime.now(UTC),
+                    open=Decimal(1),
+                    high=Decimal(1),
+                    low=Decimal(1),
+                    close=Decimal(close),
+                    volume=1,
+                )
+            ]
+        )
+
+    await save_close(unchanged.id, "50")
+    await save_close(newly_alerted.id, "50")
+    await db_session.execute(
+        update(LatestIntradayPriceModel).values(updated_at=long_ago)
+    )
+
+    def alert(security_id, target: str, condition: str, **kwargs) -> PriceAlertModel:
+        return PriceAlertModel(
+            security_id=security_id,
+            user_id=_test_user_id,
+            target_price=Decimal(target),
+            condition=condition,
+            created_at=kwargs.pop("created_at", long_ago),
+            **kwargs,
+        )
+
+    alerts = {
+        "above_met": alert(_test_security.id, "100", "above"),
+        "above_equal": alert(_test_security.id, "150", "above"),
+        "above_unmet": alert(_test_security.id, "200", "above"),
+        "below_met": alert(_test_security.id, "160", "below"),
+        "below_unmet": alert(_test_security.id, "90", "below"),
+        "already_triggered": alert(
+            _test_security.id, "100", "above", triggered_at=long_ago
+        ),
+        "unchanged_price": alert(unchanged.id, "10", "above"),
+    }
+    db_session.add_all(alerts.values())
+    await db_session.commit()
+
+    changed_since = datetime.now(UTC)
+    await save_close(_test_security.id, "150")
+    new_alert = alert(newly_alerted.id, "40", "above", created_at=datetime.now(UTC))
+    db_session.add(new_alert)
+    await db_session.commit()
+
+    triggered = await repo.get_triggered_alerts(changed_since)
+
+    assert {a.alert_id for a in triggered} == {
+        alerts["above_met"].id,
+        alerts["above_equal"].id,
+        alerts["below_met"].id,
+        new_alert.id,
+    }
+    assert {a.security_symbol for a in triggered} == {"TEST", "NEW"}
+
+
+@pytest.mark.anyio
+async def test_triggered_alerts_for_securities_and_alerted_ids(
+    db_session: AsyncSession, repo, active_alert, triggered_alert, _test_security
+):
+    """Per-security evaluation only looks at the given securities' alerts."""
+    assert await repo.get_alerted_security_ids() == {_test_security.id}
+    # No latest close yet, nothing can trigger
+    assert await repo.get_triggered_alerts_for_securities([_test_security.id]) == []
+
+    await SqlAlchemyIntradayPriceRepository(db_session).save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=_test_security.id,
+                timestamp=datetime.now(UTC),
+                open=Decimal(1),
+                high=Decimal(1),
+                low=Decimal(1),
+                close=Decimal("101.00"),
+                volume=1,
+            )
+        ]
+    )
+
+    triggered = await repo.get_triggered_alerts_for_securities([_test_security.id])
+    assert [a.alert_id for a in triggered] == [active_alert.id]
+    assert await repo.get_triggered_alerts_for_securities([uuid4()]) == []
+    assert await repo.get_triggered_alerts_for_securities([]) == []
+
+
+@pytest.mark.anyio
+async def test_claim_and_release_pending_alerts(
+    repo: SqlAlchemyPriceAlertRepository,
+    active_alert: PriceAlertModel,
+    triggered_alert: PriceAlertModel,
+    _test_security: SecurityModel,
+    _test_user_id,
+):
+    other = await repo.create(
+        PriceAlertWrite(target_price=Decimal("120.00"), condition="below"),
+        _test_security.id,
+        _test_user_id,
+    )
+    ids = [active_alert.id, triggered_alert.id, other.id]
+    at = datetime(2026, 7, 15, 10, 0, tzinfo=UTC)
+
+    claimed = await repo.claim_pending_alerts(ids, at)
+    assert [alert.alert_id for alert in claimed] == [active_alert.id, other.id]
+    assert claimed[0].security_symbol == "TEST"
+    assert await repo.claim_pending_alerts([], at) == []
+    marked = await repo.get_by_id(other.id)
+    assert marked is not None
+    assert marked.triggered_at == at
+
+    # Claimed alerts are never claimed twice
+    assert await repo.claim_pending_alerts(ids, at) == []
+
+    # Only the claims of the given time are released
+    await repo.release_alerts(ids, at)
+    released = await repo.get_by_id(other.id)
+    assert released is not None
+    assert released.triggered_at is None
+    kept = await repo.get_by_id(triggered_alert.id)
+    assert kept is not None
+    assert kept.triggered_at is not None
+    reclaimed = await repo.claim_pending_alerts(ids, at)
+    assert [alert.alert_id for alert in reclaimed] == [active_alert.id, other.id]
@@ -1,16 +1,22 @@
+import asyncio
 import datetime
 import uuid
 from decimal import Decimal
 
 import pytest
 from pydantic import ValidationError
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.market.api_types import IntradayPrice
+from src.account.model import AccountModel, PositionModel
+from src.account.repository_sqlalchemy import SqlAlchemyAccountRepository
+from src.account.schema import AccountSchema
+from src.market.api_types import IntradayPrice, SecuritySearchResult
 from src.market.repository_sqlalchemy import (
     SqlAlchemyIntradayPriceRepository,
     SqlAlchemyPriceRepository,
     SqlAlchemySecurityRepository,
+    SqlAlchemySecuritySearchIndexRepository,
 )
 from src.market.schema import IntradayPriceSchema, PriceSchema, SecuritySchema
 
@@ -52,7 +58,7 @@ async def test_save_prices_upserts_correctly(db_session: AsyncSession):
     )
 
     # Insert initial price
-    saved_initial = await price_repo.save_prices([initial_price])
+    saved_initial = await price_repo.save_prices([initial_price], returning=True)
     assert len(saved_initial) == 1
     assert saved_initial[0].close == Decimal("100.0")
 
@@ -68,7 +74,7 @@ async def test_save_prices_upserts_correctly(db_session: AsyncSession):
         volume=2000,  # Changed
     )
 
-    saved_updated = await price_repo.save_prices([updated_price])
+    saved_updated = await price_repo.save_prices([updated_price], returning=True)
     assert len(saved_updated) == 1
 
     # Verify the upsert succeeded
@@ -127,7 +133,7 @@ async def test_save_prices_large_batch(db_session: AsyncSession):
         )
 
     # This should succeed due to chunking
-    saved_prices = await price_repo.save_prices(prices)
+    saved_prices = await price_repo.save_prices(prices, returning=True)
 
     assert len(saved_prices) == num_rows
 
@@ -189,7 +195,9 @@ async def test_intraday_repository_save_and_retrieve(db_session: AsyncSession):
         )
         for i in range(1, 5)
     ]
-    saved_batch = await intraday_repo.save_intraday_prices(batch_candles)
+    saved_batch = await intraday_repo.save_intraday_prices(
+        batch_candles, returning=True
+    )
     assert len(saved_batch) == 4
 
     # Query all intraday prices for security
@@ -250,7 +258,7 @@ async def test_intraday_repository_unique_constraint(db_session: AsyncSession):
         close=Decimal("309.0"),  # updated
         volume=15000,  # updated
     )
-    updated = await intraday_repo.save_intraday_prices([candle_v2])
+    updated = await intraday_repo.save_intraday_prices([candle_v2], returning=True)
     assert len(updated) == 1
     assert updated[0].high == Decimal("310.0")
     assert updated[0].close == Decimal("309.0")
@@ -395,3 +403,659 @@ async def test_intraday_repository_single_save_upsert(db_session: AsyncSession):
     assert candles_in_db[0].close == Decimal("187.0")
     assert candles_in_db[0].high == Decimal("188.0")
 
+
+@pytest.mark.anyio
+async def test_latest_watermarks_by_security(db_session: AsyncSession):
+    """Watermarks are the latest stored date/timestamp of each security."""
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    price_repo = SqlAlchemyPriceRepository(db_session)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+
+    security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="WMARK",
+            exchange="US",
+            currency="USD",
+            name="Watermark Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    empty_security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="EMPTY",
+            exchange="US",
+            currency="USD",
+            name="Empty Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+
+    first_date = datetime.date(2026, 1, 12)
+    await price_repo.save_prices(
+        [
+            PriceSchema(
+                security_id=security.id,
+                date=first_date + datetime.timedelta(days=i),
+                open=Decimal("10.0"),
+                high=Decimal("11.0"),
+                low=Decimal("9.0"),
+                close=Decimal("10.5"),
+                adjusted_close=Decimal("10.5"),
+                volume=100,
+            )
+            for i in range(3)
+        ]
+    )
+    base_time = datetime.datetime(2026, 1, 15, 9, 30, tzinfo=datetime.UTC)
+    await intraday_repo.save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=base_time + datetime.timedelta(hours=i),
+                open=Decimal("10.0"),
+                high=Decimal("11.0"),
+                low=Decimal("9.0"),
+                close=Decimal("10.5"),
+                volume=100,
+            )
+            for i in range(3)
+        ]
+    )
+
+    latest_dates = await price_repo.get_latest_dates_by_security()
+    latest_timestamps = await intraday_repo.get_latest_timestamps_by_security()
+
+    assert latest_dates[security.id] == first_date + datetime.timedelta(days=2)
+    assert latest_timestamps[security.id] == base_time + datetime.timedelta(hours=2)
+    assert empty_security.id not in latest_dates
+    assert empty_security.id not in latest_timestamps
+
+
+@pytest.mark.anyio
+async def test_save_prices_copy_path_upserts(db_session: AsyncSession):
+    """Without returning, prices are streamed through COPY and merged."""
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    price_repo = SqlAlchemyPriceRepository(db_session)
+
+    security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="COPY",
+            exchange="US",
+            currency="USD",
+            name="Copy Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+
+    base_date = datetime.date(2000, 1, 3)
+
+    def make_prices(close: Decimal) -> list[PriceSchema]:
+        return [
+            PriceSchema(
+                security_id=security.id,
+                date=base_date + datetime.timedelta(days=i),
+                open=Decimal("100.0"),
+                high=Decimal("105.0"),
+                low=Decimal("95.0"),
+                close=close,
+                adjusted_close=close,
+                volume=1000 + i,
+            )
+            for i in range(3000)
+        ]
+
+    assert await price_repo.save_prices(make_prices(Decimal("100.0"))) == []
+    # Second run overlaps every row and must update instead of failing
+    assert await price_repo.save_prices(make_prices(Decimal("101.5"))) == []
+
+    prices_in_db, total = await price_repo.get_prices(
+        security,
+        from_date=base_date,
+        to_date=base_date + datetime.timedelta(days=2999),
+        limit=5000,
+    )
+    assert total == 3000
+    assert all(price.close == Decimal("101.5") for price in prices_in_db)
+    assert prices_in_db[-1].volume == 3999
+
+
+@pytest.mark.anyio
+async def test_concurrent_price_row_saves_share_the_session(db_session: AsyncSession):
+    """Concurrent jobs on one session are serialized, duplicated keys keep the last row."""
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    price_repo = SqlAlchemyPriceRepository(db_session)
+
+    securities = [
+        await security_repo.get_or_create(
+            SecuritySchema(
+                id=uuid.uuid4(),
+                symbol=f"CONC{i}",
+                exchange="US",
+                currency="USD",
+                name=f"Concurrent {i}",
+                isin=None,
+                is_active=True,
+                updated_at=datetime.datetime.now(datetime.UTC),
+            )
+        )
+        for i in range(4)
+    ]
+    base_date = datetime.date(2001, 1, 2)
+
+    def rows(security_id, closes):
+        return [
+            (
+                security_id,
+                base_date + datetime.timedelta(days=i % 50),
+                Decimal(1),
+                Decimal(2),
+                Decimal(1),
+                close,
+                close,
+                1,
+            )
+            for i, close in enumerate(closes)
+        ]
+
+    # 100 rows over 50 dates: the second half repeats the keys of the first
+    closes = [Decimal(i) for i in range(100)]
+    await asyncio.gather(
+        *(price_repo.save_price_rows(rows(security.id, closes)) for security in securities)
+    )
+
+    for security in securities:
+        prices, total = await price_repo.get_prices(
+            security,
+            from_date=base_date,
+            to_date=base_date + datetime.timedelta(days=49),
+            limit=100,
+        )
+        assert total == 50
+        assert [price.close for price in prices] == closes[50:]
+
+
+@pytest.mark.anyio
+async def test_save_intraday_prices_copy_path_upserts(db_session: AsyncSession):
+    """Without returning, intraday bars are streamed through COPY and merged."""
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+
+    security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="COPYI",
+            exchange="US",
+            currency="USD",
+            name="Copy Intraday Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    base_time = datetime.datetime(2026, 1, 15, 9, 30, tzinfo=datetime.UTC)
+
+    def make_candles(close: Decimal) -> list[IntradayPriceSchema]:
+        return [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=base_time + datetime.timedelta(hours=i),
+                open=Decimal("10.0"),
+                high=Decimal("11.0"),
+                low=Decimal("9.0"),
+                close=close,
+                volume=100,
+            )
+            for i in range(5)
+        ]
+
+    assert await intraday_repo.save_intraday_prices(make_candles(Decimal("10.5"))) == []
+    await intraday_repo.save_intraday_prices(make_candles(Decimal("10.75")))
+
+    candles_in_db = await intraday_repo.get_intraday_prices(security.id)
+    assert len(candles_in_db) == 5
+    assert all(candle.close == Decimal("10.75") for candle in candles_in_db)
+
+
+@pytest.mark.anyio
+async def test_intraday_partitions_and_downsampling(db_session: AsyncSession):
+    """Bars move to their monthly partition, expired months become 4h bars."""
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+
+    security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="PART",
+            exchange="US",
+            currency="USD",
+            name="Partition Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    base_time = datetime.datetime(2026, 1, 15, 9, 30, tzinfo=datetime.UTC)
+    await intraday_repo.save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=base_time + datetime.timedelta(hours=i),
+                open=Decimal(10 + i),
+                high=Decimal(20 + i),
+                low=Decimal(5 + i),
+                close=Decimal(11 + i),
+                volume=100,
+            )
+            for i in range(5)
+        ]
+    )
+
+    january = datetime.date(2026, 1, 1)
+    february = datetime.date(2026, 2, 1)
+    created = await intraday_repo.create_intraday_partitions([january, february])
+    assert created == [
+        "market_intraday_prices_p2026_01",
+        "market_intraday_prices_p2026_02",
+    ]
+    assert await intraday_repo.create_intraday_partitions([january]) == []
+
+    # Bars stored before the partition existed were moved out of the default one
+    partitions = await db_session.execute(
+        text("SELECT DISTINCT tableoid::regclass::text FROM market_intraday_prices")
+    )
+    assert partitions.scalars().all() == ["market_intraday_prices_p2026_01"]
+    assert len(await intraday_repo.get_intraday_prices(security.id)) == 5
+
+    cutoff = datetime.datetime(2026, 2, 1, tzinfo=datetime.UTC)
+    assert await intraday_repo.downsample_intraday_prices(cutoff) == 1
+
+    assert await intraday_repo.get_intraday_prices(security.id) == []
+    bars = await intraday_repo.get_intraday_4h_prices(security.id)
+    # 09:30-11:30 fall in the 08:00 bucket, 12:30-13:30 in the 12:00 bucket
+    assert [(bar.timestamp.hour, bar.open, bar.close) for bar in bars] == [
+        (8, Decimal(10), Decimal(13)),
+        (12, Decimal(13), Decimal(15)),
+    ]
+    assert bars[0].high == Decimal(22)
+    assert bars[0].low == Decimal(5)
+    assert bars[1].volume == 200
+
+    # Late bars of the rolled-up month land in the default partition and are
+    # merged into the existing bucket on the next run
+    await intraday_repo.save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=datetime.datetime(2026, 1, 15, 14, 30, tzinfo=datetime.UTC),
+                open=Decimal(30),
+                high=Decimal(40),
+                low=Decimal(1),
+                close=Decimal(31),
+                volume=50,
+            )
+        ]
+    )
+    assert await intraday_repo.downsample_intraday_prices(cutoff) == 0
+
+    assert await intraday_repo.get_intraday_prices(security.id) == []
+    bars = await intraday_repo.get_intraday_4h_prices(security.id)
+    assert len(bars) == 2
+    assert (bars[1].open, bars[1].high, bars[1].low, bars[1].close) == (
+        Decimal(13),
+        Decimal(40),
+        Decimal(1),
+        Decimal(31),
+    )
+    assert bars[1].volume == 250
+
+    # A re-ingested bar is not counted twice and an earlier late bar moves the
+    # open of the re-rolled bucket but not its close
+    await intraday_repo.save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=datetime.datetime(2026, 1, 15, hour, 0, tzinfo=datetime.UTC)
+                + datetime.timedelta(minutes=minutes),
+                open=Decimal(open_),
+                high=Decimal(25),
+                low=Decimal(2),
+                close=Decimal(26),
+                volume=volume,
+            )
+            for hour, minutes, open_, volume in [(12, 30, 13, 100), (12, 0, 12, 10)]
+        ]
+    )
+    assert await intraday_repo.downsample_intraday_prices(cutoff) == 0
+
+    bars = await intraday_repo.get_intraday_4h_prices(security.id)
+    assert (bars[1].open, bars[1].high, bars[1].low, bars[1].close) == (
+        Decimal(12),
+        Decimal(40),
+        Decimal(1),
+        Decimal(31),
+    )
+    assert bars[1].volume == 260
+    assert bars[0].volume == 300
+
+
+def _search_result(code: str, name: str, exchange: str = "US") -> SecuritySearchResult:
+    return SecuritySearchResult(
+        code=code,
+        exchange=exchange,
+        name=name,
+        currency="USD",
+        security_type="Common Stock",
+        isin=None,
+        country="USA",
+    )
+
+
+@pytest.mark.anyio
+async def test_security_search_index_prefix_search(db_session: AsyncSession):
+    """Test indexed prefix search ranks exact tickers, then tickers, then names."""
+    repo = SqlAlchemySecuritySearchIndexRepository(db_session)
+    await repo.upsert(
+        [
+            _search_result("APLE", "Apple Hospitality REIT"),
+            _search_result("AAPL", "Apple Inc"),
+            _search_result("AAPL", "Apple Inc", exchange="MX"),
+            _search_result("AP", "Ampco-Pittsburgh"),
+            _search_result("MSFT", "Microsoft Corporation"),
+        ]
+    )
+
+    results = await repo.search("ap", limit=10)
+    assert [(r.code, r.exchange) for r in results] == [
+        ("AP", "US"),
+        ("APLE", "US"),
+        ("AAPL", "MX"),
+        ("AAPL", "US"),
+    ]
+
+    assert [r.code for r in await repo.search("micro", limit=10)] == ["MSFT"]
+    assert await repo.search("%", limit=10) == []
+
+
+@pytest.mark.anyio
+async def test_security_search_index_upsert_refreshes_entries(
+    db_session: AsyncSession,
+):
+    """Test upserting a known ticker updates it instead of duplicating it."""
+    repo = SqlAlchemySecuritySearchIndexRepository(db_session)
+    await repo.upsert([_search_result("TEST", "Old Name")])
+    await repo.upsert(
+        [_search_result("TEST", "New Name"), _search_result("TEST", "New Name")]
+    )
+
+    results = await repo.search("test", limit=10)
+    assert len(results) == 1
+    assert results[0].name == "New Name"
+    assert await repo.search("old", limit=10) == []
+
+
+async def _seed_daily_prices(
+    db_session: AsyncSession, days: int = 300
+) -> tuple[SqlAlchemyPriceRepository, SecuritySchema]:
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    price_repo = SqlAlchemyPriceRepository(db_session)
+
+    securities = [
+        await security_repo.get_or_create(
+            SecuritySchema(
+                id=uuid.uuid4(),
+                symbol=symbol,
+                exchange="US",
+                currency="USD",
+                name=f"{symbol} Inc",
+                isin=None,
+                is_active=True,
+                updated_at=datetime.datetime.now(datetime.UTC),
+            )
+        )
+        for symbol in ("PLAN", "OTHER")
+    ]
+    first_day = datetime.date(2025, 1, 1)
+    await price_repo.save_price_rows(
+        [
+            (
+                security.id,
+                first_day + datetime.timedelta(days=i),
+                Decimal(10),
+                Decimal(12),
+                Decimal(9),
+                Decimal(10 + i),
+                Decimal(10 + i),
+                1000,
+            )
+            for security in securities
+            for i in range(days)
+        ]
+    )
+    # Index-only scans need the visibility map VACUUM maintains
+    async with db_session.bind.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.exec_driver_sql("VACUUM ANALYZE market_prices")
+    return price_repo, securities[0]
+
+
+async def _explain_statements(db_session: AsyncSession, call) -> list[str]:
+    """Query plans of the statements a repository call executes."""
+    connection = await db_session.connection()
+    statements = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    # Tiny tables are otherwise cheaper to scan sequentially
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    await connection.exec_driver_sql("SET LOCAL enable_bitmapscan = off")
+    event.listen(connection.sync_connection, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", capture)
+
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        plans.append("\n".join(result.scalars()))
+    return plans
+
+
+@pytest.mark.anyio
+async def test_latest_close_is_an_index_only_scan(db_session: AsyncSession):
+    price_repo, security = await _seed_daily_prices(db_session)
+
+    assert await price_repo.get_latest_close(security) == (
+        datetime.date(2025, 10, 27),
+        Decimal(309),
+    )
+
+    [plan] = await _explain_statements(
+        db_session, lambda: price_repo.get_latest_close(security)
+    )
+    assert "Index Only Scan using ix_market_prices_security_date_desc" in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.anyio
+async def test_latest_price_reads_the_index_in_date_order(db_session: AsyncSession):
+    price_repo, security = await _seed_daily_prices(db_session)
+
+    [plan] = await _explain_statements(
+        db_session, lambda: price_repo.get_latest_price(security)
+    )
+    assert "Index Scan" in plan
+    assert "Seq Scan" not in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.anyio
+async def test_price_range_and_count_use_the_indexes(db_session: AsyncSession):
+    price_repo, security = await _seed_daily_prices(db_session)
+    from_date = datetime.date(2025, 3, 1)
+    to_date = datetime.date(2025, 3, 31)
+
+    prices, total = await price_repo.get_prices(security, from_date, to_date, limit=10)
+    assert total == 31
+    assert [price.date.day for price in prices] == list(range(1, 11))
+
+    count_plan, range_plan = await _explain_statements(
+        db_session, lambda: price_repo.get_prices(security, from_date, to_date)
+    )
+    assert "Index Only Scan" in count_plan
+    assert "Index Scan" in range_plan
+    assert "Seq Scan" not in range_plan
+    assert "Sort" not in range_plan
+
+
+@pytest.mark.anyio
+async def test_latest_intraday_close_follows_saved_bars(db_session: AsyncSession):
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+
+    first, second, without_bars = [
+        await security_repo.get_or_create(
+            SecuritySchema(
+                id=uuid.uuid4(),
+                symbol=symbol,
+                exchange="US",
+                currency="USD",
+                name=f"{symbol} Inc",
+                isin=None,
+                is_active=True,
+                updated_at=datetime.datetime.now(datetime.UTC),
+            )
+        )
+        for symbol in ("LAST", "NEXT", "NONE")
+    ]
+    base_time = datetime.datetime(2026, 3, 2, 14, 30, tzinfo=datetime.UTC)
+
+    def bar(security: SecuritySchema, hours: int, close: str) -> IntradayPriceSchema:
+        return IntradayPriceSchema(
+            security_id=security.id,
+            timestamp=base_time + datetime.timedelta(hours=hours),
+            open=Decimal(10),
+            high=Decimal(20),
+            low=Decimal(5),
+            close=Decimal(close),
+            volume=100,
+        )
+
+    await intraday_repo.save_intraday_prices(
+        [bar(first, 0, "10"), bar(first, 2, "12"), bar(first, 1, "11")]
+    )
+    await intraday_repo.save_intraday_prices([bar(second, 0, "50")], returning=True)
+
+    assert await intraday_repo.get_latest_intraday_close(
+        [first.id, second.id, without_bars.id]
+    ) == {first.id: Decimal(12), second.id: Decimal(50)}
+    assert await intraday_repo.get_latest_intraday_close([]) == {}
+
+    # A backfilled older bar does not replace the latest close, a correction does
+    await intraday_repo.save_intraday_prices([bar(first, -5, "1")])
+    assert await intraday_repo.get_latest_intraday_close([first.id]) == {
+        first.id: Decimal(12)
+    }
+    await intraday_repo.save_intraday_prices([bar(first, 2, "12.5")])
+    assert await intraday_repo.get_latest_intraday_close_by_security() == {
+        first.id: Decimal("12.5"),
+        second.id: Decimal(50),
+    }
+
+
+@pytest.mark.anyio
+async def test_moved_security_ids_since(db_session: AsyncSession):
+    security_repo = SqlAlchemySecurityRepository(db_session)
+    intraday_repo = SqlAlchemyIntradayPriceRepository(db_session)
+    security = await security_repo.get_or_create(
+        SecuritySchema(
+            id=uuid.uuid4(),
+            symbol="MOVE",
+            exchange="US",
+            currency="USD",
+            name="Move Inc",
+            isin=None,
+            is_active=True,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    await db_session.commit()
+    started_at = datetime.datetime.now(datetime.UTC)
+
+    await intraday_repo.save_intraday_prices(
+        [
+            IntradayPriceSchema(
+                security_id=security.id,
+                timestamp=datetime.datetime(2026, 3, 2, 14, 30, tzinfo=datetime.UTC),
+                open=Decimal(10),
+                high=Decimal(20),
+                low=Decimal(5),
+                close=Decimal(15),
+                volume=100,
+            )
+        ]
+    )
+
+    assert await intraday_repo.get_moved_security_ids(started_at) == [security.id]
+    assert (
+        await intraday_repo.get_moved_security_ids(
+            datetime.datetime.now(datetime.UTC) + datetime.timedelta(minutes=1)
+        )
+        == []
+    )
+
+
+@pytest.mark.anyio
+async def test_stream_active_accounts_holding_securities(
+    db_session: AsyncSession,
+    test_accounts: list[AccountSchema],
+    test_security: SecuritySchema,
+):
+    holder, other_holder, inactive_holder = test_accounts
+    other_security_id = uuid.uuid4()
+    for position_id, account in enumerate(test_accounts, start=1000):
+        db_session.add(
+            PositionModel(
+                id=position_id,
+                account_id=account.id,
+                security_id=test_security.id,
+                quantity=Decimal(1),
+                average_cost=Decimal(1),
+            )
+        )
+    inactive_model = await db_session.get(AccountModel, inactive_holder.id)
+    assert inactive_model is not None
+    inactive_model.is_active = False
+    await db_session.commit()
+
+    account_repo = SqlAlchemyAccountRepository(db_session)
+    batches = [
+        batch
+        async for batch in account_repo.stream_active_by_securities(
+            [test_security.id, other_security_id], batch_size=1
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert sorted(account.id for batch in batches for account in batch) == sorted(
+        [holder.id, other_holder.id]
+    )
+    assert [
+        batch async for batch in account_repo.stream_active_by_securities([], 10)
+    ] == []
+    assert [
+        batch
+        async for batch in account_repo.stream_active_by_securities(
+            [other_security_id], 10
+        )
+    ] == []
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.market.model import IntradayPriceModel, PriceModel
+from src.market.model import IntradayPrice4hModel, IntradayPriceModel, PriceModel
 from src.market.schema import PriceSchema
 from src.market.service import MarketService
 
@@ -232,6 +232,46 @@ async def test_get_prices_4h_intraday_aggregation(auth_client, test_security, db
     assert agg["volume"] == 5700
 
 
+@pytest.mark.anyio
+async def test_get_prices_4h_includes_rolled_up_candles(auth_client, test_security, db_session):
+    """Test 4h candles past the hourly retention are served from the rollup table."""
+    db_session.add_all(
+        [
+            IntradayPrice4hModel(
+                security_id=test_security.id,
+                timestamp=datetime(2026, 1, 14, 12, 0, tzinfo=timezone.utc),
+                open=Decimal("90.00"),
+                high=Decimal("95.00"),
+                low=Decimal("89.00"),
+                close=Decimal("94.00"),
+                volume=4000,
+            ),
+            IntradayPriceModel(
+                security_id=test_security.id,
+                timestamp=datetime(2026, 1, 15, 9, 0, tzinfo=timezone.utc),
+                open=Decimal("100.00"),
+                high=Decimal("105.00"),
+                low=Decimal("98.00"),
+                close=Decimal("102.00"),
+                volume=1000,
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    response = await auth_client.get(
+        f"/api/v1/market/prices/{test_security.id}?interval=4h"
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total"] == 2
+    assert [Decimal(item["open"]) for item in result["items"]] == [
+        Decimal("90.00"),
+        Decimal("100.00"),
+    ]
+
+
 @pytest.mark.anyio
 async def test_get_prices_1h_intraday_no_date_range(auth_client, test_security, db_session):
     """Test 1h intraday endpoint with no from_date/to_date (the actual repro from #140).
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Iterable
 from typing import override
 from uuid import uuid4
 
@@ -10,6 +11,7 @@ from src.account.exception import AccountNotFoundError
 from src.account.repository import AccountRepository
 from src.account.schema import AccountSchema
 from src.account.service.account import AccountService
+from src.market.api_types import SecurityId
 
 
 class MockAccountRepository(AccountRepository):
@@ -48,6 +50,14 @@ class MockAccountRepository(AccountRepository):
     async def get_all(self) -> list[AccountSchema]:
         return self.accounts
 
+    @override
+    async def stream_active_by_securities(
+        self, security_ids: Iterable[SecurityId], batch_size: int
+    ) -> AsyncIterator[list[AccountSchema]]:
+        active = [a for a in self.accounts if a.is_active]
+        for start in range(0, len(active), batch_size):
+            yield active[start : start + batch_size]
+
     @override
     async def delete(self, account_id: AccountId) -> None:
         self.accounts = [a for a in self.accounts if a.id != account_id]
@@ -1,16 +1,19 @@
 """Tests for UserApi facade methods."""
 
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
 
 from src.auth.api import UserApi
-from src.auth.api_types import UserId
+from src.auth.api_types import User, UserId
+from src.auth.cache import AuthenticatedUserCache
 from src.auth.repository import UserRepository
 from src.auth.schema import UserSchema
 from src.auth.service import EmailVerificationService
+from src.core.redis import RedisPool
 
 
 class MockUserRepository(UserRepository):
@@ -117,3 +120,143 @@ class TestPreferences:
         res = await api.patch_preferences(user_id, patch)
         assert res == {"timeframe": "4h", "chart_style": "candlestick", "sidebar_open": False}
         assert await api.get_preferences(user_id) == res
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the Redis commands used by the user cache."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, ex: int) -> None:  # noqa: ARG002
+        self.values[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+class CountingUserRepository(MockUserRepository):
+    """UserRepository counting the email lookups done to authenticate."""
+
+    def __init__(self, users: dict[UserId, UserSchema]) -> None:
+        super().__init__(users)
+        self.email_lookups = 0
+
+    async def get_by_email(self, email: str) -> UserSchema | None:
+        self.email_lookups += 1
+        return next((user for user in self._users.values() if user.email == email), None)
+
+
+def _user_cache(redis: FakeRedis, local_ttl_seconds: float = 60) -> AuthenticatedUserCache:
+    pool = MagicMock(spec=RedisPool)
+    pool.client.return_value = redis
+    return AuthenticatedUserCache(pool, ttl_seconds=300, local_ttl_seconds=local_ttl_seconds, max_local_entries=2)
+
+
+def _user(email: str = "trader@example.com") -> UserSchema:
+    return UserSchema(
+        id=uuid4(),
+        email=email,
+        password="hashed_password",  # noqa: S106
+        is_verified=True,
+        created_at=datetime.now(UTC),
+    )
+
+
+class TestGetCurrentUserFromToken:
+    @pytest.mark.asyncio
+    async def test_user_is_looked_up_once_then_cached(self):
+        """Repeated authentications with a token skip the user lookup."""
+        user = _user()
+        repo = CountingUserRepository({user.id: user})
+        redis = FakeRedis()
+        api = UserApi(
+            user_repository=repo,
+            email_verification_service=AsyncMock(spec=EmailVerificationService),
+            user_cache=_user_cache(redis),
+        )
+        token = api.create_access_token(user.email, user.id)
+
+        first = await api.get_current_user_from_token(token)
+        second = await api.get_current_user_from_token(token)
+
+        assert first == second == User(id=user.id, email=user.email)
+        assert repo.email_lookups == 1
+        assert f"auth_user:{user.id}" in redis.values
+
+    @pytest.mark.asyncio
+    async def test_other_processes_share_the_redis_entry(self):
+        """A process with an empty local cache reads the user from Redis."""
+        user = _user()
+        repo = CountingUserRepository({user.id: user})
+        redis = FakeRedis()
+        api = UserApi(
+            user_repository=repo,
+            email_verification_service=AsyncMock(spec=EmailVerificationService),
+            user_cache=_user_cache(redis),
+        )
+        other_process = UserApi(
+            user_repository=repo,
+            email_verification_service=AsyncMock(spec=EmailVerificationService),
+            user_cache=_user_cache(redis),
+        )
+        token = api.create_access_token(user.email, user.id)
+
+        await api.get_current_user_from_token(token)
+        assert (await other_process.get_current_user_from_token(token)).id == user.id
+        assert repo.email_lookups == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidated_or_mismatching_user_is_looked_up_again(self):
+        """Invalidation and a token email not matching the cache hit the database."""
+        user = _user()
+        repo = CountingUserRepository({user.id: user})
+        cache = _user_cache(FakeRedis())
+        api = UserApi(
+            user_repository=repo,
+            email_verification_service=AsyncMock(spec=EmailVerificationService),
+            user_cache=cache,
+        )
+
+        await api.get_current_user_from_token(api.create_access_token(user.email, user.id))
+        await cache.invalidate(user.id)
+        await api.get_current_user_from_token(api.create_access_token(user.email, user.id))
+        assert repo.email_lookups == 2
+
+        with pytest.raises(HTTPException) as exc_info:
+            await api.get_current_user_from_token(api.create_access_token("old@example.com", user.id))
+        assert exc_info.value.status_code == 401
+        assert repo.email_lookups == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_fall_back_to_the_database(self):
+        """An unreachable Redis only costs the lookup."""
+        user = _user()
+        repo = CountingUserRepository({user.id: user})
+        pool = MagicMock(spec=RedisPool)
+        pool.client.return_value.get = AsyncMock(side_effect=ConnectionError("down"))
+        pool.client.return_value.set = AsyncMock(side_effect=ConnectionError("down"))
+        api = UserApi(
+            user_repository=repo,
+            email_verification_service=AsyncMock(spec=EmailVerificationService),
+            user_cache=AuthenticatedUserCache(pool, ttl_seconds=300, local_ttl_seconds=0, max_local_entries=2),
+        )
+        token = api.create_access_token(user.email, user.id)
+
+        assert (await api.get_current_user_from_token(token)).id == user.id
+        assert (await api.get_current_user_from_token(token)).id == user.id
+        assert repo.email_lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_local_entries_are_bounded():
+    """The in-process tier drops its oldest entry when full."""
+    cache = _user_cache(FakeRedis())
+    users = [User(id=uuid4(), email=f"user{i}@example.com") for i in range(3)]
+    for user in users:
+        await cache.set(user)
+
+    assert list(cache._local) == [user.id for user in users[1:]]  # noqa: SLF001
@@ -1,4 +1,5 @@
 from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
@@ -6,6 +7,7 @@ from fastapi import HTTPException
 from itsdangerous import URLSafeTimedSerializer
 
 from src.auth.api_types import UserId
+from src.auth.cache import AuthenticatedUserCache
 from src.auth.repository import UserRepository, VerificationTokenRepository
 from src.auth.schema import UserSchema, VerificationTokenSchema
 from src.auth.service import EmailVerificationService
@@ -177,6 +179,26 @@ async def test_verify_token_success(
     assert saved_token.id in mock_token_repo.used_tokens
 
 
+@pytest.mark.asyncio
+async def test_verify_token_invalidates_cached_user(
+    mock_user_repo, mock_token_repo, mock_email_service
+):
+    user_cache = AsyncMock(spec=AuthenticatedUserCache)
+    verification_service = EmailVerificationService(
+        user_repository=mock_user_repo,
+        token_repository=mock_token_repo,
+        email_service=mock_email_service,
+        user_cache=user_cache,
+    )
+    user = await mock_user_repo.create_user("test@example.com", "password")
+
+    await verification_service.generate_and_send_verification(user.email, user.id)
+    _sent_email, sent_token = mock_email_service.sent_emails[0]
+    await verification_service.verify_token(sent_token)
+
+    user_cache.invalidate.assert_awaited_once_with(user.id)
+
+
 @pytest.mark.asyncio
 async def test_verify_token_expired(verification_service, mock_token_repo):
     user_id = uuid4()
@@ -1,11 +1,19 @@
-from datetime import UTC, datetime, timedelta
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from typing import override
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 
-from src.market.api_types import HistoricalPrice, IntradayHistoricalPrice, SecurityId
+from src.config.settings import settings
+from src.market.api_types import (
+    BulkLastDayPrice,
+    HistoricalPrice,
+    IntradayHistoricalPrice,
+    SecurityId,
+)
 from src.market.gateway import MarketGateway
 from src.market.repository import (
     IntradayPriceRepository,
@@ -13,7 +21,7 @@ from src.market.repository import (
     SecurityRepository,
 )
 from src.market.schema import IntradayPriceSchema, PriceSchema, SecuritySchema
-from src.market.service import MarketService
+from src.market.service import MarketService, weekdays_after
 
 
 class MockSecurityRepository(SecurityRepository):
@@ -74,9 +82,17 @@ class MockPriceRepository(PriceRepository):
         return price
 
     @override
-    async def save_prices(self, prices: list[PriceSchema]):
+    async def save_prices(self, prices: list[PriceSchema], *, returning=False):
         self.saved_prices.extend(prices)
-        return prices
+        return prices if returning else []
+
+    @override
+    async def get_latest_dates_by_security(self):
+        latest: dict[SecurityId, date] = {}
+        for p in self.saved_prices:
+            if p.security_id not in latest or p.date > latest[p.security_id]:
+                latest[p.security_id] = p.date
+        return latest
 
 
 class MockIntradayPriceRepository(IntradayPriceRepository):
@@ -101,10 +117,10 @@ class MockIntradayPriceRepository(IntradayPriceRepository):
 
     @override
     async def save_intraday_prices(
-        self, prices: list[IntradayPriceSchema]
+        self, prices: list[IntradayPriceSchema], *, returning: bool = False
     ) -> list[IntradayPriceSchema]:
         self.saved_prices.extend(prices)
-        return prices
+        return prices if returning else []
 
     @override
     async def get_latest_intraday_close_by_security(
@@ -117,6 +133,45 @@ class MockIntradayPriceRepository(IntradayPriceRepository):
                 intermediate[p.security_id] = (p.timestamp, p.close)
         return {sid: close for sid, (_, close) in intermediate.items()}
 
+    @override
+    async def get_moved_security_ids(self, since: datetime) -> list[SecurityId]:
+        return list(await self.get_latest_intraday_close_by_security())
+
+    @override
+    async def get_latest_intraday_close(
+        self, security_ids: Iterable[SecurityId]
+    ) -> dict[SecurityId, Decimal]:
+        ids = set(security_ids)
+        latest = await self.get_latest_intraday_close_by_security()
+        return {sid: close for sid, close in latest.items() if sid in ids}
+
+    @override
+    async def get_latest_timestamps_by_security(self) -> dict[SecurityId, datetime]:
+        latest: dict[SecurityId, datetime] = {}
+        for p in self.saved_prices:
+            if p.security_id not in latest or p.timestamp > latest[p.security_id]:
+                latest[p.security_id] = p.timestamp
+        return latest
+
+    @override
+    async def get_intraday_4h_prices(
+        self,
+        security_id: SecurityId,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> list[IntradayPriceSchema]:
+        return []
+
+    @override
+    async def create_intraday_partitions(self, months: list[date]) -> list[str]:
+        self.partition_months = months
+        return [f"p{month:%Y_%m}" for month in months]
+
+    @override
+    async def downsample_intraday_prices(self, before: datetime) -> int:
+        self.downsample_cutoff = before
+        return 1
+
 
 class MockEodhdGateway(MarketGateway):
     def __init__(self, should_fail: bool = False):  # noqa: FBT001, FBT002
@@ -149,6 +204,10 @@ class MockEodhdGateway(MarketGateway):
             )
         ]
 
+    @override
+    def get_bulk_last_day(self, exchange, date=None):
+        return []
+
     @override
     def get_intraday_prices(
         self,
@@ -250,9 +309,7 @@ async def test_update_daily_prices_failure_continues():
             if symbol == "BAD":
                 msg = "API Error"
                 raise RuntimeError(msg)
-            return super().get_prices(
-                security_id, symbol, exchange, from_date, to_date
-            )
+            return super().get_prices(security_id, symbol, exchange, from_date, to_date)
 
     service = MarketService(
         gateway=FlakyGateway(),
@@ -294,11 +351,16 @@ async def test_update_intraday_prices_for_all_securities():
         intraday_price_repository=intraday_price_repo,
     )
 
-    result = await service.update_intraday_prices_for_all_securities()
+    saved: list = []
+    result = await service.update_intraday_prices_for_all_securities(
+        on_saved=saved.append
+    )
 
     assert result == {"success": 1, "failure": 0}
     assert len(intraday_price_repo.saved_prices) == 1
     assert intraday_price_repo.saved_prices[0].security_id == securities[0].id
+    # The hook is told about every security whose bars were stored
+    assert saved == [securities[0].id]
 
     # Verify populated-then-retrieved path: the repository returns rows
     # when queried for the security (end-to-end coverage for issue #140)
@@ -367,6 +429,235 @@ async def test_update_intraday_prices_failure_continues():
     assert intraday_price_repo.saved_prices[0].security_id == securities[1].id
 
 
+class RecordingGateway(MockEodhdGateway):
+    def __init__(self):
+        super().__init__()
+        self.daily_ranges: dict[str, tuple[date, date]] = {}
+        self.intraday_ranges: dict[str, tuple[datetime, datetime]] = {}
+
+    @override
+    def get_prices(self, security_id, symbol, exchange, from_date, to_date):
+        self.daily_ranges[symbol] = (from_date, to_date)
+        return super().get_prices(security_id, symbol, exchange, from_date, to_date)
+
+    @override
+    def get_intraday_prices(
+        self,
+        security_id,
+        symbol,
+        exchange,
+        from_datetime,
+        to_datetime,
+        interval="1h",
+    ):
+        self.intraday_ranges[symbol] = (from_datetime, to_datetime)
+        return super().get_intraday_prices(
+            security_id, symbol, exchange, from_datetime, to_datetime, interval
+        )
+
+
+def _watermark_securities() -> list[SecuritySchema]:
+    return [
+        SecuritySchema(
+            id=uuid4(),
+            symbol=symbol,
+            exchange="US",
+            currency="USD",
+            name=symbol,
+            isin=None,
+            is_active=True,
+            updated_at=datetime.now(UTC),
+        )
+        for symbol in ("OLD", "NEW")
+    ]
+
+
+@pytest.mark.anyio
+async def test_update_daily_prices_resumes_from_watermark():
+    securities = _watermark_securities()
+    today = datetime.now(UTC).date()
+    price_repo = MockPriceRepository()
+    price_repo.saved_prices.append(
+        PriceSchema(
+            security_id=securities[0].id,
+            date=today - timedelta(days=1),
+            open=Decimal("100.0"),
+            high=Decimal("105.0"),
+            low=Decimal("95.0"),
+            close=Decimal("102.0"),
+            adjusted_close=Decimal("102.0"),
+            volume=1000,
+        )
+    )
+    gateway = RecordingGateway()
+    service = MarketService(
+        gateway=gateway,
+        price_repository=price_repo,
+        security_repository=MockSecurityRepository(securities),
+        intraday_price_repository=MockIntradayPriceRepository(),
+    )
+
+    with patch.object(settings, "eodhd_bulk_eod_enabled", new=False):
+        result = await service.update_daily_prices_for_all_securities()
+
+    assert result == {"success": 2, "failure": 0}
+    # Known security resumes from its watermark minus the overlap
+    assert gateway.daily_ranges["OLD"] == (today - timedelta(days=6), today)
+    # Security without prices gets the full window
+    assert gateway.daily_ranges["NEW"] == (today - timedelta(days=365), today)
+
+    await service.update_daily_prices_for_all_securities(full_refresh=True)
+
+    assert gateway.daily_ranges["OLD"] == (today - timedelta(days=365), today)
+
+
+class BulkGateway(RecordingGateway):
+    """Gateway answering bulk downloads with a price per ticker for the day."""
+
+    def __init__(self, codes=("OLD", "UNTRACKED"), failing_days=()):
+        super().__init__()
+        self.codes = codes
+        self.failing_days = set(failing_days)
+        self.bulk_requests: list[tuple[str, date | None]] = []
+
+    @override
+    def get_bulk_last_day(self, exchange, date=None):
+        self.bulk_requests.append((exchange, date))
+        if date in self.failing_days:
+            raise ValueError(date)
+        return [
+            BulkLastDayPrice(
+                code=code,
+                exchange=exchange,
+                date=date,
+                open=Decimal("101.0"),
+                high=Decimal("103.0"),
+                low=Decimal("100.0"),
+                close=Decimal("102.5"),
+                adjusted_close=Decimal("102.5"),
+                volume=500,
+            )
+            for code in self.codes
+        ]
+
+
+def _bulk_price_repository(security_id, watermark: date) -> MockPriceRepository:
+    price_repo = MockPriceRepository()
+    price_repo.saved_prices.append(
+        PriceSchema(
+            security_id=security_id,
+            date=watermark,
+            open=Decimal("100.0"),
+            high=Decimal("105.0"),
+            low=Decimal("95.0"),
+            close=Decimal("102.0"),
+            adjusted_close=Decimal("102.0"),
+            volume=1000,
+        )
+    )
+    return price_repo
+
+
+@pytest.mark.anyio
+async def test_update_daily_prices_uses_bulk_download_per_exchange_and_day():
+    securities = _watermark_securities()
+    today = datetime.now(UTC).date()
+    watermark = today - timedelta(days=3)
+    price_repo = _bulk_price_repository(securities[0].id, watermark)
+    gateway = BulkGateway()
+    service = MarketService(
+        gateway=gateway,
+        price_repository=price_repo,
+        security_repository=MockSecurityRepository(securities),
+        intraday_price_repository=MockIntradayPriceRepository(),
+    )
+
+    saved: list = []
+    result = await service.update_daily_prices_for_all_securities(
+        on_saved=saved.append
+    )
+
+    # Every missed weekday is downloaded, not only the last one
+    missed = weekdays_after(watermark, today)
+    assert sorted(gateway.bulk_requests) == [("US", day) for day in missed]
+    assert result == {"success": 2, "failure": 0}
+    # Both the bulk and the per-symbol paths report saved securities, once
+    assert sorted(saved) == sorted(security.id for security in securities)
+    # Up-to-date security came from the bulk download, the new one per symbol
+    assert "OLD" not in gateway.daily_ranges
+    assert "NEW" in gateway.daily_ranges
+    bulk_saved = {
+        p.date for p in price_repo.saved_prices if p.security_id == securities[0].id
+    }
+    assert bulk_saved == {watermark, *missed}
+
+
+@pytest.mark.anyio
+async def test_update_daily_prices_falls_back_per_symbol_on_bulk_gaps():
+    securities = _watermark_securities()[:1]
+    today = datetime.now(UTC).date()
+    # Wednesday before last: the missed days always span a full week
+    watermark = today - timedelta(days=today.weekday() + 5)
+    missed = weekdays_after(watermark, today)
+
+    async def update(gateway: BulkGateway) -> None:
+        await MarketService(
+            gateway=gateway,
+            price_repository=_bulk_price_repository(securities[0].id, watermark),
+            security_repository=MockSecurityRepository(securities),
+            intraday_price_repository=MockIntradayPriceRepository(),
+        ).update_daily_prices_for_all_securities()
+
+    with patch.object(settings, "daily_price_bulk_max_gap_days", 14):
+        # A failed day leaves a hole the bulk path cannot fill
+        failing = BulkGateway(failing_days=[missed[1]])
+        await update(failing)
+        assert "OLD" in failing.daily_ranges
+
+        # So does a day the exchange traded without the security
+        absent = BulkGateway(codes=("UNTRACKED",))
+        await update(absent)
+        assert "OLD" in absent.daily_ranges
+
+        # Days without any trade (holidays, today before the close) are no gap
+        closed = BulkGateway(codes=())
+        await update(closed)
+        assert "OLD" not in closed.daily_ranges
+
+
+@pytest.mark.anyio
+async def test_update_intraday_prices_resumes_from_watermark():
+    securities = _watermark_securities()
+    watermark = datetime.now(UTC) - timedelta(hours=2)
+    intraday_price_repo = MockIntradayPriceRepository()
+    intraday_price_repo.saved_prices.append(
+        IntradayPriceSchema(
+            security_id=securities[0].id,
+            timestamp=watermark,
+            open=Decimal("100.0"),
+            high=Decimal("105.0"),
+            low=Decimal("95.0"),
+            close=Decimal("102.0"),
+            volume=1000,
+        )
+    )
+    gateway = RecordingGateway()
+    service = MarketService(
+        gateway=gateway,
+        price_repository=MockPriceRepository(),
+        security_repository=MockSecurityRepository(securities),
+        intraday_price_repository=intraday_price_repo,
+    )
+
+    result = await service.update_intraday_prices_for_all_securities()
+
+    assert result == {"success": 2, "failure": 0}
+    from_old, _ = gateway.intraday_ranges["OLD"]
+    assert from_old == watermark - timedelta(hours=6)
+    from_new, to_new = gateway.intraday_ranges["NEW"]
+    assert to_new - from_new == timedelta(days=7)
+
+
 @pytest.mark.anyio
 async def test_fetch_and_save_intraday_prices_success():
     security = SecuritySchema(
@@ -529,6 +820,31 @@ async def test_fetch_and_save_intraday_prices_gateway_error():
     assert len(intraday_price_repo.saved_prices) == 0
 
 
+@pytest.mark.anyio
+async def test_maintain_intraday_price_storage(monkeypatch):
+    monkeypatch.setattr(
+        "src.market.service.settings.intraday_partition_months_ahead", 2
+    )
+    monkeypatch.setattr("src.market.service.settings.intraday_price_retention_days", 30)
+    intraday_price_repo = MockIntradayPriceRepository()
+    service = MarketService(
+        gateway=MockEodhdGateway(),
+        price_repository=MockPriceRepository(),
+        security_repository=MockSecurityRepository([]),
+        intraday_price_repository=intraday_price_repo,
+    )
+
+    result = await service.maintain_intraday_price_storage()
+
+    assert result == {"created": 3, "dropped": 1}
+    today = datetime.now(UTC).date()
+    assert intraday_price_repo.partition_months[0] == today.replace(day=1)
+    assert len(intraday_price_repo.partition_months) == 3
+    assert intraday_price_repo.downsample_cutoff == datetime.combine(
+        today - timedelta(days=30), datetime.min.time(), tzinfo=UTC
+    )
+
+
 def test_aggregate_weekly_prices_unit():
     """Test unit logic of aggregate_weekly_prices in service."""
     from dateutil.parser import parse
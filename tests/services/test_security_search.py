@@ -0,0 +1,99 @@
+"""Tests for the security search service."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.market.api_types import SecuritySearchResult
+from src.market.search import SecuritySearchService, normalize_query
+
+
+def _result(code: str, exchange: str = "US") -> SecuritySearchResult:
+    return SecuritySearchResult(
+        code=code,
+        exchange=exchange,
+        name=f"{code} Inc",
+        currency="USD",
+        security_type="Common Stock",
+        isin=None,
+        country="USA",
+    )
+
+
+def _service(
+    cached: list[SecuritySearchResult] | None = None,
+    local: list[SecuritySearchResult] | None = None,
+    upstream: list[SecuritySearchResult] | None = None,
+) -> tuple[SecuritySearchService, AsyncMock, AsyncMock, AsyncMock]:
+    gateway = AsyncMock()
+    gateway.search.return_value = upstream or []
+    index_repository = AsyncMock()
+    index_repository.search.return_value = local or []
+    cache = AsyncMock()
+    cache.get.return_value = cached
+    service = SecuritySearchService(
+        gateway=gateway, index_repository=index_repository, cache=cache
+    )
+    return service, gateway, index_repository, cache
+
+
+def test_normalize_query():
+    assert normalize_query("  Apple   INC ") == "apple inc"
+
+
+@pytest.mark.anyio
+async def test_search_returns_cached_results():
+    service, gateway, index_repository, _ = _service(cached=[_result("AAPL")])
+
+    results = await service.search("AAPL")
+
+    assert [r.code for r in results] == ["AAPL"]
+    index_repository.search.assert_not_awaited()
+    gateway.search.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_search_answers_from_local_index(monkeypatch):
+    monkeypatch.setattr(
+        "src.market.search.settings.security_search_min_local_results", 2
+    )
+    local = [_result("AAPL"), _result("APLE")]
+    service, gateway, index_repository, _ = _service(local=local)
+
+    results = await service.search(" Ap ")
+
+    assert results == local
+    index_repository.search.assert_awaited_once()
+    assert index_repository.search.await_args.args[0] == "ap"
+    gateway.search.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_search_fetches_cold_queries_from_provider(monkeypatch):
+    monkeypatch.setattr(
+        "src.market.search.settings.security_search_min_local_results", 3
+    )
+    upstream = [_result("AAPL"), _result("AAPL", exchange="MX")]
+    service, gateway, index_repository, cache = _service(
+        local=[_result("AAPL", exchange="MX"), _result("APP")], upstream=upstream
+    )
+
+    results = await service.search("Ap")
+
+    gateway.search.assert_awaited_once_with("ap")
+    index_repository.upsert.assert_awaited_once_with(upstream)
+    cache.set.assert_awaited_once_with("ap", upstream)
+    assert [(r.code, r.exchange) for r in results] == [
+        ("AAPL", "US"),
+        ("AAPL", "MX"),
+        ("APP", "US"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_search_ignores_blank_queries():
+    service, gateway, _, cache = _service()
+
+    assert await service.search("   ") == []
+    cache.get.assert_not_awaited()
+    gateway.search.assert_not_awaited()
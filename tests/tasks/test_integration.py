@@ -125,9 +125,15 @@ async def test_sync_account_positions_task_success(mock_account, mock_integratio
         patch("src.integration.task.mark_sync_finished", AsyncMock()),
     ):
         await _sync_account_positions_task(
-            user_id, mock_account, broker_account_id, broker_class
+            user_id,
+            mock_account,
+            broker_account_id,
+            broker_class,
+            refresh_security_metadata=True,
         )
 
+        # A manual resync re-fetches the broker's security metadata
+        assert mock_broker.refresh_security_metadata is True
         mock_integration_user_repo.get.assert_awaited_once_with(
             mock_account.integration_user_id
         )
@@ -203,7 +209,7 @@ def test_sync_account_positions_task_calls_async_logic():
     broker_account_id = "broker-id"
     broker_class = cast("type[BrokerApiGateway]", MagicMock())
 
-    with patch("src.integration.task.asyncio.run") as mock_run:
+    with patch("src.integration.task.worker_runtime.submit") as mock_run:
         sync_account_positions_task(user_id, account, broker_account_id, broker_class)
         mock_run.assert_called_once()
         args = mock_run.call_args[0]
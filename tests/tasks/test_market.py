@@ -1,4 +1,5 @@
 import asyncio
+from decimal import Decimal
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -10,10 +11,15 @@ from stockholm import Currency, Money
 from src.account.api_types import AccountTotals
 from src.account.service.account import AccountService
 from src.account.service.position import PositionService
+from src.market.alert_service import AlertEvaluationService
+from src.market.repository import IntradayPriceRepository
+from src.market.schema import AlertForEvaluation
 from src.market.service import MarketService
 from src.market.task import (
     _daily_price_update,
     _hourly_intraday_price_update,
+    _push_security_price,
+    _weekly_full_price_refresh,
     daily_price_update,
     hourly_intraday_price_update,
 )
@@ -38,7 +44,8 @@ async def test_daily_price_update_success():
     ):
         await _daily_price_update()
 
-        mock_container.aget.assert_awaited_once_with(MarketService)
+        mock_container.aget.assert_any_await(MarketService)
+        mock_container.aget.assert_any_await(AlertEvaluationService)
         mock_market_service.update_daily_prices_for_all_securities.assert_awaited_once()
 
 
@@ -74,6 +81,41 @@ async def test_daily_price_update_raises_if_no_container():
         await _daily_price_update()
 
 
+@pytest.mark.asyncio
+async def test_weekly_full_price_refresh_requests_full_windows():
+    mock_market_service = AsyncMock()
+    mock_market_service.update_daily_prices_for_all_securities.return_value = {
+        "success": 2,
+        "failure": 0,
+    }
+    mock_market_service.update_intraday_prices_for_all_securities.return_value = {
+        "success": 2,
+        "failure": 0,
+    }
+
+    mock_container = AsyncMock()
+    mock_container.aget.return_value = mock_market_service
+    mock_container.__aenter__.return_value = mock_container
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+    ):
+        await _weekly_full_price_refresh()
+
+    mock_market_service.update_daily_prices_for_all_securities.assert_awaited_once_with(
+        full_refresh=True
+    )
+    mock_market_service.update_intraday_prices_for_all_securities.assert_awaited_once_with(
+        full_refresh=True
+    )
+
+
+def test_weekly_full_price_refresh_in_huey_periodic_tasks():
+    task_names = {item.name for item in huey._registry.periodic_tasks}
+    assert "weekly_full_price_refresh" in task_names
+
+
 def test_daily_price_update_is_periodic_task():
     assert hasattr(daily_price_update, "orig_fn") or callable(daily_price_update)
 
@@ -81,7 +123,7 @@ def test_daily_price_update_is_periodic_task():
 def test_daily_price_update_calls_async_logic():
     huey.immediate = True
 
-    with patch("src.market.task.asyncio.run") as mock_run:
+    with patch("src.market.task.worker_runtime.submit") as mock_run:
         daily_price_update()
         mock_run.assert_called_once()
         args = mock_run.call_args[0]
@@ -98,17 +140,14 @@ async def test_hourly_intraday_price_update_success():
         "success": 2,
         "failure": 0,
     }
-    mock_account_service = AsyncMock()
-    mock_account_service.get_all_accounts.return_value = []
-    mock_position_service = AsyncMock()
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_moved_security_ids.return_value = []
 
     async def mock_aget(service_type):
         if service_type is MarketService:
             return mock_market_service
-        if service_type is AccountService:
-            return mock_account_service
-        if service_type is PositionService:
-            return mock_position_service
+        if service_type is IntradayPriceRepository:
+            return mock_intraday_repo
         return AsyncMock()
 
     mock_container = AsyncMock()
@@ -149,17 +188,14 @@ async def test_hourly_intraday_price_update_logs_results():
         "success": 3,
         "failure": 1,
     }
-    mock_account_service = AsyncMock()
-    mock_account_service.get_all_accounts.return_value = []
-    mock_position_service = AsyncMock()
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_moved_security_ids.return_value = []
 
     async def mock_aget(service_type):
         if service_type is MarketService:
             return mock_market_service
-        if service_type is AccountService:
-            return mock_account_service
-        if service_type is PositionService:
-            return mock_position_service
+        if service_type is IntradayPriceRepository:
+            return mock_intraday_repo
         return AsyncMock()
 
     mock_container = AsyncMock()
@@ -178,42 +214,57 @@ async def test_hourly_intraday_price_update_logs_results():
         assert any("3" in call and "1" in call for call in log_calls)
 
 
+def _fake_account():
+    account = MagicMock()
+    account.id = uuid4()
+    account.user_id = uuid4()
+    account.currency = Currency.USD
+    return account
+
+
 @pytest.mark.asyncio
-async def test_hourly_intraday_price_update_recalculates_totals_and_sends_ws_message():
+async def test_hourly_intraday_price_update_pushes_totals_of_moved_holdings():
+    """Only online accounts holding a security whose price moved get a push."""
+    moved_id = uuid4()
     mock_market_service = AsyncMock(spec=MarketService)
     mock_market_service.update_intraday_prices_for_all_securities.return_value = {
         "success": 1,
         "failure": 0,
     }
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_moved_security_ids.return_value = [moved_id]
 
-    fake_account = MagicMock()
-    fake_account.id = uuid4()
-    fake_account.user_id = uuid4()
-    fake_account.currency = Currency.USD
-    fake_account.is_active = True
-
-    fake_inactive_account = MagicMock()
-    fake_inactive_account.id = uuid4()
-    fake_inactive_account.user_id = uuid4()
-    fake_inactive_account.currency = Currency.USD
-    fake_inactive_account.is_active = False
-
-    mock_account_service = AsyncMock(spec=AccountService)
-    mock_account_service.get_all_accounts.return_value = [
-        fake_account,
-        fake_inactive_account,
-    ]
+    first, second, failing = _fake_account(), _fake_account(), _fake_account()
+    offline = _fake_account()
+
+    async def stream_accounts(_security_ids, _batch_size):
+        yield [first, second]
+        yield [failing, offline]
+
+    async def is_online(user_ids):
+        return {user_id: user_id != offline.user_id for user_id in user_ids}
+
+    mock_account_service = MagicMock(spec=AccountService)
+    mock_account_service.stream_active_accounts_holding.side_effect = stream_accounts
 
     fake_totals = AccountTotals(
         cost=Money(100, Currency.USD),
         value=Money(120, Currency.USD),
     )
+
+    async def get_total_for_account(account_id, _currency):
+        if account_id == failing.id:
+            raise RuntimeError("db down")
+        return fake_totals
+
     mock_position_service = AsyncMock(spec=PositionService)
-    mock_position_service.get_total_for_account.return_value = fake_totals
+    mock_position_service.get_total_for_account.side_effect = get_total_for_account
 
     async def mock_aget(service_type):
         if service_type is MarketService:
             return mock_market_service
+        if service_type is IntradayPriceRepository:
+            return mock_intraday_repo
         if service_type is AccountService:
             return mock_account_service
         if service_type is PositionService:
@@ -228,21 +279,63 @@ async def test_hourly_intraday_price_update_recalculates_totals_and_sends_ws_mes
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
         patch("src.market.task.ws_manager") as mock_ws_manager,
-        patch("src.market.task.check_and_dispatch_price_alerts"),
+        patch("src.market.task.settings.ws_totals_push_batch_size", 2),
     ):
         mock_ws_manager.send_personal_message = AsyncMock()
+        mock_ws_manager.is_online = AsyncMock(side_effect=is_online)
+        mock_ws_manager.get_subscribed_security_ids = AsyncMock(return_value=set())
         await _hourly_intraday_price_update()
 
-        mock_account_service.get_all_accounts.assert_awaited_once()
-        mock_position_service.get_total_for_account.assert_awaited_once_with(
-            fake_account.id, fake_account.currency
-        )
-        mock_ws_manager.send_personal_message.assert_awaited_once()
-        call_args = mock_ws_manager.send_personal_message.call_args
-        args_payload, user_id_arg = call_args[0]
-        assert user_id_arg == fake_account.user_id
-        assert args_payload["type"] == "account_totals_updated"
-        assert args_payload["account_id"] == str(fake_account.id)
+    mock_account_service.stream_active_accounts_holding.assert_called_once_with(
+        [moved_id], 2
+    )
+    assert mock_ws_manager.is_online.await_count == 2
+    # The offline user's totals are not even computed
+    assert mock_position_service.get_total_for_account.await_count == 3
+    # The failing account is skipped, the others are still pushed
+    assert mock_ws_manager.send_personal_message.await_count == 2
+    pushed = {
+        call.args[1]: call.args[0]
+        for call in mock_ws_manager.send_personal_message.call_args_list
+    }
+    assert set(pushed) == {first.user_id, second.user_id}
+    payload = pushed[first.user_id]
+    assert payload["type"] == "account_totals_updated"
+    assert payload["account_id"] == str(first.id)
+
+
+@pytest.mark.asyncio
+async def test_hourly_intraday_price_update_skips_push_when_nothing_moved():
+    mock_market_service = AsyncMock(spec=MarketService)
+    mock_market_service.update_intraday_prices_for_all_securities.return_value = {
+        "success": 0,
+        "failure": 0,
+    }
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_moved_security_ids.return_value = []
+    mock_account_service = MagicMock(spec=AccountService)
+
+    async def mock_aget(service_type):
+        if service_type is MarketService:
+            return mock_market_service
+        if service_type is IntradayPriceRepository:
+            return mock_intraday_repo
+        if service_type is AccountService:
+            return mock_account_service
+        return AsyncMock()
+
+    mock_container = AsyncMock()
+    mock_container.aget.side_effect = mock_aget
+    mock_container.__aenter__.return_value = mock_container
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+    ):
+        await _hourly_intraday_price_update()
+
+    mock_intraday_repo.get_moved_security_ids.assert_awaited_once()
+    mock_account_service.stream_active_accounts_holding.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -286,7 +379,7 @@ def test_daily_price_update_in_huey_periodic_tasks():
 def test_hourly_intraday_price_update_calls_async_logic():
     huey.immediate = True
 
-    with patch("src.market.task.asyncio.run") as mock_run:
+    with patch("src.market.task.worker_runtime.submit") as mock_run:
         hourly_intraday_price_update()
         mock_run.assert_called_once()
         args = mock_run.call_args[0]
@@ -299,76 +392,189 @@ def test_hourly_intraday_price_update_calls_async_logic():
 # -- Stage 1 enqueue isolation --
 
 
-@pytest.mark.asyncio
-async def test_hourly_intraday_price_update_enqueues_check_and_dispatch():
-    """Stage 1 enqueues check_and_dispatch_price_alerts at the end."""
-    mock_market_service = AsyncMock()
-    mock_market_service.update_intraday_prices_for_all_securities.return_value = {
-        "success": 1,
-        "failure": 0,
-    }
-    mock_account_service = AsyncMock()
-    mock_account_service.get_all_accounts.return_value = []
-    mock_position_service = AsyncMock()
+def _hourly_update_container(mock_market_service, mock_alert_service):
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_moved_security_ids.return_value = []
 
     async def mock_aget(service_type):
         if service_type is MarketService:
             return mock_market_service
-        if service_type is AccountService:
-            return mock_account_service
-        if service_type is PositionService:
-            return mock_position_service
+        if service_type is IntradayPriceRepository:
+            return mock_intraday_repo
+        if service_type is AlertEvaluationService:
+            return mock_alert_service
         return AsyncMock()
 
     mock_container = AsyncMock()
     mock_container.aget.side_effect = mock_aget
     mock_container.__aenter__.return_value = mock_container
+    return mock_container
+
+
+def _alert(alert_id, security_id, user_id):
+    return AlertForEvaluation(
+        alert_id=alert_id,
+        security_id=security_id,
+        security_symbol="AAPL",
+        security_name="Apple",
+        user_id=user_id,
+        target_price=Decimal(150),
+        condition="above",
+    )
+
+
+@pytest.mark.asyncio
+async def test_hourly_intraday_price_update_dispatches_one_digest_per_run():
+    """Alerted securities are evaluated together once the run ends."""
+    alerted_ids, other_id, user_id = (uuid4(), uuid4()), uuid4(), uuid4()
+
+    async def update_intraday_prices(*, on_saved):
+        for security_id in (*alerted_ids, other_id, alerted_ids[0]):
+            on_saved(security_id)
+        return {"success": 3, "failure": 0}
+
+    mock_market_service = AsyncMock()
+    mock_market_service.update_intraday_prices_for_all_securities.side_effect = (
+        update_intraday_prices
+    )
+    mock_alert_service = AsyncMock(spec=AlertEvaluationService)
+    mock_alert_service.get_alerted_security_ids.return_value = set(alerted_ids)
+    mock_alert_service.evaluate_securities.return_value = [
+        _alert(alert_id, security_id, user_id)
+        for alert_id, security_id in enumerate(alerted_ids, start=1)
+    ]
+    mock_container = _hourly_update_container(mock_market_service, mock_alert_service)
 
     with (
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
+        patch("src.market.task.alert_digest_dispatch_task") as mock_dispatch,
         patch("src.market.task.check_and_dispatch_price_alerts") as mock_check,
     ):
         await _hourly_intraday_price_update()
 
-    mock_check.assert_called_once()
+    mock_alert_service.get_alerted_security_ids.assert_awaited_once()
+    mock_alert_service.evaluate_securities.assert_awaited_once()
+    evaluated = mock_alert_service.evaluate_securities.call_args[0][0]
+    assert sorted(evaluated, key=str) == sorted(alerted_ids, key=str)
+    # A single digest dispatch carries the alerts of every security
+    mock_dispatch.assert_called_once()
+    assert mock_dispatch.call_args[0][0] == [1, 2]
+    # No hourly sweep over all alerts anymore
+    mock_check.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_hourly_intraday_price_update_check_dispatch_failure_doesnt_abort():
-    """If check_and_dispatch_price_alerts raises, Stage 1 still completes."""
-    mock_market_service = AsyncMock()
-    mock_market_service.update_intraday_prices_for_all_securities.return_value = {
-        "success": 1,
-        "failure": 0,
-    }
-    mock_account_service = AsyncMock()
-    mock_account_service.get_all_accounts.return_value = []
-    mock_position_service = AsyncMock()
+async def test_hourly_intraday_price_update_alert_failures_dont_abort():
+    """Failing to load, evaluate or enqueue alerts keeps ingestion going."""
+    security_id = uuid4()
 
-    async def mock_aget(service_type):
-        if service_type is MarketService:
-            return mock_market_service
-        if service_type is AccountService:
-            return mock_account_service
-        if service_type is PositionService:
-            return mock_position_service
-        return AsyncMock()
+    async def update_intraday_prices(*, on_saved):
+        on_saved(security_id)
+        return {"success": 1, "failure": 0}
 
-    mock_container = AsyncMock()
-    mock_container.aget.side_effect = mock_aget
-    mock_container.__aenter__.return_value = mock_container
+    mock_market_service = AsyncMock()
+    mock_market_service.update_intraday_prices_for_all_securities.side_effect = (
+        update_intraday_prices
+    )
+    mock_alert_service = AsyncMock(spec=AlertEvaluationService)
+    mock_alert_service.get_alerted_security_ids.return_value = {security_id}
+    mock_alert_service.evaluate_securities.return_value = [
+        _alert(1, security_id, uuid4())
+    ]
+    mock_container = _hourly_update_container(mock_market_service, mock_alert_service)
 
     with (
         patch("src.market.task.huey.svcs_registry", MagicMock()),
         patch("src.market.task.Container", return_value=mock_container),
         patch(
-            "src.market.task.check_and_dispatch_price_alerts",
+            "src.market.task.alert_digest_dispatch_task",
             side_effect=RuntimeError("enqueue failed"),
         ),
     ):
-        # Should NOT raise — the try/except isolates the enqueue
         await _hourly_intraday_price_update()
 
-    # Market service was called despite enqueue failure
-    mock_market_service.update_intraday_prices_for_all_securities.assert_awaited_once()
+    mock_alert_service.evaluate_securities.side_effect = RuntimeError("db down")
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+        patch("src.market.task.alert_digest_dispatch_task") as mock_dispatch,
+    ):
+        await _hourly_intraday_price_update()
+
+    mock_alert_service.get_alerted_security_ids.side_effect = RuntimeError("db down")
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+    ):
+        await _hourly_intraday_price_update()
+
+    mock_dispatch.assert_not_called()
+    assert mock_alert_service.evaluate_securities.await_count == 2
+    assert (
+        mock_market_service.update_intraday_prices_for_all_securities.await_count == 3
+    )
+
+
+@pytest.mark.asyncio
+async def test_hourly_intraday_price_update_pushes_prices_of_subscribed_securities():
+    subscribed_id, other_id = uuid4(), uuid4()
+
+    async def update_intraday_prices(*, on_saved):
+        on_saved(subscribed_id)
+        on_saved(other_id)
+        return {"success": 2, "failure": 0}
+
+    mock_market_service = AsyncMock()
+    mock_market_service.update_intraday_prices_for_all_securities.side_effect = (
+        update_intraday_prices
+    )
+    mock_alert_service = AsyncMock(spec=AlertEvaluationService)
+    mock_alert_service.get_alerted_security_ids.return_value = set()
+    mock_container = _hourly_update_container(mock_market_service, mock_alert_service)
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+        patch(
+            "src.market.task.ws_manager.get_subscribed_security_ids",
+            AsyncMock(return_value={subscribed_id}),
+        ),
+        patch("src.market.task.push_security_price_task") as mock_push,
+    ):
+        await _hourly_intraday_price_update()
+
+    mock_push.assert_called_once_with(subscribed_id)
+
+
+@pytest.mark.asyncio
+async def test_push_security_price_sends_latest_close_to_subscribers():
+    security_id = uuid4()
+    mock_intraday_repo = AsyncMock(spec=IntradayPriceRepository)
+    mock_intraday_repo.get_latest_intraday_close.return_value = {
+        security_id: Decimal("12.5")
+    }
+    mock_container = AsyncMock()
+    mock_container.aget.return_value = mock_intraday_repo
+    mock_container.__aenter__.return_value = mock_container
+
+    with (
+        patch("src.market.task.huey.svcs_registry", MagicMock()),
+        patch("src.market.task.Container", return_value=mock_container),
+        patch("src.market.task.ws_manager") as mock_ws_manager,
+    ):
+        mock_ws_manager.send_security_message = AsyncMock()
+        await _push_security_price(security_id)
+
+        mock_ws_manager.send_security_message.assert_awaited_once_with(
+            {
+                "type": "security_price_updated",
+                "security_id": str(security_id),
+                "close": "12.5",
+            },
+            security_id,
+        )
+
+        mock_intraday_repo.get_latest_intraday_close.return_value = {}
+        await _push_security_price(security_id)
+        mock_ws_manager.send_security_message.assert_awaited_once()
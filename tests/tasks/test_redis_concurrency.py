@@ -1,134 +1,87 @@
 import asyncio
 import concurrent.futures
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.integration.sync_status import RedisManager
-from src.ws.manager import ConnectionManager
+from src.core.redis import RedisPool
+from src.core.runtime import WorkerRuntime
 
-_orig_init_redis = ConnectionManager.init_redis
-_orig_close = ConnectionManager.close
+
+@pytest.fixture
+def clients():
+    """Patch the Redis client class, recording every client the pool creates."""
+    created: list[MagicMock] = []
+
+    def create_client(**_kwargs):
+        client = MagicMock()
+        client.aclose = AsyncMock()
+        created.append(client)
+        return client
+
+    with patch("src.core.redis.aioredis.Redis", side_effect=create_client):
+        yield created
 
 
 @pytest.mark.asyncio
-async def test_redis_manager_concurrency():
-    """Verify that RedisManager manages loop-scoped clients and cleans up closed loops."""
-    redis_url = "redis://localhost:6379/0"
-    manager = RedisManager(redis_url)
-
-    mock_client_instances = []
-
-    def mock_from_url(*args, **kwargs):
-        mock_client = AsyncMock()
-        mock_client_instances.append(mock_client)
-        return mock_client
-
-    with patch("redis.asyncio.from_url", side_effect=mock_from_url):
-        # 1. Run in two different threads, each creating its own event loop
-        def run_in_thread():
-            async def task():
-                async with manager.client() as client:
-                    loop = asyncio.get_running_loop()
-                    assert loop in manager._clients
-                    return client, loop
-
-            return asyncio.run(task())
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            futures = [executor.submit(run_in_thread) for _ in range(2)]
-            results = [f.result() for f in futures]
-
-        # Verify that two distinct loops were used
-        client1, loop1 = results[0]
-        client2, loop2 = results[1]
-
-        assert loop1 is not loop2
-        # Verify that they got different client instances
-        assert client1 is not client2
-        assert len(mock_client_instances) == 2
-
-        # Since these threads finished, their loops are closed.
-        assert loop1.is_closed()
-        assert loop2.is_closed()
-
-        # 2. Access from the current test running loop
-        current_loop = asyncio.get_running_loop()
-        async with manager.client() as current_client:
-            # Running manager.client() should clean up the closed loops
-            assert loop1 not in manager._clients
-            assert loop2 not in manager._clients
-            # The current loop client should be initialized
-            assert current_loop in manager._clients
-            assert manager._clients[current_loop] is current_client
-
-        # Verify that aclose was called on the closed loops' clients
-        for client in mock_client_instances:
-            if client is not current_client:
-                client.aclose.assert_called()
-
-        await manager.close()
-        assert len(manager._clients) == 0
+async def test_redis_pool_keeps_one_client_per_loop(clients):
+    """Verify that RedisPool shares a client per loop and closes the loop's own."""
+    pool = RedisPool("redis://localhost:6379/0")
+
+    def run_in_thread():
+        async def task():
+            return pool.client(), pool.client(), asyncio.get_running_loop()
+
+        return asyncio.run(task())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        (a1, a2, loop1), (b1, b2, loop2) = executor.map(
+            lambda _: run_in_thread(), range(2)
+        )
+
+    assert loop1 is not loop2
+    assert a1 is a2
+    assert b1 is b2
+    assert a1 is not b1
+
+    current_client = pool.client()
+    assert current_client is pool.client()
+    assert len(clients) == 3
+
+    await pool.aclose()
+    current_client.aclose.assert_awaited_once_with(close_connection_pool=True)
+    a1.aclose.assert_not_awaited()
+    assert pool.client() is not current_client
 
 
 @pytest.mark.asyncio
-async def test_connection_manager_concurrency():
-    """Verify that ConnectionManager manages loop-scoped clients and cleans up closed loops."""
-    redis_url = "redis://localhost:6379/0"
-    manager = ConnectionManager()
-
-    mock_client_instances = []
-
-    def mock_from_url(*args, **kwargs):
-        mock_client = AsyncMock()
-        mock_client_instances.append(mock_client)
-        return mock_client
-
-    with (
-        patch.object(ConnectionManager, "init_redis", _orig_init_redis),
-        patch.object(ConnectionManager, "close", _orig_close),
-        patch("redis.asyncio.from_url", side_effect=mock_from_url),
-    ):
-        # 1. Run in two different threads/event loops
-        def run_in_thread():
-            async def task():
-                await manager.init_redis(redis_url, run_listener=False)
-                client = manager.get_redis_client()
-                loop = asyncio.get_running_loop()
-                assert loop in manager._clients
-                return client, loop
-
-            return asyncio.run(task())
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            futures = [executor.submit(run_in_thread) for _ in range(2)]
-            results = [f.result() for f in futures]
-
-        client1, loop1 = results[0]
-        client2, loop2 = results[1]
-
-        assert loop1 is not loop2
-        assert client1 is not client2
-        assert len(mock_client_instances) == 2
-
-        assert loop1.is_closed()
-        assert loop2.is_closed()
-
-        # 2. Access from current loop should trigger cleanup
-        current_loop = asyncio.get_running_loop()
-        await manager.init_redis(redis_url, run_listener=False)
-        current_client = manager.get_redis_client()
-
-        # Closed loops should have been cleaned up
-        assert loop1 not in manager._clients
-        assert loop2 not in manager._clients
-        assert current_loop in manager._clients
-        assert manager._clients[current_loop] is current_client
-
-        # Verify that aclose was called on the closed loops' clients
-        for client in mock_client_instances:
-            if client is not current_client:
-                client.aclose.assert_called()
-
-        await manager.close()
-        assert len(manager._clients) == 0
+async def test_execute_pipelined_sends_commands_in_one_round_trip(clients):
+    pool = RedisPool("redis://localhost:6379/0")
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, True])
+    pool.client().pipeline.return_value.__aenter__.return_value = pipe
+
+    results = await pool.execute_pipelined(("SADD", "key", "a"), ("EXPIRE", "key", 60))
+
+    assert results == [1, True]
+    clients[0].pipeline.assert_called_once_with(transaction=False)
+    assert [call.args for call in pipe.execute_command.call_args_list] == [
+        ("SADD", "key", "a"),
+        ("EXPIRE", "key", 60),
+    ]
+    pipe.execute.assert_awaited_once()
+
+
+def test_worker_runtime_closes_the_thread_pool(clients):
+    pool = RedisPool("redis://localhost:6379/0")
+    runtime = WorkerRuntime()
+    runtime.on_close(pool.aclose)
+
+    async def get_client():
+        return pool.client()
+
+    client = runtime.submit(get_client())
+    assert runtime.submit(get_client()) is client
+    runtime.close()
+
+    client.aclose.assert_awaited_once_with(close_connection_pool=True)
@@ -0,0 +1,136 @@
+"""Tests for the per-thread worker event loop and loop-scoped database pools."""
+
+import asyncio
+import concurrent.futures
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import text
+from svcs import Container
+
+from src.config.database import LoopScopedSessionManager
+from src.core.email import EmailService
+from src.core.redis import redis_pool
+from src.core.runtime import WorkerRuntime
+from src.market.gateway import AsyncMarketGateway
+from src.worker import huey, setup_worker_services, teardown_worker_services
+
+
+async def _running_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+def test_submit_reuses_the_thread_loop():
+    runtime = WorkerRuntime()
+
+    first = runtime.submit(_running_loop())
+    second = runtime.submit(_running_loop())
+
+    assert first is second
+    assert not first.is_closed()
+    runtime.close()
+    assert first.is_closed()
+
+
+def test_each_thread_gets_its_own_loop():
+    runtime = WorkerRuntime()
+
+    def run_twice():
+        loops = (runtime.submit(_running_loop()), runtime.submit(_running_loop()))
+        runtime.close()
+        return loops
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        (a1, a2), (b1, b2) = executor.map(lambda _: run_twice(), range(2))
+
+    assert a1 is a2
+    assert b1 is b2
+    assert a1 is not b1
+
+
+def test_close_runs_cleanups_and_cancels_leftover_tasks():
+    runtime = WorkerRuntime()
+    closed = []
+
+    async def cleanup():
+        closed.append(asyncio.get_running_loop())
+
+    async def start_background_task():
+        return asyncio.create_task(asyncio.sleep(3600))
+
+    runtime.on_close(cleanup)
+    background = runtime.submit(start_background_task())
+    loop = runtime.loop()
+    runtime.close()
+
+    assert closed == [loop]
+    assert background.cancelled()
+    assert runtime.loop() is not loop
+    runtime.close()
+
+
+def test_loop_scoped_session_manager_keeps_one_pool_per_loop(test_db_url):
+    runtime = WorkerRuntime()
+    sessionmanager = LoopScopedSessionManager(test_db_url, {"pool_size": 1})
+    runtime.on_close(sessionmanager.close)
+
+    async def query():
+        async with sessionmanager.session() as session:
+            await session.execute(text("SELECT 1"))
+            return (await session.connection()).engine
+
+    try:
+        first = runtime.submit(query())
+        second = runtime.submit(query())
+        # The pooled connection is reused by the next task on the same loop
+        assert first is second
+        assert first.pool.checkedin() == 1
+    finally:
+        runtime.close()
+
+    runtime_2 = WorkerRuntime()
+    try:
+        assert runtime_2.submit(query()) is not first
+    finally:
+        runtime_2.submit(sessionmanager.close())
+        runtime_2.close()
+
+
+def test_worker_threads_share_one_registry_closed_by_the_last():
+    with (
+        patch("src.worker.init_worker_signals"),
+        patch("src.config.logging.init_logging"),
+        patch.object(huey, "svcs_registry", None),
+    ):
+        setup_worker_services()
+        registry = huey.svcs_registry
+        setup_worker_services()
+        assert huey.svcs_registry is registry
+        assert huey.worker_threads == 2
+
+        teardown_worker_services()
+        assert huey.svcs_registry is registry
+        teardown_worker_services()
+        assert huey.svcs_registry is None
+        assert huey.worker_threads == 0
+
+
+def test_worker_closes_loop_scoped_clients_on_each_thread():
+    runtime = MagicMock()
+    with (
+        patch("src.worker.init_worker_signals"),
+        patch("src.config.logging.init_logging"),
+        patch("src.worker.worker_runtime", runtime),
+        patch.object(huey, "svcs_registry", None),
+    ):
+        setup_worker_services()
+        registry = huey.svcs_registry
+        assert registry is not None
+        with Container(registry) as services:
+            gateway = services.get(AsyncMarketGateway)
+            email_service = services.get(EmailService)
+        huey.worker_threads -= 1
+
+    closers = [call.args[0] for call in runtime.on_close.call_args_list]
+    assert redis_pool.aclose in closers
+    assert gateway.aclose in closers
+    assert email_service.aclose in closers
@@ -1,5 +1,4 @@
 import json
-from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -24,15 +23,11 @@ async def test_health_live(client):
 
 @pytest.mark.anyio
 async def test_health_ready(monkeypatch, client):
-    # Setup mock for redis client context manager
+    # Setup mock for the shared Redis pool client
     mock_redis = AsyncMock()
     mock_redis.ping.return_value = True
 
-    @asynccontextmanager
-    async def mock_client():
-        yield mock_redis
-
-    monkeypatch.setattr("src.main.redis_manager.client", mock_client)
+    monkeypatch.setattr("src.main.redis_pool.client", lambda: mock_redis)
 
     response = await client.get("/health/ready")
     assert response.status_code == 200
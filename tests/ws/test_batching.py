@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+from src.ws.batching import coalesce, to_frame
+
+
+def _totals(account_id: str, value: int) -> dict:
+    return {"type": "account_totals_updated", "account_id": account_id, "totals": value}
+
+
+def test_coalesce_keeps_latest_totals_per_account():
+    first, second = str(uuid4()), str(uuid4())
+    started = {"type": "sync_started", "account_id": first}
+
+    assert coalesce(
+        [
+            _totals(first, 1),
+            _totals(second, 1),
+            started,
+            _totals(first, 2),
+            started,
+        ]
+    ) == [_totals(second, 1), started, _totals(first, 2), started]
+
+
+def test_coalesce_flattens_batches():
+    account_id = str(uuid4())
+    batch = to_frame([_totals(account_id, 1), {"type": "sync_started"}])
+
+    assert batch["type"] == "batch"
+    assert coalesce([batch, _totals(account_id, 2)]) == [
+        {"type": "sync_started"},
+        _totals(account_id, 2),
+    ]
+
+
+def test_to_frame_leaves_single_messages_unwrapped():
+    message = {"type": "ping"}
+
+    assert to_frame([message]) is message
+
+
+def test_coalesce_keeps_latest_price_per_security():
+    security_id = str(uuid4())
+
+    def price(close: str) -> dict:
+        return {
+            "type": "security_price_updated",
+            "security_id": security_id,
+            "close": close,
+        }
+
+    assert coalesce([price("1"), price("2"), {"type": "ping"}, price("3")]) == [
+        {"type": "ping"},
+        price("3"),
+    ]
@@ -0,0 +1,156 @@
+"""Tests for per-connection outbound queues, heartbeats and slow-consumer eviction."""
+
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from src.ws.connection import WS_POLICY_VIOLATION, WS_TRY_AGAIN_LATER, ClientConnection
+
+
+def _connection(websocket, *, on_evicted=None, **kwargs) -> ClientConnection:
+    options = {
+        "queue_size": 2,
+        "ping_interval": 3600,
+        "ping_timeout": 3600,
+        "drop_oldest_on_overflow": False,
+        "coalesce_window": 0,
+    } | kwargs
+    return ClientConnection(
+        websocket, uuid4(), on_evicted=on_evicted or AsyncMock(), **options
+    )
+
+
+def _websocket(send_json=None) -> AsyncMock:
+    websocket = AsyncMock()
+    websocket.application_state = WebSocketState.CONNECTED
+    if send_json is not None:
+        websocket.send_json.side_effect = send_json
+    return websocket
+
+
+def _frames(websocket) -> list[dict]:
+    return [c.args[0] for c in websocket.send_json.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_messages_are_written_in_order():
+    websocket = _websocket()
+    connection = _connection(websocket)
+    connection.start()
+
+    connection.send({"n": 1})
+    await asyncio.sleep(0.01)
+    connection.send({"n": 2})
+    await asyncio.sleep(0.01)
+
+    assert _frames(websocket) == [{"n": 1}, {"n": 2}]
+    await connection.close()
+    websocket.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected_when_queue_overflows():
+    stuck = asyncio.Event()
+
+    async def send_stuck(_message):
+        await stuck.wait()
+
+    websocket = _websocket(send_stuck)
+    on_evicted = AsyncMock()
+    connection = _connection(websocket, on_evicted=on_evicted)
+    connection.start()
+
+    # One message in flight, two queued, the fourth overflows
+    for n in range(4):
+        connection.send({"n": n})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    websocket.close.assert_awaited_once_with(code=WS_TRY_AGAIN_LATER)
+    on_evicted.assert_awaited_once_with(connection)
+    # Messages sent after the eviction are ignored
+    connection.send({"n": 5})
+    assert websocket.send_json.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_loses_oldest_messages_with_drop_policy():
+    release = asyncio.Event()
+
+    async def send_slow(_message):
+        await release.wait()
+
+    websocket = _websocket(send_slow)
+    on_evicted = AsyncMock()
+    connection = _connection(
+        websocket, on_evicted=on_evicted, drop_oldest_on_overflow=True
+    )
+    connection.start()
+
+    for n in range(5):
+        connection.send({"n": n})
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.sleep(0.01)
+
+    # The backlog is written as one frame once the client catches up
+    assert _frames(websocket) == [
+        {"n": 0},
+        {"type": "batch", "messages": [{"n": 3}, {"n": 4}]},
+    ]
+    on_evicted.assert_not_awaited()
+    await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_pings_and_evicts_silent_clients():
+    websocket = _websocket()
+    on_evicted = AsyncMock()
+    connection = _connection(
+        websocket, on_evicted=on_evicted, ping_interval=0.01, ping_timeout=0.035
+    )
+    connection.start()
+
+    await asyncio.sleep(0.025)
+    websocket.send_json.assert_any_await({"type": "ping"})
+    connection.touch()
+    await asyncio.sleep(0.025)
+    on_evicted.assert_not_awaited()
+
+    await asyncio.sleep(0.05)
+    websocket.close.assert_awaited_once_with(code=WS_POLICY_VIOLATION)
+    on_evicted.assert_awaited_once_with(connection)
+
+
+@pytest.mark.asyncio
+async def test_messages_within_the_window_are_coalesced_into_one_frame():
+    websocket = _websocket()
+    connection = _connection(websocket, coalesce_window=0.02, queue_size=10)
+    connection.start()
+    account_id = str(uuid4())
+
+    def totals(value):
+        return {
+            "type": "account_totals_updated",
+            "account_id": account_id,
+            "totals": value,
+        }
+
+    connection.send(totals(1))
+    connection.send({"type": "sync_finished", "account_id": account_id})
+    connection.send(totals(2))
+    await asyncio.sleep(0.05)
+
+    assert _frames(websocket) == [
+        {
+            "type": "batch",
+            "messages": [
+                {"type": "sync_finished", "account_id": account_id},
+                totals(2),
+            ],
+        }
+    ]
+    await connection.close()
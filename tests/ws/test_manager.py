@@ -8,46 +8,43 @@ from uuid import uuid4
 import pytest
 from starlette.websockets import WebSocketState
 
+from src.config.settings import settings
+from src.core.redis import RedisPool
+from src.ws.batching import coalesce
 from src.ws.manager import ConnectionManager
 
 
+def _pool(redis) -> MagicMock:
+    """A Redis pool handing out the given client."""
+    pool = MagicMock(spec=RedisPool)
+    pool.client.return_value = redis
+    return pool
+
+
 @pytest.fixture
 def cm():
     manager = ConnectionManager()
     yield manager
-    # Clean up loop-scoped clients after test
-    manager._clients.clear()
     if manager._pubsub_task and not manager._pubsub_task.done():
         manager._pubsub_task.cancel()
 
 
 @pytest.mark.asyncio
 async def test_init_redis(cm):
-    loop = asyncio.get_running_loop()
-
-    closed_loop = MagicMock()
-    closed_loop.is_closed.return_value = True
-    closed_client = AsyncMock()
-    closed_client.aclose.side_effect = Exception("aclose error")
-    cm._clients[closed_loop] = closed_client
-
     mock_redis = AsyncMock()
-    with (
-        patch("redis.asyncio.from_url", return_value=mock_redis),
-        patch.object(cm, "_listen_for_messages", new=AsyncMock()),
-    ):
-        await cm._orig_init_redis("redis://localhost:6379", run_listener=True)
+    pool = _pool(mock_redis)
+
+    assert cm.get_redis_client() is None
+    with patch.object(cm, "_listen_for_messages", new=AsyncMock()):
+        await cm._orig_init_redis(pool, run_listener=True)
 
-        assert closed_client.aclose.called
-        assert cm._clients[loop] == mock_redis
+        assert cm.get_redis_client() is mock_redis
         assert cm._pubsub_task is not None
         await asyncio.sleep(0.01)
 
 
 @pytest.mark.asyncio
 async def test_init_redis_restarts_done_listener(cm):
-    mock_redis = AsyncMock()
-
     async def dummy():
         pass
 
@@ -55,20 +52,15 @@ async def test_init_redis_restarts_done_listener(cm):
     await done_task
     cm._pubsub_task = done_task
 
-    with (
-        patch("redis.asyncio.from_url", return_value=mock_redis),
-        patch.object(cm, "_listen_for_messages", new=AsyncMock()),
-    ):
-        await cm._orig_init_redis("redis://localhost:6379", run_listener=True)
+    with patch.object(cm, "_listen_for_messages", new=AsyncMock()):
+        await cm._orig_init_redis(_pool(AsyncMock()), run_listener=True)
         assert cm._pubsub_task is not done_task
 
 
 @pytest.mark.asyncio
 async def test_close(cm):
-    loop = asyncio.get_running_loop()
-    mock_client = AsyncMock()
-    mock_client.aclose.side_effect = Exception("aclose fail")
-    cm._clients[loop] = mock_client
+    pool = _pool(AsyncMock())
+    cm._pool = pool
 
     async def slow_task():
         with contextlib.suppress(asyncio.CancelledError):
@@ -78,8 +70,9 @@ async def test_close(cm):
 
     await cm._orig_close()
     assert cm._pubsub_task is None
-    assert len(cm._clients) == 0
-    assert mock_client.aclose.called
+    assert cm.get_redis_client() is None
+    # The shared pool is left to its owner
+    pool.aclose.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -88,62 +81,246 @@ async def test_connect_and_disconnect(cm):
     ws1 = AsyncMock()
     ws2 = AsyncMock()
 
-    await cm.connect(ws1, user_id, subprotocol="proto1")
+    def sockets():
+        return [c.websocket for c in cm.active_connections[user_id]]
+
+    connection = await cm.connect(ws1, user_id, subprotocol="proto1")
     ws1.accept.assert_called_once_with(subprotocol="proto1")
-    assert cm.active_connections[user_id] == [ws1]
+    assert connection.websocket is ws1
+    assert sockets() == [ws1]
 
     await cm.connect(ws2, user_id)
-    assert cm.active_connections[user_id] == [ws1, ws2]
+    assert sockets() == [ws1, ws2]
 
-    cm.disconnect(ws1, user_id)
-    assert cm.active_connections[user_id] == [ws2]
+    await cm.disconnect(ws1, user_id)
+    assert sockets() == [ws2]
 
-    cm.disconnect(ws1, user_id)
+    await cm.disconnect(ws1, user_id)
 
-    cm.disconnect(ws2, user_id)
+    await cm.disconnect(ws2, user_id)
     assert user_id not in cm.active_connections
 
-    cm.disconnect(ws1, user_id)
+    await cm.disconnect(ws1, user_id)
+
+
+class FakePresenceRedis:
+    """In-memory stand-in for the Redis hash commands used for presence."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.ttls: dict[str, int] = {}
+        self.sorted_sets: dict[str, dict[str, float]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.registered_scripts: list[str] = []
+        self._queued: list = []
+
+    def pipeline(self, *, transaction: bool = True):  # noqa: ARG002
+        return self
+
+    async def __aenter__(self):
+        self._queued = []
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._queued = []
+
+    def hset(self, key, field, value):
+        self._queued.append(
+            lambda: self.hashes.setdefault(key, {}).update({field: value})
+        )
+
+    def hdel(self, key, field):
+        def run():
+            self.hashes.get(key, {}).pop(field, None)
+            if not self.hashes.get(key):
+                self.hashes.pop(key, None)
+
+        self._queued.append(run)
+
+    def expire(self, key, seconds):
+        self._queued.append(lambda: self.ttls.__setitem__(key, seconds))
+
+    def exists(self, key):
+        self._queued.append(lambda: int(key in self.hashes))
+
+    def zadd(self, key, mapping):
+        self._queued.append(
+            lambda: self.sorted_sets.setdefault(key, {}).update(mapping)
+        )
+
+    def zremrangebyscore(self, key, _min, max_score):
+        def run():
+            members = self.sorted_sets.get(key, {})
+            for member, score in list(members.items()):
+                if score <= max_score:
+                    del members[member]
+
+        self._queued.append(run)
+
+    def zrangebyscore(self, key, min_score, _max):
+        self._queued.append(
+            lambda: [
+                member
+                for member, score in self.sorted_sets.get(key, {}).items()
+                if score >= min_score
+            ]
+        )
+
+    async def execute(self):
+        results = [command() for command in self._queued]
+        self._queued = []
+        return results
+
+    def register_script(self, script):
+        self.registered_scripts.append(script)
+
+        async def publish(keys, args):
+            # Mirrors the publish script: one publish per process holding the key
+            (key,), (channel_prefix, payload) = keys, args
+            for instance_id in self.hashes.get(key, {}):
+                self.published.append((f"{channel_prefix}{instance_id}", payload))
+            return len(self.hashes.get(key, {}))
+
+        return publish
+
+
+@pytest.mark.asyncio
+async def test_presence_counts_connections_per_process(cm):
+    user_id, other_user = uuid4(), uuid4()
+    redis = FakePresenceRedis()
+    cm._pool = _pool(redis)
+    ws1, ws2 = AsyncMock(), AsyncMock()
+    key = f"ws-presence:{user_id}"
+
+    await cm.connect(ws1, user_id)
+    await cm.connect(ws2, user_id)
+    assert redis.hashes[key] == {cm.instance_id: 2}
+    assert redis.ttls[key] == settings.ws_presence_ttl_seconds
+
+    # Another process holding a connection of the same user
+    redis.hashes[key]["other-process"] = 1
+    await cm.disconnect(ws1, user_id)
+    await cm.disconnect(ws2, user_id)
+    assert redis.hashes[key] == {"other-process": 1}
+    assert await cm.is_online([user_id, other_user]) == {
+        user_id: True,
+        other_user: False,
+    }
+
+    # The other process died and its entry expired
+    del redis.hashes[key]
+    assert await cm.is_online([user_id]) == {user_id: False}
+
+
+@pytest.mark.asyncio
+async def test_presence_heartbeat_refreshes_local_users(cm):
+    user_id = uuid4()
+    redis = FakePresenceRedis()
+    cm._pool = _pool(redis)
+    cm.active_connections[user_id] = [AsyncMock()]
+
+    with (
+        patch.object(settings, "ws_presence_heartbeat_seconds", 0),
+        patch.object(settings, "ws_presence_ttl_seconds", 7),
+    ):
+        heartbeat = asyncio.create_task(cm._heartbeat_presence())
+        await asyncio.sleep(0.01)
+        heartbeat.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await heartbeat
+
+    assert redis.hashes[f"ws-presence:{user_id}"] == {cm.instance_id: 1}
+    assert redis.ttls[f"ws-presence:{user_id}"] == 7
+
+
+@pytest.mark.asyncio
+async def test_close_clears_presence_of_this_process(cm):
+    user_id = uuid4()
+    redis = FakePresenceRedis()
+    redis.aclose = AsyncMock()
+    cm._pool = _pool(redis)
+    await cm.connect(AsyncMock(), user_id)
+
+    await cm._orig_close()
+
+    assert redis.hashes == {}
+    # The client belongs to the shared pool
+    redis.aclose.assert_not_awaited()
 
 
 @pytest.mark.asyncio
+async def test_is_online_fails_open_without_redis(cm):
+    user_id = uuid4()
+    with patch.object(cm, "get_redis_client", return_value=None):
+        assert await cm.is_online([user_id, user_id]) == {user_id: True}
+
+    failing = MagicMock()
+    failing.pipeline.return_value.__aenter__.side_effect = ConnectionError("down")
+    with patch.object(cm, "get_redis_client", return_value=failing):
+        assert await cm.is_online([user_id]) == {user_id: True}
+
+
+@pytest.mark.asyncio
+@patch.object(settings, "ws_coalesce_window_seconds", 0)
 async def test_send_to_local_connections(cm):
     user_id = uuid4()
-    ws_connected = AsyncMock()
-    ws_connected.client_state = WebSocketState.CONNECTED
+    stuck = asyncio.Event()
+
+    ws_ok = AsyncMock()
 
-    ws_disconnected = AsyncMock()
-    ws_disconnected.client_state = WebSocketState.DISCONNECTED
+    async def send_stuck(_message):
+        await stuck.wait()
 
+    ws_slow = AsyncMock()
+    ws_slow.send_json.side_effect = send_stuck
     ws_error = AsyncMock()
-    ws_error.client_state = WebSocketState.CONNECTED
     ws_error.send_json.side_effect = Exception("Send failed")
-
-    cm.active_connections[user_id] = [ws_connected, ws_disconnected, ws_error]
+    for ws in (ws_ok, ws_slow, ws_error):
+        ws.application_state = WebSocketState.CONNECTED
+        await cm.connect(ws, user_id)
 
     msg = {"type": "test"}
     await cm._send_to_local_connections(user_id, msg)
+    await cm._send_to_local_connections(user_id, msg)
+    await asyncio.sleep(0.01)
 
-    ws_connected.send_json.assert_called_once_with(msg)
-    ws_disconnected.send_json.assert_not_called()
-    ws_error.send_json.assert_called_once_with(msg)
+    # The stuck client holds up neither the caller nor the other clients
+    sent = [frame for c in ws_ok.send_json.await_args_list for frame in c.args]
+    assert coalesce(sent) == [msg, msg]
+    ws_slow.send_json.assert_called_once()
+    # The failing client is evicted
+    ws_error.send_json.assert_called_once()
+    ws_error.close.assert_awaited_once()
+    assert [c.websocket for c in cm.active_connections[user_id]] == [ws_ok, ws_slow]
 
     other_user = uuid4()
     await cm._send_to_local_connections(other_user, msg)
 
+    for ws in (ws_ok, ws_slow):
+        await cm.disconnect(ws, user_id)
+    assert user_id not in cm.active_connections
+
 
 @pytest.mark.asyncio
 async def test_send_personal_message_redis_success(cm):
     user_id = uuid4()
+    script = AsyncMock()
     mock_redis = AsyncMock()
-    loop = asyncio.get_running_loop()
-    cm._clients[loop] = mock_redis
+    mock_redis.register_script = MagicMock(return_value=script)
+    cm._pool = _pool(mock_redis)
 
     msg = {"content": "hello"}
     await cm._orig_send_personal_message(msg, user_id)
+    await cm._orig_send_personal_message(msg, user_id)
 
+    # The script is registered once and then sent by its SHA
+    mock_redis.register_script.assert_called_once()
+    mock_redis.eval.assert_not_called()
     expected_payload = json.dumps({"user_id": str(user_id), "message": msg})
-    mock_redis.publish.assert_called_once_with("ws_messages", expected_payload)
+    script.assert_awaited_with(
+        keys=[f"ws-presence:{user_id}"], args=["ws_messages:", expected_payload]
+    )
+    assert script.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -167,9 +344,10 @@ async def test_send_personal_message_redis_fallback_on_init_failure(cm):
 async def test_send_personal_message_redis_fallback_on_publish_failure(cm):
     user_id = uuid4()
     mock_redis = AsyncMock()
-    mock_redis.publish.side_effect = Exception("Publish error")
-    loop = asyncio.get_running_loop()
-    cm._clients[loop] = mock_redis
+    mock_redis.register_script = MagicMock(
+        return_value=AsyncMock(side_effect=Exception("Publish error"))
+    )
+    cm._pool = _pool(mock_redis)
     msg = {"content": "hello"}
     mock_local = AsyncMock()
 
@@ -247,7 +425,7 @@ async def test_listen_for_messages_processes_messages(cm):
     ):
         await cm._listen_for_messages()
 
-        mock_pubsub.subscribe.assert_called_once_with("ws_messages")
+        mock_pubsub.subscribe.assert_called_once_with(cm.channel)
         mock_local.assert_called_once_with(user_id, msg_payload)
 
 
@@ -263,7 +441,7 @@ async def test_listen_for_messages_cancelled(cm):
 
     with patch.object(cm, "get_redis_client", return_value=mock_redis):
         await cm._listen_for_messages()
-        mock_pubsub.unsubscribe.assert_called_once_with("ws_messages")
+        mock_pubsub.unsubscribe.assert_called_once_with(cm.channel)
         mock_pubsub.aclose.assert_called_once()
 
 
@@ -293,3 +471,172 @@ async def test_listen_for_messages_restarts_on_error(cm):
         # Clean up created task
         if cm._pubsub_task:
             await cm._pubsub_task
+
+
+@pytest.mark.asyncio
+async def test_messages_are_published_only_to_processes_of_the_user(cm):
+    other_process = ConnectionManager()
+    redis = FakePresenceRedis()
+    cm._pool = _pool(redis)
+    other_process._pool = _pool(redis)
+    local_user, remote_user, offline_user = uuid4(), uuid4(), uuid4()
+
+    await cm.connect(AsyncMock(), local_user)
+    await other_process.connect(AsyncMock(), remote_user)
+    await other_process.connect(AsyncMock(), local_user)
+
+    for user_id in (local_user, remote_user, offline_user):
+        await cm._orig_send_personal_message({"type": "ping"}, user_id)
+
+    channels = [
+        (channel, json.loads(payload)["user_id"])
+        for channel, payload in redis.published
+    ]
+    assert channels == [
+        (cm.channel, str(local_user)),
+        (other_process.channel, str(local_user)),
+        (other_process.channel, str(remote_user)),
+    ]
+    assert cm.channel != other_process.channel
+    # One registration per manager and client, however many messages
+    assert len(redis.registered_scripts) == 1
+
+    for manager in (cm, other_process):
+        for connections in manager.active_connections.values():
+            for connection in connections:
+                await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_publishes_one_frame_per_user(cm):
+    user_id, other_user = uuid4(), uuid4()
+    account_id = str(uuid4())
+    published = []
+
+    async def publish(message, user_id):
+        published.append((user_id, message))
+
+    def totals(value):
+        return {
+            "type": "account_totals_updated",
+            "account_id": account_id,
+            "totals": value,
+        }
+
+    with patch.object(cm, "_publish", side_effect=publish):
+        async with cm.coalescing():
+            await cm._orig_send_personal_message(totals(1), user_id)
+            await cm._orig_send_personal_message({"type": "sync_started"}, user_id)
+            async with cm.coalescing():
+                await cm._orig_send_personal_message(totals(2), user_id)
+            await cm._orig_send_personal_message({"type": "sync_failed"}, other_user)
+            assert published == []
+
+        await cm._orig_send_personal_message({"type": "ping"}, user_id)
+
+    assert published == [
+        (
+            user_id,
+            {"type": "batch", "messages": [{"type": "sync_started"}, totals(2)]},
+        ),
+        (other_user, {"type": "sync_failed"}),
+        (user_id, {"type": "ping"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_flushes_every_window(cm):
+    user_id = uuid4()
+    published = []
+
+    async def publish(message, user_id):
+        published.append((user_id, message))
+
+    with (
+        patch.object(cm, "_publish", side_effect=publish),
+        patch.object(settings, "ws_coalesce_window_seconds", 0.01),
+    ):
+        async with cm.coalescing():
+            await cm._orig_send_personal_message({"type": "sync_started"}, user_id)
+            await asyncio.sleep(0.03)
+            assert published == [(user_id, {"type": "sync_started"})]
+            await cm._orig_send_personal_message({"type": "sync_finished"}, user_id)
+
+    assert published[-1] == (user_id, {"type": "sync_finished"})
+
+
+@pytest.mark.asyncio
+@patch.object(settings, "ws_coalesce_window_seconds", 0)
+async def test_price_subscriptions_are_indexed_and_published(cm):
+    redis = FakePresenceRedis()
+    cm._pool = _pool(redis)
+    watched, other = uuid4(), uuid4()
+    ws1, ws2 = AsyncMock(), AsyncMock()
+    first = await cm.connect(ws1, uuid4())
+    second = await cm.connect(ws2, uuid4())
+
+    await cm.subscribe(first, [watched, other, watched])
+    await cm.subscribe(second, [watched])
+
+    assert cm.subscriptions == {watched: {first, second}, other: {first}}
+    assert redis.hashes[f"ws-price-subs:{watched}"] == {cm.instance_id: 2}
+    assert await cm.get_subscribed_security_ids() == {watched, other}
+
+    # Only the processes with subscribers receive the price
+    price = {"type": "security_price_updated", "security_id": str(watched)}
+    await cm.send_security_message(price, watched)
+    assert [channel for channel, _ in redis.published] == [cm.channel]
+
+    await cm._send_to_subscribers(watched, price)
+    await asyncio.sleep(0.01)
+    ws1.send_json.assert_awaited_once_with(price)
+    ws2.send_json.assert_awaited_once_with(price)
+
+    await cm.unsubscribe(first, [other])
+    assert cm.subscriptions == {watched: {first, second}}
+    assert f"ws-price-subs:{other}" not in redis.hashes
+
+    # Disconnecting drops the connection's subscriptions
+    await cm.disconnect(ws1, first.user_id)
+    await cm.disconnect(ws2, second.user_id)
+    assert cm.subscriptions == {}
+    assert redis.hashes == {}
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_per_connection_are_limited(cm):
+    connection = await cm.connect(AsyncMock(), uuid4())
+
+    with patch.object(settings, "ws_max_subscriptions_per_connection", 2):
+        await cm.subscribe(connection, [uuid4(), uuid4(), uuid4()])
+        await cm.subscribe(connection, [uuid4()])
+
+    assert len(connection.security_ids) == 2
+    await cm.disconnect(connection.websocket, connection.user_id)
+
+
+@pytest.mark.asyncio
+async def test_listen_for_messages_routes_security_messages(cm):
+    security_id = uuid4()
+    msg_payload = {"type": "security_price_updated"}
+
+    async def gen():
+        yield {
+            "type": "message",
+            "data": json.dumps(
+                {"security_id": str(security_id), "message": msg_payload}
+            ),
+        }
+
+    mock_redis = MagicMock()
+    mock_redis.pubsub.return_value = MockPubSub(gen)
+
+    with (
+        patch.object(cm, "get_redis_client", return_value=mock_redis),
+        patch.object(cm, "_send_to_subscribers", new=AsyncMock()) as mock_send,
+        patch.object(cm, "_send_to_local_connections", new=AsyncMock()) as mock_local,
+    ):
+        await cm._listen_for_messages()
+
+    mock_send.assert_awaited_once_with(security_id, msg_payload)
+    mock_local.assert_not_awaited()
@@ -17,7 +17,7 @@ from src.config.services import register_services
 from src.config.settings import settings
 from src.main import app
 from src.ws.api_types import AccountTotalsUpdatedMessage, WsEventType
-from src.ws.router import _check_ticket_not_replayed
+from src.ws.router import _check_ticket_not_replayed, _handle_client_message
 
 WS_POLICY_VIOLATION = 1008
 
@@ -62,10 +62,10 @@ async def test_check_ticket_not_replayed_first_use():
     mock_redis = AsyncMock()
     mock_redis.set.return_value = "OK"
 
-    with patch("redis.asyncio.from_url", return_value=mock_redis):
-        result = await _check_ticket_not_replayed("ticket123", "redis://localhost:6379")
+    with patch("src.ws.router.redis_pool.client", return_value=mock_redis):
+        result = await _check_ticket_not_replayed("ticket123")
         assert result is True
-        mock_redis.aclose.assert_called_once()
+        mock_redis.aclose.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -73,10 +73,10 @@ async def test_check_ticket_not_replayed_already_used():
     mock_redis = AsyncMock()
     mock_redis.set.return_value = None
 
-    with patch("redis.asyncio.from_url", return_value=mock_redis):
-        result = await _check_ticket_not_replayed("ticket123", "redis://localhost:6379")
+    with patch("src.ws.router.redis_pool.client", return_value=mock_redis):
+        result = await _check_ticket_not_replayed("ticket123")
         assert result is False
-        mock_redis.aclose.assert_called_once()
+        mock_redis.aclose.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -84,10 +84,10 @@ async def test_check_ticket_not_replayed_exception_handled():
     mock_redis = AsyncMock()
     mock_redis.set.side_effect = Exception("Redis connection error")
 
-    with patch("redis.asyncio.from_url", return_value=mock_redis):
-        result = await _check_ticket_not_replayed("ticket123", "redis://localhost:6379")
+    with patch("src.ws.router.redis_pool.client", return_value=mock_redis):
+        result = await _check_ticket_not_replayed("ticket123")
         assert result is True
-        mock_redis.aclose.assert_called_once()
+        mock_redis.aclose.assert_not_called()
 
 
 # --- Router integration tests using TestClient ---
@@ -208,3 +208,32 @@ def test_websocket_with_custom_request_id(client, user_id):
         ) as websocket,
     ):
         assert websocket is not None
+
+
+@pytest.mark.asyncio
+async def test_client_messages_subscribe_and_unsubscribe():
+    connection = object()
+    security_id = uuid4()
+
+    with patch("src.ws.router.ws_manager") as mock_ws_manager:
+        mock_ws_manager.subscribe = AsyncMock()
+        mock_ws_manager.unsubscribe = AsyncMock()
+
+        await _handle_client_message(
+            connection,
+            json.dumps({"type": "subscribe", "security_ids": [str(security_id)]}),
+        )
+        await _handle_client_message(
+            connection,
+            json.dumps({"type": "unsubscribe", "security_ids": [str(security_id)]}),
+        )
+        for ignored in (
+            '{"type": "pong"}',
+            "not json",
+            "[]",
+            '{"type": "subscribe", "security_ids": ["not-a-uuid"]}',
+        ):
+            await _handle_client_message(connection, ignored)
+
+    mock_ws_manager.subscribe.assert_awaited_once_with(connection, [security_id])
+    mock_ws_manager.unsubscribe.assert_awaited_once_with(connection, [security_id])